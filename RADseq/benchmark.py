@@ -0,0 +1,580 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+#-------------------------------------------------------------------------------
+
+'''This software has been developed by:
+
+       GI Genética, Fisiología e Historia Forestal
+       Dpto. Sistemas y Recursos Naturales
+       ETSI Montes, Forestal y del Medio Natural
+       Universidad Politécnica de Madrid
+       https://github.com/ggfhf/
+
+   Licence: GNU General Public Licence Version 3
+'''
+
+#-------------------------------------------------------------------------------
+
+'''This source contains the program of the ddRADseqTools software package that
+   generates a seeded synthetic genome and times the digests of rsitesearch.py
+   and the main sequence functions of genlib.py, so the changes of performance
+   can be measured against the results of a previous benchmark.
+'''
+#-------------------------------------------------------------------------------
+
+import json
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from genlib import *
+import rsitesearch
+
+#-------------------------------------------------------------------------------
+
+def main(argv):
+    '''Main line of the program.'''
+
+    # build the options dictionary
+    options_dict = build_options()
+
+    # it has been requested the help or to build a new config file
+    for param in argv:
+        # show the help and exit OK
+        if param.startswith('--help'):
+            print_help(options_dict)
+            sys.exit(0)
+        # build the config file and exit OK
+        elif param.startswith('--config'):
+            build_config(options_dict)
+            sys.exit(0)
+
+    # get the config file
+    config_file = get_config_file(__file__)
+
+    # get options from the config file and the input parameters
+    options_dict = get_options(options_dict, config_file, argv)
+
+    # run the benchmark
+    do_benchmark(options_dict)
+
+#-------------------------------------------------------------------------------
+
+def do_benchmark(options_dict):
+    '''Generate the synthetic genome and time the digests and the sequence functions.'''
+
+    benchsize = options_dict['benchsize']['value']
+    benchstartup = options_dict['benchstartup']['value']
+    benchgc = options_dict['benchgc']['value']
+    benchcontigs = options_dict['benchcontigs']['value']
+    benchcontigdist = options_dict['benchcontigdist']['value']
+    benchngaps = options_dict['benchngaps']['value']
+    benchseed = options_dict['benchseed']['value']
+    benchrepeats = options_dict['benchrepeats']['value']
+    benchdir = options_dict['benchdir']['value']
+    benchfile = options_dict['benchfile']['value']
+    benchbaseline = options_dict['benchbaseline']['value']
+    rsfile = options_dict['rsfile']['value']
+    enzyme1 = options_dict['enzyme1']['value']
+    enzyme2 = options_dict['enzyme2']['value']
+    minfragsize = options_dict['minfragsize']['value']
+    maxfragsize = options_dict['maxfragsize']['value']
+    engine = options_dict['engine']['value']
+    processes = options_dict['processes']['value']
+    verbose = options_dict['verbose']['value']
+    trace = options_dict['trace']['value']
+
+    # set the verbose and trace status
+    if verbose.upper() == 'YES':
+        Message.set_verbose_status(True)
+    else:
+        Message.set_verbose_status(False)
+    if trace.upper() == 'YES':
+        Message.set_trace_status(True)
+    else:
+        Message.set_trace_status(False)
+
+    # create the directory of the synthetic genomes and the files of the digests
+    try:
+        os.makedirs(benchdir, exist_ok=True)
+    except:
+        raise ProgramError('F001', benchdir)
+
+    # initialize the results
+    results_dict = {}
+
+    # time the start of the programs, before any other benchmark runs child processes
+    results_dict.update(benchmark_startup(benchstartup, benchrepeats))
+
+    # get the synthetic genome, which is generated when it does not exist
+    genfile = build_synthetic_genome(benchdir, benchsize, benchgc, benchcontigs, benchcontigdist, benchngaps, benchseed)
+
+    # time the sequence functions of genlib
+    results_dict.update(benchmark_sequence_functions(genfile, benchseed, benchrepeats))
+
+    # time the double digest and the single digest of rsitesearch
+    digest_params_list = [
+        '--genfile={0}'.format(genfile),
+        '--rsfile={0}'.format(rsfile),
+        '--minfragsize={0}'.format(minfragsize),
+        '--maxfragsize={0}'.format(maxfragsize),
+        '--engine={0}'.format(engine),
+        '--processes={0}'.format(processes)
+        ]
+    results_dict['do_double_digest'] = benchmark_digest('do_double_digest', digest_params_list + ['--enzyme1={0}'.format(enzyme1), '--enzyme2={0}'.format(enzyme2)], benchdir, benchsize, benchrepeats)
+    results_dict['do_single_digest'] = benchmark_digest('do_single_digest', digest_params_list + ['--enzyme1={0}'.format(enzyme1), '--enzyme2={0}'.format(enzyme1)], benchdir, benchsize, benchrepeats)
+
+    # build the benchmark data
+    benchmark_dict = {
+        'program': get_file_name(__file__),
+        'version': get_project_version(),
+        'genome': {'genfile': genfile, 'size_mb': benchsize, 'GC_rate': benchgc, 'contigs': benchcontigs, 'contig_distribution': benchcontigdist, 'N_gaps_per_mb': benchngaps, 'seed': benchseed},
+        'digest': {'enzymes': [enzyme1, enzyme2], 'minfragsize': minfragsize, 'maxfragsize': maxfragsize, 'engine': engine, 'processes': processes},
+        'repeats': benchrepeats,
+        'startup_budget_ms': benchstartup,
+        'results': results_dict
+        }
+
+    # compare the results with the ones of the baseline
+    if benchbaseline.upper() != 'NONE':
+        benchmark_dict['comparison'] = compare_baseline(benchbaseline, results_dict)
+
+    # write the benchmark file
+    write_benchmark_file(benchfile, benchmark_dict)
+
+#-------------------------------------------------------------------------------
+
+def benchmark_startup(benchstartup, benchrepeats):
+    '''Time the start of every program showing its help, which is paid by every small job, and check it against the budget of benchstartup milliseconds.'''
+
+    # initialize the results
+    results_dict = {}
+
+    # for every program
+    for program in ['rsitesearch.py', 'rsitescreen.py', 'fragsweep.py']:
+
+        # run the program several times (at least 5 because the times are short)
+        program_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), program)
+        wall_times_list = []
+        cpu_times_list = []
+        for i in range(max(benchrepeats, 5)):
+            (wall_start_time, children_start_times) = (time.perf_counter(), os.times())
+            try:
+                subprocess.run([sys.executable, program_file, '--help'], stdout=subprocess.DEVNULL, check=True)
+            except:
+                raise ProgramError('S003', program_file)
+            children_end_times = os.times()
+            wall_times_list.append(time.perf_counter() - wall_start_time)
+            cpu_times_list.append(children_end_times.children_user + children_end_times.children_system - children_start_times.children_user - children_start_times.children_system)
+
+        # get the result and check the budget
+        result_dict = get_result_dict(wall_times_list, cpu_times_list, 1, 'starts', 'peak_rss_kb', RunReport.get_peak_rss_kb(True))
+        result_dict['is_within_budget'] = result_dict['best_time'] * 1000 <= benchstartup
+        results_dict['startup {0}'.format(program)] = result_dict
+        if result_dict['is_within_budget']:
+            Message.print('info', 'The start of {0} takes {1:.1f} ms (budget: {2} ms).'.format(program, result_dict['best_time'] * 1000, benchstartup))
+        else:
+            Message.print('info', '*** WARNING: The start of {0} takes {1:.1f} ms, which is over the budget of {2} ms.'.format(program, result_dict['best_time'] * 1000, benchstartup))
+
+    # return the results
+    return results_dict
+
+#-------------------------------------------------------------------------------
+
+def build_synthetic_genome(benchdir, benchsize, benchgc, benchcontigs, benchcontigdist, benchngaps, benchseed):
+    '''Build a synthetic genome in FASTA format from a seeded random generator, so the same options always give the same genome, and return its path (its messages are verbose ones, so a caller using it as a library can turn them off).'''
+
+    import numpy as np
+
+    # get the genome file, which is not generated again when it exists
+    genfile = os.path.join(benchdir, 'genome-{0:g}Mb-GC{1:g}-{2}{3}-N{4:g}-seed{5}.fasta'.format(benchsize, benchgc, benchcontigs, benchcontigdist.lower(), benchngaps, benchseed))
+    if os.path.isfile(genfile):
+        Message.print('verbose', 'The synthetic genome {0} is used.\n', get_file_name(genfile))
+        return genfile
+
+    # initialize the random generator
+    generator = np.random.default_rng(benchseed)
+
+    # get the contig lengths
+    genome_len = int(benchsize * 1000000)
+    if benchcontigdist == 'UNIFORM':
+        weights_array = np.ones(benchcontigs)
+    else:
+        weights_array = generator.lognormal(0.0, 1.0, benchcontigs)
+    contig_lens_array = np.maximum(np.floor(weights_array / weights_array.sum() * genome_len).astype(np.int64), 1)
+    contig_lens_array[-1] = max(1, genome_len - int(contig_lens_array[:-1].sum()))
+
+    # set the nucleotides and their probabilities
+    nucleotides_array = np.frombuffer(b'ACGT', dtype=np.uint8)
+    probabilities_list = [(1 - benchgc) / 2, benchgc / 2, benchgc / 2, (1 - benchgc) / 2]
+
+    # open the genome file
+    try:
+        genfile_id = open(genfile, mode='wb')
+    except:
+        raise ProgramError('F001', genfile)
+
+    # for each contig
+    line_len = 60
+    chunk_len = line_len * 16384
+    for (i, contig_len) in enumerate(contig_lens_array.tolist()):
+
+        # write the head
+        genfile_id.write('>contig_{0} synthetic length={1}\n'.format(i + 1, contig_len).encode('iso-8859-1'))
+
+        # write the nucleotides in chunks with the N gaps of each chunk
+        for chunk_start in range(0, contig_len, chunk_len):
+            chunk_array = generator.choice(nucleotides_array, size=min(chunk_len, contig_len - chunk_start), p=probabilities_list)
+            for gap_start in generator.integers(0, len(chunk_array), generator.poisson(benchngaps * len(chunk_array) / 1000000)).tolist():
+                chunk_array[gap_start:gap_start + int(generator.integers(10, 1000))] = ord('N')
+            chunk_bytes = chunk_array.tobytes()
+            genfile_id.write(b'\n'.join([chunk_bytes[j:j + line_len] for j in range(0, len(chunk_bytes), line_len)]))
+            genfile_id.write(b'\n')
+
+        # notify the contigs written
+        Message.print_progress('Contigs generated', i + 1, 'contigs')
+
+    # close the genome file
+    genfile_id.close()
+
+    # show OK message
+    Message.end_progress()
+    Message.print('verbose', 'The synthetic genome {0} is generated.\n', get_file_name(genfile))
+
+    # return the genome file
+    return genfile
+
+#-------------------------------------------------------------------------------
+
+def benchmark_sequence_functions(genfile, benchseed, benchrepeats):
+    '''Time the main sequence functions of genlib with fragments taken from the synthetic genome.'''
+
+    # get the fragments from the first loci of the genome (up to 3 Mb)
+    seq_list = []
+    seq_len = 0
+    genfile_id = open_genome_file(genfile)
+    for (locus_info, locus_seq) in read_fasta_loci(genfile_id, genfile):
+        seq_list.append(locus_seq)
+        seq_len += len(locus_seq)
+        if seq_len >= 3000000:
+            break
+    genfile_id.close()
+    seq = b''.join(seq_list)[:3000000].decode('iso-8859-1')
+    random.seed(benchseed)
+    fragment_len = 300
+    fragments_list = [seq[i:i + fragment_len] for i in [random.randrange(0, max(1, len(seq) - fragment_len)) for j in range(10000)]]
+    fragments_nucleotides_count = sum([len(fragment) for fragment in fragments_list])
+
+    # set the ambiguous restriction sites
+    ressites_list = ['GAATTC', 'CCNGG', 'GDGCHC', 'RGATCY', 'GGTCTCN', 'GCNNNNNNNGC', 'CCTNAGG', 'GTMKAC']
+
+    # get the unambiguous sequences of the restriction sites excluded from the mutations
+    unambiguous_ressite1_seq_list = get_unambiguous_sequence_list('GAATTC')
+    unambiguous_ressite2_seq_list = get_unambiguous_sequence_list('TTAA')
+
+    # initialize the results
+    results_dict = {}
+
+    # time get_reverse_complementary_sequence
+    function = lambda: [get_reverse_complementary_sequence(fragment) for fragment in fragments_list]
+    results_dict['get_reverse_complementary_sequence'] = time_function(function, benchseed, benchrepeats, fragments_nucleotides_count / 1e6, 'Mb')
+
+    # time get_GC_N_data
+    function = lambda: [get_GC_N_data(fragment) for fragment in fragments_list]
+    results_dict['get_GC_N_data'] = time_function(function, benchseed, benchrepeats, fragments_nucleotides_count / 1e6, 'Mb')
+
+    # time get_unambiguous_sequence_list
+    function = lambda: [get_unambiguous_sequence_list(ressite) for i in range(10) for ressite in ressites_list]
+    results_dict['get_unambiguous_sequence_list'] = time_function(function, benchseed, benchrepeats, 10 * len(ressites_list), 'sequences')
+
+    # time RestrictionSiteScanner with the ambiguous restriction sites and their reverse complementary sequences
+    ressite_seq_lists = [[ressite] for ressite in ressites_list] + [[get_reverse_complementary_sequence(ressite)] for ressite in ressites_list]
+    function = lambda: RestrictionSiteScanner(ressite_seq_lists).scan(seq)
+    results_dict['RestrictionSiteScanner'] = time_function(function, benchseed, benchrepeats, len(seq) / 1e6, 'Mb')
+
+    # time mutate_sequence
+    function = lambda: [mutate_sequence(fragment, 0.4, 3, 4, fragment_len // 2, unambiguous_ressite1_seq_list, unambiguous_ressite2_seq_list) for fragment in fragments_list[:1000]]
+    results_dict['mutate_sequence'] = time_function(function, benchseed, benchrepeats, 1000, 'sequences')
+
+    # return the results
+    return results_dict
+
+#-------------------------------------------------------------------------------
+
+def time_function(function, benchseed, benchrepeats, work_count, unit):
+    '''Time a function repeating it benchrepeats times and run it once more tracing the memory allocated to get its peak.'''
+
+    # time every repetition with the same random seed
+    wall_times_list = []
+    cpu_times_list = []
+    for i in range(benchrepeats):
+        random.seed(benchseed)
+        (wall_start_time, cpu_start_time) = (time.perf_counter(), time.process_time())
+        function()
+        wall_times_list.append(time.perf_counter() - wall_start_time)
+        cpu_times_list.append(time.process_time() - cpu_start_time)
+
+    # get the peak of memory allocated
+    random.seed(benchseed)
+    tracemalloc.start()
+    function()
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    # return the results
+    return get_result_dict(wall_times_list, cpu_times_list, work_count, unit, 'peak_traced_kb', peak_memory // 1024)
+
+#-------------------------------------------------------------------------------
+
+def benchmark_digest(digest_name, params_list, benchdir, benchsize, benchrepeats):
+    '''Time a digest of rsitesearch repeating it benchrepeats times, each one in a new process so its peak of resident memory is its own.'''
+
+    # set the parameters of the output files
+    params_list = params_list + [
+        '--fragsfile={0}'.format(os.path.join(benchdir, '{0}-fragments.fasta'.format(digest_name))),
+        '--fragstfile={0}'.format(os.path.join(benchdir, '{0}-fragments-stats.txt'.format(digest_name))),
+        '--fragtable=NONE',
+        '--plot=NO',
+        '--verbose=NO',
+        '--trace=NO'
+        ]
+
+    # run every repetition in a new process
+    wall_times_list = []
+    cpu_times_list = []
+    peak_rss_list = []
+    for i in range(benchrepeats):
+        with multiprocessing.Pool(1) as pool:
+            (wall_time, cpu_time, peak_rss) = pool.apply(run_digest, (digest_name, params_list))
+        wall_times_list.append(wall_time)
+        cpu_times_list.append(cpu_time)
+        peak_rss_list.append(peak_rss)
+        Message.print('info', '{0} repetition {1}: {2:.3f} s.'.format(digest_name, i + 1, wall_time))
+
+    # return the results
+    return get_result_dict(wall_times_list, cpu_times_list, benchsize, 'Mb', 'peak_rss_kb', max(peak_rss_list))
+
+#-------------------------------------------------------------------------------
+
+def run_digest(digest_name, params_list):
+    '''Run a digest of rsitesearch in this process and get its wall time, CPU time and peak of resident memory.'''
+
+    # get the options of rsitesearch from its config file and the parameters
+    options_dict = get_options(rsitesearch.build_options(), get_config_file(rsitesearch.__file__), params_list)
+
+    # run the digest without its messages
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, mode='w')
+    try:
+        (wall_start_time, cpu_start_time) = (time.perf_counter(), time.process_time())
+        getattr(rsitesearch, digest_name)(options_dict)
+        (wall_time, cpu_time) = (time.perf_counter() - wall_start_time, time.process_time() - cpu_start_time)
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+    # return the times and the peak of resident memory
+    return (wall_time, cpu_time, RunReport.get_peak_rss_kb(False))
+
+#-------------------------------------------------------------------------------
+
+def get_result_dict(wall_times_list, cpu_times_list, work_count, unit, memory_key, memory_value):
+    '''Get the dictionary with the result of a benchmark.'''
+
+    # get the fastest time
+    best_time = min(wall_times_list)
+
+    # return the result
+    return {
+        'best_time': best_time,
+        'mean_time': sum(wall_times_list) / len(wall_times_list),
+        'cpu_time': min(cpu_times_list),
+        'throughput': work_count / best_time if best_time > 0 else 0.0,
+        'unit': '{0}/s'.format(unit),
+        memory_key: memory_value
+        }
+
+#-------------------------------------------------------------------------------
+
+def compare_baseline(benchbaseline, results_dict):
+    '''Compare the results with the ones of a previous benchmark and show the speedup of every benchmark.'''
+
+    # read the baseline
+    try:
+        with open(benchbaseline, mode='r', encoding='utf-8') as benchbaseline_id:
+            baseline_results_dict = json.load(benchbaseline_id)['results']
+    except:
+        raise ProgramError('F002', benchbaseline)
+
+    # show the heads
+    Message.print('info', '')
+    Message.print('info', '{0:36} {1:>12} {2:>12} {3:>9}'.format('benchmark', 'baseline (s)', 'current (s)', 'speedup'))
+    Message.print('info', '{0:36} {1:>12} {2:>12} {3:>9}'.format('=' * 36, '=' * 12, '=' * 12, '=' * 9))
+
+    # compare every benchmark of both results
+    comparison_dict = {}
+    for (name, result) in results_dict.items():
+        if name in baseline_results_dict:
+            baseline_time = baseline_results_dict[name]['best_time']
+            speedup = baseline_time / result['best_time'] if result['best_time'] > 0 else 0.0
+            comparison_dict[name] = {'baseline_time': baseline_time, 'current_time': result['best_time'], 'speedup': speedup}
+            Message.print('info', '{0:36} {1:>12.4f} {2:>12.4f} {3:>8.2f}x'.format(name, baseline_time, result['best_time'], speedup))
+    Message.print('info', '')
+
+    # return the comparison
+    return comparison_dict
+
+#-------------------------------------------------------------------------------
+
+def write_benchmark_file(benchfile, benchmark_dict):
+    '''Write the JSON file with the results of the benchmark.'''
+
+    # write the benchmark data
+    try:
+        with open(benchfile, mode='w', encoding='utf-8') as benchfile_id:
+            json.dump(benchmark_dict, benchfile_id, indent=1)
+            benchfile_id.write('\n')
+    except:
+        raise ProgramError('F001', benchfile)
+
+    # show OK message
+    Message.print('info', 'The file {0} containing the results of the benchmark is created.'.format(get_file_name(benchfile)))
+
+#-------------------------------------------------------------------------------
+
+def build_options():
+    '''Build a dictionary with the program options.'''
+
+    # get all options dictionary
+    all_options_dict = get_all_options_dict()
+
+    # define the options dictionary
+    options_dict = {
+        'benchsize': all_options_dict['benchsize'],
+        'benchstartup': all_options_dict['benchstartup'],
+        'benchgc': all_options_dict['benchgc'],
+        'benchcontigs': all_options_dict['benchcontigs'],
+        'benchcontigdist': all_options_dict['benchcontigdist'],
+        'benchngaps': all_options_dict['benchngaps'],
+        'benchseed': all_options_dict['benchseed'],
+        'benchrepeats': all_options_dict['benchrepeats'],
+        'benchdir': all_options_dict['benchdir'],
+        'benchfile': all_options_dict['benchfile'],
+        'benchbaseline': all_options_dict['benchbaseline'],
+        'rsfile': all_options_dict['rsfile'],
+        'enzyme1': all_options_dict['enzyme1'],
+        'enzyme2': all_options_dict['enzyme2'],
+        'minfragsize': all_options_dict['minfragsize'],
+        'maxfragsize': all_options_dict['maxfragsize'],
+        'engine': all_options_dict['engine'],
+        'processes': all_options_dict['processes'],
+        'verbose': all_options_dict['verbose'],
+        'trace': all_options_dict['trace']
+    }
+
+    # return the options dictionary
+    return options_dict
+
+#-------------------------------------------------------------------------------
+
+def print_help(options_dict):
+    '''Print the program help.'''
+
+    # get general data
+    project_name = get_project_name()
+    project_version = get_project_version()
+    program_file = get_file_name(__file__)
+    config_file = get_config_file(__file__)
+
+    # print the help
+    Message.print('info', '')
+    Message.print('info', '{0} version {1}'.format(project_name, project_version))
+    Message.print('info', '')
+    Message.print('info', '{0} generates a seeded synthetic genome and times the digests of rsitesearch.py and the main sequence functions.'.format(program_file))
+    Message.print('info', '')
+    Message.print('info', 'Usage: {0} --help'.format(program_file))
+    Message.print('info', '')
+    Message.print('info', '       Show the help of {0}.'.format(program_file))
+    Message.print('info', '')
+    Message.print('info', '   or: {0} --config'.format(program_file))
+    Message.print('info', '')
+    Message.print('info', '       Create the config file {0} with the default value of the options.'.format(config_file))
+    Message.print('info', '       The default value of the options can be modified.'.format(config_file))
+    Message.print('info', '')
+    Message.print('info', '   or: {0} [--option=<value> [--option=<value>, ...]]'.format(program_file))
+    Message.print('info', '')
+    Message.print('info', '       The options values are read from the config file {0}, but they can be modified'.format(config_file))
+    Message.print('info', '       in command line. The options are:')
+    Message.print('info', '')
+    Message.print('info', '       {0:16}   {1}'.format('option', 'value'))
+    Message.print('info', '       {0:16}   {1}'.format('=' * 16, '=' * 78))
+    Message.print('info', '       {0:16}   {1}'.format('--benchsize', options_dict['benchsize']['comment']))
+    Message.print('info', '       {0:16}   {1}'.format('--benchstartup', options_dict['benchstartup']['comment']))
+    Message.print('info', '       {0:16}   {1}'.format('--benchgc', options_dict['benchgc']['comment']))
+    Message.print('info', '       {0:16}   {1}'.format('--benchcontigs', options_dict['benchcontigs']['comment']))
+    Message.print('info', '       {0:16}   {1}'.format('--benchcontigdist', options_dict['benchcontigdist']['comment']))
+    Message.print('info', '       {0:16}   {1}'.format('--benchngaps', options_dict['benchngaps']['comment']))
+    Message.print('info', '       {0:16}   {1}'.format('--benchseed', options_dict['benchseed']['comment']))
+    Message.print('info', '       {0:16}   {1}'.format('--benchrepeats', options_dict['benchrepeats']['comment']))
+    Message.print('info', '       {0:16}   {1}'.format('--benchdir', options_dict['benchdir']['comment']))
+    Message.print('info', '       {0:16}   {1}'.format('--benchfile', options_dict['benchfile']['comment']))
+    Message.print('info', '       {0:16}   {1}'.format('--benchbaseline', options_dict['benchbaseline']['comment']))
+    Message.print('info', '       {0:16}   {1}'.format('--rsfile', options_dict['rsfile']['comment']))
+    Message.print('info', '       {0:16}   {1}'.format('--enzyme1', options_dict['enzyme1']['comment']))
+    Message.print('info', '       {0:16}   {1}'.format('--enzyme2', options_dict['enzyme2']['comment']))
+    Message.print('info', '       {0:16}   {1}'.format('--minfragsize', options_dict['minfragsize']['comment']))
+    Message.print('info', '       {0:16}   {1}'.format('--maxfragsize', options_dict['maxfragsize']['comment']))
+    Message.print('info', '       {0:16}   {1}'.format('--engine', options_dict['engine']['comment']))
+    Message.print('info', '       {0:16}   {1}'.format('--processes', options_dict['processes']['comment']))
+    Message.print('info', '       {0:16}   {1}'.format('--verbose', options_dict['verbose']['comment']))
+    Message.print('info', '       {0:16}   {1}'.format('--trace', options_dict['trace']['comment']))
+
+#-------------------------------------------------------------------------------
+
+def build_config(options_dict):
+    '''Build the file with the options by default.'''
+
+    # get the config file
+    config_file = get_config_file(__file__)
+
+    # create the config file and write the default options
+    try:
+        with open(config_file, mode='w', encoding='iso-8859-1') as config_file_id:
+            config_file_id.write('{0:43} # {1}\n'.format('benchsize' + '=' + options_dict['benchsize']['default'], options_dict['benchsize']['comment']))
+            config_file_id.write('{0:43} # {1}\n'.format('benchstartup' + '=' + options_dict['benchstartup']['default'], options_dict['benchstartup']['comment']))
+            config_file_id.write('{0:43} # {1}\n'.format('benchgc' + '=' + options_dict['benchgc']['default'], options_dict['benchgc']['comment']))
+            config_file_id.write('{0:43} # {1}\n'.format('benchcontigs' + '=' + options_dict['benchcontigs']['default'], options_dict['benchcontigs']['comment']))
+            config_file_id.write('{0:43} # {1}\n'.format('benchcontigdist' + '=' + options_dict['benchcontigdist']['default'], options_dict['benchcontigdist']['comment']))
+            config_file_id.write('{0:43} # {1}\n'.format('benchngaps' + '=' + options_dict['benchngaps']['default'], options_dict['benchngaps']['comment']))
+            config_file_id.write('{0:43} # {1}\n'.format('benchseed' + '=' + options_dict['benchseed']['default'], options_dict['benchseed']['comment']))
+            config_file_id.write('{0:43} # {1}\n'.format('benchrepeats' + '=' + options_dict['benchrepeats']['default'], options_dict['benchrepeats']['comment']))
+            config_file_id.write('{0:43} # {1}\n'.format('benchdir' + '=' + options_dict['benchdir']['default'], options_dict['benchdir']['comment']))
+            config_file_id.write('{0:43} # {1}\n'.format('benchfile' + '=' + options_dict['benchfile']['default'], options_dict['benchfile']['comment']))
+            config_file_id.write('{0:43} # {1}\n'.format('benchbaseline' + '=' + options_dict['benchbaseline']['default'], options_dict['benchbaseline']['comment']))
+            config_file_id.write('{0:43} # {1}\n'.format('rsfile' + '=' + options_dict['rsfile']['default'], options_dict['rsfile']['comment']))
+            config_file_id.write('{0:43} # {1}\n'.format('enzyme1' + '=' + options_dict['enzyme1']['default'], options_dict['enzyme1']['comment']))
+            config_file_id.write('{0:43} # {1}\n'.format('enzyme2' + '=' + options_dict['enzyme2']['default'], options_dict['enzyme2']['comment']))
+            config_file_id.write('{0:43} # {1}\n'.format('minfragsize' + '=' + options_dict['minfragsize']['default'], options_dict['minfragsize']['comment']))
+            config_file_id.write('{0:43} # {1}\n'.format('maxfragsize' + '=' + options_dict['maxfragsize']['default'], options_dict['maxfragsize']['comment']))
+            config_file_id.write('{0:43} # {1}\n'.format('engine' + '=' + options_dict['engine']['default'], options_dict['engine']['comment']))
+            config_file_id.write('{0:43} # {1}\n'.format('processes' + '=' + options_dict['processes']['default'], options_dict['processes']['comment']))
+            config_file_id.write('{0:43} # {1}\n'.format('verbose' + '=' + options_dict['verbose']['default'], options_dict['verbose']['comment']))
+            config_file_id.write('{0:43} # {1}\n'.format('trace' + '=' + options_dict['trace']['default'], options_dict['trace']['comment']))
+    except:
+        raise ProgramError('F001', config_file)
+
+    # show OK message
+    Message.print('info', 'The configuration file {0} is created.'.format(get_file_name(config_file)))
+
+#-------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
+    sys.exit(0)
+
+#-------------------------------------------------------------------------------
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+#-------------------------------------------------------------------------------
+
+'''This software has been developed by:
+
+       GI Genética, Fisiología e Historia Forestal
+       Dpto. Sistemas y Recursos Naturales
+       ETSI Montes, Forestal y del Medio Natural
+       Universidad Politécnica de Madrid
+       https://github.com/ggfhf/
+
+   Licence: GNU General Public Licence Version 3
+'''
+
+#-------------------------------------------------------------------------------
+
+'''This source contains the program of the ddRADseqTools software package that
+   sweeps size windows over the fragments table saved by rsitesearch.py and
+   writes a CSV file with the fragments of every size window, so the size
+   selection can be tuned without digesting the genome again.
+'''
+#-------------------------------------------------------------------------------
+
+import sys
+
+from genlib import *
+
+#-------------------------------------------------------------------------------
+
+def main(argv):
+    '''Main line of the program.'''
+
+    # build the options dictionary
+    options_dict = build_options()
+
+    # it has been requested the help or to build a new config file
+    for param in argv:
+        # show the help and exit OK
+        if param.startswith('--help'):
+            print_help(options_dict)
+            sys.exit(0)
+        # build the config file and exit OK
+        elif param.startswith('--config'):
+            build_config(options_dict)
+            sys.exit(0)
+
+    # get the config file
+    config_file = get_config_file(__file__)
+
+    # get options from the config file and the input parameters
+    options_dict = get_options(options_dict, config_file, argv)
+
+    # sweep the size windows
+    do_sweep(options_dict)
+
+#-------------------------------------------------------------------------------
+
+def do_sweep(options_dict):
+    '''Get the fragments of every size window of the sweep from the fragments table.'''
+
+    import numpy as np
+
+    fragtable = options_dict['fragtable']['value']
+    sweepstart = options_dict['sweepstart']['value']
+    sweepstop = options_dict['sweepstop']['value']
+    sweepstep = options_dict['sweepstep']['value']
+    sweepwidth = options_dict['sweepwidth']['value']
+    sweepfile = options_dict['sweepfile']['value']
+    verbose = options_dict['verbose']['value']
+    trace = options_dict['trace']['value']
+
+    # set the verbose and trace status
+    if verbose.upper() == 'YES':
+        Message.set_verbose_status(True)
+    else:
+        Message.set_verbose_status(False)
+    if trace.upper() == 'YES':
+        Message.set_trace_status(True)
+    else:
+        Message.set_trace_status(False)
+
+    # get the fragments table, which has to be saved by rsitesearch with the fragtable option
+    if fragtable.upper() == 'NONE':
+        raise ProgramError('D207', 'fragtable', fragtable, 'the path of a fragments table saved by rsitesearch')
+    (fragment_lens_array, GC_rates_array, N_counts_array) = read_fragments_table(fragtable)
+    Message.print('info', 'The fragments table has {0} fragments.'.format(len(fragment_lens_array)))
+
+    # sort the fragments by length and get the cumulative sums of the GC rates and the fragments with Ns
+    order_array = np.argsort(fragment_lens_array, kind='stable')
+    sorted_lens_array = fragment_lens_array[order_array]
+    GC_cumulative_array = np.concatenate(([0.0], np.cumsum(GC_rates_array[order_array])))
+    N_cumulative_array = np.concatenate(([0], np.cumsum(N_counts_array[order_array] > 0)))
+
+    # get the bounds of the size windows
+    minfragsizes_array = np.arange(sweepstart, sweepstop + 1, sweepstep, dtype=np.int64)
+    maxfragsizes_array = minfragsizes_array + sweepwidth - 1
+
+    # get the range of the sorted fragments in every size window with a binary search
+    firsts_array = np.searchsorted(sorted_lens_array, minfragsizes_array, side='left')
+    lasts_array = np.searchsorted(sorted_lens_array, maxfragsizes_array, side='right')
+
+    # calculate the fragments count, the mean GC rate and the count of fragments with Ns of every size window
+    counts_array = lasts_array - firsts_array
+    GC_sums_array = GC_cumulative_array[lasts_array] - GC_cumulative_array[firsts_array]
+    GC_means_array = np.where(counts_array != 0, GC_sums_array / np.maximum(counts_array, 1), 0.0)
+    N_fragments_counts_array = N_cumulative_array[lasts_array] - N_cumulative_array[firsts_array]
+
+    # write the sweep file
+    write_sweep_file(sweepfile, minfragsizes_array, maxfragsizes_array, counts_array, GC_means_array, N_fragments_counts_array)
+
+#-------------------------------------------------------------------------------
+
+def write_sweep_file(sweepfile, minfragsizes_array, maxfragsizes_array, counts_array, GC_means_array, N_fragments_counts_array):
+    '''Write the CSV file with the fragments of every size window of the sweep.'''
+
+    # open the sweep file
+    try:
+        sweepfile_id = open(sweepfile, mode='w', encoding='iso-8859-1')
+    except:
+        raise ProgramError('F001', sweepfile)
+
+    # write the heads
+    sweepfile_id.write('"MINFRAGSIZE";"MAXFRAGSIZE";"FRAGS";"MEAN GC";"FRAGS WITH Ns";\n')
+
+    # write the data of every size window
+    for (minfragsize, maxfragsize, count, GC_mean, N_fragments_count) in zip(minfragsizes_array.tolist(), maxfragsizes_array.tolist(), counts_array.tolist(), GC_means_array.tolist(), N_fragments_counts_array.tolist()):
+        sweepfile_id.write('{0};{1};{2};{3:3.4f};{4};\n'.format(minfragsize, maxfragsize, count, GC_mean, N_fragments_count))
+
+    # close the sweep file
+    sweepfile_id.close()
+
+    # show OK message
+    Message.print('info', 'The file {0} containing the fragments of {1} size windows is created.'.format(get_file_name(sweepfile), len(counts_array)))
+
+#-------------------------------------------------------------------------------
+
+def build_options():
+    '''Build a dictionary with the program options.'''
+
+    # get all options dictionary
+    all_options_dict = get_all_options_dict()
+
+    # define the options dictionary
+    options_dict = {
+        'fragtable': all_options_dict['fragtable'],
+        'sweepstart': all_options_dict['sweepstart'],
+        'sweepstop': all_options_dict['sweepstop'],
+        'sweepstep': all_options_dict['sweepstep'],
+        'sweepwidth': all_options_dict['sweepwidth'],
+        'sweepfile': all_options_dict['sweepfile'],
+        'verbose': all_options_dict['verbose'],
+        'trace': all_options_dict['trace']
+    }
+
+    # return the options dictionary
+    return options_dict
+
+#-------------------------------------------------------------------------------
+
+def print_help(options_dict):
+    '''Print the program help.'''
+
+    # get general data
+    project_name = get_project_name()
+    project_version = get_project_version()
+    program_file = get_file_name(__file__)
+    config_file = get_config_file(__file__)
+
+    # print the help
+    Message.print('info', '')
+    Message.print('info', '{0} version {1}'.format(project_name, project_version))
+    Message.print('info', '')
+    Message.print('info', '{0} sweeps size windows over the fragments table saved by rsitesearch.py and writes the fragments of every size window.'.format(program_file))
+    Message.print('info', '')
+    Message.print('info', 'Usage: {0} --help'.format(program_file))
+    Message.print('info', '')
+    Message.print('info', '       Show the help of {0}.'.format(program_file))
+    Message.print('info', '')
+    Message.print('info', '   or: {0} --config'.format(program_file))
+    Message.print('info', '')
+    Message.print('info', '       Create the config file {0} with the default value of the options.'.format(config_file))
+    Message.print('info', '       The default value of the options can be modified.'.format(config_file))
+    Message.print('info', '')
+    Message.print('info', '   or: {0} [--option=<value> [--option=<value>, ...]]'.format(program_file))
+    Message.print('info', '')
+    Message.print('info', '       The options values are read from the config file {0}, but they can be modified'.format(config_file))
+    Message.print('info', '       in command line. The options are:')
+    Message.print('info', '')
+    Message.print('info', '       {0:16}   {1}'.format('option', 'value'))
+    Message.print('info', '       {0:16}   {1}'.format('=' * 16, '=' * 78))
+    Message.print('info', '       {0:16}   {1}'.format('--fragtable', options_dict['fragtable']['comment']))
+    Message.print('info', '       {0:16}   {1}'.format('--sweepstart', options_dict['sweepstart']['comment']))
+    Message.print('info', '       {0:16}   {1}'.format('--sweepstop', options_dict['sweepstop']['comment']))
+    Message.print('info', '       {0:16}   {1}'.format('--sweepstep', options_dict['sweepstep']['comment']))
+    Message.print('info', '       {0:16}   {1}'.format('--sweepwidth', options_dict['sweepwidth']['comment']))
+    Message.print('info', '       {0:16}   {1}'.format('--sweepfile', options_dict['sweepfile']['comment']))
+    Message.print('info', '       {0:16}   {1}'.format('--verbose', options_dict['verbose']['comment']))
+    Message.print('info', '       {0:16}   {1}'.format('--trace', options_dict['trace']['comment']))
+
+#-------------------------------------------------------------------------------
+
+def build_config(options_dict):
+    '''Build the file with the options by default.'''
+
+    # get the config file
+    config_file = get_config_file(__file__)
+
+    # create the config file and write the default options
+    try:
+        with open(config_file, mode='w', encoding='iso-8859-1') as config_file_id:
+            config_file_id.write('{0:43} # {1}\n'.format('fragtable' + '=' + options_dict['fragtable']['default'], options_dict['fragtable']['comment']))
+            config_file_id.write('{0:43} # {1}\n'.format('sweepstart' + '=' + options_dict['sweepstart']['default'], options_dict['sweepstart']['comment']))
+            config_file_id.write('{0:43} # {1}\n'.format('sweepstop' + '=' + options_dict['sweepstop']['default'], options_dict['sweepstop']['comment']))
+            config_file_id.write('{0:43} # {1}\n'.format('sweepstep' + '=' + options_dict['sweepstep']['default'], options_dict['sweepstep']['comment']))
+            config_file_id.write('{0:43} # {1}\n'.format('sweepwidth' + '=' + options_dict['sweepwidth']['default'], options_dict['sweepwidth']['comment']))
+            config_file_id.write('{0:43} # {1}\n'.format('sweepfile' + '=' + options_dict['sweepfile']['default'], options_dict['sweepfile']['comment']))
+            config_file_id.write('{0:43} # {1}\n'.format('verbose' + '=' + options_dict['verbose']['default'], options_dict['verbose']['comment']))
+            config_file_id.write('{0:43} # {1}\n'.format('trace' + '=' + options_dict['trace']['default'], options_dict['trace']['comment']))
+    except:
+        raise ProgramError('F001', config_file)
+
+    # show OK message
+    Message.print('info', 'The configuration file {0} is created.'.format(get_file_name(config_file)))
+
+#-------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
+    sys.exit(0)
+
+#-------------------------------------------------------------------------------
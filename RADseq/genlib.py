@@ -23,13 +23,37 @@ of the ddRADseqTools software package.
 '''
 #-------------------------------------------------------------------------------
 
+import array
+import bisect
+import collections
+import gzip
+import mmap
 import os.path
+import queue
 import random
 import re
-import statistics
+import struct
 import sys
+import threading
+import time
+import zlib
 
-import numpy as np
+# the heavy modules (numpy, matplotlib, json, hashlib and concurrent.futures) are imported by the functions that use them,
+# so the programs start without loading them
+
+#-------------------------------------------------------------------------------
+
+# the patterns of the records of the input files, the keys of the statistics and the options, compiled once
+rsfile_record_pattern = re.compile(r'^(.*);(.*)$')
+endsfile_record_pattern = re.compile(r'^(.*);(.*)$')
+individualsfile_record_pattern = re.compile(r'^(.+);(.+);(.+);(.+);(.*)$')
+fragments_head_pattern = re.compile(r'^>fragment: (\d*)(.*)GC: (\d\.\d\d)(.*)$')
+locus_head_pattern = re.compile(r'^>(.*)$')
+stats_key_pattern = re.compile(r'^(\d+)-(.+)$')
+GC_distribution_record_pattern = re.compile(r'([\d\.]+);(\d+)$')
+window_pattern = re.compile(r'^\s*(\d+)\s*-\s*(\d+)\s*$')
+config_option_pattern = re.compile(r'^\w+=(.+)$')
+parameter_option_pattern = re.compile(r'^\-{2}\w+=(.+)$')
 
 #-------------------------------------------------------------------------------
     
@@ -159,7 +183,7 @@ def get_ressites(rsfile, enzyme1, enzyme2):
             raise ProgramError('F002', rsfile)
 
         # set the pattern of the rsfile record (enzyme_id;restriction_site_seq)
-        pattern = r'^(.*);(.*)$'
+        pattern = rsfile_record_pattern
 
         # read the first record
         record = rsfile_id.readline()
@@ -172,7 +196,7 @@ def get_ressites(rsfile, enzyme1, enzyme2):
 
                 # extract the data
                 try: 
-                    mo = re.search(pattern, record)
+                    mo = pattern.search(record)
                     enzyme_id = mo.group(1).strip()
                     restriction_site_seq = mo.group(2).strip().lower()
                 except:
@@ -208,7 +232,7 @@ def get_ressites(rsfile, enzyme1, enzyme2):
             raise ProgramError('F002', rsfile)
 
         # set the pattern of the rsfile record (enzyme_id;restriction_site_seq)
-        pattern = r'^(.*);(.*)$'
+        pattern = rsfile_record_pattern
 
         # read the first record
         record = rsfile_id.readline()
@@ -221,7 +245,7 @@ def get_ressites(rsfile, enzyme1, enzyme2):
 
                 # extract the data
                 try: 
-                    mo = re.search(pattern, record)
+                    mo = pattern.search(record)
                     enzyme_id = mo.group(1).strip()
                     restriction_site_seq = mo.group(2).strip().lower()
                 except:
@@ -275,6 +299,60 @@ def get_ressites(rsfile, enzyme1, enzyme2):
 
 #-------------------------------------------------------------------------------
 
+def get_enzymes_ressites(rsfile, enzymes):
+    '''
+    Get the restriction site sequences of several enzymes. The variable enzymes
+    holds ALL (every enzyme of rsfile) or comma-separated enzyme identifiers or
+    valid nucleotides sequences corresponding to restriction sites. It returns
+    a list of tuples (enzyme_id, ressite_seq, ressite_lcut_seq, ressite_rcut_seq).
+    '''
+
+    # initialize the enzymes list
+    enzymes_list = []
+
+    # if every enzyme of rsfile is used
+    if enzymes.upper() == 'ALL':
+
+        # open the rsfile
+        try:
+            rsfile_id = open(rsfile, mode='r', encoding='iso-8859-1')
+        except:
+            raise ProgramError('F002', rsfile)
+
+        # set the pattern of the rsfile record (enzyme_id;restriction_site_seq)
+        pattern = rsfile_record_pattern
+
+        # read the enzyme identifiers of the records that are not a comment nor a line with blank characters
+        for record in rsfile_id:
+            if not record.lstrip().startswith('#') and record.strip() != '':
+                try:
+                    mo = pattern.search(record)
+                    enzyme_id = mo.group(1).strip()
+                except:
+                    raise ProgramError('D102', record.strip('\n'), rsfile)
+                if enzyme_id not in enzymes_list:
+                    enzymes_list.append(enzyme_id)
+
+        # close the rsfile
+        rsfile_id.close()
+
+    # if the enzymes are listed
+    else:
+        for enzyme in enzymes.split(','):
+            if enzyme.strip() not in enzymes_list:
+                enzymes_list.append(enzyme.strip())
+
+    # get the restriction site sequences of every enzyme
+    enzymes_ressites_list = []
+    for enzyme in enzymes_list:
+        (ressite_seq, ressite_lcut_seq, ressite_rcut_seq) = get_ressites(rsfile, enzyme, enzyme)[:3]
+        enzymes_ressites_list.append((enzyme, ressite_seq, ressite_lcut_seq, ressite_rcut_seq))
+
+    # return the restriction site sequences
+    return enzymes_ressites_list
+
+#-------------------------------------------------------------------------------
+
 def get_symbols():
     '''
     Get the symbol of the indexes and the DBR to indentify the PCR duplicates
@@ -317,11 +395,11 @@ def get_ends(endsfile, wend, cend, technique, index1len, index1_symbol, index2le
         if not record.lstrip().startswith('#') and record.strip() != '':
 
             # set the pattern of the endsfile record (end_id|end_seq)
-            pattern = r'^(.*);(.*)$'
+            pattern = endsfile_record_pattern
 
             # extract the data 
             try:
-                mo = re.search(pattern, record)
+                mo = pattern.search(record)
                 end_id = mo.group(1).strip()
                 end_seq = mo.group(2).strip()
             except:
@@ -426,11 +504,11 @@ def get_individuals(individualsfile, technique):
         if not record.strip().startswith('#') and record.strip() != '':
 
             # set the pattern of the individualsfile record (individual_id;replicated_individual_id;population_id;index1_seq(5'->3');[index2_seq(5'->3')])
-            pattern = r'^(.+);(.+);(.+);(.+);(.*)$'
+            pattern = individualsfile_record_pattern
 
             # extract the data
             try: 
-                mo = re.search(pattern, record)
+                mo = pattern.search(record)
                 individual_id = mo.group(1).strip()
                 replicated_individual_id = mo.group(2).strip()
                 population_id = mo.group(3).strip()
@@ -502,18 +580,26 @@ def get_individual_keys(individuals_dict):
 
 def get_fragments_list(fragsfile):
     '''
-    Get the fragments from fragsfile and sort them randomly.
+    Get the fragments from fragsfile and sort them randomly. fragsfile can be
+    a FASTA file or a columnar fragments file (.npz) written by rsitesearch.
     '''
 
+    # if fragsfile is a columnar fragments file
+    if fragsfile.endswith('.npz'):
+        return get_fragments_list_from_columns(fragsfile)
+
     # initialize the fragments list
     fragments_list = []
 
     # set the pattern of the head records (>read_info)
-    pattern = r'^>fragment: (\d*)(.*)GC: (\d\.\d\d)(.*)$'
+    pattern = fragments_head_pattern
 
-    # open fragsfile
+    # open fragsfile (it can be compressed with gzip)
     try:
-        fragsfile_id = open(fragsfile, mode='r', encoding='iso-8859-1')
+        if fragsfile.endswith('.gz'):
+            fragsfile_id = gzip.open(fragsfile, mode='rt', encoding='iso-8859-1')
+        else:
+            fragsfile_id = open(fragsfile, mode='r', encoding='iso-8859-1')
     except:
         raise ProgramError('F002', fragsfile)
 
@@ -527,7 +613,7 @@ def get_fragments_list(fragsfile):
         if record.startswith('>'):
 
             # extract the data 
-            mo = re.search(pattern, record)
+            mo = pattern.search(record)
             try:
                 fragment_num = int(mo.group(1).strip())
                 GC_rate = float(mo.group(3).strip())
@@ -568,6 +654,621 @@ def get_fragments_list(fragsfile):
 
 #-------------------------------------------------------------------------------
 
+def get_fragments_list_from_columns(fragscolumns):
+    '''
+    Get the fragments from a columnar fragments file and sort them randomly.
+    '''
+
+    # initialize the fragments list
+    fragments_list = []
+
+    # get the columns of the fragments
+    columns_dict = read_fragments_columns(fragscolumns)
+
+    # open the genome store where the sequences are
+    genome_store = GenomeStore(columns_dict['genstore'])
+
+    # for each fragment
+    for (i, (strand, GC_rate, seq_start, seq_end)) in enumerate(zip(columns_dict['strands'].tolist(), columns_dict['GC_rates'].tolist(), columns_dict['seq_starts'].tolist(), columns_dict['seq_ends'].tolist())):
+
+        # get the fragment sequence from its segment of the Watson strand
+        fragment_seq = genome_store.seq[seq_start:seq_end]
+        if strand < 0:
+            fragment_seq = get_reverse_complementary_bytes(fragment_seq)
+        fragment_seq = fragment_seq.decode('iso-8859-1')
+
+        # add new fragment to fragments_list
+        fragments_list.append([i + 1, GC_rate, fragment_seq, random.random()])
+
+    # close the genome store
+    genome_store.close()
+
+    # sort randomly the fragments list
+    fragments_list = sorted(fragments_list, key=lambda x:x[3])
+
+    # return the fragments list
+    return fragments_list
+
+#-------------------------------------------------------------------------------
+
+def read_fasta_blocks(genfile_id, genfile, blocksize):
+    '''
+    Read the loci of a FASTA file in blocks of about blocksize nucleotides,
+    so the memory used does not depend on the locus size. It yields tuples
+    (locus_info, block_seq, is_locus_end) where block_seq holds the nucleotides
+    in uppercase and is_locus_end is True in the last block of each locus.
+    '''
+
+    # set the pattern of the head records (>locus_info)
+    pattern = locus_head_pattern
+
+    # read the first record (a long record is read in pieces of blocksize characters)
+    record = genfile_id.readline(blocksize)
+
+    # while there are records
+    while record != '':
+
+        # process the head record
+        if record.startswith('>'):
+
+            # complete the head record when it is longer than blocksize
+            while not record.endswith('\n'):
+                piece = genfile_id.readline()
+                if piece == '':
+                    break
+                record += piece
+
+            # extract the data
+            mo = pattern.search(record)
+            locus_info = mo.group(1)
+
+            # read the next record
+            record = genfile_id.readline(blocksize)
+
+        else:
+
+            # control the FASTA format
+            raise ProgramError('F003', genfile, 'FASTA')
+
+        # initialize the block
+        block_seq_list = []
+        block_len = 0
+
+        # initialize the indicators of the record position (a record can be a piece of a line)
+        is_line_start = True
+        is_seq_start = True
+
+        # initialize the blank characters pending at the end of the previous piece
+        pending_blanks = ''
+
+        # while there are records and they are sequence
+        while record != '' and not (is_line_start and record.startswith('>')):
+
+            # get the sequence of the piece removing the blank characters of both line ends
+            is_line_end = record.endswith('\n')
+            seq = pending_blanks + record
+            if is_seq_start:
+                seq = seq.lstrip()
+            if is_line_end:
+                seq = seq.rstrip()
+                pending_blanks = ''
+            else:
+                stripped_seq = seq.rstrip()
+                pending_blanks = seq[len(stripped_seq):]
+                seq = stripped_seq
+            is_seq_start = is_line_end or (is_seq_start and seq == '' and pending_blanks == '')
+            is_line_start = is_line_end
+
+            # add the piece to the block
+            if seq != '':
+                block_seq_list.append(seq.upper())
+                block_len += len(seq)
+
+            # yield the block when it is full
+            if block_len >= blocksize:
+                yield (locus_info, ''.join(block_seq_list), False)
+                block_seq_list = []
+                block_len = 0
+
+            # read the next record
+            record = genfile_id.readline(blocksize)
+
+        # yield the last block of the locus
+        yield (locus_info, ''.join(block_seq_list), True)
+
+#-------------------------------------------------------------------------------
+
+def read_fasta_loci(genfile_id, genfile):
+    '''
+    Read the loci of a FASTA file. It yields tuples (locus_info, locus_seq)
+    where locus_seq holds the nucleotides in uppercase as bytes.
+    '''
+
+    # for every list of loci of the genome
+    for loci_list in read_fasta_loci_lists(genfile_id, genfile, 4194304):
+        yield from loci_list
+
+#-------------------------------------------------------------------------------
+
+def read_fasta_loci_lists(genfile_id, genfile, listsize):
+    '''
+    Read the loci of a FASTA file in lists of consecutive loci with at least
+    listsize nucleotides (the last list can have less). It yields lists of
+    tuples (locus_info, locus_seq) where locus_seq holds the nucleotides in
+    uppercase as bytes. The file is read in chunks of whole lines, which are
+    split in the records of the loci, so the small loci are parsed in a single
+    pass without walking their lines one by one.
+    '''
+
+    # initialize the loci list and the data of the current locus
+    loci_list = []
+    loci_len = 0
+    locus_info = None
+    seq_list = []
+
+    # get the sequence of some lines removing the blank characters of both line ends
+    def get_lines_seq(lines):
+        return ''.join([line.strip() for line in lines.split('\n')])
+
+    # while there are chunks (a chunk is completed until the end of its last line)
+    chunk = genfile_id.read(listsize)
+    while chunk != '':
+        if not chunk.endswith('\n'):
+            chunk += genfile_id.readline()
+
+        # split the chunk in the records of the loci starting in it: the first piece has the lines of the current locus
+        pieces_list = ('\n' + chunk).split('\n>')
+
+        # control the FASTA format
+        if locus_info is None and pieces_list[0] != '':
+            raise ProgramError('F003', genfile, 'FASTA')
+
+        # add the lines of the first piece to the current locus
+        seq_list.append(get_lines_seq(pieces_list[0]))
+
+        # for each locus starting in the chunk
+        for piece in pieces_list[1:]:
+
+            # add the previous locus to the loci list and yield the list when it is full
+            if locus_info is not None:
+                locus_seq = ''.join(seq_list).upper().encode('iso-8859-1', errors='replace')
+                loci_list.append((locus_info, locus_seq))
+                loci_len += len(locus_seq)
+                if loci_len >= listsize:
+                    yield loci_list
+                    loci_list = []
+                    loci_len = 0
+
+            # get the head record (>locus_info) and the lines of the locus
+            (locus_info, _, lines) = piece.partition('\n')
+            seq_list = [get_lines_seq(lines)]
+
+        # read the next chunk
+        chunk = genfile_id.read(listsize)
+
+    # yield the last list with the last locus
+    if locus_info is not None:
+        loci_list.append((locus_info, ''.join(seq_list).upper().encode('iso-8859-1', errors='replace')))
+    if loci_list != []:
+        yield loci_list
+
+#-------------------------------------------------------------------------------
+
+def open_genome_file(genfile):
+    '''
+    Open a genome file in FASTA format (it can be compressed with gzip).
+    '''
+
+    # open the genome file
+    try:
+        if genfile.endswith('.gz'):
+            genfile_id = gzip.open(genfile, mode='rt', encoding='iso-8859-1')
+        else:
+            genfile_id = open(genfile, mode='r', encoding='iso-8859-1')
+    except:
+        raise ProgramError('F002', genfile)
+
+    # return the genome file identification
+    return genfile_id
+
+#-------------------------------------------------------------------------------
+
+def get_output_file(file, gz):
+    '''
+    Get the path of an output file: when gz is YES, the extension .gz is added
+    if it is missing, so the readers that go by the extension do not take the
+    compressed data as text.
+    '''
+
+    # add the extension .gz to the path of a compressed file without it
+    if gz.upper() == 'YES' and not file.endswith('.gz'):
+        file += '.gz'
+        Message.print('info', 'The file is compressed in BGZF format, so it is written as {0}.'.format(file))
+
+    # return the path of the file
+    return file
+
+#-------------------------------------------------------------------------------
+
+def open_output_file(file, gz, gzlevel, gzthreads):
+    '''
+    Open a text file to write it; when gz is YES, it is compressed in BGZF
+    format by gzthreads threads with the compression level gzlevel.
+    '''
+
+    # open the file
+    if gz.upper() == 'YES':
+        file_id = BgzfWriter(file, gzlevel, gzthreads)
+    else:
+        try:
+            file_id = open(file, mode='w', encoding='iso-8859-1')
+        except:
+            raise ProgramError('F002', file)
+
+    # return the file identification
+    return file_id
+
+#-------------------------------------------------------------------------------
+
+def open_truncated_output_file(file, size):
+    '''
+    Open a text file to go on writing it after truncating it at size bytes.
+    '''
+
+    # truncate and open the file
+    try:
+        os.truncate(file, size)
+        file_id = open(file, mode='a', encoding='iso-8859-1')
+    except:
+        raise ProgramError('F002', file)
+
+    # return the file identification
+    return file_id
+
+#-------------------------------------------------------------------------------
+
+def get_genome_store_index_file(storefile):
+    '''
+    Get the index file of a genome store.
+    '''
+
+    # return the index file
+    return storefile + '.fai'
+
+#-------------------------------------------------------------------------------
+
+def get_GC_N_index_file(storefile):
+    '''
+    Get the file of the GC and N index of a genome store.
+    '''
+
+    # return the GC and N index file
+    return storefile + '.gci'
+
+#-------------------------------------------------------------------------------
+
+def get_genome_signature(genfile):
+    '''
+    Get the signature (size and modification time) of a genome file used to
+    verify that a genome store is updated.
+    '''
+
+    # get the file status
+    stat = os.stat(genfile)
+
+    # return the signature
+    return '{0};{1}'.format(stat.st_size, stat.st_mtime_ns)
+
+#-------------------------------------------------------------------------------
+
+def is_genome_store_updated(genfile, storefile):
+    '''
+    Verify that the genome store exists and it has been built from the current
+    genome file.
+    '''
+
+    # get the index file
+    indexfile = get_genome_store_index_file(storefile)
+
+    # the genome store has to exist
+    if not os.path.isfile(storefile) or not os.path.isfile(indexfile):
+        return False
+
+    # if the genome file does not exist, the genome store is used as it is
+    if not os.path.isfile(genfile):
+        return True
+
+    # compare the signature saved in the index file with the one of the genome file
+    try:
+        with open(indexfile, mode='r', encoding='iso-8859-1') as indexfile_id:
+            record = indexfile_id.readline()
+    except:
+        raise ProgramError('F002', indexfile)
+    return record.rstrip('\n') == '#{0}'.format(get_genome_signature(genfile))
+
+#-------------------------------------------------------------------------------
+
+def build_genome_store(genfile, storefile):
+    '''
+    Build a genome store from a genome file in FASTA format. The store has the
+    nucleotides of all loci in uppercase without line breaks and an index file
+    with the length, the offset and the head of each locus.
+    '''
+
+    # get the index file
+    indexfile = get_genome_store_index_file(storefile)
+
+    # open the genome file
+    genfile_id = open_genome_file(genfile)
+
+    # open the genome store and its index
+    try:
+        storefile_id = open(storefile, mode='wb')
+    except:
+        raise ProgramError('F001', storefile)
+    try:
+        indexfile_id = open(indexfile, mode='w', encoding='iso-8859-1')
+    except:
+        raise ProgramError('F001', indexfile)
+
+    # write the signature of the genome file
+    indexfile_id.write('#{0}\n'.format(get_genome_signature(genfile)))
+
+    # initialize the offset and the length of the locus
+    offset = 0
+    locus_len = 0
+
+    # for every block of the genome
+    for (locus_info, block_seq, is_locus_end) in read_fasta_blocks(genfile_id, genfile, 4194304):
+
+        # write the nucleotides of the block
+        block_bytes = block_seq.encode('iso-8859-1', errors='replace')
+        storefile_id.write(block_bytes)
+        locus_len += len(block_bytes)
+
+        # write the locus data in the index at its end
+        if is_locus_end:
+            indexfile_id.write('{0}\t{1}\t{2}\n'.format(locus_len, offset, locus_info))
+            offset += locus_len
+            locus_len = 0
+
+    # close files
+    genfile_id.close()
+    storefile_id.close()
+    indexfile_id.close()
+
+    # build the GC and N index of the genome store
+    build_GC_N_index(storefile)
+
+    # show OK message
+    Message.print('info', 'The genome store {0} is built from {1}.'.format(get_file_name(storefile), get_file_name(genfile)))
+
+#-------------------------------------------------------------------------------
+
+def build_GC_N_index(storefile):
+    '''
+    Build the GC and N index of a genome store. The index has the cumulative
+    counts of GC and GCAT nucleotides of the store at every multiple of
+    GCNIndex.step, so the GC rate and the N count of any segment are got
+    from two subtractions and the count of a few nucleotides.
+    '''
+
+    import numpy as np
+
+    # get the GC and N index file
+    indexfile = get_GC_N_index_file(storefile)
+
+    # map the nucleotides of the genome store
+    seq_array = GCNIndex.map_store(storefile)
+
+    # get the counts of GC and GCAT nucleotides of every step of the store
+    (GC_lookup_array, GCAT_lookup_array) = GCNIndex.get_lookup_arrays()
+    steps_count = len(seq_array) // GCNIndex.step
+    GC_counts_array = np.zeros(steps_count + 1, dtype=np.int64)
+    GCAT_counts_array = np.zeros(steps_count + 1, dtype=np.int64)
+    chunk_steps_count = 65536
+    for first_step in range(0, steps_count, chunk_steps_count):
+        last_step = min(first_step + chunk_steps_count, steps_count)
+        chunk_array = seq_array[first_step * GCNIndex.step:last_step * GCNIndex.step].reshape(-1, GCNIndex.step)
+        GC_counts_array[first_step + 1:last_step + 1] = GC_lookup_array[chunk_array].sum(axis=1, dtype=np.int64)
+        GCAT_counts_array[first_step + 1:last_step + 1] = GCAT_lookup_array[chunk_array].sum(axis=1, dtype=np.int64)
+
+    # save the cumulative counts
+    try:
+        with open(indexfile, mode='wb') as indexfile_id:
+            np.save(indexfile_id, np.stack((np.cumsum(GC_counts_array), np.cumsum(GCAT_counts_array))))
+    except:
+        raise ProgramError('F001', indexfile)
+
+#-------------------------------------------------------------------------------
+
+def open_genome_store(genfile, genstore):
+    '''
+    Open a genome store building it before when it is not updated.
+    '''
+
+    # build the genome store if it does not exist or the genome file has changed
+    if not is_genome_store_updated(genfile, genstore):
+        build_genome_store(genfile, genstore)
+
+    # build the GC and N index if the genome store was built without it
+    elif not os.path.isfile(get_GC_N_index_file(genstore)):
+        build_GC_N_index(genstore)
+
+    # return the genome store
+    return GenomeStore(genstore)
+
+#-------------------------------------------------------------------------------
+
+def get_genome_loci(genfile, genstore):
+    '''
+    Get the loci of a genome one by one from the lists yielded by
+    get_genome_loci_lists.
+    '''
+
+    # for every list of loci of the genome
+    for loci_list in get_genome_loci_lists(genfile, genstore, 4194304):
+        yield from loci_list
+
+#-------------------------------------------------------------------------------
+
+def get_genome_loci_lists(genfile, genstore, listsize):
+    '''
+    Get the loci of a genome in lists of consecutive loci with at least
+    listsize nucleotides (the last list can have less). It yields lists of
+    tuples (locus_info, seq, locus_start, locus_end) where the locus
+    nucleotides are seq[locus_start:locus_end]. When genstore is NONE, seq is
+    the locus read from the FASTA file; otherwise, seq is the whole genome
+    store mapped in memory, which is built before if it is not updated. A
+    genome file compressed in BGZF format is read through its index, which is
+    built when it does not exist or the genome has changed.
+    '''
+
+    # if the genome is read from a BGZF genome file, whose loci are read with its index
+    if genstore.upper() == 'NONE' and genfile.endswith('.gz') and is_bgzf_file(genfile):
+        bgzf_genome = BgzfGenome(genfile)
+        def get_bgzf_loci():
+            for (locus_info, seq_start, seq_end) in bgzf_genome.get_loci_list():
+                locus_seq = bgzf_genome.get_locus_seq(seq_start, seq_end)
+                yield (locus_info, locus_seq, 0, len(locus_seq))
+        yield from get_loci_lists(get_bgzf_loci(), listsize)
+        bgzf_genome.close()
+
+    # if the genome is read from the FASTA file
+    elif genstore.upper() == 'NONE':
+        genfile_id = open_genome_file(genfile)
+        for loci_list in read_fasta_loci_lists(genfile_id, genfile, listsize):
+            yield [(locus_info, locus_seq, 0, len(locus_seq)) for (locus_info, locus_seq) in loci_list]
+        genfile_id.close()
+
+    # if the genome is read from the genome store
+    else:
+        genome_store = open_genome_store(genfile, genstore)
+        yield from get_loci_lists(((locus_info, genome_store.seq, offset, offset + locus_len) for (locus_info, offset, locus_len) in genome_store.get_loci_list()), listsize)
+        genome_store.close()
+
+#-------------------------------------------------------------------------------
+
+def get_loci_lists(loci_iterator, listsize):
+    '''
+    Group the loci of an iterator, given as tuples whose last items are the
+    locus start and end, in lists of consecutive loci with at least listsize
+    nucleotides (the last list can have less).
+    '''
+
+    # initialize the loci list
+    loci_list = []
+    loci_len = 0
+
+    # for each locus, add it to the list and yield the list when it is full
+    for locus in loci_iterator:
+        loci_list.append(locus)
+        loci_len += locus[-1] - locus[-2]
+        if loci_len >= listsize:
+            yield loci_list
+            loci_list = []
+            loci_len = 0
+
+    # yield the last list
+    if loci_list != []:
+        yield loci_list
+
+#-------------------------------------------------------------------------------
+
+def get_prefetched_items(items_iterator, queue_size):
+    '''
+    Yield the items of an iterator, which are got ahead by a thread while the
+    caller works with the previous ones. The thread keeps up to queue_size
+    items in a bounded queue, so the memory is bounded, and an exception raised
+    getting the items (including the exit of a ProgramError) is raised again
+    in the caller.
+    '''
+
+    # initialize the bounded queue and the event that stops the thread when the caller does not get all the items
+    items_queue = queue.Queue(maxsize=queue_size)
+    stop_event = threading.Event()
+
+    # put an item in the queue waiting while it is full, unless the thread has to stop
+    def put_item(item):
+        while not stop_event.is_set():
+            try:
+                items_queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    # get the items and put them in the queue followed by the end mark or the exception raised
+    def get_items():
+        try:
+            for item in items_iterator:
+                if not put_item((True, item)):
+                    return
+            put_item((False, None))
+        except BaseException as exception:
+            put_item((False, exception))
+
+    # start the thread
+    thread = threading.Thread(target=get_items, daemon=True)
+    thread.start()
+
+    # yield the items until the end mark and raise the exception of the thread if there is one
+    try:
+        while True:
+            (is_item, item) = items_queue.get()
+            if not is_item:
+                if item is not None:
+                    raise item
+                break
+            yield item
+    finally:
+        stop_event.set()
+        thread.join()
+
+#-------------------------------------------------------------------------------
+
+def get_genome_loci_positions(genfile, genstore):
+    '''
+    Get the positions of the loci of a genome held in a genome store (the
+    offsets in the store) or in a BGZF genome file (the offsets in the
+    uncompressed file), so the loci can be read by other processes. It yields
+    tuples (locus_info, locus_start, locus_end).
+    '''
+
+    # if the genome is read from the genome store
+    if genstore.upper() != 'NONE':
+        genome_store = open_genome_store(genfile, genstore)
+        for (locus_info, offset, locus_len) in genome_store.get_loci_list():
+            yield (locus_info, offset, offset + locus_len)
+        genome_store.close()
+
+    # if the genome is read from the BGZF genome file
+    else:
+        bgzf_genome = BgzfGenome(genfile)
+        for (locus_info, seq_start, seq_end) in bgzf_genome.get_loci_list():
+            yield (locus_info, seq_start, seq_end)
+        bgzf_genome.close()
+
+#-------------------------------------------------------------------------------
+
+def is_bgzf_file(file):
+    '''
+    Verify that a file is compressed in BGZF format, i. e. its first gzip
+    member has the extra field BC with the member size.
+    '''
+
+    # read the gzip header of the first member
+    try:
+        with open(file, mode='rb') as file_id:
+            header = file_id.read(16)
+    except:
+        return False
+
+    # return if the header has the extra field BC
+    return len(header) == 16 and header[:4] == b'\x1f\x8b\x08\x04' and header[12:14] == b'BC'
+
+#-------------------------------------------------------------------------------
+
 def get_nucleotide_dict():
     '''
     Get a dictionary with nucleotide data.
@@ -775,9 +1476,30 @@ def get_reverse_complementary_sequence(seq):
 
 #-------------------------------------------------------------------------------
 
-def get_unambiguous_sequence_list(seq):
+def get_reverse_complementary_bytes(seq):
     '''
-    Get the list of unambiguous sequences from a sequence with ambiguous nucleotides.
+    Get the reverse complementary sequence of a sequence held as bytes.
+    '''
+
+    # get the nucleotide dictionary
+    nucleotide_dict =  get_nucleotide_dict()
+
+    # build the translation table of each nucleotide to its complementary nucleotide
+    codes = ''.join(nucleotide_dict.keys()).encode('iso-8859-1')
+    complementary_codes = ''.join([nucleotide_dict[code]['complementary_code'] for code in nucleotide_dict.keys()]).encode('iso-8859-1')
+    table = bytes.maketrans(codes, complementary_codes)
+
+    # get the reverse complementary sequence
+    revcompl_seq = bytes(seq).translate(table)[::-1]
+
+    # return the reverse complementary sequence
+    return revcompl_seq
+
+#-------------------------------------------------------------------------------
+
+def get_unambiguous_sequence_list(seq):
+    '''
+    Get the list of unambiguous sequences from a sequence with ambiguous nucleotides.
     '''
 
     # get the nucleotide dictionary
@@ -906,36 +1628,101 @@ def remove_nucleotides_from_seq_to_end(seq, nucleotides, sense):
 
 #-------------------------------------------------------------------------------
 
-def get_GC_N_data(seq):
+def get_double_digest_cuts_array(ressite1_positions_array, ressite2_positions_array, ressite1_seq, resoverhang1_seq, resoverhang2_seq):
     '''
-    Get the GC rate and the count of nucleotide codes no standard.
+    Get the arrays of start and end positions of the fragments of a double
+    digest in a strand from the sorted arrays of positions of the restriction
+    sites of both enzymes in this strand.
     '''
 
-    # initialize the GC, GCAT  and N counts
-    GC_count = 0
-    GCAT_count = 0
-    N_count = 0
+    import numpy as np
 
-    # for each nuecletide in the sequence
-    for i in range(len(seq)):
+    # search the next restriction site of the second enzyme from every restriction site of the first enzyme
+    next_ressite2_indexes_array = np.searchsorted(ressite2_positions_array, ressite1_positions_array + len(ressite1_seq), side='left')
+
+    # the restriction sites of the first enzyme are processed until one without restriction site of the second enzyme after it
+    not_found_indexes_array = np.flatnonzero(next_ressite2_indexes_array == len(ressite2_positions_array))
+    ressite1_count = not_found_indexes_array[0] if len(not_found_indexes_array) > 0 else len(ressite1_positions_array)
+    ressite2_positions_array = ressite2_positions_array[next_ressite2_indexes_array[:ressite1_count]]
+
+    # there is a cut when the restriction site of the second enzyme is previous to the next restriction site of the first enzyme
+    next_ressite1_positions_array = np.append(ressite1_positions_array[1:], np.iinfo(np.int64).max)[:ressite1_count]
+    is_cut_array = ressite2_positions_array < next_ressite1_positions_array
+
+    # calculate the start and end positions of the fragments in the locus
+    start_positions_array = ressite1_positions_array[:ressite1_count][is_cut_array] + len(ressite1_seq) - len(resoverhang1_seq)
+    end_positions_array = ressite2_positions_array[is_cut_array] + len(resoverhang2_seq)
+
+    # return the arrays of start and end positions
+    return (start_positions_array, end_positions_array)
+
+#-------------------------------------------------------------------------------
+
+def get_fragments_segments_arrays(start_positions_array, end_positions_array, strand, locus_len):
+    '''
+    Get the arrays of lengths and segments in the Watson strand (start and end)
+    of the fragments of a strand of a locus from their cuts (in the
+    coordinates of the strand).
+    '''
+
+    import numpy as np
+
+    # calculate the fragment lengths and their segments in the Watson strand
+    clipped_end_positions_array = np.maximum(start_positions_array, np.minimum(end_positions_array, locus_len))
+    fragment_lens_array = clipped_end_positions_array - start_positions_array
+    if strand == '+':
+        (segment_starts_array, segment_ends_array) = (start_positions_array, clipped_end_positions_array)
+    else:
+        (segment_starts_array, segment_ends_array) = (locus_len - clipped_end_positions_array, locus_len - start_positions_array)
+
+    # return the arrays
+    return (fragment_lens_array, segment_starts_array, segment_ends_array)
+
+#-------------------------------------------------------------------------------
+
+def get_fragments_GC_N_arrays(start_positions_array, end_positions_array, strand, locus_len, GC_cumulative_array, GCAT_cumulative_array, positions_array=None):
+    '''
+    Get the arrays of lengths, segments in the Watson strand (start and end),
+    GC rates and N counts of the fragments of a strand of a locus from their
+    cuts (in the coordinates of the strand) and the cumulative counts of GC and
+    GCAT nucleotides of the locus. When positions_array is not None, the
+    cumulative counts are only those of its sorted positions, which have to
+    include the ends of every segment.
+    '''
+
+    import numpy as np
+
+    # calculate the fragment lengths and their segments in the Watson strand
+    (fragment_lens_array, segment_starts_array, segment_ends_array) = get_fragments_segments_arrays(start_positions_array, end_positions_array, strand, locus_len)
+
+    # get the indexes of the ends of the segments in the cumulative counts
+    if positions_array is None:
+        (start_indexes_array, end_indexes_array) = (segment_starts_array, segment_ends_array)
+    else:
+        (start_indexes_array, end_indexes_array) = (np.searchsorted(positions_array, segment_starts_array), np.searchsorted(positions_array, segment_ends_array))
 
-        # if nucleotide is C or G
-        if seq[i] in ['C', 'G']:
+    # calculate the GC rates and the N counts
+    GC_counts_array = GC_cumulative_array[end_indexes_array] - GC_cumulative_array[start_indexes_array]
+    GCAT_counts_array = GCAT_cumulative_array[end_indexes_array] - GCAT_cumulative_array[start_indexes_array]
+    GC_rates_array = np.where(GCAT_counts_array != 0, GC_counts_array / np.maximum(GCAT_counts_array, 1), 0.0)
+    N_counts_array = fragment_lens_array - GCAT_counts_array
 
-            # add 1 to the GC count
-            GC_count += 1
+    # return the arrays
+    return (fragment_lens_array, segment_starts_array, segment_ends_array, GC_rates_array, N_counts_array)
 
-        # if nucleotide is C or G or A or T
-        if seq[i] in ['C', 'G', 'A', 'T']:
+#-------------------------------------------------------------------------------
 
-            # add 1 to the GCAT count
-            GCAT_count += 1
+def get_GC_N_data(seq):
+    '''
+    Get the GC rate and the count of nucleotide codes no standard.
+    '''
 
-        # if nucleotide is not C or G or A or T (i. e. other nucletide code no standard)
-        if seq[i] not in ['C', 'G', 'A', 'T']:
+    # count the GC and GCAT nucleotides
+    GC_count = seq.count('C') + seq.count('G')
+    GCAT_count = GC_count + seq.count('A') + seq.count('T')
 
-            # add 1 to the N count
-            N_count += 1
+    # the nucleotides that are not C or G or A or T are nucleotide codes no standard
+    N_count = len(seq) - GCAT_count
 
     # calculate the GC rate
     GC_rate = GC_count / GCAT_count if GCAT_count != 0 else 0
@@ -1063,7 +1850,7 @@ def mutate_sequence(seq, indelprob, maxindelsize, locusmaxmut, min_seq_len, unam
         for j in range(1, i + 1):
             seq_mutations_number_list.append(j)
     seq_mutations_number = seq_mutations_number_list[random.randrange(0, len(seq_mutations_number_list))]
-    Message.print('trace', 'seq_mutations_number: {0}'.format(seq_mutations_number))
+    Message.print('trace', 'seq_mutations_number: {0}', seq_mutations_number)
 
     # assign the initial value of new sequence
     new_seq = ''
@@ -1074,7 +1861,7 @@ def mutate_sequence(seq, indelprob, maxindelsize, locusmaxmut, min_seq_len, unam
     # while the new sequence lenth is less than get a sequence with a length greater or equal than the minimum sequence length
     while len(new_seq) < min_seq_len and attempts_number < 10:
 
-        Message.print('trace', 'attempts_number: {0}'.format(attempts_number))
+        Message.print('trace', 'attempts_number: {0}', attempts_number)
 
         # assign the initial value of the previous sequence
         old_seq = seq
@@ -1106,7 +1893,7 @@ def mutate_sequence(seq, indelprob, maxindelsize, locusmaxmut, min_seq_len, unam
                     # build the new sequence
                     new_seq = old_seq[:j] + insertion_seq + old_seq[j:]
 
-                    Message.print('trace', 'insertion ({0}) generated in {1} with length of {2}'.format(insertion_seq, j, indelsize))
+                    Message.print('trace', 'insertion ({0}) generated in {1} with length of {2}', insertion_seq, j, indelsize)
 
                 # there is a deletion
                 else:
@@ -1117,7 +1904,7 @@ def mutate_sequence(seq, indelprob, maxindelsize, locusmaxmut, min_seq_len, unam
                     # build the new sequence
                     new_seq = old_seq[:j] + old_seq[(j + indelsize):]
 
-                    Message.print('trace', 'deletion generated in {0} with length of {1}'.format(j, indelsize))
+                    Message.print('trace', 'deletion generated in {0} with length of {1}', j, indelsize)
 
             # there is a SNP or there was an excessive number of indel attempts due to a short fragments
             else:
@@ -1134,7 +1921,7 @@ def mutate_sequence(seq, indelprob, maxindelsize, locusmaxmut, min_seq_len, unam
 
                 # build the new mutated sequence on the previusly mutated sequence
                 new_seq = old_seq[:j] + mutated_nucleotide + old_seq[(j + 1):]
-                Message.print('trace', 'SNP in position {0} changing {1} by {2}'.format(j, old_seq[j], mutated_nucleotide))
+                Message.print('trace', 'SNP in position {0} changing {1} by {2}', j, old_seq[j], mutated_nucleotide)
 
             # assign new sequence to the previous sequence for the next iteration
             old_seq = new_seq
@@ -1217,6 +2004,8 @@ def calculate_pcrdup_num(pcrdup, pcrdistribution, multiparam ,poissonparam):
     Calculate the PCR duplicates number.
     '''
 
+    import numpy as np
+
     # initialize the PCR duplicates number
     pcrdup_num = 0
 
@@ -1236,45 +2025,13 @@ def calculate_pcrdup_num(pcrdup, pcrdistribution, multiparam ,poissonparam):
 
 #-------------------------------------------------------------------------------
 
-def update_fragments_intervals(intervals_dict, fragstinterval, fragment_len, N_count):
-    '''
-    Update the intervals with the fragment data.
-    '''
-
-    # calculate the interval identification
-    start = ((fragment_len - 1)  // fragstinterval) * fragstinterval + 1
-    end = start + fragstinterval - 1
-    interval_id = '{0:0>9d}-{1:0>9d}'.format(start, end)
-
-    # retrieve the intervals data
-    data_interval = intervals_dict.get(interval_id, [0, 0])
-
-    # add 1 to the count of the range
-    data_interval[0] += 1 
-
-    # if N count is greater than 0
-    if N_count > 0:
-        # add 1 to the count of fragment with N
-        data_interval[1] += 1 
-
-    # update the data interval
-    intervals_dict[interval_id] = data_interval
-
-    # return the updated intervals
-    return intervals_dict
-
-#-------------------------------------------------------------------------------
-
-def write_fragments_stats(fragstfile, intervals_dict, total_fragments_count, written_fragments_count, minfragsize, maxfragsize, title):
+def write_fragments_stats(fragstfile, fragments_histogram, fragstinterval, total_fragments_count, written_fragments_count, minfragsize, maxfragsize, title):
     '''
     Write the statistics of the fragments gotten in the double digest.
     '''
 
-    # get a list with the sorted intervals
-    intervals_list = []
-    for interval_id, data in intervals_dict.items():
-        intervals_list.append([interval_id, data[0], data[1]])
-    intervals_list.sort()
+    # get a list with the intervals of the fragments histogram
+    intervals_list = fragments_histogram.get_intervals_list(fragstinterval)
 
     # open the text file of fragments statistics
     try:
@@ -1301,19 +2058,10 @@ def write_fragments_stats(fragstfile, intervals_dict, total_fragments_count, wri
     csv_fragstfile_id.write('"FRAGMENT INTERVAL";"FRAGS";"PERCENT";"FRAGS WITH Ns";\n')
 
     # write the data of each interval
-    pattern = r'(\d+)-(\d+)$'
-    for i in range(len(intervals_list)):
-        
-        # extract the data
-        try:
-            mo = re.search(pattern, intervals_list[i][0])
-            first_value = int(mo.group(1))
-            last_value = int(mo.group(2))
-        except:
-            raise ProgramError('D101', pattern, intervals_list[i][0])
-        count = intervals_list[i][1]
-        percentage = intervals_list[i][1] * 100 / total_fragments_count if total_fragments_count else 0
-        count_N = intervals_list[i][2]
+    for (first_value, last_value, count, count_N) in intervals_list:
+
+        # calculate the percentage
+        percentage = count * 100 / total_fragments_count if total_fragments_count else 0
 
         # write the data in the text file
         fragstfile_id.write('|{0:>9d}-{1:<9d}|{2:>7d}|{3:>7.4f}|{4:>13d}|\n'.format(first_value, last_value, count, percentage, count_N))
@@ -1340,7 +2088,7 @@ def write_fragments_stats(fragstfile, intervals_dict, total_fragments_count, wri
 
 #-------------------------------------------------------------------------------
 
-def plot_fragments_graphic(fragstfile, intervals_dict, title):
+def plot_fragments_graphic(fragstfile, fragments_histogram, fragstinterval, title):
     '''
     Plot a fragments distribution graphic and save it in a file.
     '''
@@ -1359,26 +2107,13 @@ def plot_fragments_graphic(fragstfile, intervals_dict, title):
         Message.print('info', 'The library matplotlib is not installed. The program will not plot the fragments distribution graphic.')
         return
 
-    # get a list with the sorted intervals
-    intervals_list = []
-    for interval_id, data in intervals_dict.items():
-        intervals_list.append([interval_id, data[0], data[1]])
-    intervals_list.sort()
-
     # get intervals list and counts list with range values lower or equal to 1000 nucleotides
-    pattern = r'(\d+)-(\d+)$'
     interval_id_list = []
     counts_list = []
-    for i in range(len(intervals_list)):
-        try:
-            mo = re.search(pattern, intervals_list[i][0])
-            first_value = int(mo.group(1))
-            last_value = int(mo.group(2))
-        except:
-            raise ProgramError('D101', pattern, intervals_list[i][0])
+    for (first_value, last_value, count, count_N) in fragments_histogram.get_intervals_list(fragstinterval):
         if first_value <= 1000:
             interval_id_list.append('{0:d}-{1:d}'.format(first_value, last_value))
-            counts_list.append(int(intervals_list[i][1]))
+            counts_list.append(count)
 
     # do the graphic
     fig = plt.figure()
@@ -1451,7 +2186,7 @@ def write_pcrdup_stats(dupstfile, stats_dict):
                 loci_pcrdup_list.append(pcrdup)
 
             # set the pattern of the key of stats dictionary
-            pattern = r'^(\d+)-(.+)$'
+            pattern = stats_key_pattern
 
             # initialize the loci list and the individuals list
             loci_list = []
@@ -1462,11 +2197,11 @@ def write_pcrdup_stats(dupstfile, stats_dict):
 
                 # extract the data
                 try:
-                    mo = re.search(pattern, key)
+                    mo = pattern.search(key)
                     locus = int(mo.group(1))
                     individual = mo.group(2)
                 except:
-                    raise ProgramError('D101', pattern, key)
+                    raise ProgramError('D101', pattern.pattern, key)
 
                 # add locus to the loci list
                 if loci_list.count(locus) == 0:
@@ -1618,18 +2353,18 @@ def calculate_loci_pcrdup_stats(stats_dict):
     loci_stats_dict = {}
 
     # set the pattern of the key of stats dictionary
-    pattern = r'^(\d+)-(.+)$'
+    pattern = stats_key_pattern
 
     # for each key in stats dictionary
     for stats_key, stats_data_dict in stats_dict.items():
 
         # extract the data
         try:
-            mo = re.search(pattern, stats_key)
+            mo = pattern.search(stats_key)
             locus = int(mo.group(1))
             individual = mo.group(2)
         except:
-            raise ProgramError('D101', pattern, stats_key)
+            raise ProgramError('D101', pattern.pattern, stats_key)
 
         # add value to the locus count
         locus_data_dict = loci_stats_dict.get(locus, {'total':0, 'removed':0})
@@ -1755,18 +2490,18 @@ def calculate_individuals_withoutdata_distribution(stats_dict):
     individuals_list = []
 
     # set the pattern of the key of stats dictionary
-    pattern = r'^(\d+)-(.+)$'
+    pattern = stats_key_pattern
 
     # for each key in stats dictionary
     for stats_key, data_dict in stats_dict.items():
 
         # extract the data
         try:
-            mo = re.search(pattern, stats_key)
+            mo = pattern.search(stats_key)
             locus = int(mo.group(1))
             individual = mo.group(2)
         except:
-            raise ProgramError('D101', pattern, stats_key)
+            raise ProgramError('D101', pattern.pattern, stats_key)
 
         # add locus to the loci list
         if loci_list.count(locus) == 0:
@@ -1869,18 +2604,18 @@ def calculate_loci_withoutdata_distribution(stats_dict):
     individuals_list = []
 
     # set the pattern of the key of stats dictionary
-    pattern = r'^(\d+)-(.+)$'
+    pattern = stats_key_pattern
 
     # for each key in stats dictionary
     for stats_key, data_dict in stats_dict.items():
 
         # extract the data
         try:
-            mo = re.search(pattern, stats_key)
+            mo = pattern.search(stats_key)
             locus = int(mo.group(1))
             individual = mo.group(2)
         except:
-            raise ProgramError('D101', pattern, stats_key)
+            raise ProgramError('D101', pattern.pattern, stats_key)
 
         # add locus to the loci list
         if loci_list.count(locus) == 0:
@@ -1976,7 +2711,9 @@ def write_GC_distribution(fragsfile, GC_distribution_dict):
         GC_distribution_list.append([float(GC_rate), count])
     GC_distribution_list.sort()
 
-    # build the GC distribution file
+    # build the GC distribution file (without the extension .gz of a compressed fragments file)
+    if fragsfile.endswith('.gz'):
+        fragsfile = fragsfile[:-3]
     GC_distribution_file = os.path.splitext(fragsfile)[0] + '-GC-distribution.csv'
 
     # create the config file and write the default options
@@ -1992,6 +2729,242 @@ def write_GC_distribution(fragsfile, GC_distribution_dict):
 
 #-------------------------------------------------------------------------------
 
+def merge_GC_distribution(GC_distribution_dict, other_GC_distribution_dict):
+    '''
+    Add the counts of other GC distribution to the GC distribution.
+    '''
+
+    # for each GC rate of the other GC distribution
+    for GC_rate, count in other_GC_distribution_dict.items():
+        GC_distribution_dict[GC_rate] = GC_distribution_dict.get(GC_rate, 0) + count
+
+    # return the updated GC distribution
+    return GC_distribution_dict
+
+#-------------------------------------------------------------------------------
+
+def create_fragments_table():
+    '''
+    Create an empty table with the length, the GC rate and the N count of every
+    fragment of a digest.
+    '''
+
+    return {'lengths': array.array('q'), 'GC_rates': array.array('d'), 'N_counts': array.array('q')}
+
+#-------------------------------------------------------------------------------
+
+def update_fragments_table(fragments_table, fragment_len, GC_rate, N_count):
+    '''
+    Add the data of a fragment to the fragments table.
+    '''
+
+    # add the fragment data
+    fragments_table['lengths'].append(fragment_len)
+    fragments_table['GC_rates'].append(GC_rate)
+    fragments_table['N_counts'].append(N_count)
+
+    # return the updated fragments table
+    return fragments_table
+
+#-------------------------------------------------------------------------------
+
+def update_fragments_table_arrays(fragments_table, fragment_lens_array, GC_rates_array, N_counts_array):
+    '''
+    Add the data of the fragments held in arrays to the fragments table.
+    '''
+
+    import numpy as np
+
+    # add the fragments data
+    fragments_table['lengths'].frombytes(np.asarray(fragment_lens_array, dtype=np.int64).tobytes())
+    fragments_table['GC_rates'].frombytes(np.asarray(GC_rates_array, dtype=np.float64).tobytes())
+    fragments_table['N_counts'].frombytes(np.asarray(N_counts_array, dtype=np.int64).tobytes())
+
+    # return the updated fragments table
+    return fragments_table
+
+#-------------------------------------------------------------------------------
+
+def merge_fragments_table(fragments_table, other_fragments_table):
+    '''
+    Add the fragments of other fragments table (for example, those of a locus
+    digested by another process) to the fragments table.
+    '''
+
+    # add the data of the other fragments
+    for key in ('lengths', 'GC_rates', 'N_counts'):
+        fragments_table[key].extend(other_fragments_table[key])
+
+    # return the updated fragments table
+    return fragments_table
+
+#-------------------------------------------------------------------------------
+
+def write_fragments_table(fragtable, fragments_table):
+    '''
+    Save the fragments table in a NumPy file (.npz) with the arrays lengths,
+    GC_rates and N_counts.
+    '''
+
+    import numpy as np
+
+    # save the arrays of the fragments table
+    try:
+        with open(fragtable, mode='wb') as fragtable_id:
+            np.savez_compressed(fragtable_id, lengths=np.frombuffer(fragments_table['lengths'], dtype=np.int64), GC_rates=np.frombuffer(fragments_table['GC_rates'], dtype=np.float64), N_counts=np.frombuffer(fragments_table['N_counts'], dtype=np.int64))
+    except:
+        raise ProgramError('F001', fragtable)
+
+    # show OK message 
+    Message.print('info', 'The file {0} containing the fragments table is created.'.format(get_file_name(fragtable)))
+
+#-------------------------------------------------------------------------------
+
+def read_fragments_table(fragtable):
+    '''
+    Get the arrays of lengths, GC rates and N counts of a fragments table
+    saved in a NumPy file (.npz).
+    '''
+
+    import numpy as np
+
+    # open the fragments table file
+    try:
+        fragtable_data = np.load(fragtable)
+    except:
+        raise ProgramError('F002', fragtable)
+
+    # get the arrays
+    try:
+        fragment_lens_array = fragtable_data['lengths']
+        GC_rates_array = fragtable_data['GC_rates']
+        N_counts_array = fragtable_data['N_counts']
+    except:
+        raise ProgramError('F003', fragtable, 'a fragments table')
+
+    # return the arrays
+    return (fragment_lens_array, GC_rates_array, N_counts_array)
+
+#-------------------------------------------------------------------------------
+
+def create_fragments_columns():
+    '''
+    Create the empty columns of the fragments written in a digest.
+    '''
+
+    return {'contigs': [], 'contig_ids': array.array('q'), 'strands': array.array('b'), 'starts': array.array('q'), 'ends': array.array('q'), 'lengths': array.array('q'), 'GC_rates': array.array('d'), 'N_counts': array.array('q'), 'segment_starts': array.array('q')}
+
+#-------------------------------------------------------------------------------
+
+def update_fragments_columns(fragments_columns, locus_info, fragments_list):
+    '''
+    Add the fragments written of a locus to the fragments columns.
+    '''
+
+    # add the locus
+    contig_id = len(fragments_columns['contigs'])
+    fragments_columns['contigs'].append(locus_info)
+
+    # for each fragment
+    for (fragment_len, GC_rate_formatted, strand, start_position, end_position, fragment_seq) in fragments_list:
+
+        # add the fragment data with the start of its segment of the Watson strand in the locus
+        fragments_columns['contig_ids'].append(contig_id)
+        fragments_columns['strands'].append(1 if strand == '+' else -1)
+        fragments_columns['starts'].append(start_position)
+        fragments_columns['ends'].append(end_position)
+        fragments_columns['lengths'].append(fragment_len)
+        fragments_columns['GC_rates'].append(float(GC_rate_formatted))
+        fragments_columns['N_counts'].append(fragment_len - fragment_seq.count('A') - fragment_seq.count('C') - fragment_seq.count('G') - fragment_seq.count('T'))
+        fragments_columns['segment_starts'].append(start_position - 1 if strand == '+' else start_position - fragment_len)
+
+    # return the updated fragments columns
+    return fragments_columns
+
+#-------------------------------------------------------------------------------
+
+def merge_fragments_columns(fragments_columns, other_fragments_columns):
+    '''
+    Add the contigs and the fragments of other fragments columns (for example,
+    those of a locus saved in the journal of a digest) to the fragments columns.
+    '''
+
+    # add the contigs, whose identifications follow the current ones
+    contigs_count = len(fragments_columns['contigs'])
+    fragments_columns['contigs'].extend(other_fragments_columns['contigs'])
+    fragments_columns['contig_ids'].extend([contig_id + contigs_count for contig_id in other_fragments_columns['contig_ids']])
+
+    # add the data of the other fragments
+    for key in ('strands', 'starts', 'ends', 'lengths', 'GC_rates', 'N_counts', 'segment_starts'):
+        fragments_columns[key].extend(other_fragments_columns[key])
+
+    # return the updated fragments columns
+    return fragments_columns
+
+#-------------------------------------------------------------------------------
+
+def write_fragments_columns(fragscolumns, fragments_columns, genstore):
+    '''
+    Save the fragments columns in a NumPy file (.npz). The file has the arrays
+    contigs (heads of the loci), contig_ids, strands (1 or -1), starts and
+    ends (as in the FASTA heads), lengths, GC_rates and N_counts, and the
+    sequences as segments of the Watson strand in the genome store genstore
+    (seq_starts and seq_ends); the sequences of the fragments of the Crick
+    strand are their reverse complementary ones.
+    '''
+
+    import numpy as np
+
+    # get the offsets of the loci in the genome store
+    genome_store = GenomeStore(genstore)
+    offsets_array = np.array([offset for (locus_info, offset, locus_len) in genome_store.get_loci_list()], dtype=np.int64)
+    genome_store.close()
+
+    # get the arrays of the columns
+    contig_ids_array = np.frombuffer(fragments_columns['contig_ids'], dtype=np.int64).astype(np.int32)
+    lengths_array = np.frombuffer(fragments_columns['lengths'], dtype=np.int64)
+    seq_starts_array = offsets_array[contig_ids_array] + np.frombuffer(fragments_columns['segment_starts'], dtype=np.int64) if len(contig_ids_array) > 0 else np.zeros(0, dtype=np.int64)
+
+    # save the arrays
+    try:
+        with open(fragscolumns, mode='wb') as fragscolumns_id:
+            np.savez(fragscolumns_id, genstore=np.array(os.path.abspath(genstore)), contigs=np.array(fragments_columns['contigs'], dtype=np.str_), contig_ids=contig_ids_array, strands=np.frombuffer(fragments_columns['strands'], dtype=np.int8), starts=np.frombuffer(fragments_columns['starts'], dtype=np.int64), ends=np.frombuffer(fragments_columns['ends'], dtype=np.int64), lengths=lengths_array, GC_rates=np.frombuffer(fragments_columns['GC_rates'], dtype=np.float64), N_counts=np.frombuffer(fragments_columns['N_counts'], dtype=np.int64), seq_starts=seq_starts_array, seq_ends=seq_starts_array + lengths_array)
+    except:
+        raise ProgramError('F001', fragscolumns)
+
+    # show OK message 
+    Message.print('info', 'The file {0} containing the fragments columns is created.'.format(get_file_name(fragscolumns)))
+
+#-------------------------------------------------------------------------------
+
+def read_fragments_columns(fragscolumns):
+    '''
+    Get a dictionary with the arrays of a columnar fragments file.
+    '''
+
+    import numpy as np
+
+    # set the names of the columns
+    names_list = ['contigs', 'contig_ids', 'strands', 'starts', 'ends', 'lengths', 'GC_rates', 'N_counts', 'seq_starts', 'seq_ends']
+
+    # open the columnar fragments file
+    try:
+        fragscolumns_data = np.load(fragscolumns)
+    except:
+        raise ProgramError('F002', fragscolumns)
+
+    # get the arrays
+    try:
+        columns_dict = {name: fragscolumns_data[name] for name in names_list}
+        columns_dict['genstore'] = str(fragscolumns_data['genstore'])
+    except:
+        raise ProgramError('F003', fragscolumns, 'a columnar fragments file')
+
+    # return the columns
+    return columns_dict
+
+#-------------------------------------------------------------------------------
+
 def get_GC_distribution(GC_distribution_file):
     '''
     Get the GC distribution list.
@@ -2016,11 +2989,11 @@ def get_GC_distribution(GC_distribution_file):
     while record != '':
 
         # set the pattern of the GC distribution file record (GC_rate|count)
-        pattern = r'([\d\.]+);(\d+)$'
+        pattern = GC_distribution_record_pattern
 
         # extract the data
         try:
-            mo = re.search(pattern, record)
+            mo = pattern.search(record)
             GC_rate = float(mo.group(1).strip())
             count = int(mo.group(2).strip())
         except:
@@ -2100,6 +3073,19 @@ def get_all_options_dict():
 
     # define all options dictionary
     all_options_dict = {
+        'batchsize': {'value':'', 'default':'10000', 'comment':'length limit of the loci that are digested together in batches of blocksize nucleotides with a single scan (0 <= batchsize <= 1000000; 0 disables the batches; they are not used when engine is NUMPY or fragcache is not NONE)'},
+        'benchbaseline': {'value':'', 'default':'NONE', 'comment':'path of the JSON file with the results of a previous benchmark to compare with or NONE'},
+        'benchcontigdist': {'value':'', 'default':'LOGNORMAL', 'comment':'distribution of the contig lengths in the synthetic genome: UNIFORM or LOGNORMAL'},
+        'benchcontigs': {'value':'', 'default':'100', 'comment':'number of contigs of the synthetic genome'},
+        'benchdir': {'value':'', 'default':'./results/benchmark', 'comment':'path of the directory where the synthetic genomes and the files of the digests are written'},
+        'benchfile': {'value':'', 'default':'./results/benchmark.json', 'comment':'path of the JSON file with the results of the benchmark'},
+        'benchgc': {'value':'', 'default':'0.41', 'comment':'GC rate of the synthetic genome (0.0 <= benchgc <= 1.0)'},
+        'benchngaps': {'value':'', 'default':'2.0', 'comment':'number of N gaps per Mb in the synthetic genome'},
+        'benchrepeats': {'value':'', 'default':'3', 'comment':'number of times every benchmark is repeated (the fastest time is kept)'},
+        'benchseed': {'value':'', 'default':'1', 'comment':'seed of the random generator of the synthetic genome'},
+        'benchsize': {'value':'', 'default':'10', 'comment':'size in Mb of the synthetic genome (1 <= benchsize <= 1000)'},
+        'benchstartup': {'value':'', 'default':'100', 'comment':'budget in milliseconds of the start of every program (it is timed showing the help)'},
+        'blocksize': {'value':'', 'default':'1000000', 'comment':'nucleotides number of the blocks used to scan the genome when stream is YES and of the batches of small loci otherwise (the NUMPY engine codes the loci in blocks of this size, using about 15 bytes per nucleotide)'},
         'cend': {'value':'', 'default':'end02', 'comment':"code used in endsfile corresponding to the end where the adapter 2 is"},
         'clearfile': {'value':'', 'default':'./results/reads-cleared', 'comment':'path of the file with PCR duplicates removed without extension'},
         'cut': {'value':'', 'default':'YES', 'comment':'YES (cut nucleotides from or until a seq into the read) or NO (change bases by Ns from or until a seq into the read)'},
@@ -2109,16 +3095,25 @@ def get_all_options_dict():
         'dupstfile': {'value':'', 'default':'./results/pcrduplicates-stats.txt', 'comment':'path of the the PCR duplicates statistics file'},
         'endsfile': {'value':'', 'default':'./ends.txt', 'comment':'path oh the end selengthquences file'},
         'enzyme1': {'value':'', 'default':'EcoRI', 'comment':'id of 1st restriction enzyme used in rsfile or its restriction site sequence'},
+        'engine': {'value':'', 'default':'REGEX', 'comment':'REGEX (the sites are found with regular expressions) or NUMPY (they are found with vectorised bitmasks; it can not be used when stream is YES)'},
         'enzyme2': {'value':'', 'default':'MseI', 'comment':'id of 2nd restriction enzyme used in rsfile or its restriction site sequence'},
+        'enzymes': {'value':'', 'default':'ALL', 'comment':'ALL (every enzyme of rsfile) or comma-separated ids of enzymes used in rsfile or their restriction site sequences'},
         'filenum': {'value':'', 'default':'1', 'comment':'1: in SE file or the first file in PE files; 2: the second file in PE files'},
         'format': {'value':'', 'default':'FASTQ', 'comment':'FASTA or FASTQ (format of fragments file)'},
+        'fragcache': {'value':'', 'default':'NONE', 'comment':'path of the directory where the fragments and statistics of every locus are cached by its content or NONE (only the new or changed loci are digested again; it can not be used when stream is YES)'},
+        'fragcachesize': {'value':'', 'default':'4096', 'comment':'size limit in MB of fragcache (the least recently used entries are removed)'},
+        'fragscolumns': {'value':'', 'default':'NONE', 'comment':'path of the columnar fragments file (.npz) with the sequences as segments of genstore or NONE (it can not be written when genstore is NONE)'},
         'fragsfile': {'value':'', 'default':'./results/fragments.fasta', 'comment':'path of the fragments file'},
         'fragsnum': {'value':'', 'default':'10000', 'comment':'fragments number'},
         'fragstinterval': {'value':'', 'default':'25', 'comment':'interval length of fragment size'},
+        'fragtable': {'value':'', 'default':'NONE', 'comment':'path of the NumPy file (.npz) with the length, GC rate and N count of every fragment used by fragsweep or NONE (it can not be saved when stream is YES)'},
         'fragstfile': {'value':'', 'default':'./results/fragments-stats.txt', 'comment':'path of the fragment statistics file'},
         'gcfactor': {'value':'', 'default':'0.0', 'comment':'weight factor of GC ratio in a locus with PCR duplicates (0.0 <= gcfactor < 1.0)'},
         'genfile': {'value':'', 'default':'./genomes/genome.fasta', 'comment':'file of the reference genome in fasta format'},
-        'gz': {'value':'', 'default':'NO', 'comment':'YES or NO (gzip format is used to compress the files)'},
+        'genstore': {'value':'', 'default':'NONE', 'comment':'path of the indexed genome store built from genfile or NONE (genfile is read as FASTA)'},
+        'gz': {'value':'', 'default':'NO', 'comment':'YES or NO (gzip format is used to compress the files and .gz is added to their names when it is missing)'},
+        'gzlevel': {'value':'', 'default':'6', 'comment':'compression level of the gzip files (1 <= gzlevel <= 9)'},
+        'gzthreads': {'value':'', 'default':'4', 'comment':'number of threads used to compress the gzip files'},
         'indelprob': {'value':'', 'default':'0.4', 'comment':'insertion/deletion probability (0.0 <= indelprob < 1.0)'},
         'index1len': {'value':'', 'default':'6', 'comment':'index sequence length in the adapter 1'},
         'index2len': {'value':'', 'default':'6', 'comment':'index sequence length in the adapter 2 (it must be 0 when technique is IND1)'},
@@ -2134,24 +3129,38 @@ def get_all_options_dict():
         'minreadvar': {'value':'', 'default':'0.8', 'comment':'lower variation on reads number per locus (0.5 <= minreadvar <= 1.0)'},
         'multiparam': {'value':'', 'default':'0.333,0.267,0.200,0.133,0.067', 'comment':'probability values to multinomial distribution with format prob1,prob2,...,probn (they must sum 1.0)'},
         'mutprob': {'value':'', 'default':'0.2', 'comment':'mutation probability (0.0 <= mutprob < 1.0)'},
+        'pipeline': {'value':'', 'default':'YES', 'comment':'YES (the genome is read ahead and the fragments file is written by threads that overlap the digest) or NO'},
         'plot': {'value':'', 'default':'YES', 'comment':'statistical graphs: YES or NO'},
         'poissonparam': {'value':'', 'default':'1.0', 'comment':'lambda value of the Poisson distribution'},
         'pcrdupprob': {'value':'', 'default':'0.0', 'comment':'PCR duplicates probability in a locus (0.0 <= pcrdupprob < 1.0)'},
         'pcrdistribution': {'value':'', 'default':'MULTINOMIAL', 'comment':'distribution type to calculate the PCR duplicates number: MULTINOMIAL or POISSON'},
+        'processes': {'value':'', 'default':'1', 'comment':'number of processes used to digest the loci in parallel (it must be 1 when stream is YES)'},
         'readsfile': {'value':'', 'default':'./results/reads', 'comment':'path of the read file without extension'},
         'input_readfile': {'value':'', 'default':'./results/reads-1.fastq', 'comment':'path of the read file'},
         'readsfile1': {'value':'', 'default':'./results/reads-1.fastq', 'comment':'path of the reads file in SE read type or the Watson strand reads file in PE case'},
         'readsfile2': {'value':'', 'default':'./results/reads-2.fastq', 'comment':'path of the Crick strand reads file in PE read type or NONE in SE case'},
         'readsnum': {'value':'', 'default':'10000', 'comment':'reads number'},
         'readtype': {'value':'', 'default':'PE', 'comment':'SE (single-end) or PE (pair-end)'},
+        'report': {'value':'', 'default':'NO', 'comment':'YES (a JSON report with the time and memory of every stage and locus is written next to fragstfile) or NO'},
+        'resume': {'value':'', 'default':'NO', 'comment':'YES (a journal of the loci completed is kept next to fragsfile and a digest interrupted in a previous run with resume YES and the same options goes on after the last locus completed) or NO (no journal is kept; it can not be YES when gz or stream is YES)'},
         'rsfile': {'value':'', 'default':'./restrictionsites.txt', 'comment':'path of the restriction sites file'},
+        'screenfile': {'value':'', 'default':'./results/enzymes-screen.csv', 'comment':'path of the CSV file with the fragments of every enzyme pair in every size window'},
         'sense': {'value':'', 'default':'33', 'comment':'33 (cut or change from the seq 3\' end to read 3\' end) or 55 (cut or change from read 5\' end to the seq 5\' end)'},
         'seq': {'value':'', 'default':'TGGAGGTGGGG', 'comment':'sequence to be located'},
+        'sitecache': {'value':'', 'default':'NONE', 'comment':'path of the directory where the positions of the restriction sites are cached or NONE (it can not be used when stream is YES)'},
+        'sitecachesize': {'value':'', 'default':'1024', 'comment':'size limit in MB of sitecache (the least recently used entries are removed)'},
+        'stream': {'value':'', 'default':'NO', 'comment':'YES (the genome is scanned in blocks with bounded memory) or NO (every locus is loaded in memory)'},
+        'sweepfile': {'value':'', 'default':'./results/fragments-sweep.csv', 'comment':'path of the CSV file with the fragments of every size window of the sweep'},
+        'sweepstart': {'value':'', 'default':'100', 'comment':'lower boundary of the first size window of the sweep'},
+        'sweepstep': {'value':'', 'default':'10', 'comment':'increment of the lower boundary between consecutive size windows of the sweep'},
+        'sweepstop': {'value':'', 'default':'1000', 'comment':'lower boundary of the last size window of the sweep'},
+        'sweepwidth': {'value':'', 'default':'100', 'comment':'length of the size windows of the sweep'},
         'technique': {'value':'', 'default':'IND1_IND2_DBR', 'comment':'IND1 (only index1), IND1_DBR (index1 + DBR), IND1_IND2 (index1 + index2) or IND1_IND2_DBR (index1 + index2 + DBR)'},
         'trace': {'value':'', 'default':'NO', 'comment':'additional info useful to the developer team: YES or NO'},
         'trimfile': {'value':'', 'default':'./results/reads-trimmed', 'comment':'path of the file with trimmed reads without extension'},
         'verbose': {'value':'', 'default':'YES', 'comment':'additional job status info during the run: YES or NO'},
         'wend': {'value':'', 'default':'end01', 'comment':"code used in endsfile corresponding to the end where the adapter 1 is"},
+        'windows': {'value':'', 'default':'201-300', 'comment':'comma-separated size windows of fragments with format minfragsize-maxfragsize'},
         }
 
     # return all options dictionary
@@ -2202,8 +3211,120 @@ def parse_options(options_dict, param, origin):
     Parse and extract a option from the config file or the input parameters.
     '''
 
+    # parse batchsize
+    if param.startswith('--batchsize=') or param.lstrip().startswith('batchsize='):
+        try:
+            batchsize = int(get_option_value(param, origin))
+        except:
+            raise ProgramError('D002', 'batchsize', 0, 1000000)
+        if batchsize < 0 or batchsize > 1000000:
+            raise ProgramError('D002', 'batchsize', 0, 1000000)
+        options_dict['batchsize']['value'] = batchsize
+
+    # parse benchbaseline
+    elif param.startswith('--benchbaseline=') or param.lstrip().startswith('benchbaseline='):
+        benchbaseline = get_option_value(param, origin)
+        options_dict['benchbaseline']['value'] = benchbaseline
+
+    # parse benchcontigdist
+    elif param.startswith('--benchcontigdist=') or param.lstrip().startswith('benchcontigdist='):
+        benchcontigdist = get_option_value(param, origin).upper()
+        if benchcontigdist not in ['UNIFORM', 'LOGNORMAL']:
+            raise ProgramError('D207', 'benchcontigdist', benchcontigdist, 'UNIFORM or LOGNORMAL')
+        options_dict['benchcontigdist']['value'] = benchcontigdist
+
+    # parse benchcontigs
+    elif param.startswith('--benchcontigs=') or param.lstrip().startswith('benchcontigs='):
+        try:
+            benchcontigs = int(get_option_value(param, origin))
+        except:
+            raise ProgramError('D001', 'benchcontigs', 0)
+        if benchcontigs <= 0:
+            raise ProgramError('D001', 'benchcontigs', 0)
+        options_dict['benchcontigs']['value'] = benchcontigs
+
+    # parse benchdir
+    elif param.startswith('--benchdir=') or param.lstrip().startswith('benchdir='):
+        benchdir = get_option_value(param, origin)
+        options_dict['benchdir']['value'] = benchdir
+
+    # parse benchfile
+    elif param.startswith('--benchfile=') or param.lstrip().startswith('benchfile='):
+        benchfile = get_option_value(param, origin)
+        options_dict['benchfile']['value'] = benchfile
+
+    # parse benchgc
+    elif param.startswith('--benchgc=') or param.lstrip().startswith('benchgc='):
+        try:
+            benchgc = float(get_option_value(param, origin))
+        except:
+            raise ProgramError('D004', 'benchgc', 0.0, 1.0)
+        if benchgc < 0.0 or benchgc > 1.0:
+            raise ProgramError('D004', 'benchgc', 0.0, 1.0)
+        options_dict['benchgc']['value'] = benchgc
+
+    # parse benchngaps
+    elif param.startswith('--benchngaps=') or param.lstrip().startswith('benchngaps='):
+        try:
+            benchngaps = float(get_option_value(param, origin))
+        except:
+            raise ProgramError('D006', 'benchngaps', 0.0)
+        if benchngaps < 0.0:
+            raise ProgramError('D006', 'benchngaps', 0.0)
+        options_dict['benchngaps']['value'] = benchngaps
+
+    # parse benchrepeats
+    elif param.startswith('--benchrepeats=') or param.lstrip().startswith('benchrepeats='):
+        try:
+            benchrepeats = int(get_option_value(param, origin))
+        except:
+            raise ProgramError('D001', 'benchrepeats', 0)
+        if benchrepeats <= 0:
+            raise ProgramError('D001', 'benchrepeats', 0)
+        options_dict['benchrepeats']['value'] = benchrepeats
+
+    # parse benchseed
+    elif param.startswith('--benchseed=') or param.lstrip().startswith('benchseed='):
+        try:
+            benchseed = int(get_option_value(param, origin))
+        except:
+            raise ProgramError('D002', 'benchseed', 0, 2**32 - 1)
+        if benchseed < 0 or benchseed > 2**32 - 1:
+            raise ProgramError('D002', 'benchseed', 0, 2**32 - 1)
+        options_dict['benchseed']['value'] = benchseed
+
+    # parse benchsize
+    elif param.startswith('--benchsize=') or param.lstrip().startswith('benchsize='):
+        try:
+            benchsize = float(get_option_value(param, origin))
+        except:
+            raise ProgramError('D004', 'benchsize', 1.0, 1000.0)
+        if benchsize < 1.0 or benchsize > 1000.0:
+            raise ProgramError('D004', 'benchsize', 1.0, 1000.0)
+        options_dict['benchsize']['value'] = benchsize
+
+    # parse benchstartup
+    elif param.startswith('--benchstartup=') or param.lstrip().startswith('benchstartup='):
+        try:
+            benchstartup = int(get_option_value(param, origin))
+        except:
+            raise ProgramError('D001', 'benchstartup', 0)
+        if benchstartup <= 0:
+            raise ProgramError('D001', 'benchstartup', 0)
+        options_dict['benchstartup']['value'] = benchstartup
+
+    # parse blocksize
+    elif param.startswith('--blocksize=') or param.lstrip().startswith('blocksize='):
+        try:
+            blocksize = int(get_option_value(param, origin))
+        except:
+            raise ProgramError('D001', 'blocksize', 0)
+        if blocksize <= 0:
+            raise ProgramError('D001', 'blocksize', 0)
+        options_dict['blocksize']['value'] = blocksize
+
     # parse cend
-    if param.startswith('--cend=') or param.lstrip().startswith('cend='):
+    elif param.startswith('--cend=') or param.lstrip().startswith('cend='):
         wend = get_option_value(param, origin)
         options_dict['cend']['value'] = wend
 
@@ -2254,6 +3375,13 @@ def parse_options(options_dict, param, origin):
         endsfile = get_option_value(param, origin)
         options_dict['endsfile']['value'] = endsfile
 
+    # parse engine
+    elif param.startswith('--engine=') or param.lstrip().startswith('engine='):
+        engine = get_option_value(param, origin).upper()
+        if engine not in ['REGEX', 'NUMPY']:
+            raise ProgramError('D207', 'engine', engine, 'REGEX or NUMPY')
+        options_dict['engine']['value'] = engine
+
     # parse enzyme1
     elif param.startswith('--enzyme1=') or param.lstrip().startswith('enzyme1='):
         enzyme1 = get_option_value(param, origin)
@@ -2264,6 +3392,11 @@ def parse_options(options_dict, param, origin):
         enzyme2 = get_option_value(param, origin)
         options_dict['enzyme2']['value'] = enzyme2
 
+    # parse enzymes
+    elif param.startswith('--enzymes=') or param.lstrip().startswith('enzymes='):
+        enzymes = get_option_value(param, origin)
+        options_dict['enzymes']['value'] = enzymes
+
     # parse filenum
     elif param.startswith('--filenum=') or param.lstrip().startswith('filenum='):
         filenum = get_option_value(param, origin)
@@ -2271,6 +3404,26 @@ def parse_options(options_dict, param, origin):
             raise ProgramError('D206', filenum)
         options_dict['filenum']['value'] = filenum
 
+    # parse fragcache
+    elif param.startswith('--fragcache=') or param.lstrip().startswith('fragcache='):
+        fragcache = get_option_value(param, origin)
+        options_dict['fragcache']['value'] = fragcache
+
+    # parse fragcachesize
+    elif param.startswith('--fragcachesize=') or param.lstrip().startswith('fragcachesize='):
+        try:
+            fragcachesize = int(get_option_value(param, origin))
+        except:
+            raise ProgramError('D001', 'fragcachesize', 0)
+        if fragcachesize <= 0:
+            raise ProgramError('D001', 'fragcachesize', 0)
+        options_dict['fragcachesize']['value'] = fragcachesize
+
+    # parse fragscolumns
+    elif param.startswith('--fragscolumns=') or param.lstrip().startswith('fragscolumns='):
+        fragscolumns = get_option_value(param, origin)
+        options_dict['fragscolumns']['value'] = fragscolumns
+
     # parse fragsfile
     elif param.startswith('--fragsfile=') or param.lstrip().startswith('fragsfile='):
         fragsfile = get_option_value(param, origin)
@@ -2296,6 +3449,11 @@ def parse_options(options_dict, param, origin):
             raise ProgramError('D001', 'fragstinterval', 0)
         options_dict['fragstinterval']['value'] = fragstinterval
 
+    # parse fragtable
+    elif param.startswith('--fragtable=') or param.lstrip().startswith('fragtable='):
+        fragtable = get_option_value(param, origin)
+        options_dict['fragtable']['value'] = fragtable
+
     # parse fragstfile
     elif param.startswith('--fragstfile=') or param.lstrip().startswith('fragstfile='):
         fragstfile = get_option_value(param, origin)
@@ -2323,6 +3481,11 @@ def parse_options(options_dict, param, origin):
         genfile = get_option_value(param, origin)
         options_dict['genfile']['value'] = genfile
 
+    # parse genstore
+    elif param.startswith('--genstore=') or param.lstrip().startswith('genstore='):
+        genstore = get_option_value(param, origin)
+        options_dict['genstore']['value'] = genstore
+
     # parse gz
     elif param.startswith('--gz=') or param.lstrip().startswith('gz='):
         gz = get_option_value(param, origin).upper()
@@ -2330,6 +3493,26 @@ def parse_options(options_dict, param, origin):
             raise ProgramError('D205', 'gz', gz)
         options_dict['gz']['value'] = gz
 
+    # parse gzlevel
+    elif param.startswith('--gzlevel=') or param.lstrip().startswith('gzlevel='):
+        try:
+            gzlevel = int(get_option_value(param, origin))
+        except:
+            raise ProgramError('D002', 'gzlevel', 1, 9)
+        if gzlevel < 1 or gzlevel > 9:
+            raise ProgramError('D002', 'gzlevel', 1, 9)
+        options_dict['gzlevel']['value'] = gzlevel
+
+    # parse gzthreads
+    elif param.startswith('--gzthreads=') or param.lstrip().startswith('gzthreads='):
+        try:
+            gzthreads = int(get_option_value(param, origin))
+        except:
+            raise ProgramError('D001', 'gzthreads', 0)
+        if gzthreads <= 0:
+            raise ProgramError('D001', 'gzthreads', 0)
+        options_dict['gzthreads']['value'] = gzthreads
+
     # parse indelprob
     elif param.startswith('--indelprob=') or param.lstrip().startswith('indelprob='):
         try:
@@ -2473,6 +3656,13 @@ def parse_options(options_dict, param, origin):
             raise ProgramError('D005', 'mutprob', 0.0, 1.0)
         options_dict['mutprob']['value'] = mutprob
 
+    # parse pipeline
+    elif param.startswith('--pipeline=') or param.lstrip().startswith('pipeline='):
+        pipeline = get_option_value(param, origin).upper()
+        if pipeline not in ['YES', 'NO']:
+            raise ProgramError('D205', 'pipeline', pipeline)
+        options_dict['pipeline']['value'] = pipeline
+
     # parse plot
     elif param.startswith('--plot=') or param.lstrip().startswith('plot='):
         plot = get_option_value(param, origin).upper()
@@ -2507,6 +3697,16 @@ def parse_options(options_dict, param, origin):
             raise ProgramError('D005', 'pcrdupprob', 0.0, 1.0)
         options_dict['pcrdupprob']['value'] = pcrdupprob
 
+    # parse processes
+    elif param.startswith('--processes=') or param.lstrip().startswith('processes='):
+        try:
+            processes = int(get_option_value(param, origin))
+        except:
+            raise ProgramError('D001', 'processes', 0)
+        if processes <= 0:
+            raise ProgramError('D001', 'processes', 0)
+        options_dict['processes']['value'] = processes
+
     # parse readsfile
     elif param.startswith('--readsfile=') or param.lstrip().startswith('readsfile='):
         readsfile = get_option_value(param, origin)
@@ -2539,11 +3739,30 @@ def parse_options(options_dict, param, origin):
             raise ProgramError('D204', readtype)
         options_dict['readtype']['value'] = readtype
 
+    # parse report
+    elif param.startswith('--report=') or param.lstrip().startswith('report='):
+        report = get_option_value(param, origin).upper()
+        if report not in ['YES', 'NO']:
+            raise ProgramError('D205', 'report', report)
+        options_dict['report']['value'] = report
+
+    # parse resume
+    elif param.startswith('--resume=') or param.lstrip().startswith('resume='):
+        resume = get_option_value(param, origin).upper()
+        if resume not in ['YES', 'NO']:
+            raise ProgramError('D205', 'resume', resume)
+        options_dict['resume']['value'] = resume
+
     # parse rsfile
     elif param.startswith('--rsfile=') or param.lstrip().startswith('rsfile='):
         rsfile = get_option_value(param, origin)
         options_dict['rsfile']['value'] = rsfile
 
+    # parse screenfile
+    elif param.startswith('--screenfile=') or param.lstrip().startswith('screenfile='):
+        screenfile = get_option_value(param, origin)
+        options_dict['screenfile']['value'] = screenfile
+
     # parse sense
     elif param.startswith('--sense=') or param.lstrip().startswith('sense='):
         sense = get_option_value(param, origin)
@@ -2556,6 +3775,73 @@ def parse_options(options_dict, param, origin):
         seq = get_option_value(param, origin)
         options_dict['seq']['value'] = seq
 
+    # parse sitecache
+    elif param.startswith('--sitecache=') or param.lstrip().startswith('sitecache='):
+        sitecache = get_option_value(param, origin)
+        options_dict['sitecache']['value'] = sitecache
+
+    # parse sitecachesize
+    elif param.startswith('--sitecachesize=') or param.lstrip().startswith('sitecachesize='):
+        try:
+            sitecachesize = int(get_option_value(param, origin))
+        except:
+            raise ProgramError('D001', 'sitecachesize', 0)
+        if sitecachesize <= 0:
+            raise ProgramError('D001', 'sitecachesize', 0)
+        options_dict['sitecachesize']['value'] = sitecachesize
+
+    # parse stream
+    elif param.startswith('--stream=') or param.lstrip().startswith('stream='):
+        stream = get_option_value(param, origin).upper()
+        if stream not in ['YES', 'NO']:
+            raise ProgramError('D205', 'stream', stream)
+        options_dict['stream']['value'] = stream
+
+    # parse sweepfile
+    elif param.startswith('--sweepfile=') or param.lstrip().startswith('sweepfile='):
+        sweepfile = get_option_value(param, origin)
+        options_dict['sweepfile']['value'] = sweepfile
+
+    # parse sweepstart
+    elif param.startswith('--sweepstart=') or param.lstrip().startswith('sweepstart='):
+        try:
+            sweepstart = int(get_option_value(param, origin))
+        except:
+            raise ProgramError('D001', 'sweepstart', 0)
+        if sweepstart <= 0:
+            raise ProgramError('D001', 'sweepstart', 0)
+        options_dict['sweepstart']['value'] = sweepstart
+
+    # parse sweepstep
+    elif param.startswith('--sweepstep=') or param.lstrip().startswith('sweepstep='):
+        try:
+            sweepstep = int(get_option_value(param, origin))
+        except:
+            raise ProgramError('D001', 'sweepstep', 0)
+        if sweepstep <= 0:
+            raise ProgramError('D001', 'sweepstep', 0)
+        options_dict['sweepstep']['value'] = sweepstep
+
+    # parse sweepstop
+    elif param.startswith('--sweepstop=') or param.lstrip().startswith('sweepstop='):
+        try:
+            sweepstop = int(get_option_value(param, origin))
+        except:
+            raise ProgramError('D001', 'sweepstop', 0)
+        if sweepstop <= 0:
+            raise ProgramError('D001', 'sweepstop', 0)
+        options_dict['sweepstop']['value'] = sweepstop
+
+    # parse sweepwidth
+    elif param.startswith('--sweepwidth=') or param.lstrip().startswith('sweepwidth='):
+        try:
+            sweepwidth = int(get_option_value(param, origin))
+        except:
+            raise ProgramError('D001', 'sweepwidth', 0)
+        if sweepwidth <= 0:
+            raise ProgramError('D001', 'sweepwidth', 0)
+        options_dict['sweepwidth']['value'] = sweepwidth
+
     # parse technique
     elif param.startswith('--technique=') or param.lstrip().startswith('technique='):
         technique = get_option_value(param, origin).upper()
@@ -2587,6 +3873,17 @@ def parse_options(options_dict, param, origin):
         wend = get_option_value(param, origin)
         options_dict['wend']['value'] = wend
 
+    # parse windows
+    elif param.startswith('--windows=') or param.lstrip().startswith('windows='):
+        windows = get_option_value(param, origin)
+        windows_list = []
+        for window in windows.split(','):
+            mo = window_pattern.match(window)
+            if mo is None or int(mo.group(1)) > int(mo.group(2)):
+                raise ProgramError('D208', 'windows', windows, 'minfragsize-maxfragsize[,minfragsize-maxfragsize ...]')
+            windows_list.append((int(mo.group(1)), int(mo.group(2))))
+        options_dict['windows']['value'] = windows_list
+
     # another is a mistake
     else:
         if param.strip() != '' and not param.lstrip().startswith('#'):
@@ -2609,18 +3906,18 @@ def get_option_value(param, origin):
     # if origin is the config file
     if origin == 'CF':
         # set the pattern (option=value)
-        pattern = r'^\w+=(.+)$'
+        pattern = config_option_pattern
     # if origin is input parameters
     elif origin == 'IP':
         # set the pattern (--option=value)
-        pattern = r'^\-{2}\w+=(.+)$'
+        pattern = parameter_option_pattern
 
     # extract the data
     try:
-        mo = re.search(pattern, param.strip())
+        mo = pattern.search(param.strip())
         value = mo.group(1).strip()
     except:
-        raise ProgramError('D101', pattern, param.strip())
+        raise ProgramError('D101', pattern.pattern, param.strip())
 
     # return the value
     return value
@@ -2670,6 +3967,10 @@ class ProgramError(Exception):
             Message.print('error', '*** ERROR {0}: {1} is not a valid value in option {2}. It must be YES or NO.'.format(code_exception, param2, param1))
         elif code_exception == 'D206':
             Message.print('error', '*** ERROR {0}: file number {1} is wrong. It must be 1 or 2.'.format(code_exception, param1))
+        elif code_exception == 'D207':
+            Message.print('error', '*** ERROR {0}: {1} is not a valid value in option {2}. It must be {3}.'.format(code_exception, param2, param1, param3))
+        elif code_exception == 'D208':
+            Message.print('error', '*** ERROR {0}: {1} is not a valid value in option {2}. Its format must be {3}.'.format(code_exception, param2, param1, param3))
         elif code_exception == 'D301':
             Message.print('error', '*** ERROR {0}: Enzyme identification or restriction site sequence {1} is not valid.'.format(code_exception, param1))
         elif code_exception == 'D302':
@@ -2710,10 +4011,14 @@ class ProgramError(Exception):
             Message.print('error', "*** ERROR {0}: {1} must be comma-separated float numbers and they must sum 1.0.".format(code_exception, param1))
         elif code_exception == 'L010':
             Message.print('error', "*** ERROR {0}: If read type is SE, the file number can not be 2.".format(code_exception))
+        elif code_exception == 'L011':
+            Message.print('error', "*** ERROR {0}: {1} is not a valid value in option {2} when {3}.".format(code_exception, param2, param1, param3))
         elif code_exception == 'S001':
             Message.print('error', '*** ERROR {0}: OS not detected.'.format(code_exception))
         elif code_exception == 'S002':
             Message.print('error', '*** ERROR {0}: Sorting of file {1} has mistakenly finished.'.format(code_exception, param1))
+        elif code_exception == 'S003':
+            Message.print('error', '*** ERROR {0}: The run of {1} has failed.'.format(code_exception, param1))
         else:
             Message.print('error', '*** ERROR {0}: This exception is not managed.'.format(code_exception))
 
@@ -2734,6 +4039,12 @@ class Message():
     verbose_status = True
     trace_status = False
 
+    # the minimum seconds between two progress messages and the data of the current progress
+    progress_interval = 0.5
+    progress_start_time = None
+    progress_last_time = None
+    progress_data = None
+
     #---------------
 
     def set_verbose_status(status):
@@ -2752,17 +4063,30 @@ class Message():
 
     #---------------
 
-    def print(message_type, message_text):
+    def print(message_type, message_text, *message_args):
         '''
+        Print a message. The verbose and trace messages are not built when
+        their status is off, so they can be given lazily: as a callable that
+        returns the text or as a text with the arguments of its format.
         '''
 
+        # skip the verbose and trace messages whose status is off
+        if message_type == 'verbose' and not Message.verbose_status or message_type == 'trace' and not Message.trace_status:
+            return
+
+        # build the message text
+        if callable(message_text):
+            message_text = message_text()
+        elif message_args:
+            message_text = message_text.format(*message_args)
+
         if message_type == 'info':
             print(message_text, file=sys.stdout)
             sys.stdout.flush()
-        elif message_type == 'verbose' and Message.verbose_status:
+        elif message_type == 'verbose':
             sys.stdout.write(message_text)
             sys.stdout.flush()
-        elif message_type == 'trace' and Message.trace_status:
+        elif message_type == 'trace':
             print(message_text, file=sys.stdout)
             sys.stdout.flush()
         elif message_type == 'error':
@@ -2771,6 +4095,2269 @@ class Message():
 
     #---------------
 
+    def print_progress(text, count, unit, nucleotides_count=None):
+        '''
+        Print a verbose message with the progress of a count and its throughput
+        (per second and, when nucleotides_count is given, in Mb per second). The
+        message is printed at most once every progress_interval seconds.
+        '''
+
+        # skip the message when the verbose status is off
+        if not Message.verbose_status:
+            return
+
+        # save the progress data
+        Message.progress_data = (text, count, unit, nucleotides_count)
+
+        # print the message when the interval since the previous one is passed
+        now = time.monotonic()
+        if Message.progress_start_time is None:
+            Message.progress_start_time = now
+        if Message.progress_last_time is None or now - Message.progress_last_time >= Message.progress_interval:
+            Message.progress_last_time = now
+            Message.write_progress(now)
+
+    #---------------
+
+    def end_progress():
+        '''
+        Print the last progress message with the final count and end its line.
+        '''
+
+        # skip the message when the verbose status is off
+        if not Message.verbose_status:
+            return
+
+        # print the final count and reset the progress
+        if Message.progress_data is not None:
+            Message.write_progress(time.monotonic())
+        sys.stdout.write('\n')
+        sys.stdout.flush()
+        Message.progress_start_time = None
+        Message.progress_last_time = None
+        Message.progress_data = None
+
+    #---------------
+
+    def write_progress(now):
+        '''
+        Write the progress message with the saved progress data.
+        '''
+
+        # get the progress data and the elapsed seconds
+        (text, count, unit, nucleotides_count) = Message.progress_data
+        elapsed_time = now - Message.progress_start_time
+
+        # write the message with the throughput when some time has passed
+        message_text = '\r{0} ... {1:9d}'.format(text, count)
+        if elapsed_time > 0:
+            message_text += ' ({0:.0f} {1}/s'.format(count / elapsed_time, unit)
+            if nucleotides_count is not None:
+                message_text += ', {0:.2f} Mb/s'.format(nucleotides_count / elapsed_time / 1e6)
+            message_text += ')'
+        sys.stdout.write(message_text)
+        sys.stdout.flush()
+
+    #---------------
+
+#-------------------------------------------------------------------------------
+
+class RunReport():
+    '''
+    This class records the wall time, the CPU time, the bytes processed and the
+    largest growth of resident memory during a call of every stage of a run
+    (the peak of resident memory of the process only rises, so it can not be
+    assigned to a stage) and the data of every locus, and writes them in a
+    JSON report.
+    '''
+
+    #---------------
+
+    status = False
+
+    # the data of the stages and the loci, and the start times of the stages and the run
+    stages_dict = {}
+    loci_list = []
+    start_times_dict = {}
+    run_start_times = None
+
+    # the descriptor of the file with the current memory of the process (None when it is not available), the process that opened it
+    # (a child process of a pool has to open its own file) and the size of a memory page in KB
+    statm_fd = None
+    statm_pid = None
+    page_kb = 0
+
+    #---------------
+
+    def set_status(status):
+        '''
+        Set the report status and start the run when it is on.
+        '''
+
+        RunReport.status = status
+        if status:
+            RunReport.run_start_times = (time.perf_counter(), time.process_time())
+
+    #---------------
+
+    def start_stage(stage):
+        '''
+        Start the timing of a stage and save the current resident memory.
+        '''
+
+        if RunReport.status:
+            RunReport.start_times_dict[stage] = (time.perf_counter(), time.process_time(), RunReport.get_current_rss_kb())
+
+    #---------------
+
+    def stop_stage(stage, bytes_count=0):
+        '''
+        Stop the timing of a stage and add its data.
+        '''
+
+        if RunReport.status:
+            start_times = RunReport.start_times_dict.pop(stage)
+            (wall_time, cpu_time) = RunReport.get_elapsed_times(start_times)
+            data = RunReport.stages_dict.setdefault(stage, {'calls': 0, 'wall_time': 0.0, 'cpu_time': 0.0, 'bytes': 0, 'rss_delta_kb': 0})
+            data['calls'] += 1
+            data['wall_time'] += wall_time
+            data['cpu_time'] += cpu_time
+            data['bytes'] += bytes_count
+            data['rss_delta_kb'] = max(data['rss_delta_kb'], RunReport.get_current_rss_kb() - start_times[2])
+
+    #---------------
+
+    def add_locus(locus_info, locus_len, fragments_count, start_times):
+        '''
+        Add the data of a locus whose digest started at start_times.
+        '''
+
+        if RunReport.status:
+            (wall_time, cpu_time) = RunReport.get_elapsed_times(start_times)
+            RunReport.loci_list.append({'locus': locus_info, 'length': locus_len, 'fragments': fragments_count, 'wall_time': wall_time, 'cpu_time': cpu_time})
+
+    #---------------
+
+    def get_peak_rss_kb(is_children):
+        '''
+        Get the peak of resident memory in KB of this process or of its finished
+        children processes (0 when the library resource is not available).
+        '''
+
+        try:
+            import resource
+        except:
+            return 0
+        return resource.getrusage(resource.RUSAGE_CHILDREN if is_children else resource.RUSAGE_SELF).ru_maxrss
+
+    #---------------
+
+    def get_current_rss_kb():
+        '''
+        Get the current resident memory in KB of this process (0 when the file
+        /proc/self/statm is not available). The file is kept open because the
+        stages of every locus read it.
+        '''
+
+        pid = os.getpid()
+        if RunReport.statm_pid != pid:
+            RunReport.statm_pid = pid
+            try:
+                RunReport.statm_fd = os.open('/proc/self/statm', os.O_RDONLY)
+                RunReport.page_kb = os.sysconf('SC_PAGE_SIZE') // 1024
+            except:
+                RunReport.statm_fd = None
+        if RunReport.statm_fd is None:
+            return 0
+        return int(os.pread(RunReport.statm_fd, 128, 0).split()[1]) * RunReport.page_kb
+
+    #---------------
+
+    def get_start_times():
+        '''
+        Get the current wall and CPU times.
+        '''
+
+        return (time.perf_counter(), time.process_time()) if RunReport.status else None
+
+    #---------------
+
+    def get_elapsed_times(start_times):
+        '''
+        Get the wall and CPU seconds passed since start_times.
+        '''
+
+        return (time.perf_counter() - start_times[0], time.process_time() - start_times[1])
+
+    #---------------
+
+    def pop_data():
+        '''
+        Get the data of the stages and the loci recorded, and empty them (for
+        example, to send them from a process of a pool to the main one).
+        '''
+
+        data = (RunReport.stages_dict, RunReport.loci_list)
+        RunReport.stages_dict = {}
+        RunReport.loci_list = []
+        return data
+
+    #---------------
+
+    def merge_data(data):
+        '''
+        Add the data of the stages and the loci recorded by other process.
+        '''
+
+        (stages_dict, loci_list) = data
+        for (stage, other_data) in stages_dict.items():
+            data = RunReport.stages_dict.setdefault(stage, {'calls': 0, 'wall_time': 0.0, 'cpu_time': 0.0, 'bytes': 0, 'rss_delta_kb': 0})
+            for key in ['calls', 'wall_time', 'cpu_time', 'bytes']:
+                data[key] += other_data[key]
+            data['rss_delta_kb'] = max(data['rss_delta_kb'], other_data['rss_delta_kb'])
+        RunReport.loci_list.extend(loci_list)
+
+    #---------------
+
+    def write(reportfile, run_dict):
+        '''
+        Write the JSON report with the data of the run, the stages and the loci.
+        '''
+
+        import json
+
+        # add the times and the peaks of resident memory of the run
+        (wall_time, cpu_time) = RunReport.get_elapsed_times(RunReport.run_start_times)
+        report_dict = dict(run_dict)
+        report_dict['wall_time'] = wall_time
+        report_dict['cpu_time'] = cpu_time
+        report_dict['peak_rss_kb'] = RunReport.get_peak_rss_kb(False)
+        report_dict['children_peak_rss_kb'] = RunReport.get_peak_rss_kb(True)
+        report_dict['stages'] = RunReport.stages_dict
+        report_dict['loci'] = RunReport.loci_list
+
+        # write the report
+        try:
+            with open(reportfile, mode='w', encoding='utf-8') as reportfile_id:
+                json.dump(report_dict, reportfile_id, indent=1)
+                reportfile_id.write('\n')
+        except:
+            raise ProgramError('F001', reportfile)
+
+        # show OK message
+        Message.print('info', 'The report {0} with the time and memory of every stage is created.'.format(get_file_name(reportfile)))
+
+    #---------------
+
+#-------------------------------------------------------------------------------
+
+class FragmentsHistogram():
+    '''
+    This class holds the histogram of the fragment lengths and of the lengths
+    of the fragments with Ns. The fragments are counted by their exact length
+    in integer arrays (the longest ones in a dictionary), so the histogram can
+    be gotten with any interval and merged with the ones of other loci.
+    '''
+
+    #---------------
+
+    # the lengths counted in arrays are lower than max_array_len
+    max_array_len = 1048576
+
+    # the count of pending lengths that are added to the arrays together
+    max_pending_count = 1048576
+
+    #---------------
+
+    def __init__(self):
+        '''
+        Initialize an empty histogram.
+        '''
+
+        import numpy as np
+
+        # the fragments lengths and N flags not yet counted
+        self.pending_lens = array.array('q')
+        self.pending_N_flags = array.array('b')
+
+        # the counts of fragments and fragments with Ns of every length
+        self.counts_array = np.zeros(0, dtype=np.int64)
+        self.N_counts_array = np.zeros(0, dtype=np.int64)
+        self.long_counts_dict = {}
+
+    #---------------
+
+    def update(self, fragment_len, N_count):
+        '''
+        Add a fragment to the histogram.
+        '''
+
+        self.pending_lens.append(fragment_len)
+        self.pending_N_flags.append(N_count > 0)
+        if len(self.pending_lens) >= FragmentsHistogram.max_pending_count:
+            self.count_pending()
+
+    #---------------
+
+    def update_arrays(self, fragment_lens_array, N_counts_array):
+        '''
+        Add the fragments of the arrays of lengths and N counts to the histogram.
+        '''
+
+        import numpy as np
+
+        self.pending_lens.frombytes(np.asarray(fragment_lens_array, dtype=np.int64).tobytes())
+        self.pending_N_flags.frombytes((np.asarray(N_counts_array) > 0).astype(np.int8).tobytes())
+        if len(self.pending_lens) >= FragmentsHistogram.max_pending_count:
+            self.count_pending()
+
+    #---------------
+
+    def merge(self, other_histogram):
+        '''
+        Add the fragments of other histogram (for example, the one of a locus
+        digested by another process) to the histogram.
+        '''
+
+        # add the pending fragments of the other histogram
+        self.pending_lens.extend(other_histogram.pending_lens)
+        self.pending_N_flags.extend(other_histogram.pending_N_flags)
+        if len(self.pending_lens) >= FragmentsHistogram.max_pending_count:
+            self.count_pending()
+
+        # add the counted fragments of the other histogram
+        if len(other_histogram.counts_array) > 0:
+            self.resize_arrays(len(other_histogram.counts_array))
+            self.counts_array[:len(other_histogram.counts_array)] += other_histogram.counts_array
+            self.N_counts_array[:len(other_histogram.N_counts_array)] += other_histogram.N_counts_array
+        for (fragment_len, (count, N_count)) in other_histogram.long_counts_dict.items():
+            data = self.long_counts_dict.setdefault(fragment_len, [0, 0])
+            data[0] += count
+            data[1] += N_count
+
+        # return the histogram
+        return self
+
+    #---------------
+
+    def get_lens_arrays(self):
+        '''
+        Get the arrays of lengths and N flags of every fragment of the
+        histogram (for example, to save it in a file), which can be added to
+        another histogram with update_arrays.
+        '''
+
+        import numpy as np
+
+        # get the pending fragments
+        lens_arrays_list = [np.frombuffer(self.pending_lens, dtype=np.int64)]
+        N_flags_arrays_list = [np.frombuffer(self.pending_N_flags, dtype=np.int8) != 0]
+
+        # get the counted fragments of every length (the first ones of each length are those with Ns)
+        counted_lens_array = np.flatnonzero(self.counts_array)
+        counts_array = self.counts_array[counted_lens_array]
+        group_starts_array = np.repeat(np.cumsum(counts_array) - counts_array, counts_array)
+        lens_arrays_list.append(np.repeat(counted_lens_array, counts_array).astype(np.int64))
+        N_flags_arrays_list.append(np.arange(len(group_starts_array)) - group_starts_array < np.repeat(self.N_counts_array[counted_lens_array], counts_array))
+
+        # get the longest fragments
+        for (fragment_len, (count, N_count)) in self.long_counts_dict.items():
+            lens_arrays_list.append(np.full(count, fragment_len, dtype=np.int64))
+            N_flags_arrays_list.append(np.arange(count) < N_count)
+
+        # return the arrays of lengths and N flags
+        return (np.concatenate(lens_arrays_list), np.concatenate(N_flags_arrays_list))
+
+    #---------------
+
+    def count_pending(self):
+        '''
+        Add the pending fragments to the counts of their lengths.
+        '''
+
+        import numpy as np
+
+        if len(self.pending_lens) > 0:
+            self.count_lens(np.frombuffer(self.pending_lens, dtype=np.int64), np.frombuffer(self.pending_N_flags, dtype=np.int8) != 0)
+            self.pending_lens = array.array('q')
+            self.pending_N_flags = array.array('b')
+
+    #---------------
+
+    def count_lens(self, fragment_lens_array, N_flags_array):
+        '''
+        Add the fragments of the arrays of lengths and N flags to the counts of
+        their lengths.
+        '''
+
+        import numpy as np
+
+        # count the fragments whose lengths are counted in the arrays
+        is_short_array = fragment_lens_array < FragmentsHistogram.max_array_len
+        short_lens_array = fragment_lens_array[is_short_array]
+        if len(short_lens_array) > 0:
+            self.resize_arrays(int(short_lens_array.max()) + 1)
+            self.counts_array += np.bincount(short_lens_array, minlength=len(self.counts_array))
+            self.N_counts_array += np.bincount(short_lens_array[N_flags_array[is_short_array]], minlength=len(self.N_counts_array))
+
+        # count the longest fragments in the dictionary
+        for (fragment_len, is_N) in zip(fragment_lens_array[~is_short_array].tolist(), N_flags_array[~is_short_array].tolist()):
+            data = self.long_counts_dict.setdefault(fragment_len, [0, 0])
+            data[0] += 1
+            data[1] += is_N
+
+    #---------------
+
+    def resize_arrays(self, arrays_len):
+        '''
+        Enlarge the count arrays so they have at least arrays_len lengths.
+        '''
+
+        import numpy as np
+
+        if arrays_len > len(self.counts_array):
+            self.counts_array = np.concatenate((self.counts_array, np.zeros(arrays_len - len(self.counts_array), dtype=np.int64)))
+            self.N_counts_array = np.concatenate((self.N_counts_array, np.zeros(arrays_len - len(self.N_counts_array), dtype=np.int64)))
+
+    #---------------
+
+    def get_intervals_list(self, fragstinterval):
+        '''
+        Get the sorted list of intervals of fragstinterval nucleotides with
+        fragments as tuples (first_value, last_value, count, count_N). The
+        fragments of length 0 are in the interval ending in 0.
+        '''
+
+        import numpy as np
+
+        # add the pending fragments to the counts
+        self.count_pending()
+
+        # get the counts of each interval with fragments from the counts of every length (the length 0 is in the interval -1)
+        intervals_dict = {}
+        if len(self.counts_array) > 0 and self.counts_array[0] > 0:
+            intervals_dict[-1] = [int(self.counts_array[0]), int(self.N_counts_array[0])]
+        if len(self.counts_array) > 1:
+            intervals_count = (len(self.counts_array) - 2) // fragstinterval + 1
+            padding_array = np.zeros(intervals_count * fragstinterval - (len(self.counts_array) - 1), dtype=np.int64)
+            interval_counts_array = np.concatenate((self.counts_array[1:], padding_array)).reshape(intervals_count, fragstinterval).sum(axis=1)
+            interval_N_counts_array = np.concatenate((self.N_counts_array[1:], padding_array)).reshape(intervals_count, fragstinterval).sum(axis=1)
+            for interval in np.flatnonzero(interval_counts_array).tolist():
+                intervals_dict[interval] = [int(interval_counts_array[interval]), int(interval_N_counts_array[interval])]
+        for (fragment_len, (count, N_count)) in self.long_counts_dict.items():
+            data = intervals_dict.setdefault((fragment_len - 1) // fragstinterval, [0, 0])
+            data[0] += count
+            data[1] += N_count
+
+        # return the intervals list
+        return [(interval * fragstinterval + 1, (interval + 1) * fragstinterval, count, N_count) for (interval, (count, N_count)) in sorted(intervals_dict.items())]
+
+    #---------------
+
+#-------------------------------------------------------------------------------
+
+class FragmentRecord():
+    '''
+    This class holds a fragment of a digest: the index and the head of its
+    locus, its strand, the start and end positions of its FASTA head, its
+    length and its GC rate (with two decimals, as in the fragments file). The
+    fragment keeps the segment of the locus sequence where it is, so its
+    sequence and its N count are only got when they are used.
+    '''
+
+    #---------------
+
+    __slots__ = ('contig_index', 'contig_info', 'strand', 'start', 'end', 'length', 'GC_rate', 'locus_seq', 'seq_start')
+
+    #---------------
+
+    def __init__(self, contig_index, contig_info, strand, start, end, length, GC_rate, locus_seq, seq_start):
+        '''
+        Initialize the fragment, whose Watson strand nucleotides are
+        locus_seq[seq_start:seq_start + length].
+        '''
+
+        self.contig_index = contig_index
+        self.contig_info = contig_info
+        self.strand = strand
+        self.start = start
+        self.end = end
+        self.length = length
+        self.GC_rate = GC_rate
+        self.locus_seq = locus_seq
+        self.seq_start = seq_start
+
+    #---------------
+
+    @property
+    def seq(self):
+        '''
+        Get the sequence of the fragment (the reverse complementary sequence of
+        its segment when the strand is the Crick one).
+        '''
+
+        seq = self.locus_seq[self.seq_start:self.seq_start + self.length].decode('iso-8859-1')
+        return seq if self.strand == '+' else get_reverse_complementary_sequence(seq)
+
+    #---------------
+
+    @property
+    def N_count(self):
+        '''
+        Get the count of nucleotides of the fragment that are not A, C, G or T.
+        '''
+
+        segment = self.locus_seq[self.seq_start:self.seq_start + self.length]
+        return self.length - segment.count(b'A') - segment.count(b'C') - segment.count(b'G') - segment.count(b'T')
+
+    #---------------
+
+    def __repr__(self):
+        '''
+        Get the representation of the fragment without its sequence.
+        '''
+
+        return 'FragmentRecord(contig_index={0}, strand={1!r}, start={2}, end={3}, length={4}, GC_rate={5:3.2f})'.format(self.contig_index, self.strand, self.start, self.end, self.length, self.GC_rate)
+
+    #---------------
+
+#-------------------------------------------------------------------------------
+
+class SequenceWindow():
+    '''
+    This class holds the last nucleotides read of a locus when the genome is
+    scanned in blocks and the positions of the nucleotide codes no standard,
+    so the sequence and the N count of a recent fragment can be gotten without
+    loading the whole locus in memory.
+    '''
+
+    #---------------
+
+    N_pattern = re.compile(r'[^ACGT]+')
+
+    #---------------
+
+    def __init__(self, keep_len):
+        '''
+        Initialize the window of a locus keeping at least keep_len nucleotides
+        before the last block appended.
+        '''
+
+        self.keep_len = keep_len
+        self.head_seq = ''
+        self.start = 0
+        self.seq = ''
+        self.N_starts_list = []
+        self.N_ends_list = []
+        self.N_counts_list = []
+        self.N_count = 0
+        self.pruned_N_count = 0
+
+    #---------------
+
+    def append(self, block_seq):
+        '''
+        Append a block of the locus removing the nucleotides not longer needed.
+        '''
+
+        # keep the first nucleotides of the locus
+        if len(self.head_seq) < self.keep_len:
+            self.head_seq = (self.head_seq + block_seq)[:self.keep_len]
+
+        # remove the nucleotides previous to the kept ones
+        cut_len = len(self.seq) - self.keep_len
+        if cut_len > 0:
+            self.start += cut_len
+            self.seq = self.seq[cut_len:]
+
+        # save the runs of nucleotide codes no standard of the block
+        end = self.start + len(self.seq)
+        for mo in SequenceWindow.N_pattern.finditer(block_seq):
+            self.N_starts_list.append(end + mo.start())
+            self.N_ends_list.append(end + mo.end())
+            self.N_counts_list.append(self.N_count)
+            self.N_count += mo.end() - mo.start()
+
+        # remove the runs previous to the kept nucleotides
+        i = bisect.bisect_right(self.N_ends_list, self.start)
+        if i > 0:
+            self.pruned_N_count = self.N_counts_list[i - 1] + self.N_ends_list[i - 1] - self.N_starts_list[i - 1]
+            del self.N_starts_list[:i]
+            del self.N_ends_list[:i]
+            del self.N_counts_list[:i]
+
+        # append the block
+        self.seq += block_seq
+
+    #---------------
+
+    def get_end(self):
+        '''
+        Get the position following the last nucleotide read.
+        '''
+
+        return self.start + len(self.seq)
+
+    #---------------
+
+    def get_seq(self, start, end):
+        '''
+        Get the sequence between two positions of the locus (start must be
+        a position kept in the window).
+        '''
+
+        if start < self.start:
+            return self.head_seq[start:end]
+        return self.seq[(start - self.start):(end - self.start)]
+
+    #---------------
+
+    def get_N_count(self, position):
+        '''
+        Get the count of nucleotide codes no standard from the locus start to
+        a position (position must not be previous to the window start unless
+        it is one of the first nucleotides of the locus).
+        '''
+
+        # if the position is previous to the window, count in the first nucleotides
+        if position < self.start:
+            seq = self.head_seq[:position]
+            return len(seq) - seq.count('A') - seq.count('C') - seq.count('G') - seq.count('T')
+
+        # search the last run started before the position
+        i = bisect.bisect_left(self.N_starts_list, position) - 1
+        if i < 0:
+            return self.pruned_N_count
+        return self.N_counts_list[i] + min(position, self.N_ends_list[i]) - self.N_starts_list[i]
+
+    #---------------
+
+#-------------------------------------------------------------------------------
+
+class GenomeStore():
+    '''
+    This class gives access to the loci of a genome store mapping it in memory,
+    so the loci are not read nor copied until their nucleotides are used.
+    '''
+
+    #---------------
+
+    def __init__(self, storefile):
+        '''
+        Open the genome store and read its index.
+        '''
+
+        # get the index file
+        indexfile = get_genome_store_index_file(storefile)
+
+        # read the locus data of the index (length, offset and head)
+        self.loci_list = []
+        try:
+            with open(indexfile, mode='r', encoding='iso-8859-1') as indexfile_id:
+                for record in indexfile_id:
+                    if not record.startswith('#'):
+                        (locus_len, offset, locus_info) = record.rstrip('\n').split('\t', 2)
+                        self.loci_list.append((locus_info, int(offset), int(locus_len)))
+        except:
+            raise ProgramError('F002', indexfile)
+
+        # map the nucleotides in memory
+        try:
+            self.storefile_id = open(storefile, mode='rb')
+        except:
+            raise ProgramError('F002', storefile)
+        if os.path.getsize(storefile) > 0:
+            self.seq = mmap.mmap(self.storefile_id.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self.seq = b''
+
+    #---------------
+
+    def get_loci_list(self):
+        '''
+        Get the list of loci as tuples (locus_info, offset, length), where the
+        offset is the position of the first nucleotide of the locus in seq.
+        '''
+
+        return self.loci_list
+
+    #---------------
+
+    def close(self):
+        '''
+        Close the genome store.
+        '''
+
+        if isinstance(self.seq, mmap.mmap):
+            self.seq.close()
+        self.storefile_id.close()
+
+    #---------------
+
+#-------------------------------------------------------------------------------
+
+class GCNIndex():
+    '''
+    This class gets the GC rate and the N count of segments of a genome store
+    from the cumulative counts of GC and GCAT nucleotides saved in its GC and
+    N index, instead of walking every nucleotide of the segments.
+    '''
+
+    # the cumulative counts are saved every step nucleotides
+    step = 256
+
+    # the lookup arrays of the GC and the GCAT nucleotides (they are built when they are first used)
+    lookup_arrays = None
+
+    #---------------
+
+    def __init__(self, storefile):
+        '''
+        Map the genome store and its GC and N index.
+        '''
+
+        import numpy as np
+
+        # get the GC and N index file
+        indexfile = get_GC_N_index_file(storefile)
+
+        # map the nucleotides of the genome store
+        self.seq_array = GCNIndex.map_store(storefile)
+
+        # map the cumulative counts of GC and GCAT nucleotides
+        try:
+            (self.GC_cumulative_array, self.GCAT_cumulative_array) = np.load(indexfile, mmap_mode='r')
+        except:
+            raise ProgramError('F002', indexfile)
+
+    #---------------
+
+    @staticmethod
+    def get_lookup_arrays():
+        '''
+        Get the lookup arrays of the GC and the GCAT nucleotides.
+        '''
+
+        import numpy as np
+
+        if GCNIndex.lookup_arrays is None:
+            GC_lookup_array = np.zeros(256, dtype=np.uint8)
+            GC_lookup_array[list(b'CG')] = 1
+            GCAT_lookup_array = np.zeros(256, dtype=np.uint8)
+            GCAT_lookup_array[list(b'ACGT')] = 1
+            GCNIndex.lookup_arrays = (GC_lookup_array, GCAT_lookup_array)
+        return GCNIndex.lookup_arrays
+
+    #---------------
+
+    @staticmethod
+    def map_store(storefile):
+        '''
+        Map the nucleotides of a genome store in a read only array.
+        '''
+
+        import numpy as np
+
+        try:
+            if os.path.getsize(storefile) > 0:
+                return np.memmap(storefile, dtype=np.uint8, mode='r')
+            else:
+                return np.zeros(0, dtype=np.uint8)
+        except:
+            raise ProgramError('F002', storefile)
+
+    #---------------
+
+    def get_cumulative_counts(self, position):
+        '''
+        Get the counts of GC and GCAT nucleotides of the store before a position.
+        '''
+
+        # get the counts saved at the previous multiple of step and add the ones of the remaining nucleotides
+        (GC_lookup_array, GCAT_lookup_array) = GCNIndex.get_lookup_arrays()
+        i = position // GCNIndex.step
+        remaining_array = self.seq_array[i * GCNIndex.step:position]
+        GC_count = int(self.GC_cumulative_array[i]) + int(GC_lookup_array[remaining_array].sum())
+        GCAT_count = int(self.GCAT_cumulative_array[i]) + int(GCAT_lookup_array[remaining_array].sum())
+
+        # return the counts
+        return (GC_count, GCAT_count)
+
+    #---------------
+
+    def get_GC_N_data(self, start, end):
+        '''
+        Get the GC rate and the N count of the segment [start, end) of the store.
+        '''
+
+        # get the GC and GCAT counts of the segment
+        (start_GC_count, start_GCAT_count) = self.get_cumulative_counts(start)
+        (end_GC_count, end_GCAT_count) = self.get_cumulative_counts(end)
+        GC_count = end_GC_count - start_GC_count
+        GCAT_count = end_GCAT_count - start_GCAT_count
+
+        # calculate the GC rate and the N count
+        GC_rate = GC_count / GCAT_count if GCAT_count != 0 else 0
+        N_count = end - start - GCAT_count
+
+        # return the GC rate and the N count
+        return (GC_rate, N_count)
+
+    #---------------
+
+    def get_cumulative_counts_arrays(self, positions_array):
+        '''
+        Get the arrays of counts of GC and GCAT nucleotides of the store before
+        every position of an array.
+        '''
+
+        import numpy as np
+
+        # get the multiples of step previous to the positions and the count of the remaining nucleotides
+        steps_array = positions_array // GCNIndex.step
+        remaining_lens_array = positions_array - steps_array * GCNIndex.step
+
+        # gather the remaining nucleotides of all positions and get their cumulative counts
+        remaining_ends_array = np.cumsum(remaining_lens_array)
+        remaining_starts_array = remaining_ends_array - remaining_lens_array
+        gathered_positions_array = np.arange(remaining_ends_array[-1] if len(remaining_ends_array) > 0 else 0, dtype=np.int64) + np.repeat(steps_array * GCNIndex.step - remaining_starts_array, remaining_lens_array)
+        (GC_lookup_array, GCAT_lookup_array) = GCNIndex.get_lookup_arrays()
+        gathered_array = self.seq_array[gathered_positions_array]
+        GC_remaining_array = np.concatenate(([0], np.cumsum(GC_lookup_array[gathered_array], dtype=np.int64)))
+        GCAT_remaining_array = np.concatenate(([0], np.cumsum(GCAT_lookup_array[gathered_array], dtype=np.int64)))
+
+        # add the counts saved at the multiples of step and the ones of the remaining nucleotides
+        GC_counts_array = self.GC_cumulative_array[steps_array] + GC_remaining_array[remaining_ends_array] - GC_remaining_array[remaining_starts_array]
+        GCAT_counts_array = self.GCAT_cumulative_array[steps_array] + GCAT_remaining_array[remaining_ends_array] - GCAT_remaining_array[remaining_starts_array]
+
+        # return the arrays of counts
+        return (GC_counts_array, GCAT_counts_array)
+
+    #---------------
+
+    def get_GC_N_arrays(self, starts_array, ends_array):
+        '''
+        Get the arrays of GC rates and N counts of the segments of the store
+        given by the arrays of their starts and ends.
+        '''
+
+        import numpy as np
+
+        # get the GC and GCAT counts of the segments
+        (GC_counts_array, GCAT_counts_array) = self.get_cumulative_counts_arrays(np.concatenate((starts_array, ends_array)).astype(np.int64))
+        GC_counts_array = GC_counts_array[len(starts_array):] - GC_counts_array[:len(starts_array)]
+        GCAT_counts_array = GCAT_counts_array[len(starts_array):] - GCAT_counts_array[:len(starts_array)]
+
+        # calculate the GC rates and the N counts
+        GC_rates_array = np.where(GCAT_counts_array != 0, GC_counts_array / np.maximum(GCAT_counts_array, 1), 0.0)
+        N_counts_array = np.asarray(ends_array, dtype=np.int64) - np.asarray(starts_array, dtype=np.int64) - GCAT_counts_array
+
+        # return the arrays
+        return (GC_rates_array, N_counts_array)
+
+    #---------------
+
+#-------------------------------------------------------------------------------
+
+class BgzfGenome():
+    '''
+    This class gives random access to the loci of a genome file in FASTA
+    format compressed in BGZF format. It uses an index of the blocks (.gzi,
+    with the same format as the one of bgzip) and an index of the loci (.loci,
+    with the offsets of the sequence of every locus in the uncompressed file),
+    so a locus is read decompressing only its blocks and several processes
+    can read their loci at the same time.
+    '''
+
+    #---------------
+
+    def __init__(self, genfile):
+        '''
+        Open the genome file and read its indexes, building them before when
+        they do not exist or the genome file has changed.
+        '''
+
+        self.genfile = genfile
+        self.gzifile = genfile + '.gzi'
+        self.locifile = genfile + '.loci'
+
+        # read the indexes or build them
+        if not self.read_indexes():
+            self.build_indexes()
+
+        # open the genome file
+        try:
+            self.genfile_id = open(genfile, mode='rb')
+        except:
+            raise ProgramError('F002', genfile)
+
+    #---------------
+
+    def read_indexes(self):
+        '''
+        Read the indexes when they exist and they have been built from the
+        current genome file.
+        '''
+
+        import numpy as np
+
+        # the indexes have to exist
+        if not os.path.isfile(self.gzifile) or not os.path.isfile(self.locifile):
+            return False
+
+        # read the index of the loci verifying the signature of the genome file
+        self.loci_list = []
+        try:
+            with open(self.locifile, mode='r', encoding='iso-8859-1') as locifile_id:
+                if locifile_id.readline().rstrip('\n') != '#{0}'.format(get_genome_signature(self.genfile)):
+                    return False
+                for record in locifile_id:
+                    (seq_start, seq_end, locus_info) = record.rstrip('\n').split('\t', 2)
+                    self.loci_list.append((locus_info, int(seq_start), int(seq_end)))
+        except:
+            raise ProgramError('F002', self.locifile)
+
+        # read the index of the blocks (the first block is not saved)
+        try:
+            with open(self.gzifile, mode='rb') as gzifile_id:
+                data = gzifile_id.read()
+        except:
+            raise ProgramError('F002', self.gzifile)
+        offsets_array = np.frombuffer(data, dtype='<u8', offset=8).reshape(-1, 2)
+        self.compressed_offsets_list = [0] + offsets_array[:, 0].tolist()
+        self.uncompressed_offsets_list = [0] + offsets_array[:, 1].tolist()
+
+        # return the indexes are read
+        return True
+
+    #---------------
+
+    def build_indexes(self):
+        '''
+        Build the indexes of the blocks and the loci decompressing the genome
+        file once, and save them when the directory can be written.
+        '''
+
+        # initialize the indexes
+        self.loci_list = []
+        self.compressed_offsets_list = []
+        self.uncompressed_offsets_list = []
+
+        # initialize the offsets, the data of the locus and the head being read
+        compressed_offset = 0
+        uncompressed_offset = 0
+        locus_info = None
+        seq_start = 0
+        head_list = None
+        previous_byte = b'\n'
+
+        # for every block of the genome file
+        try:
+            genfile_id = open(self.genfile, mode='rb')
+        except:
+            raise ProgramError('F002', self.genfile)
+        for (block_size, data) in BgzfGenome.read_blocks(genfile_id, self.genfile):
+
+            # save the block offsets
+            self.compressed_offsets_list.append(compressed_offset)
+            self.uncompressed_offsets_list.append(uncompressed_offset)
+
+            # the file has to start with a head record
+            if uncompressed_offset == 0 and data != b'' and data[:1] != b'>':
+                raise ProgramError('F003', self.genfile, 'FASTA')
+
+            # complete the head started in a previous block
+            position = 0
+            if head_list is not None:
+                i = data.find(b'\n')
+                if i == -1:
+                    head_list.append(data)
+                    position = len(data)
+                else:
+                    head_list.append(data[:i])
+                    locus_info = b''.join(head_list).decode('iso-8859-1').rstrip('\r')
+                    seq_start = uncompressed_offset + i + 1
+                    head_list = None
+                    position = i + 1
+
+            # search the head records of the block (a '>' at the start of a line)
+            while head_list is None:
+                j = data.find(b'>', position)
+                if j == -1:
+                    break
+                if (data[j - 1:j] if j > 0 else previous_byte) != b'\n':
+                    position = j + 1
+                    continue
+
+                # save the previous locus
+                if locus_info is not None:
+                    self.loci_list.append((locus_info, seq_start, uncompressed_offset + j))
+                locus_info = None
+
+                # get the head
+                i = data.find(b'\n', j)
+                if i == -1:
+                    head_list = [data[j + 1:]]
+                else:
+                    locus_info = data[j + 1:i].decode('iso-8859-1').rstrip('\r')
+                    seq_start = uncompressed_offset + i + 1
+                    position = i + 1
+
+            # update the offsets
+            if data != b'':
+                previous_byte = data[-1:]
+            compressed_offset += block_size
+            uncompressed_offset += len(data)
+
+        genfile_id.close()
+
+        # save the last locus
+        if head_list is not None:
+            locus_info = b''.join(head_list).decode('iso-8859-1').rstrip('\r')
+            seq_start = uncompressed_offset
+        if locus_info is not None:
+            self.loci_list.append((locus_info, seq_start, uncompressed_offset))
+
+        # save the indexes (the first block is not saved in the index of the blocks)
+        try:
+            with open(self.gzifile, mode='wb') as gzifile_id:
+                gzifile_id.write(struct.pack('<Q', len(self.compressed_offsets_list) - 1))
+                for (compressed_offset, uncompressed_offset) in zip(self.compressed_offsets_list[1:], self.uncompressed_offsets_list[1:]):
+                    gzifile_id.write(struct.pack('<QQ', compressed_offset, uncompressed_offset))
+            with open(self.locifile, mode='w', encoding='iso-8859-1') as locifile_id:
+                locifile_id.write('#{0}\n'.format(get_genome_signature(self.genfile)))
+                for (locus_info, seq_start, seq_end) in self.loci_list:
+                    locifile_id.write('{0}\t{1}\t{2}\n'.format(seq_start, seq_end, locus_info))
+        except:
+            Message.print('info', 'The indexes of {0} can not be saved, so they will be built again.'.format(get_file_name(self.genfile)))
+        else:
+            Message.print('info', 'The indexes of {0} are built.'.format(get_file_name(self.genfile)))
+
+    #---------------
+
+    @staticmethod
+    def read_blocks(file_id, file):
+        '''
+        Read the blocks of a BGZF file from the current position. It yields
+        tuples (block_size, data) with the uncompressed data of every block.
+        '''
+
+        while True:
+
+            # read the header and get the block size
+            header = file_id.read(18)
+            if len(header) < 18:
+                break
+            if header[:4] != b'\x1f\x8b\x08\x04' or header[12:14] != b'BC':
+                raise ProgramError('F003', file, 'BGZF')
+            block_size = struct.unpack('<H', header[16:18])[0] + 1
+
+            # decompress the data (the footer has the CRC32 and the uncompressed size)
+            compressed_data = file_id.read(block_size - 18)
+            try:
+                data = zlib.decompress(compressed_data[:-8], -15)
+            except:
+                raise ProgramError('F003', file, 'BGZF')
+
+            yield (block_size, data)
+
+    #---------------
+
+    def get_loci_list(self):
+        '''
+        Get the list of loci as tuples (locus_info, seq_start, seq_end), where
+        the sequence of the locus is between seq_start and seq_end in the
+        uncompressed file.
+        '''
+
+        return self.loci_list
+
+    #---------------
+
+    def get_locus_seq(self, seq_start, seq_end):
+        '''
+        Get the nucleotides of a locus in uppercase as bytes decompressing
+        only the blocks where it is.
+        '''
+
+        # search the block where the locus starts
+        i = bisect.bisect_right(self.uncompressed_offsets_list, seq_start) - 1
+        self.genfile_id.seek(self.compressed_offsets_list[i])
+
+        # decompress the blocks until the locus end
+        data_list = []
+        uncompressed_offset = self.uncompressed_offsets_list[i]
+        first_offset = uncompressed_offset
+        if uncompressed_offset < seq_end:
+            for (block_size, data) in BgzfGenome.read_blocks(self.genfile_id, self.genfile):
+                data_list.append(data)
+                uncompressed_offset += len(data)
+                if uncompressed_offset >= seq_end:
+                    break
+        data = b''.join(data_list)[seq_start - first_offset:seq_end - first_offset]
+
+        # remove the blank characters of both line ends
+        locus_seq = ''.join([line.strip() for line in data.decode('iso-8859-1').split('\n')]).upper()
+
+        # return the locus nucleotides
+        return locus_seq.encode('iso-8859-1', errors='replace')
+
+    #---------------
+
+    def close(self):
+        '''
+        Close the genome file.
+        '''
+
+        self.genfile_id.close()
+
+    #---------------
+
+#-------------------------------------------------------------------------------
+
+def save_cache_entry(entry_file, entry_data, is_compressed):
+    '''
+    Save the arrays of the dictionary entry_data in the NumPy file (.npz) of a
+    cache entry (compressed when is_compressed is True) through a temporal file
+    of this process, which then replaces the entry, so a broken entry is never
+    read.
+    '''
+
+    import numpy as np
+
+    # write the temporal file and replace the entry
+    temporal_file = '{0}.{1}.tmp'.format(entry_file, os.getpid())
+    try:
+        with open(temporal_file, mode='wb') as entry_file_id:
+            if is_compressed:
+                np.savez_compressed(entry_file_id, **entry_data)
+            else:
+                np.savez(entry_file_id, **entry_data)
+        os.replace(temporal_file, entry_file)
+    except:
+        raise ProgramError('F001', entry_file)
+
+#-------------------------------------------------------------------------------
+
+def load_cache_entry(entry_file, key_array):
+    '''
+    Get a dictionary with the arrays of the NumPy file (.npz) of a cache entry
+    or None when the entry does not exist, it can not be read or its array key
+    is not key_array. The arrays are read as plain data (no object is
+    unpickled), so a cache directory that is shared or tampered with can not
+    run code.
+    '''
+
+    import numpy as np
+
+    # the entry has to exist
+    if not os.path.isfile(entry_file):
+        return None
+
+    # read the arrays of the entry and check its key
+    try:
+        with np.load(entry_file, allow_pickle=False) as entry_npz:
+            entry_data = {name: entry_npz[name] for name in entry_npz.files}
+    except:
+        return None
+    if 'key' not in entry_data or not np.array_equal(entry_data['key'], key_array):
+        return None
+
+    # return the arrays of the entry
+    return entry_data
+
+#-------------------------------------------------------------------------------
+
+class RestrictionSiteCache():
+    '''
+    This class manages a directory with the positions of the restriction sites
+    found in the loci of genomes, so they are not searched again in later runs
+    with the same genome and restriction sites. Every entry is keyed by the
+    checksum of the genome content and the restriction site sequences
+    searched, so it is not used when the genome changes, and the least
+    recently used entries are removed when the directory size exceeds its
+    limit.
+    '''
+
+    #---------------
+
+    def __init__(self, cachedir, cachesize):
+        '''
+        Open the cache directory (it is created when it does not exist) with a
+        size limit in MB.
+        '''
+
+        self.cachedir = cachedir
+        self.cachesize = cachesize * 1048576
+
+        # create the cache directory
+        if not os.path.isdir(cachedir):
+            try:
+                os.makedirs(cachedir)
+            except:
+                raise ProgramError('F001', cachedir)
+
+    #---------------
+
+    def get_genome_checksum(self, genfile):
+        '''
+        Get the checksum of the content of a genome file. The checksums are
+        saved with the signature of the genome file, so the file is read again
+        only when it has changed.
+        '''
+
+        import hashlib
+
+        # get the genome file path and signature
+        genfile_path = os.path.abspath(genfile)
+        signature = get_genome_signature(genfile)
+
+        # read the saved checksums
+        checksums_file = os.path.join(self.cachedir, 'genomes.txt')
+        checksums_dict = {}
+        if os.path.isfile(checksums_file):
+            try:
+                with open(checksums_file, mode='r', encoding='utf-8') as checksums_file_id:
+                    for record in checksums_file_id:
+                        (path, path_signature, checksum) = record.rstrip('\n').split('\t')
+                        checksums_dict[path] = (path_signature, checksum)
+            except:
+                raise ProgramError('F002', checksums_file)
+
+        # return the saved checksum when the genome file has not changed
+        if checksums_dict.get(genfile_path, ('', ''))[0] == signature:
+            return checksums_dict[genfile_path][1]
+
+        # calculate the checksum of the genome file content
+        hash_object = hashlib.sha1()
+        try:
+            with open(genfile, mode='rb') as genfile_id:
+                for chunk in iter(lambda: genfile_id.read(4194304), b''):
+                    hash_object.update(chunk)
+        except:
+            raise ProgramError('F002', genfile)
+        checksum = hash_object.hexdigest()
+
+        # save the checksum
+        checksums_dict[genfile_path] = (signature, checksum)
+        try:
+            with open(checksums_file, mode='w', encoding='utf-8') as checksums_file_id:
+                for (path, (path_signature, path_checksum)) in checksums_dict.items():
+                    checksums_file_id.write('{0}\t{1}\t{2}\n'.format(path, path_signature, path_checksum))
+        except:
+            raise ProgramError('F001', checksums_file)
+
+        # return the checksum
+        return checksum
+
+    #---------------
+
+    def get_entry_file(self, genfile, ressite_seq_lists):
+        '''
+        Get the file of the entry with the positions of the restriction sites
+        whose sequences are in ressite_seq_lists.
+        '''
+
+        import hashlib
+
+        # build the key from the genome checksum and the sequences searched
+        hash_object = hashlib.sha1(self.get_genome_checksum(genfile).encode('utf-8'))
+        for seq_list in ressite_seq_lists:
+            hash_object.update(('|' + ','.join(sorted(seq_list))).encode('utf-8'))
+
+        # return the entry file
+        return os.path.join(self.cachedir, 'sites-{0}.npz'.format(hash_object.hexdigest()))
+
+    #---------------
+
+    def get_entry_key(self, entry_file):
+        '''
+        Get the key saved in the header of an entry, which is checked when the
+        entry is read.
+        '''
+
+        import numpy as np
+
+        return np.frombuffer(os.path.basename(entry_file).encode('utf-8'), dtype=np.uint8)
+
+    #---------------
+
+    def load(self, entry_file):
+        '''
+        Get the list of the positions of the restriction sites of every locus
+        saved in an entry (a tuple of arrays, one per sequence list, by locus)
+        or None when the entry does not exist or its key is not the one of the
+        entry file.
+        '''
+
+        import numpy as np
+
+        # read the arrays of the entry
+        entry_data = load_cache_entry(entry_file, self.get_entry_key(entry_file))
+        if entry_data is None:
+            return None
+        try:
+            lists_count = int(entry_data['lists_count'])
+            counts_arrays = [entry_data['counts_{0}'.format(k)] for k in range(lists_count)]
+            positions_arrays = [np.cumsum(entry_data['deltas_{0}'.format(k)]) for k in range(lists_count)]
+        except:
+            return None
+
+        # split the positions by locus
+        loci_positions_list = []
+        if len(counts_arrays[0]) > 0:
+            loci_positions_list = list(zip(*[np.split(positions_arrays[k], np.cumsum(counts_arrays[k])[:-1]) for k in range(lists_count)]))
+
+        # mark the entry as recently used
+        os.utime(entry_file)
+
+        # return the positions of every locus
+        return loci_positions_list
+
+    #---------------
+
+    def save(self, entry_file, loci_positions_list, lists_count):
+        '''
+        Save the positions of the restriction sites of every locus in an entry
+        and remove the least recently used entries over the size limit.
+        '''
+
+        import numpy as np
+
+        # build the arrays of the entry: the count of positions of every locus and the differences between consecutive positions
+        entry_data = {'key': self.get_entry_key(entry_file), 'lists_count': np.array(lists_count)}
+        for k in range(lists_count):
+            locus_positions_arrays = [np.asarray(locus_positions[k], dtype=np.int64) for locus_positions in loci_positions_list]
+            positions_array = np.concatenate(locus_positions_arrays) if locus_positions_arrays else np.zeros(0, dtype=np.int64)
+            entry_data['counts_{0}'.format(k)] = np.array([len(array) for array in locus_positions_arrays], dtype=np.int64)
+            entry_data['deltas_{0}'.format(k)] = np.diff(positions_array, prepend=0)
+
+        # save the entry
+        save_cache_entry(entry_file, entry_data, True)
+
+        # remove the least recently used entries while the cache size exceeds the limit
+        entries_list = sorted([(os.path.getmtime(path), os.path.getsize(path), path) for path in [os.path.join(self.cachedir, name) for name in os.listdir(self.cachedir) if name.startswith('sites-') and name.endswith('.npz')]])
+        cache_size = sum([entry[1] for entry in entries_list])
+        for (mtime, size, path) in entries_list:
+            if cache_size <= self.cachesize or path == entry_file:
+                break
+            os.remove(path)
+            cache_size -= size
+
+    #---------------
+
+#-------------------------------------------------------------------------------
+
+class LocusFragmentsCache():
+    '''
+    This class manages a directory with the fragments and the partial
+    statistics of the loci digested in previous runs, so only the new or
+    changed loci of an updated genome are digested again. Every entry is keyed
+    by the checksum of the locus content and the digest parameters, so it is
+    used whatever the locus name or position is. A manifest with the length,
+    the checksum and the head of every locus is kept for each genome file: the
+    entries of the loci that are no longer in the genome are removed when it is
+    updated, and the least recently used entries are removed when the
+    directory size exceeds its limit.
+    '''
+
+    #---------------
+
+    def __init__(self, cachedir, cachesize, parameters_list):
+        '''
+        Open the cache directory (it is created when it does not exist) with a
+        size limit in MB for the digest with the parameters of parameters_list.
+        '''
+
+        import hashlib
+
+        self.cachedir = cachedir
+        self.cachesize = cachesize * 1048576
+        self.parameters_key = hashlib.sha1(repr(parameters_list).encode('utf-8')).hexdigest()
+
+        # create the cache directory
+        if not os.path.isdir(cachedir):
+            try:
+                os.makedirs(cachedir)
+            except:
+                raise ProgramError('F001', cachedir)
+
+    #---------------
+
+    def get_locus_checksum(self, locus_seq, locus_start, locus_end):
+        '''
+        Get the checksum of the nucleotides locus_seq[locus_start:locus_end]
+        (locus_seq can be a genome store mapped in memory, which is not copied).
+        '''
+
+        import hashlib
+
+        with memoryview(locus_seq) as seq_view, seq_view[locus_start:locus_end] as locus_view:
+            return hashlib.sha1(locus_view).hexdigest()
+
+    #---------------
+
+    def get_entry_file(self, checksum):
+        '''
+        Get the file of the entry of the locus whose checksum is checksum.
+        '''
+
+        return os.path.join(self.cachedir, 'locus-{0}-{1}.npz'.format(self.parameters_key[:16], checksum))
+
+    #---------------
+
+    def get_entry_key(self, checksum):
+        '''
+        Get the key saved in the header of the entry of the locus whose
+        checksum is checksum, which is checked when the entry is read.
+        '''
+
+        import numpy as np
+
+        return np.frombuffer('{0}-{1}'.format(self.parameters_key, checksum).encode('utf-8'), dtype=np.uint8)
+
+    #---------------
+
+    def load(self, checksum, locus_info):
+        '''
+        Get the locus data saved in the entry of the locus whose checksum is
+        checksum with its head changed to locus_info, or None when the entry
+        does not exist or its key is not the one of the locus.
+        '''
+
+        import numpy as np
+
+        # read the arrays of the entry
+        entry_file = self.get_entry_file(checksum)
+        entry_data = load_cache_entry(entry_file, self.get_entry_key(checksum))
+        if entry_data is None:
+            return None
+        try:
+            (locus_len, fragments_count, is_seq, is_fragments_table) = entry_data['header'].tolist()
+            fragment_lens_list = entry_data['fragment_lens'].tolist()
+            GC_rates_list = entry_data['GC_rates'].tolist()
+            strands_list = entry_data['strands'].tolist()
+            starts_list = entry_data['starts'].tolist()
+            ends_list = entry_data['ends'].tolist()
+            seqs_bytes = entry_data['seqs'].tobytes()
+            seq_ends_list = np.cumsum(entry_data['seq_lens']).tolist()
+            histogram_lens_array = entry_data['histogram_lens']
+            histogram_N_flags_array = entry_data['histogram_N_flags']
+            GC_distribution_dict = dict(zip(entry_data['GC_distribution_rates'].tolist(), entry_data['GC_distribution_counts'].tolist()))
+            table_arrays = (entry_data['table_lengths'], entry_data['table_GC_rates'], entry_data['table_N_counts'])
+            positions_counts_array = entry_data['positions_counts']
+            positions_array = entry_data['positions']
+        except:
+            return None
+
+        # rebuild the fragments list
+        seq_starts_list = [0] + seq_ends_list[:-1]
+        seqs_list = [seqs_bytes[seq_start:seq_end].decode('iso-8859-1') for (seq_start, seq_end) in zip(seq_starts_list, seq_ends_list)] if is_seq else [None] * len(fragment_lens_list)
+        fragments_list = list(zip(fragment_lens_list, GC_rates_list, strands_list, starts_list, ends_list, seqs_list))
+
+        # rebuild the fragments histogram, the fragments table and the positions of the restriction sites
+        fragments_histogram = FragmentsHistogram()
+        fragments_histogram.update_arrays(histogram_lens_array, histogram_N_flags_array)
+        fragments_table = None
+        if is_fragments_table:
+            fragments_table = create_fragments_table()
+            fragments_table = update_fragments_table_arrays(fragments_table, *table_arrays)
+        positions = tuple([positions.tolist() for positions in np.split(positions_array, np.cumsum(positions_counts_array)[:-1])])
+
+        # mark the entry as recently used
+        os.utime(entry_file)
+
+        # return the locus data with the current head
+        return (locus_info, locus_len, fragments_list, fragments_count, fragments_histogram, GC_distribution_dict, fragments_table, positions)
+
+    #---------------
+
+    def save(self, checksum, locus_data):
+        '''
+        Save the locus data in the entry of the locus whose checksum is checksum
+        as plain arrays with a header that has the key of the locus.
+        '''
+
+        import numpy as np
+
+        # build the arrays of the entry
+        (locus_info, locus_len, fragments_list, fragments_count, fragments_histogram, GC_distribution_dict, fragments_table, positions) = locus_data
+        is_seq = fragments_list != [] and fragments_list[0][5] is not None
+        seqs_list = [fragment[5].encode('iso-8859-1') for fragment in fragments_list] if is_seq else []
+        (histogram_lens_array, histogram_N_flags_array) = fragments_histogram.get_lens_arrays()
+        entry_data = {
+            'key': self.get_entry_key(checksum),
+            'header': np.array([locus_len, fragments_count, is_seq, fragments_table is not None], dtype=np.int64),
+            'fragment_lens': np.array([fragment[0] for fragment in fragments_list], dtype=np.int64),
+            'GC_rates': np.array([fragment[1] for fragment in fragments_list], dtype=np.str_),
+            'strands': np.array([fragment[2] for fragment in fragments_list], dtype=np.str_),
+            'starts': np.array([fragment[3] for fragment in fragments_list], dtype=np.int64),
+            'ends': np.array([fragment[4] for fragment in fragments_list], dtype=np.int64),
+            'seqs': np.frombuffer(b''.join(seqs_list), dtype=np.uint8),
+            'seq_lens': np.array([len(seq) for seq in seqs_list], dtype=np.int64),
+            'histogram_lens': histogram_lens_array,
+            'histogram_N_flags': histogram_N_flags_array,
+            'GC_distribution_rates': np.array(list(GC_distribution_dict.keys()), dtype=np.str_),
+            'GC_distribution_counts': np.array(list(GC_distribution_dict.values()), dtype=np.int64),
+            'table_lengths': np.frombuffer(fragments_table['lengths'], dtype=np.int64) if fragments_table is not None else np.zeros(0, dtype=np.int64),
+            'table_GC_rates': np.frombuffer(fragments_table['GC_rates'], dtype=np.float64) if fragments_table is not None else np.zeros(0, dtype=np.float64),
+            'table_N_counts': np.frombuffer(fragments_table['N_counts'], dtype=np.int64) if fragments_table is not None else np.zeros(0, dtype=np.int64),
+            'positions_counts': np.array([len(locus_positions) for locus_positions in positions], dtype=np.int64),
+            'positions': np.concatenate([np.asarray(locus_positions, dtype=np.int64) for locus_positions in positions]) if len(positions) > 0 else np.zeros(0, dtype=np.int64)
+            }
+
+        # save the entry
+        save_cache_entry(self.get_entry_file(checksum), entry_data, False)
+
+    #---------------
+
+    def get_manifest_file(self, genfile):
+        '''
+        Get the manifest file of a genome file.
+        '''
+
+        import hashlib
+
+        # build the key from the genome file path
+        genome_key = hashlib.sha1(os.path.abspath(genfile).encode('utf-8')).hexdigest()
+
+        # return the manifest file
+        return os.path.join(self.cachedir, 'manifest-{0}-{1}.txt'.format(self.parameters_key[:16], genome_key))
+
+    #---------------
+
+    def read_manifest(self, manifest_file):
+        '''
+        Get the list of loci of a manifest as tuples (locus_info, length,
+        checksum) or an empty list when the manifest does not exist.
+        '''
+
+        manifest_list = []
+        if os.path.isfile(manifest_file):
+            try:
+                with open(manifest_file, mode='r', encoding='iso-8859-1') as manifest_file_id:
+                    for record in manifest_file_id:
+                        if not record.startswith('#'):
+                            (locus_len, checksum, locus_info) = record.rstrip('\n').split('\t', 2)
+                            manifest_list.append((locus_info, int(locus_len), checksum))
+            except:
+                raise ProgramError('F002', manifest_file)
+
+        return manifest_list
+
+    #---------------
+
+    def save_manifest(self, genfile, manifest_list):
+        '''
+        Save the manifest of a genome file with its list of loci as tuples
+        (locus_info, length, checksum), remove the entries of the loci that are
+        no longer in the genome nor in the manifests of other genomes, and remove
+        the least recently used entries over the size limit.
+        '''
+
+        # get the checksums of the previous manifest of the genome
+        manifest_file = self.get_manifest_file(genfile)
+        previous_checksums_set = set([checksum for (locus_info, locus_len, checksum) in self.read_manifest(manifest_file)])
+
+        # save the manifest through a temporal file, which then replaces it
+        try:
+            with open(manifest_file + '.tmp', mode='w', encoding='iso-8859-1') as manifest_file_id:
+                manifest_file_id.write('#{0}\n'.format(os.path.abspath(genfile)))
+                for (locus_info, locus_len, checksum) in manifest_list:
+                    manifest_file_id.write('{0}\t{1}\t{2}\n'.format(locus_len, checksum, locus_info))
+            os.replace(manifest_file + '.tmp', manifest_file)
+        except:
+            raise ProgramError('F001', manifest_file)
+
+        # get the entry files used by every manifest of the cache with the same digest parameters
+        used_entries_set = set()
+        for name in os.listdir(self.cachedir):
+            if name.startswith('manifest-{0}-'.format(self.parameters_key[:16])) and name.endswith('.txt'):
+                used_entries_set.update([os.path.basename(self.get_entry_file(checksum)) for (locus_info, locus_len, checksum) in self.read_manifest(os.path.join(self.cachedir, name))])
+        current_entries_set = set([os.path.basename(self.get_entry_file(checksum)) for (locus_info, locus_len, checksum) in manifest_list])
+
+        # remove the entries of the loci of the previous manifest that are no longer used
+        for checksum in previous_checksums_set:
+            entry_file = self.get_entry_file(checksum)
+            if os.path.basename(entry_file) not in used_entries_set and os.path.isfile(entry_file):
+                os.remove(entry_file)
+
+        # remove the least recently used entries while the cache size exceeds the limit (the entries of the genome are kept)
+        entries_list = sorted([(os.path.getmtime(path), os.path.getsize(path), path) for path in [os.path.join(self.cachedir, name) for name in os.listdir(self.cachedir) if name.startswith('locus-') and name.endswith('.npz')]])
+        cache_size = sum([entry[1] for entry in entries_list])
+        for (mtime, size, path) in entries_list:
+            if cache_size <= self.cachesize:
+                break
+            if os.path.basename(path) not in current_entries_set:
+                os.remove(path)
+                cache_size -= size
+
+    #---------------
+
+#-------------------------------------------------------------------------------
+
+class DigestJournal():
+    '''
+    This class manages the journal of a digest, where a record with the data of
+    every locus is appended once its fragments are written, together with the
+    size of the fragments file at that time. The journal is a JSON lines file
+    whose first line is the signature of the run, so reading it only parses
+    plain values. When the digest is interrupted, a later run with the same
+    signature reads the records, skips the loci completed and truncates the
+    fragments file at the end of the last one; a broken record at the end of
+    the journal is discarded.
+    '''
+
+    #---------------
+
+    def __init__(self, journal_file, run_signature):
+        '''
+        Initialize the journal of a run with the signature run_signature.
+        '''
+
+        self.journal_file = journal_file
+        self.run_signature = run_signature
+        self.journal_file_id = None
+        self.valid_size = 0
+
+    #---------------
+
+    def read(self):
+        '''
+        Get the list of tuples (record, fragsfile_size) of the journal written
+        by a run with the same signature (it is empty when the journal does not
+        exist or it was written by another run).
+        '''
+
+        import json
+
+        # initialize the records list
+        records_list = []
+        self.valid_size = 0
+
+        # the journal has to exist
+        if not os.path.isfile(self.journal_file):
+            return records_list
+
+        # read the records until the end of the journal or a broken record
+        try:
+            with open(self.journal_file, mode='rb') as journal_file_id:
+                if json.loads(journal_file_id.readline()) != self.run_signature:
+                    return records_list
+                self.valid_size = journal_file_id.tell()
+                for line in iter(journal_file_id.readline, b''):
+                    if not line.endswith(b'\n'):
+                        break
+                    (record, fragsfile_size) = json.loads(line)
+                    records_list.append((record, fragsfile_size))
+                    self.valid_size += len(line)
+        except:
+            pass
+
+        # return the records list
+        return records_list
+
+    #---------------
+
+    def open(self, is_resumed):
+        '''
+        Open the journal to append records: after the valid records read when
+        is_resumed is True or, otherwise, as a new journal.
+        '''
+
+        import json
+
+        try:
+            if is_resumed:
+                self.journal_file_id = open(self.journal_file, mode='r+b')
+                self.journal_file_id.truncate(self.valid_size)
+                self.journal_file_id.seek(self.valid_size)
+            else:
+                self.journal_file_id = open(self.journal_file, mode='wb')
+                self.journal_file_id.write(json.dumps(self.run_signature).encode('utf-8') + b'\n')
+                self.journal_file_id.flush()
+        except:
+            raise ProgramError('F001', self.journal_file)
+
+    #---------------
+
+    def add(self, record, fragsfile_size):
+        '''
+        Append a record, built with plain JSON values, and the size of the
+        fragments file to the journal and flush it, so it is kept although the
+        run is interrupted.
+        '''
+
+        import json
+
+        self.journal_file_id.write(json.dumps([record, fragsfile_size], separators=(',', ':')).encode('utf-8') + b'\n')
+        self.journal_file_id.flush()
+
+    #---------------
+
+    def remove(self):
+        '''
+        Close and remove the journal when the digest has been completed.
+        '''
+
+        self.journal_file_id.close()
+        os.remove(self.journal_file)
+
+    #---------------
+
+#-------------------------------------------------------------------------------
+
+class RestrictionSiteScanner():
+    '''
+    This class finds the restriction sites of several enzymes in a single pass
+    over a sequence. The sequences of every enzyme are loaded with their
+    ambiguity codes in a trie, which is compiled as a factored regular
+    expression where each code is a character class to find the positions
+    where any site starts, and walked at each of these positions to tag the
+    enzymes whose sites are there, so the scan cost does not depend on the
+    number of unambiguous sequences of the restriction sites. The walk is
+    skipped when the first nucleotide of a position leads to a single
+    sequence of the trie, whose tags are then the ones found there.
+    '''
+
+    #---------------
+
+    def __init__(self, ressite_seq_lists):
+        '''
+        Build the scanner from a list with the list of restriction site
+        sequences (with ambiguity codes) of each enzyme; the enzymes are
+        tagged with their index in the list.
+        '''
+
+        # get the nucleotide dictionary
+        self.nucleotide_dict = get_nucleotide_dict()
+
+        # save the count of enzymes
+        self.lists_count = len(ressite_seq_lists)
+
+        # build the trie: each node is a dictionary with the children by code, the tags of the sequences ending in it
+        # and, once the trie is built, the children matching every nucleotide (as character and as byte value)
+        self.trie = {'children': {}, 'tags': []}
+        self.maxlen = 0
+        for (tag, ressite_seq_list) in enumerate(ressite_seq_lists):
+            for ressite_seq in ressite_seq_list:
+                node = self.trie
+                for code in ressite_seq.upper():
+                    child = node['children'].get(code)
+                    if child is None:
+                        child = {'children': {}, 'tags': []}
+                        node['children'][code] = child
+                    node = child
+                if tag not in node['tags']:
+                    node['tags'].append(tag)
+                self.maxlen = max(self.maxlen, len(ressite_seq))
+        self.index_trie_node(self.trie)
+
+        # get the tags of the nucleotides (as character and as byte value) that start a single sequence of the trie
+        self.first_tags_dict = {}
+        for (nucleotide, nodes_list) in self.trie['next'].items():
+            tags_lists = [tags_list for node in nodes_list for tags_list in self.get_trie_tags_lists(node)]
+            if len(tags_lists) == 1:
+                self.first_tags_dict[nucleotide] = sorted(set(tags_lists[0]))
+
+        # compile the patterns of the trie for strings and bytes
+        trie_pattern = self.get_trie_pattern(self.trie)
+        self.str_pattern = re.compile('(?={0})'.format(trie_pattern))
+        self.bytes_pattern = re.compile('(?={0})'.format(trie_pattern).encode('iso-8859-1'))
+
+    #---------------
+
+    def index_trie_node(self, node):
+        '''
+        Save in a trie node and its descendants the lists of children matching
+        every nucleotide, so the codes are not expanded when the trie is walked.
+        '''
+
+        # index the children by the nucleotides of their codes
+        node['next'] = {}
+        for (code, child) in node['children'].items():
+            for nucleotide in self.nucleotide_dict[code]['nuclotide_list']:
+                node['next'].setdefault(nucleotide, []).append(child)
+                node['next'].setdefault(ord(nucleotide), []).append(child)
+            self.index_trie_node(child)
+
+    #---------------
+
+    def get_trie_tags_lists(self, node):
+        '''
+        Get the tags lists of the nodes where a sequence ends in a trie node and
+        its descendants.
+        '''
+
+        # get the tags list of the node and the ones of its children
+        tags_lists = [node['tags']] if node['tags'] != [] else []
+        for child in node['children'].values():
+            tags_lists.extend(self.get_trie_tags_lists(child))
+
+        # return the tags lists
+        return tags_lists
+
+    #---------------
+
+    def get_trie_pattern(self, node):
+        '''
+        Get the regular expression matching the sequences of a trie node.
+        '''
+
+        # get the alternatives of the children (each code is the class of its nucleotides)
+        alternatives_list = []
+        for code in sorted(node['children'].keys()):
+            nucleotide_list = self.nucleotide_dict[code]['nuclotide_list']
+            code_pattern = re.escape(nucleotide_list[0]) if len(nucleotide_list) == 1 else '[{0}]'.format(''.join(nucleotide_list))
+            alternatives_list.append(code_pattern + self.get_trie_pattern(node['children'][code]))
+
+        # build the pattern (the children are optional when a sequence ends in the node)
+        if alternatives_list == []:
+            pattern = ''
+        elif len(alternatives_list) == 1 and node['tags'] == []:
+            pattern = alternatives_list[0]
+        else:
+            pattern = '(?:{0})'.format('|'.join(alternatives_list))
+            if node['tags'] != []:
+                pattern += '?'
+
+        # return the pattern
+        return pattern
+
+    #---------------
+
+    def scan(self, seq, start=0, end=None):
+        '''
+        Get the sorted list of tuples (position, tag) of the restriction sites
+        found entirely in seq[start:end]; seq can be a string, bytes or a
+        memory map and the positions are relative to seq.
+        '''
+
+        # set the end of the scan
+        if end is None:
+            end = len(seq)
+
+        # select the pattern of the sequence type
+        pattern = self.str_pattern if isinstance(seq, str) else self.bytes_pattern
+
+        # initialize the restriction sites list
+        ressites_list = []
+        first_tags_dict = self.first_tags_dict
+
+        # for each position where a restriction site starts
+        for m in pattern.finditer(seq, start, end):
+
+            # the tags are known without walking the trie when the nucleotide in the position starts a single sequence
+            position = m.start()
+            first_tags_list = first_tags_dict.get(seq[position])
+            if first_tags_list is not None:
+                for tag in first_tags_list:
+                    ressites_list.append((position, tag))
+                continue
+
+            # walk the trie to get the tags of the restriction sites in the position (several nodes can match a nucleotide
+            # when the sequences have different codes in the same position)
+            tags_list = []
+            nodes_list = [self.trie]
+            for i in range(position, min(position + self.maxlen, end)):
+                if len(nodes_list) == 1:
+                    next_nodes_list = nodes_list[0]['next'].get(seq[i])
+                else:
+                    next_nodes_list = [child for node in nodes_list for child in node['next'].get(seq[i], [])]
+                if not next_nodes_list:
+                    break
+                for node in next_nodes_list:
+                    tags_list.extend(node['tags'])
+                nodes_list = next_nodes_list
+
+            # add the restriction sites sorted by tag
+            for tag in sorted(set(tags_list)):
+                ressites_list.append((position, tag))
+
+        # return the restriction sites list
+        return ressites_list
+
+    #---------------
+
+    def scan_loci(self, loci_list):
+        '''
+        Get, for each locus of loci_list given as a tuple (seq, start, end), a
+        tuple with a list per enzyme of the positions of its restriction sites
+        relative to the locus start. The loci are joined with a separator that
+        is not a nucleotide, so a site cannot span two loci, and all of them
+        are scanned in a single pass.
+        '''
+
+        # join the loci with the separator and get the start of every locus in the joined sequence
+        starts_list = []
+        segments_list = []
+        joined_len = 0
+        for (seq, start, end) in loci_list:
+            starts_list.append(joined_len)
+            segments_list.append(seq[start:end])
+            joined_len += end - start + 1
+        joined_seq = b'|'.join(segments_list)
+
+        # initialize the positions lists of every locus
+        loci_positions_list = [tuple([[] for k in range(self.lists_count)]) for locus in loci_list]
+
+        # scan the joined sequence and add each restriction site to its locus (the sites are sorted by position)
+        locus_index = 0
+        loci_count = len(loci_list)
+        for (position, tag) in self.scan(joined_seq):
+            while locus_index + 1 < loci_count and position >= starts_list[locus_index + 1]:
+                locus_index += 1
+            loci_positions_list[locus_index][tag].append(position - starts_list[locus_index])
+
+        # return the positions of every locus
+        return loci_positions_list
+
+    #---------------
+
+#-------------------------------------------------------------------------------
+
+class NumpySiteScanner():
+    '''
+    This class finds the restriction sites of several enzymes coding the
+    sequence as an array of uint8 where each nucleotide is a bit (A=1, C=2,
+    G=4, T=8 and 0 for the nucleotide codes no standard). The restriction site
+    sequences keep their ambiguity codes as bitmasks, so every site is found
+    with vectorised comparisons over sliding windows of the array. The
+    sequence is coded in blocks of blocksize nucleotides, so the memory used
+    (about 15 bytes per nucleotide of a block) does not grow with the length
+    of the chromosomes.
+    '''
+
+    #---------------
+
+    def __init__(self, ressite_seq_list, blocksize=1000000):
+        '''
+        Build the scanner from a list with the restriction site sequence of
+        each enzyme (with ambiguity codes) and the nucleotides number of the
+        coded blocks; the enzymes are tagged with their index in the list.
+        '''
+
+        import numpy as np
+
+        self.blocksize = blocksize
+
+        # get the nucleotide dictionary
+        nucleotide_dict = get_nucleotide_dict()
+
+        # build the table to code the sequences
+        self.nucleotide_bits_dict = {'A': 1, 'C': 2, 'G': 4, 'T': 8}
+        self.code_table = np.zeros(256, dtype=np.uint8)
+        for (nucleotide, bit) in self.nucleotide_bits_dict.items():
+            self.code_table[ord(nucleotide)] = bit
+
+        # build the bitmasks of every restriction site sequence
+        self.ressite_seq_list = [ressite_seq.upper() for ressite_seq in ressite_seq_list]
+        self.masks_dict = {}
+        for ressite_seq in self.ressite_seq_list:
+            masks_list = []
+            for code in ressite_seq:
+                mask = 0
+                for nucleotide in nucleotide_dict[code]['nuclotide_list']:
+                    mask |= self.nucleotide_bits_dict[nucleotide.upper()]
+                masks_list.append(mask)
+            self.masks_dict[ressite_seq] = np.array(masks_list, dtype=np.uint8)
+
+    #---------------
+
+    def encode(self, seq, start=0, end=None):
+        '''
+        Code seq[start:end] (bytes or a memory map) as an array of uint8.
+        '''
+
+        import numpy as np
+
+        # set the end of the sequence
+        if end is None:
+            end = len(seq)
+
+        # return the coded sequence
+        return self.code_table[np.frombuffer(seq, dtype=np.uint8, count=end - start, offset=start)]
+
+    #---------------
+
+    def get_positions_arrays(self, seq, start, end):
+        '''
+        Get a tuple with the sorted array of the positions of the restriction
+        sites of each enzyme in seq[start:end] (bytes or a memory map), which is
+        coded in blocks that overlap the length of the longest sequence minus
+        one, so the sites across two blocks are found once.
+        '''
+
+        import numpy as np
+
+        # initialize the positions of every restriction site sequence (the palindromic ones are shared by several enzymes)
+        positions_lists_dict = {ressite_seq: [] for ressite_seq in self.ressite_seq_list}
+        max_ressite_len = max([len(masks_array) for masks_array in self.masks_dict.values()])
+
+        # for each block of the sequence
+        for block_start in range(0, end - start, self.blocksize):
+
+            # code the block with the nucleotides of the sites starting in its last positions
+            encoded_block = self.encode(seq, start + block_start, min(start + block_start + self.blocksize + max_ressite_len - 1, end))
+
+            # for each restriction site sequence
+            for (ressite_seq, positions_list) in positions_lists_dict.items():
+
+                # get the bitmasks and the number of windows starting in the block
+                masks_array = self.masks_dict[ressite_seq]
+                windows_number = min(self.blocksize, len(encoded_block) - len(masks_array) + 1)
+
+                # a window matches when every nucleotide has a bit of the bitmask of its position
+                if windows_number > 0:
+                    is_match_array = (encoded_block[:windows_number] & masks_array[0]) != 0
+                    for i in range(1, len(masks_array)):
+                        is_match_array &= (encoded_block[i:i + windows_number] & masks_array[i]) != 0
+                    positions_list.append(np.flatnonzero(is_match_array) + block_start)
+
+        # return the positions of each enzyme
+        return tuple([np.concatenate(positions_lists_dict[ressite_seq]) if positions_lists_dict[ressite_seq] != [] else np.zeros(0, dtype=np.int64) for ressite_seq in self.ressite_seq_list])
+
+    #---------------
+
+    def get_GC_cumulative_counts(self, encoded_seq):
+        '''
+        Get the arrays of cumulative counts of GC and GCAT nucleotides of a coded
+        sequence, where the counts of seq[i:j] are array[j] - array[i].
+        '''
+
+        import numpy as np
+
+        # build the cumulative counts starting with 0 (with 32 bit integers when they are enough)
+        dtype = np.int32 if len(encoded_seq) < 2**31 else np.int64
+        GC_cumulative_array = np.zeros(len(encoded_seq) + 1, dtype=dtype)
+        np.cumsum((encoded_seq & 6) != 0, out=GC_cumulative_array[1:])
+        GCAT_cumulative_array = np.zeros(len(encoded_seq) + 1, dtype=dtype)
+        np.cumsum(encoded_seq != 0, out=GCAT_cumulative_array[1:])
+
+        # return the cumulative counts
+        return (GC_cumulative_array, GCAT_cumulative_array)
+
+    #---------------
+
+    def get_GC_cumulative_counts_at(self, seq, start, end, positions_array):
+        '''
+        Get the arrays of cumulative counts of GC and GCAT nucleotides of
+        seq[start:end] (bytes or a memory map) at the sorted positions of
+        positions_array, where the counts of seq[start + i:start + j] are the
+        difference of the counts at j and i; the sequence is coded in blocks.
+        '''
+
+        import numpy as np
+
+        # initialize the cumulative counts (the counts at 0 are 0)
+        GC_cumulative_array = np.zeros(len(positions_array), dtype=np.int64)
+        GCAT_cumulative_array = np.zeros(len(positions_array), dtype=np.int64)
+        (GC_count, GCAT_count) = (0, 0)
+
+        # for each block of the sequence up to the last position
+        last_position = int(positions_array[-1]) if len(positions_array) > 0 else 0
+        for block_start in range(0, last_position, self.blocksize):
+
+            # code the block and get its cumulative counts
+            block_end = min(block_start + self.blocksize, end - start)
+            encoded_block = self.encode(seq, start + block_start, start + block_end)
+            GC_block_cumulative_array = np.cumsum((encoded_block & 6) != 0)
+            GCAT_block_cumulative_array = np.cumsum(encoded_block != 0)
+
+            # set the counts of the positions after the block start up to the block end
+            (i, j) = np.searchsorted(positions_array, [block_start, block_end], side='right').tolist()
+            GC_cumulative_array[i:j] = GC_count + GC_block_cumulative_array[positions_array[i:j] - block_start - 1]
+            GCAT_cumulative_array[i:j] = GCAT_count + GCAT_block_cumulative_array[positions_array[i:j] - block_start - 1]
+
+            # add the counts of the block
+            GC_count += int(GC_block_cumulative_array[-1])
+            GCAT_count += int(GCAT_block_cumulative_array[-1])
+
+        # return the cumulative counts
+        return (GC_cumulative_array, GCAT_cumulative_array)
+
+    #---------------
+
+#-------------------------------------------------------------------------------
+
+class BgzfWriter():
+    '''
+    This class writes a text file compressed in BGZF format (a series of gzip
+    members of up to 64 KB, readable by any gzip reader and indexable for
+    random access). The blocks are compressed in parallel by a pool of threads
+    (zlib releases the GIL) and written in order.
+    '''
+
+    #---------------
+
+    block_len = 65280
+    eof_block = bytes.fromhex('1f8b08040000000000ff0600424302001b0003000000000000000000')
+
+    #---------------
+
+    def __init__(self, file, level=6, threads=4):
+        '''
+        Open the file with a compression level and a number of threads.
+        '''
+
+        import concurrent.futures
+
+        self.level = level
+        self.threads = threads
+        self.buffer_list = []
+        self.buffer_len = 0
+        self.pending_futures_deque = collections.deque()
+        try:
+            self.file_id = open(file, mode='wb')
+        except:
+            raise ProgramError('F001', file)
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=threads)
+
+    #---------------
+
+    @staticmethod
+    def compress_block(data, level):
+        '''
+        Compress a block and get the BGZF member with its header and footer.
+        '''
+
+        # compress the data as raw deflate
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+        compressed_data = compressor.compress(data) + compressor.flush()
+
+        # build the member: gzip header with the extra field BC holding the member size, data, CRC32 and uncompressed size
+        header = struct.pack('<4BI2BH2BHH', 31, 139, 8, 4, 0, 0, 255, 6, 66, 67, 2, len(compressed_data) + 25)
+        footer = struct.pack('<II', zlib.crc32(data) & 0xffffffff, len(data))
+
+        # return the member
+        return header + compressed_data + footer
+
+    #---------------
+
+    def write(self, text):
+        '''
+        Write a text in the file.
+        '''
+
+        # add the text to the buffer
+        data = text.encode('iso-8859-1')
+        self.buffer_list.append(data)
+        self.buffer_len += len(data)
+
+        # send the full blocks to be compressed
+        if self.buffer_len >= BgzfWriter.block_len:
+            data = b''.join(self.buffer_list)
+            full_len = len(data) - len(data) % BgzfWriter.block_len
+            for start in range(0, full_len, BgzfWriter.block_len):
+                self.submit_block(data[start:start + BgzfWriter.block_len])
+            self.buffer_list = [data[full_len:]]
+            self.buffer_len = len(data) - full_len
+
+    #---------------
+
+    def submit_block(self, data):
+        '''
+        Send a block to the pool and write the oldest blocks compressed when
+        there are too many pending ones.
+        '''
+
+        self.pending_futures_deque.append(self.executor.submit(BgzfWriter.compress_block, data, self.level))
+        while len(self.pending_futures_deque) > 4 * self.threads:
+            self.file_id.write(self.pending_futures_deque.popleft().result())
+
+    #---------------
+
+    def close(self):
+        '''
+        Write the pending blocks and the end of file block and close the file.
+        '''
+
+        # compress the rest of the buffer
+        data = b''.join(self.buffer_list)
+        if data:
+            self.submit_block(data)
+        self.buffer_list = []
+        self.buffer_len = 0
+
+        # write the pending blocks in order
+        while self.pending_futures_deque:
+            self.file_id.write(self.pending_futures_deque.popleft().result())
+
+        # write the end of file block and close the file
+        self.file_id.write(BgzfWriter.eof_block)
+        self.file_id.close()
+        self.executor.shutdown()
+
+    #---------------
+
+#-------------------------------------------------------------------------------
+
+class ThreadedWriter():
+    '''
+    This class runs a write function in a thread, so the writing of a file
+    overlaps the work of the caller. The arguments of every call wait in a
+    bounded queue of queue_size calls, so the memory is bounded, and an
+    exception raised writing (including the exit of a ProgramError) is raised
+    again in the caller.
+    '''
+
+    #---------------
+
+    def __init__(self, write_function, queue_size):
+        '''
+        Start the thread of a write function with a queue of queue_size calls.
+        '''
+
+        self.write_function = write_function
+        self.calls_queue = queue.Queue(maxsize=queue_size)
+        self.exception = None
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    #---------------
+
+    def run(self):
+        '''
+        Call the write function with the arguments of the queue until the end
+        mark (after an exception, the calls are dropped so the caller is never
+        blocked).
+        '''
+
+        while True:
+            args = self.calls_queue.get()
+            if args is None:
+                break
+            if self.exception is None:
+                try:
+                    self.write_function(*args)
+                except BaseException as exception:
+                    self.exception = exception
+
+    #---------------
+
+    def write(self, *args):
+        '''
+        Queue a call of the write function, waiting while the queue is full.
+        '''
+
+        if self.exception is not None:
+            raise self.exception
+        self.calls_queue.put(args)
+
+    #---------------
+
+    def close(self):
+        '''
+        Wait until the queued calls are done and stop the thread.
+        '''
+
+        self.calls_queue.put(None)
+        self.thread.join()
+        if self.exception is not None:
+            raise self.exception
+
+    #---------------
+
 #-------------------------------------------------------------------------------
 
 class BreakLoops(Exception):
@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+#-------------------------------------------------------------------------------
+
+'''This software has been developed by:
+
+       GI Genética, Fisiología e Historia Forestal
+       Dpto. Sistemas y Recursos Naturales
+       ETSI Montes, Forestal y del Medio Natural
+       Universidad Politécnica de Madrid
+       https://github.com/ggfhf/
+
+   Licence: GNU General Public Licence Version 3
+'''
+
+#-------------------------------------------------------------------------------
+
+'''This source contains the program of the ddRADseqTools software package that
+   screens a panel of enzymes: it searches the restriction sites of every enzyme
+   in a single pass over a genome and writes a CSV file with the fragments of a
+   double digest of every enzyme pair in every size window.
+'''
+#-------------------------------------------------------------------------------
+
+import sys
+
+from genlib import *
+
+#-------------------------------------------------------------------------------
+
+def main(argv):
+    '''Main line of the program.'''
+
+    # build the options dictionary
+    options_dict = build_options()
+
+    # it has been requested the help or to build a new config file
+    for param in argv:
+        # show the help and exit OK
+        if param.startswith('--help'):
+            print_help(options_dict)
+            sys.exit(0)
+        # build the config file and exit OK
+        elif param.startswith('--config'):
+            build_config(options_dict)
+            sys.exit(0)
+
+    # get the config file
+    config_file = get_config_file(__file__)
+
+    # get options from the config file and the input parameters
+    options_dict = get_options(options_dict, config_file, argv)
+
+    # screen the enzyme pairs
+    do_screen(options_dict)
+
+#-------------------------------------------------------------------------------
+
+def do_screen(options_dict):
+    '''Do in silico the double digest of the genome with every enzyme pair of a panel.'''
+
+    import numpy as np
+
+    genfile = options_dict['genfile']['value']
+    genstore = options_dict['genstore']['value']
+    rsfile = options_dict['rsfile']['value']
+    enzymes = options_dict['enzymes']['value']
+    windows_list = options_dict['windows']['value']
+    screenfile = options_dict['screenfile']['value']
+    verbose = options_dict['verbose']['value']
+    trace = options_dict['trace']['value']
+
+    # set the verbose and trace status
+    if verbose.upper() == 'YES':
+        Message.set_verbose_status(True)
+    else:
+        Message.set_verbose_status(False)
+    if trace.upper() == 'YES':
+        Message.set_trace_status(True)
+    else:
+        Message.set_trace_status(False)
+
+    # get the restriction site sequences of the enzymes
+    enzymes_ressites_list = get_enzymes_ressites(rsfile, enzymes)
+    Message.print('trace', 'enzymes_ressites_list: {0}', enzymes_ressites_list)
+
+    # build the lists of sequences of the scanner: the sequences of the enzyme k are tagged 2 * k and their reverse
+    # complementary sequences are tagged 2 * k + 1 (the palindromic sequences are shared, so they are found once)
+    ressite_seq_lists = []
+    for (enzyme, ressite_seq, ressite_lcut_seq, ressite_rcut_seq) in enzymes_ressites_list:
+        ressite_seq_lists.append([ressite_seq.upper()])
+        ressite_seq_lists.append([get_reverse_complementary_sequence(ressite_seq.upper())])
+    scanner = RestrictionSiteScanner(ressite_seq_lists)
+
+    # build the coder of the loci used to calculate the GC rates and N counts
+    coder = NumpySiteScanner([])
+
+    # build the enzyme pairs with different restriction site sequences and their restriction overhangs
+    pairs_list = []
+    for i in range(len(enzymes_ressites_list)):
+        for j in range(len(enzymes_ressites_list)):
+            (enzyme1, ressite1_seq, ressite1_lcut_seq, ressite1_rcut_seq) = enzymes_ressites_list[i]
+            (enzyme2, ressite2_seq, ressite2_lcut_seq, ressite2_rcut_seq) = enzymes_ressites_list[j]
+            if ressite1_seq.upper() != ressite2_seq.upper():
+                if len(ressite1_lcut_seq) >= len(ressite1_rcut_seq):
+                    resoverhang1_seq = get_reverse_complementary_sequence(ressite1_lcut_seq)
+                else:
+                    resoverhang1_seq = ressite1_rcut_seq
+                if len(ressite2_lcut_seq) >= len(ressite2_rcut_seq):
+                    resoverhang2_seq = ressite1_lcut_seq
+                else:
+                    resoverhang2_seq = get_reverse_complementary_sequence(ressite2_rcut_seq)
+                pairs_list.append((i, j, ressite1_seq, ressite2_seq, resoverhang1_seq, resoverhang2_seq))
+    Message.print('info', 'There are {0} enzymes and {1} enzyme pairs to screen.'.format(len(enzymes_ressites_list), len(pairs_list)))
+
+    # initialize the data of every pair: count of total fragments, count of selected fragments (in any size window),
+    # sum of GC rates and count with Ns of the selected fragments and count of fragments in every size window
+    pairs_data_list = [[0, 0, 0.0, 0, np.zeros(len(windows_list), dtype=np.int64)] for pair in pairs_list]
+
+    # get the bounds of the size windows
+    minfragsizes_array = np.array([window[0] for window in windows_list], dtype=np.int64)
+    maxfragsizes_array = np.array([window[1] for window in windows_list], dtype=np.int64)
+
+    # initialize the count of loci and nucleotides
+    loci_count = 0
+    nucleotides_count = 0
+
+    # for each group of consecutive loci of the genome with about 8 Mb (the loci of a group are scanned together and the fragments
+    # of every enzyme pair are got once per group)
+    for loci_list in get_genome_loci_lists(genfile, genstore, 8388608):
+
+        # join the loci with a separator that is not a nucleotide, so a restriction site cannot span two loci, and get the bounds
+        # of every locus in the joined sequence
+        (joined_seq, loci_starts_array, loci_ends_array) = join_loci(loci_list)
+
+        # get the positions of the restriction sites of every enzyme in both strands in a single scan
+        (watson_positions_arrays, crick_positions_arrays) = get_loci_positions_arrays(scanner, joined_seq, loci_starts_array, loci_ends_array, [len(ressite_seq) for (enzyme, ressite_seq, ressite_lcut_seq, ressite_rcut_seq) in enzymes_ressites_list])
+
+        # get the cumulative counts of GC and GCAT nucleotides of the joined sequence
+        (GC_cumulative_array, GCAT_cumulative_array) = coder.get_GC_cumulative_counts(coder.encode(joined_seq))
+
+        # for each enzyme pair
+        for (pair_data, (i, j, ressite1_seq, ressite2_seq, resoverhang1_seq, resoverhang2_seq)) in zip(pairs_data_list, pairs_list):
+
+            # get the fragments of both strands of all the loci with their lengths, GC rates and N counts
+            fragments_arrays_list = [get_loci_fragments_arrays(positions_arrays[i], positions_arrays[j], ressite1_seq, resoverhang1_seq, resoverhang2_seq, strand, loci_starts_array, loci_ends_array, GC_cumulative_array, GCAT_cumulative_array) for (strand, positions_arrays) in (('+', watson_positions_arrays), ('-', crick_positions_arrays))]
+            (fragment_lens_array, GC_rates_array, N_counts_array) = [np.concatenate(arrays) for arrays in zip(*fragments_arrays_list)]
+
+            # get the fragments in every size window
+            is_in_window_array = (fragment_lens_array[:, np.newaxis] >= minfragsizes_array) & (fragment_lens_array[:, np.newaxis] <= maxfragsizes_array)
+            is_selected_array = is_in_window_array.any(axis=1)
+
+            # update the pair data
+            pair_data[0] += len(fragment_lens_array)
+            pair_data[1] += int(is_selected_array.sum())
+            pair_data[2] += float(GC_rates_array[is_selected_array].sum())
+            pair_data[3] += int((N_counts_array[is_selected_array] > 0).sum())
+            pair_data[4] += is_in_window_array.sum(axis=0)
+
+        # notify the loci screened
+        loci_count += len(loci_list)
+        nucleotides_count += int((loci_ends_array - loci_starts_array).sum())
+        Message.print_progress('Loci screened', loci_count, 'loci', nucleotides_count)
+
+    # write the screen file
+    Message.end_progress()
+    write_screen_file(screenfile, enzymes_ressites_list, windows_list, pairs_list, pairs_data_list)
+
+#-------------------------------------------------------------------------------
+
+def join_loci(loci_list):
+    '''Join the loci of a list, given as tuples (locus_info, seq, locus_start, locus_end), with a separator that is not a nucleotide and get the tuple (joined_seq, loci_starts_array, loci_ends_array) with the bounds of every locus in the joined sequence.'''
+
+    import numpy as np
+
+    # get the bounds of every locus (each locus is followed by the separator)
+    loci_lens_array = np.array([locus_end - locus_start for (locus_info, seq, locus_start, locus_end) in loci_list], dtype=np.int64)
+    loci_starts_array = np.concatenate(([0], np.cumsum(loci_lens_array + 1)[:-1])).astype(np.int64)
+    loci_ends_array = loci_starts_array + loci_lens_array
+
+    # join the loci
+    joined_seq = b'|'.join([bytes(seq[locus_start:locus_end]) for (locus_info, seq, locus_start, locus_end) in loci_list])
+
+    # return the joined sequence and the bounds of the loci
+    return (joined_seq, loci_starts_array, loci_ends_array)
+
+#-------------------------------------------------------------------------------
+
+def get_loci_positions_arrays(scanner, joined_seq, loci_starts_array, loci_ends_array, ressite_lens_list):
+    '''Get the tuple (watson_positions_arrays, crick_positions_arrays) with the sorted arrays of positions of the restriction sites of every enzyme in both strands of the loci of a joined sequence, found by scanner in a single scan (the sequences of the enzyme k are tagged 2 * k and their reverse complementary ones 2 * k + 1). The positions of the Crick strand of a locus are counted from the locus end, but they are kept within the locus bounds, so the loci are in the same order in both strands.'''
+
+    import numpy as np
+
+    # get the positions and tags of the restriction sites, grouped by tag keeping the positions sorted
+    ressites_array = np.array(scanner.scan(joined_seq), dtype=np.int64).reshape(-1, 2)
+    ressites_array = ressites_array[np.argsort(ressites_array[:, 1], kind='stable')]
+    tag_bounds_array = np.searchsorted(ressites_array[:, 1], np.arange(2 * len(ressite_lens_list) + 1), side='left')
+
+    # for each enzyme, get its positions in the Watson strand and the positions of its reverse complementary sequence converted
+    # to the Crick strand of their locus
+    watson_positions_arrays = []
+    crick_positions_arrays = []
+    for (k, ressite_len) in enumerate(ressite_lens_list):
+        watson_positions_arrays.append(ressites_array[tag_bounds_array[2 * k]:tag_bounds_array[2 * k + 1], 0])
+        positions_array = ressites_array[tag_bounds_array[2 * k + 1]:tag_bounds_array[2 * k + 2], 0]
+        loci_indexes_array = np.searchsorted(loci_starts_array, positions_array, side='right') - 1
+        crick_positions_arrays.append(np.sort(loci_starts_array[loci_indexes_array] + loci_ends_array[loci_indexes_array] - positions_array - ressite_len))
+
+    # return the positions arrays
+    return (watson_positions_arrays, crick_positions_arrays)
+
+#-------------------------------------------------------------------------------
+
+def get_loci_fragments_arrays(ressite1_positions_array, ressite2_positions_array, ressite1_seq, resoverhang1_seq, resoverhang2_seq, strand, loci_starts_array, loci_ends_array, GC_cumulative_array, GCAT_cumulative_array):
+    '''Get the arrays of lengths, GC rates and N counts of the fragments of a double digest in a strand of the loci of a joined sequence from the sorted arrays of positions of the restriction sites of both enzymes in this strand, as get_double_digest_cuts_array and get_fragments_GC_N_arrays do with a locus.'''
+
+    import numpy as np
+
+    # search the next restriction site of the second enzyme from every restriction site of the first enzyme
+    next_ressite2_positions_array = np.append(ressite2_positions_array, np.iinfo(np.int64).max)[np.searchsorted(ressite2_positions_array, ressite1_positions_array + len(ressite1_seq), side='left')]
+
+    # there is a cut when the restriction site of the second enzyme is in the locus of the restriction site of the first enzyme
+    # and it is previous to the next restriction site of the first enzyme
+    loci_indexes_array = np.searchsorted(loci_starts_array, ressite1_positions_array, side='right') - 1
+    next_ressite1_positions_array = np.append(ressite1_positions_array[1:], np.iinfo(np.int64).max)
+    is_cut_array = (next_ressite2_positions_array < loci_ends_array[loci_indexes_array]) & (next_ressite2_positions_array < next_ressite1_positions_array)
+    loci_indexes_array = loci_indexes_array[is_cut_array]
+
+    # calculate the start and end positions of the fragments clipping them at the end of their locus
+    start_positions_array = ressite1_positions_array[is_cut_array] + len(ressite1_seq) - len(resoverhang1_seq)
+    end_positions_array = np.maximum(start_positions_array, np.minimum(next_ressite2_positions_array[is_cut_array] + len(resoverhang2_seq), loci_ends_array[loci_indexes_array]))
+
+    # calculate the fragment lengths and their segments in the Watson strand
+    fragment_lens_array = end_positions_array - start_positions_array
+    if strand == '+':
+        (segment_starts_array, segment_ends_array) = (start_positions_array, end_positions_array)
+    else:
+        mirror_positions_array = loci_starts_array[loci_indexes_array] + loci_ends_array[loci_indexes_array]
+        (segment_starts_array, segment_ends_array) = (mirror_positions_array - end_positions_array, mirror_positions_array - start_positions_array)
+
+    # calculate the GC rates and the N counts
+    GC_counts_array = GC_cumulative_array[segment_ends_array] - GC_cumulative_array[segment_starts_array]
+    GCAT_counts_array = GCAT_cumulative_array[segment_ends_array] - GCAT_cumulative_array[segment_starts_array]
+    GC_rates_array = np.where(GCAT_counts_array != 0, GC_counts_array / np.maximum(GCAT_counts_array, 1), 0.0)
+    N_counts_array = fragment_lens_array - GCAT_counts_array
+
+    # return the arrays
+    return (fragment_lens_array, GC_rates_array, N_counts_array)
+
+#-------------------------------------------------------------------------------
+
+def write_screen_file(screenfile, enzymes_ressites_list, windows_list, pairs_list, pairs_data_list):
+    '''Write the CSV file with the fragments of every enzyme pair in every size window.'''
+
+    # open the screen file
+    try:
+        screenfile_id = open(screenfile, mode='w', encoding='iso-8859-1')
+    except:
+        raise ProgramError('F001', screenfile)
+
+    # write the heads
+    windows_heads = ''.join(['"{0}-{1}";'.format(window[0], window[1]) for window in windows_list])
+    screenfile_id.write('"ENZYME1";"ENZYME2";"FRAGS";"SELECTED FRAGS";"SELECTED MEAN GC";"SELECTED FRAGS WITH Ns";{0}\n'.format(windows_heads))
+
+    # write the data of every pair
+    for ((i, j, ressite1_seq, ressite2_seq, resoverhang1_seq, resoverhang2_seq), (fragments_count, selected_fragments_count, GC_rates_sum, N_fragments_count, windows_counts_array)) in zip(pairs_list, pairs_data_list):
+        GC_mean = GC_rates_sum / selected_fragments_count if selected_fragments_count != 0 else 0
+        windows_counts = ''.join(['{0};'.format(count) for count in windows_counts_array.tolist()])
+        screenfile_id.write('"{0}";"{1}";{2};{3};{4:3.4f};{5};{6}\n'.format(enzymes_ressites_list[i][0], enzymes_ressites_list[j][0], fragments_count, selected_fragments_count, GC_mean, N_fragments_count, windows_counts))
+
+    # close the screen file
+    screenfile_id.close()
+
+    # show OK message
+    Message.print('info', 'The file {0} containing the screen of the enzyme pairs is created.'.format(get_file_name(screenfile)))
+
+#-------------------------------------------------------------------------------
+
+def build_options():
+    '''Build a dictionary with the program options.'''
+
+    # get all options dictionary
+    all_options_dict = get_all_options_dict()
+
+    # define the options dictionary
+    options_dict = {
+        'genfile': all_options_dict['genfile'],
+        'genstore': all_options_dict['genstore'],
+        'rsfile': all_options_dict['rsfile'],
+        'enzymes': all_options_dict['enzymes'],
+        'windows': all_options_dict['windows'],
+        'screenfile': all_options_dict['screenfile'],
+        'verbose': all_options_dict['verbose'],
+        'trace': all_options_dict['trace']
+    }
+
+    # return the options dictionary
+    return options_dict
+
+#-------------------------------------------------------------------------------
+
+def print_help(options_dict):
+    '''Print the program help.'''
+
+    # get general data
+    project_name = get_project_name()
+    project_version = get_project_version()
+    program_file = get_file_name(__file__)
+    config_file = get_config_file(__file__)
+
+    # print the help
+    Message.print('info', '')
+    Message.print('info', '{0} version {1}'.format(project_name, project_version))
+    Message.print('info', '')
+    Message.print('info', '{0} searches the restriction sites of a panel of enzymes in a single pass over a genome and writes the fragments of every enzyme pair in every size window.'.format(program_file))
+    Message.print('info', '')
+    Message.print('info', 'Usage: {0} --help'.format(program_file))
+    Message.print('info', '')
+    Message.print('info', '       Show the help of {0}.'.format(program_file))
+    Message.print('info', '')
+    Message.print('info', '   or: {0} --config'.format(program_file))
+    Message.print('info', '')
+    Message.print('info', '       Create the config file {0} with the default value of the options.'.format(config_file))
+    Message.print('info', '       The default value of the options can be modified.'.format(config_file))
+    Message.print('info', '')
+    Message.print('info', '   or: {0} [--option=<value> [--option=<value>, ...]]'.format(program_file))
+    Message.print('info', '')
+    Message.print('info', '       The options values are read from the config file {0}, but they can be modified'.format(config_file))
+    Message.print('info', '       in command line. The options are:')
+    Message.print('info', '')
+    Message.print('info', '       {0:16}   {1}'.format('option', 'value'))
+    Message.print('info', '       {0:16}   {1}'.format('=' * 16, '=' * 78))
+    Message.print('info', '       {0:16}   {1}'.format('--genfile', options_dict['genfile']['comment']))
+    Message.print('info', '       {0:16}   {1}'.format('--genstore', options_dict['genstore']['comment']))
+    Message.print('info', '       {0:16}   {1}'.format('--rsfile', options_dict['rsfile']['comment']))
+    Message.print('info', '       {0:16}   {1}'.format('--enzymes', options_dict['enzymes']['comment']))
+    Message.print('info', '       {0:16}   {1}'.format('--windows', options_dict['windows']['comment']))
+    Message.print('info', '       {0:16}   {1}'.format('--screenfile', options_dict['screenfile']['comment']))
+    Message.print('info', '       {0:16}   {1}'.format('--verbose', options_dict['verbose']['comment']))
+    Message.print('info', '       {0:16}   {1}'.format('--trace', options_dict['trace']['comment']))
+
+#-------------------------------------------------------------------------------
+
+def build_config(options_dict):
+    '''Build the file with the options by default.'''
+
+    # get the config file
+    config_file = get_config_file(__file__)
+
+    # create the config file and write the default options
+    try:
+        with open(config_file, mode='w', encoding='iso-8859-1') as config_file_id:
+            config_file_id.write('{0:43} # {1}\n'.format('genfile' + '=' + options_dict['genfile']['default'], options_dict['genfile']['comment']))
+            config_file_id.write('{0:43} # {1}\n'.format('genstore' + '=' + options_dict['genstore']['default'], options_dict['genstore']['comment']))
+            config_file_id.write('{0:43} # {1}\n'.format('rsfile' + '=' + options_dict['rsfile']['default'], options_dict['rsfile']['comment']))
+            config_file_id.write('{0:43} # {1}\n'.format('enzymes' + '=' + options_dict['enzymes']['default'], options_dict['enzymes']['comment']))
+            config_file_id.write('{0:43} # {1}\n'.format('windows' + '=' + options_dict['windows']['default'], options_dict['windows']['comment']))
+            config_file_id.write('{0:43} # {1}\n'.format('screenfile' + '=' + options_dict['screenfile']['default'], options_dict['screenfile']['comment']))
+            config_file_id.write('{0:43} # {1}\n'.format('verbose' + '=' + options_dict['verbose']['default'], options_dict['verbose']['comment']))
+            config_file_id.write('{0:43} # {1}\n'.format('trace' + '=' + options_dict['trace']['default'], options_dict['trace']['comment']))
+    except:
+        raise ProgramError('F001', config_file)
+
+    # show OK message
+    Message.print('info', 'The configuration file {0} is created.'.format(get_file_name(config_file)))
+
+#-------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
+    sys.exit(0)
+
+#-------------------------------------------------------------------------------
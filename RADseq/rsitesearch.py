@@ -22,10 +22,14 @@
 '''
 #-------------------------------------------------------------------------------
 
-import gzip
-import re
+import bisect
+import collections
+import os
+import struct
 import sys
 
+from genlib import *
+
 #-------------------------------------------------------------------------------
 
 def main(argv):
@@ -51,6 +55,9 @@ def main(argv):
     # get options from the config file and the input parameters
     options_dict = get_options(options_dict, config_file, argv)
 
+    # check the options that are not compatible with the values of other ones
+    check_options(options_dict)
+
     # get the restriction site sequences
     rsfile = options_dict['rsfile']['value']
     enzyme1 = options_dict['enzyme1']['value']
@@ -76,8 +83,12 @@ def main(argv):
 def do_double_digest(options_dict):
     '''Do in silico a double digest of the genome.'''
 
-    genfile = options_dict['genfile']['GCA_000699005.1_ASM69900v1_genomic.fna']
+    genfile = options_dict['genfile']['value']
     fragsfile = options_dict['fragsfile']['value']
+    fragscolumns = options_dict['fragscolumns']['value']
+    gz = options_dict['gz']['value']
+    gzlevel = options_dict['gzlevel']['value']
+    gzthreads = options_dict['gzthreads']['value']
     rsfile = options_dict['rsfile']['value']
     enzyme1 = options_dict['enzyme1']['value']
     enzyme2 = options_dict['enzyme2']['value']
@@ -85,7 +96,20 @@ def do_double_digest(options_dict):
     maxfragsize = options_dict['maxfragsize']['value']
     fragstfile = options_dict['fragstfile']['value']
     fragstinterval = options_dict['fragstinterval']['value']
+    fragtable = options_dict['fragtable']['value']
+    genstore = options_dict['genstore']['value']
+    sitecache = options_dict['sitecache']['value']
+    sitecachesize = options_dict['sitecachesize']['value']
+    fragcache = options_dict['fragcache']['value']
+    fragcachesize = options_dict['fragcachesize']['value']
+    processes = options_dict['processes']['value']
+    engine = options_dict['engine']['value']
+    stream = options_dict['stream']['value']
+    blocksize = options_dict['blocksize']['value']
+    batchsize = options_dict['batchsize']['value']
+    pipeline = options_dict['pipeline']['value']
     plot = options_dict['plot']['value']
+    report = options_dict['report']['value']
     verbose = options_dict['verbose']['value']
     trace = options_dict['trace']['value']
 
@@ -99,12 +123,453 @@ def do_double_digest(options_dict):
     else:
         Message.set_trace_status(False)
 
+    # set the report status
+    RunReport.set_status(report.upper() == 'YES')
+
+    # get the restriction site sequences and overhangs, the scanner of the restriction sites of both enzymes and their reverse complementary
+    # sequences and the digest function and scanner of the loci digested in memory
+    (ressite1_seq, ressite2_seq, resoverhang1_seq, resoverhang2_seq, ressite_seq_lists, scanner, digest_function, locus_scanner) = get_digest_setup(rsfile, enzyme1, enzyme2, engine, blocksize)
+
+    # get the path of the fragments file, with the extension .gz when it is compressed
+    fragsfile = get_output_file(fragsfile, gz)
+
+    # get the journal of the digest and the records of the loci completed by an interrupted run with the same options when resume is YES
+    (journal, journal_records_list) = get_digest_journal(fragsfile, options_dict)
+
+    # open the fragments file (compressed in BGZF format when gz is YES), which is truncated at the end of the last locus completed when the digest is resumed
+    if journal_records_list != []:
+        fragsfile_id = open_truncated_output_file(fragsfile, journal_records_list[-1][-1])
+    else:
+        fragsfile_id = open_output_file(fragsfile, gz, gzlevel, gzthreads)
+
+    # initialize the count of the total fragments and written fragments
+    total_fragments_count = 0
+    written_fragments_count = 0
+
+    # initialize the fragments histogram
+    fragments_histogram = FragmentsHistogram()
+
+    # initialize the GC distribution
+    GC_distribution_dict = {}
+
+    # initialize the fragments table
+    fragments_table = create_fragments_table() if fragtable.upper() != 'NONE' else None
+
+    # initialize the fragments columns, whose sequences are segments of the genome store
+    fragments_columns = create_fragments_columns() if fragscolumns.upper() != 'NONE' else None
+
+    # if the genome has to be scanned in blocks
+    if genstore.upper() == 'NONE' and stream.upper() == 'YES':
+
+        # do the digest with a bounded memory
+        RunReport.start_stage('stream digest')
+        genfile_id = open_genome_file(genfile)
+        (total_fragments_count, written_fragments_count, fragments_histogram, GC_distribution_dict) = stream_double_digest(genfile_id, genfile, fragsfile_id, blocksize, ressite1_seq, ressite2_seq, resoverhang1_seq, resoverhang2_seq, scanner, minfragsize, maxfragsize, fragstinterval, fragments_histogram, GC_distribution_dict, pipeline.upper() == 'YES')
+        genfile_id.close()
+        RunReport.stop_stage('stream digest', os.path.getsize(genfile))
+
+    # if every locus has to be digested in memory
+    else:
+
+        # get the positions of the restriction sites cached in a previous run with the same genome and restriction sites
+        RunReport.start_stage('site cache load')
+        (site_cache, entry_file, loci_positions_list) = get_cached_positions(sitecache, sitecachesize, genfile, ressite_seq_lists)
+        RunReport.stop_stage('site cache load')
+
+        # open the cache of the fragments of the loci digested in previous runs with the same digest parameters
+        fragments_cache = LocusFragmentsCache(fragcache, fragcachesize, ['double', ressite1_seq.upper(), ressite2_seq.upper(), resoverhang1_seq.upper(), resoverhang2_seq.upper(), minfragsize, maxfragsize, fragments_table is not None]) if fragcache.upper() != 'NONE' else None
+        manifest_list = []
+        digested_loci_count = 0
+
+        # for each batch of loci of the genome, digested by a pool of processes when there are several ones
+        # (the loci shorter than batchsize are digested together when their sites are found with regular expressions and their fragments are not cached)
+        # (when the pipeline is used, the loci are read ahead by a thread and the fragments are written by another one)
+        digest_args = (ressite1_seq, ressite2_seq, resoverhang1_seq, resoverhang2_seq, locus_scanner, minfragsize, maxfragsize, fragstinterval, True)
+        loci_batchsize = batchsize if engine.upper() != 'NUMPY' and fragments_cache is None else 0
+        found_positions_list = []
+        nucleotides_count = 0
+
+        # add the data of the loci completed by the interrupted run
+        resumed_loci_count = 0
+        for (journal_loci_list, batch_fragments_count, batch_fragments_histogram, batch_GC_distribution_dict, batch_fragments_table, batch_fragments_columns, batch_written_fragments_count, fragsfile_size) in journal_records_list:
+            total_fragments_count += batch_fragments_count
+            fragments_histogram = fragments_histogram.merge(batch_fragments_histogram)
+            GC_distribution_dict = merge_GC_distribution(GC_distribution_dict, batch_GC_distribution_dict)
+            if fragments_table is not None:
+                fragments_table = merge_fragments_table(fragments_table, batch_fragments_table)
+            if fragments_columns is not None:
+                fragments_columns = merge_fragments_columns(fragments_columns, batch_fragments_columns)
+            written_fragments_count = batch_written_fragments_count
+            for (locus_info, locus_len, locus_positions, locus_cache_data) in journal_loci_list:
+                resumed_loci_count += 1
+                nucleotides_count += locus_len
+                if site_cache is not None and loci_positions_list is None:
+                    found_positions_list.append(locus_positions)
+                if fragments_cache is not None:
+                    manifest_list.append((locus_info, locus_len, locus_cache_data[0]))
+
+        # digest the other loci
+        fragments_writer = ThreadedWriter(write_timed_loci_fragments, 16) if pipeline.upper() == 'YES' else None
+        for (loci_list, batch_fragments_count, batch_fragments_histogram, batch_GC_distribution_dict, batch_fragments_table) in digest_genome_loci(genfile, genstore, processes, digest_function, digest_args, fragments_table is not None, loci_positions_list, pipeline.upper() == 'YES', fragments_cache, resumed_loci_count, scanner, loci_batchsize, blocksize):
+
+            # update the count of total fragments, the fragments histogram, the GC distribution, the fragments table and the fragments columns
+            RunReport.start_stage('merge')
+            total_fragments_count += batch_fragments_count
+            fragments_histogram = fragments_histogram.merge(batch_fragments_histogram)
+            GC_distribution_dict = merge_GC_distribution(GC_distribution_dict, batch_GC_distribution_dict)
+            if fragments_table is not None:
+                fragments_table = merge_fragments_table(fragments_table, batch_fragments_table)
+            batch_fragments_columns = None
+            if fragments_columns is not None:
+                batch_fragments_columns = create_fragments_columns()
+                for (locus_info, locus_len, fragments_list, locus_positions, locus_cache_data) in loci_list:
+                    batch_fragments_columns = update_fragments_columns(batch_fragments_columns, locus_info, fragments_list)
+                fragments_columns = merge_fragments_columns(fragments_columns, batch_fragments_columns)
+            RunReport.stop_stage('merge')
+
+            # build the record of the batch in the journal (without the fragments, which are in the fragments file)
+            batch_written_fragments_count = written_fragments_count + sum([len(locus[2]) for locus in loci_list])
+            journal_record = None
+            if journal is not None:
+                journal_loci_list = [(locus_info, locus_len, locus_positions if site_cache is not None and loci_positions_list is None else None, locus_cache_data) for (locus_info, locus_len, fragments_list, locus_positions, locus_cache_data) in loci_list]
+                journal_record = encode_journal_record(journal_loci_list, batch_fragments_count, batch_fragments_histogram, batch_GC_distribution_dict, batch_fragments_table, batch_fragments_columns, batch_written_fragments_count)
+
+            # write the fragments of the loci and then add the record of the batch to the journal
+            if fragments_writer is not None:
+                fragments_writer.write(fragsfile_id, loci_list, written_fragments_count, journal, journal_record)
+            else:
+                write_timed_loci_fragments(fragsfile_id, loci_list, written_fragments_count, journal, journal_record)
+            written_fragments_count = batch_written_fragments_count
+            nucleotides_count += sum([locus[1] for locus in loci_list])
+            Message.print_progress('Fragments written', written_fragments_count, 'fragments', nucleotides_count)
+
+            # for each locus of the batch
+            for (locus_info, locus_len, fragments_list, locus_positions, locus_cache_data) in loci_list:
+
+                # save the positions of the restriction sites when they have been searched
+                if site_cache is not None and loci_positions_list is None:
+                    found_positions_list.append(locus_positions)
+
+                # add the locus to the manifest of the fragments cache
+                if fragments_cache is not None:
+                    (locus_checksum, is_cached) = locus_cache_data
+                    manifest_list.append((locus_info, locus_len, locus_checksum))
+                    if not is_cached:
+                        digested_loci_count += 1
+
+        # wait until the fragments are written
+        if fragments_writer is not None:
+            fragments_writer.close()
+
+        # cache the positions of the restriction sites
+        if site_cache is not None and loci_positions_list is None:
+            RunReport.start_stage('site cache save')
+            site_cache.save(entry_file, found_positions_list, len(ressite_seq_lists))
+            RunReport.stop_stage('site cache save')
+
+        # save the manifest of the genome in the fragments cache
+        if fragments_cache is not None:
+            RunReport.start_stage('fragments cache save')
+            fragments_cache.save_manifest(genfile, manifest_list)
+            RunReport.stop_stage('fragments cache save')
+            Message.print('info', '{0} of {1} loci have been digested and the other ones have been read from the fragments cache.'.format(digested_loci_count, len(manifest_list)))
+
+    # close files
+    RunReport.start_stage('write')
+    fragsfile_id.close()
+    RunReport.stop_stage('write')
+
+    # show OK message 
+    Message.end_progress()
+    Message.print('info', 'The file {0} containing the fragments of the double digest of the genome is created.'.format(get_file_name(fragsfile)))
+
+    # write the statistics and save them in the statistics file
+    title = 'Distribution of fragments after a double digest with {0} and {1}'.format(enzyme1, enzyme2)
+    RunReport.start_stage('statistics')
+    write_fragments_stats(fragstfile, fragments_histogram, fragstinterval, total_fragments_count, written_fragments_count, minfragsize, maxfragsize, title)
+    RunReport.stop_stage('statistics')
+    if plot.upper() == 'YES':
+        RunReport.start_stage('plot')
+        plot_fragments_graphic(fragstfile, fragments_histogram, fragstinterval, title)
+        RunReport.stop_stage('plot')
+
+    # write the GC distribution file
+    RunReport.start_stage('GC distribution')
+    write_GC_distribution(fragsfile, GC_distribution_dict)
+    RunReport.stop_stage('GC distribution')
+
+    # write the fragments table file
+    if fragments_table is not None:
+        RunReport.start_stage('fragments table')
+        write_fragments_table(fragtable, fragments_table)
+        RunReport.stop_stage('fragments table')
+
+    # write the columnar fragments file
+    if fragments_columns is not None:
+        RunReport.start_stage('fragments columns')
+        write_fragments_columns(fragscolumns, fragments_columns, genstore)
+        RunReport.stop_stage('fragments columns')
+
+    # write the report of the run
+    if RunReport.status:
+        write_report(fragstfile, options_dict, [enzyme1, enzyme2], total_fragments_count, written_fragments_count)
+
+    # remove the journal because the digest has been completed
+    if journal is not None:
+        journal.remove()
+
+#-------------------------------------------------------------------------------
+
+def do_single_digest(options_dict):
+    '''Do in silico a single digest of the genome.'''
+
+    genfile = options_dict['genfile']['value']
+    fragsfile = options_dict['fragsfile']['value']
+    fragscolumns = options_dict['fragscolumns']['value']
+    gz = options_dict['gz']['value']
+    gzlevel = options_dict['gzlevel']['value']
+    gzthreads = options_dict['gzthreads']['value']
+    rsfile = options_dict['rsfile']['value']
+    enzyme1 = options_dict['enzyme1']['value']
+    enzyme2 = options_dict['enzyme2']['value']
+    minfragsize = options_dict['minfragsize']['value']
+    maxfragsize = options_dict['maxfragsize']['value']
+    fragstfile = options_dict['fragstfile']['value']
+    fragstinterval = options_dict['fragstinterval']['value']
+    fragtable = options_dict['fragtable']['value']
+    genstore = options_dict['genstore']['value']
+    sitecache = options_dict['sitecache']['value']
+    sitecachesize = options_dict['sitecachesize']['value']
+    fragcache = options_dict['fragcache']['value']
+    fragcachesize = options_dict['fragcachesize']['value']
+    processes = options_dict['processes']['value']
+    engine = options_dict['engine']['value']
+    stream = options_dict['stream']['value']
+    blocksize = options_dict['blocksize']['value']
+    batchsize = options_dict['batchsize']['value']
+    pipeline = options_dict['pipeline']['value']
+    plot = options_dict['plot']['value']
+    report = options_dict['report']['value']
+    verbose = options_dict['verbose']['value']
+    trace = options_dict['trace']['value']
+
+    # set the verbose and trace status
+    if verbose.upper() == 'YES':
+        Message.set_verbose_status(True)
+    else:
+        Message.set_verbose_status(False)
+    if trace.upper() == 'YES':
+        Message.set_trace_status(True)
+    else:
+        Message.set_trace_status(False)
+
+    # set the report status
+    RunReport.set_status(report.upper() == 'YES')
+
+    # get the restriction site sequence and overhangs, the scanner of the restriction sites of the enzyme and the digest function and scanner
+    # of the loci digested in memory
+    (ressite1_seq, ressite2_seq, resoverhang1_seq, resoverhang2_seq, ressite_seq_lists, scanner, digest_function, locus_scanner) = get_digest_setup(rsfile, enzyme1, enzyme2, engine, blocksize)
+
+    # get the path of the fragments file, with the extension .gz when it is compressed
+    fragsfile = get_output_file(fragsfile, gz)
+
+    # get the journal of the digest and the records of the loci completed by an interrupted run with the same options when resume is YES
+    (journal, journal_records_list) = get_digest_journal(fragsfile, options_dict)
+
+    # open the fragments file (compressed in BGZF format when gz is YES), which is truncated at the end of the last locus completed when the digest is resumed
+    if journal_records_list != []:
+        fragsfile_id = open_truncated_output_file(fragsfile, journal_records_list[-1][-1])
+    else:
+        fragsfile_id = open_output_file(fragsfile, gz, gzlevel, gzthreads)
+
+    # initialize the count of the total fragments and written fragments
+    total_fragments_count = 0
+    written_fragments_count = 0
+
+    # initialize the fragments histogram
+    fragments_histogram = FragmentsHistogram()
+
+    # initialize the GC distribution
+    GC_distribution_dict = {}
+
+    # initialize the fragments table
+    fragments_table = create_fragments_table() if fragtable.upper() != 'NONE' else None
+
+    # initialize the fragments columns, whose sequences are segments of the genome store
+    fragments_columns = create_fragments_columns() if fragscolumns.upper() != 'NONE' else None
+
+    # if the genome has to be scanned in blocks
+    if genstore.upper() == 'NONE' and stream.upper() == 'YES':
+
+        # do the digest with a bounded memory
+        RunReport.start_stage('stream digest')
+        genfile_id = open_genome_file(genfile)
+        (total_fragments_count, written_fragments_count, fragments_histogram, GC_distribution_dict) = stream_single_digest(genfile_id, genfile, fragsfile_id, blocksize, ressite1_seq, resoverhang1_seq, resoverhang2_seq, scanner, minfragsize, maxfragsize, fragstinterval, fragments_histogram, GC_distribution_dict, pipeline.upper() == 'YES')
+        genfile_id.close()
+        RunReport.stop_stage('stream digest', os.path.getsize(genfile))
+
+    # if every locus has to be digested in memory
+    else:
+
+        # get the positions of the restriction sites cached in a previous run with the same genome and restriction site
+        RunReport.start_stage('site cache load')
+        (site_cache, entry_file, loci_positions_list) = get_cached_positions(sitecache, sitecachesize, genfile, ressite_seq_lists)
+        RunReport.stop_stage('site cache load')
+
+        # open the cache of the fragments of the loci digested in previous runs with the same digest parameters
+        fragments_cache = LocusFragmentsCache(fragcache, fragcachesize, ['single', ressite1_seq.upper(), resoverhang1_seq.upper(), resoverhang2_seq.upper(), minfragsize, maxfragsize, fragments_table is not None]) if fragcache.upper() != 'NONE' else None
+        manifest_list = []
+        digested_loci_count = 0
+
+        # for each batch of loci of the genome, digested by a pool of processes when there are several ones
+        # (the loci shorter than batchsize are digested together when their sites are found with regular expressions and their fragments are not cached)
+        # (when the pipeline is used, the loci are read ahead by a thread and the fragments are written by another one)
+        digest_args = (ressite1_seq, resoverhang1_seq, resoverhang2_seq, locus_scanner, minfragsize, maxfragsize, fragstinterval, True)
+        loci_batchsize = batchsize if engine.upper() != 'NUMPY' and fragments_cache is None else 0
+        found_positions_list = []
+        nucleotides_count = 0
+
+        # add the data of the loci completed by the interrupted run
+        resumed_loci_count = 0
+        for (journal_loci_list, batch_fragments_count, batch_fragments_histogram, batch_GC_distribution_dict, batch_fragments_table, batch_fragments_columns, batch_written_fragments_count, fragsfile_size) in journal_records_list:
+            total_fragments_count += batch_fragments_count
+            fragments_histogram = fragments_histogram.merge(batch_fragments_histogram)
+            GC_distribution_dict = merge_GC_distribution(GC_distribution_dict, batch_GC_distribution_dict)
+            if fragments_table is not None:
+                fragments_table = merge_fragments_table(fragments_table, batch_fragments_table)
+            if fragments_columns is not None:
+                fragments_columns = merge_fragments_columns(fragments_columns, batch_fragments_columns)
+            written_fragments_count = batch_written_fragments_count
+            for (locus_info, locus_len, locus_positions, locus_cache_data) in journal_loci_list:
+                resumed_loci_count += 1
+                nucleotides_count += locus_len
+                if site_cache is not None and loci_positions_list is None:
+                    found_positions_list.append(locus_positions)
+                if fragments_cache is not None:
+                    manifest_list.append((locus_info, locus_len, locus_cache_data[0]))
+
+        # digest the other loci
+        fragments_writer = ThreadedWriter(write_timed_loci_fragments, 16) if pipeline.upper() == 'YES' else None
+        for (loci_list, batch_fragments_count, batch_fragments_histogram, batch_GC_distribution_dict, batch_fragments_table) in digest_genome_loci(genfile, genstore, processes, digest_function, digest_args, fragments_table is not None, loci_positions_list, pipeline.upper() == 'YES', fragments_cache, resumed_loci_count, scanner, loci_batchsize, blocksize):
+
+            # update the count of total fragments, the fragments histogram, the GC distribution, the fragments table and the fragments columns
+            RunReport.start_stage('merge')
+            total_fragments_count += batch_fragments_count
+            fragments_histogram = fragments_histogram.merge(batch_fragments_histogram)
+            GC_distribution_dict = merge_GC_distribution(GC_distribution_dict, batch_GC_distribution_dict)
+            if fragments_table is not None:
+                fragments_table = merge_fragments_table(fragments_table, batch_fragments_table)
+            batch_fragments_columns = None
+            if fragments_columns is not None:
+                batch_fragments_columns = create_fragments_columns()
+                for (locus_info, locus_len, fragments_list, locus_positions, locus_cache_data) in loci_list:
+                    batch_fragments_columns = update_fragments_columns(batch_fragments_columns, locus_info, fragments_list)
+                fragments_columns = merge_fragments_columns(fragments_columns, batch_fragments_columns)
+            RunReport.stop_stage('merge')
+
+            # build the record of the batch in the journal (without the fragments, which are in the fragments file)
+            batch_written_fragments_count = written_fragments_count + sum([len(locus[2]) for locus in loci_list])
+            journal_record = None
+            if journal is not None:
+                journal_loci_list = [(locus_info, locus_len, locus_positions if site_cache is not None and loci_positions_list is None else None, locus_cache_data) for (locus_info, locus_len, fragments_list, locus_positions, locus_cache_data) in loci_list]
+                journal_record = encode_journal_record(journal_loci_list, batch_fragments_count, batch_fragments_histogram, batch_GC_distribution_dict, batch_fragments_table, batch_fragments_columns, batch_written_fragments_count)
+
+            # write the fragments of the loci and then add the record of the batch to the journal
+            if fragments_writer is not None:
+                fragments_writer.write(fragsfile_id, loci_list, written_fragments_count, journal, journal_record)
+            else:
+                write_timed_loci_fragments(fragsfile_id, loci_list, written_fragments_count, journal, journal_record)
+            written_fragments_count = batch_written_fragments_count
+            nucleotides_count += sum([locus[1] for locus in loci_list])
+            Message.print_progress('Fragments written', written_fragments_count, 'fragments', nucleotides_count)
+
+            # for each locus of the batch
+            for (locus_info, locus_len, fragments_list, locus_positions, locus_cache_data) in loci_list:
+
+                # save the positions of the restriction sites when they have been searched
+                if site_cache is not None and loci_positions_list is None:
+                    found_positions_list.append(locus_positions)
+
+                # add the locus to the manifest of the fragments cache
+                if fragments_cache is not None:
+                    (locus_checksum, is_cached) = locus_cache_data
+                    manifest_list.append((locus_info, locus_len, locus_checksum))
+                    if not is_cached:
+                        digested_loci_count += 1
+
+        # wait until the fragments are written
+        if fragments_writer is not None:
+            fragments_writer.close()
+
+        # cache the positions of the restriction sites
+        if site_cache is not None and loci_positions_list is None:
+            RunReport.start_stage('site cache save')
+            site_cache.save(entry_file, found_positions_list, len(ressite_seq_lists))
+            RunReport.stop_stage('site cache save')
+
+        # save the manifest of the genome in the fragments cache
+        if fragments_cache is not None:
+            RunReport.start_stage('fragments cache save')
+            fragments_cache.save_manifest(genfile, manifest_list)
+            RunReport.stop_stage('fragments cache save')
+            Message.print('info', '{0} of {1} loci have been digested and the other ones have been read from the fragments cache.'.format(digested_loci_count, len(manifest_list)))
+
+    # close files
+    RunReport.start_stage('write')
+    fragsfile_id.close()
+    RunReport.stop_stage('write')
+
+    # show OK message 
+    Message.end_progress()
+    Message.print('info', 'The file {0} containing the fragments of the single digest of the genome is created.'.format(get_file_name(fragsfile)))
+
+    # write the statistics and save them in the statistics file
+    title = 'Distribution of fragments after a single digest with {0}'.format(enzyme1)
+    RunReport.start_stage('statistics')
+    write_fragments_stats(fragstfile, fragments_histogram, fragstinterval, total_fragments_count, written_fragments_count, minfragsize, maxfragsize, title)
+    RunReport.stop_stage('statistics')
+    if plot.upper() == 'YES':
+        RunReport.start_stage('plot')
+        plot_fragments_graphic(fragstfile, fragments_histogram, fragstinterval, title)
+        RunReport.stop_stage('plot')
+
+    # write the GC distribution file
+    RunReport.start_stage('GC distribution')
+    write_GC_distribution(fragsfile, GC_distribution_dict)
+    RunReport.stop_stage('GC distribution')
+
+    # write the fragments table file
+    if fragments_table is not None:
+        RunReport.start_stage('fragments table')
+        write_fragments_table(fragtable, fragments_table)
+        RunReport.stop_stage('fragments table')
+
+    # write the columnar fragments file
+    if fragments_columns is not None:
+        RunReport.start_stage('fragments columns')
+        write_fragments_columns(fragscolumns, fragments_columns, genstore)
+        RunReport.stop_stage('fragments columns')
+
+    # write the report of the run
+    if RunReport.status:
+        write_report(fragstfile, options_dict, [enzyme1], total_fragments_count, written_fragments_count)
+
+    # remove the journal because the digest has been completed
+    if journal is not None:
+        journal.remove()
+
+#-------------------------------------------------------------------------------
+
+def get_digest_setup(rsfile, enzyme1, enzyme2, engine, blocksize):
+    '''Get the setup of a digest with enzyme1 and enzyme2, double when their restriction site sequences are different and single otherwise: the tuple (ressite1_seq, ressite2_seq, resoverhang1_seq, resoverhang2_seq, ressite_seq_lists, scanner, digest_function, locus_scanner), where scanner finds the sequences of ressite_seq_lists in one pass and digest_function is the function of engine that digests a locus in memory with locus_scanner.'''
+
     # get the restriction site sequences
     (ressite1_seq, ressite1_lcut_seq, ressite1_rcut_seq, ressite2_seq, ressite2_lcut_seq, ressite2_rcut_seq) = get_ressites(rsfile, enzyme1, enzyme2)
-    Message.print('trace', 'ressite1_seq: {0} - ressite1_lcut_seq: {1} - ressite1_rcut_seq: {2}'.format(ressite1_seq, ressite1_lcut_seq, ressite1_rcut_seq))
-    Message.print('trace', 'ressite2_seq: {0} - ressite2_lcut_seq: {1} - ressite2_rcut_seq: {2}'.format(ressite2_seq, ressite2_lcut_seq, ressite2_rcut_seq))
+    Message.print('trace', 'ressite1_seq: {0} - ressite1_lcut_seq: {1} - ressite1_rcut_seq: {2}', ressite1_seq, ressite1_lcut_seq, ressite1_rcut_seq)
+    Message.print('trace', 'ressite2_seq: {0} - ressite2_lcut_seq: {1} - ressite2_rcut_seq: {2}', ressite2_seq, ressite2_lcut_seq, ressite2_rcut_seq)
 
-    # get the restriction overhangs
+    # get the restriction overhangs (the restriction overhang sequences in both ends can be different; only the length of
+    # resoverhang2_seq is used, which is the one of the left cut of the first enzyme when it is the longest, as the program always did)
     if len(ressite1_lcut_seq) >= len(ressite1_rcut_seq):
         resoverhang1_seq = get_reverse_complementary_sequence(ressite1_lcut_seq)
     else:
@@ -113,484 +578,1250 @@ def do_double_digest(options_dict):
         resoverhang2_seq = ressite1_lcut_seq
     else:
         resoverhang2_seq = get_reverse_complementary_sequence(ressite2_rcut_seq)
-    Message.print('trace', 'resoverhang1_seq: {0}'.format(resoverhang1_seq))
-    Message.print('trace', 'resoverhang2_seq: {0}'.format(resoverhang2_seq))
+    Message.print('trace', 'resoverhang1_seq: {0}', resoverhang1_seq)
+    Message.print('trace', 'resoverhang2_seq: {0}', resoverhang2_seq)
 
-    # get the list of sequences corresponding to each enzyme
-    unambiguous_ressite1_seq_list = get_unambiguous_sequence_list(ressite1_seq.upper())
-    unambiguous_ressite2_seq_list = get_unambiguous_sequence_list(ressite2_seq.upper())
-    Message.print('trace', 'unambiguous_ressite1_seq_list: {0}'.format(unambiguous_ressite1_seq_list))
-    Message.print('trace', 'unambiguous_ressite2_seq_list: {0}'.format(unambiguous_ressite2_seq_list))
+    # if it is a double digest
+    if ressite1_seq.upper() != ressite2_seq.upper():
 
-    # open the genome file
-    try:
-        if genfile.endswith('.gz'):
-            genfile_id = gzip.open(genfile, mode='rt', encoding='iso-8859-1')
+        # build the scanner of the restriction sites of both enzymes and their reverse complementary sequences with their ambiguity
+        # codes (the palindromic sequences are shared, so their positions serve both strands)
+        ressite_seq_lists = [[ressite1_seq.upper()], [ressite2_seq.upper()], [get_reverse_complementary_sequence(ressite1_seq.upper())], [get_reverse_complementary_sequence(ressite2_seq.upper())]]
+        scanner = RestrictionSiteScanner(ressite_seq_lists)
+
+        # set the digest function and the scanner of the loci digested in memory
+        if engine.upper() == 'NUMPY':
+            digest_function = digest_locus_double_array
+            locus_scanner = NumpySiteScanner([ressite1_seq, ressite2_seq, get_reverse_complementary_sequence(ressite1_seq.upper()), get_reverse_complementary_sequence(ressite2_seq.upper())], blocksize)
         else:
-            genfile_id = open(genfile, mode='r', encoding='iso-8859-1')
-    except:
-        raise ProgramError('F002', genfile)
+            digest_function = digest_locus_double
+            locus_scanner = scanner
 
-    # open the fragments file
-    try:
-        fragsfile_id = open(fragsfile, mode='w', encoding='iso-8859-1')
-    except:
-        raise ProgramError('F002', fragsfile)
+    # if it is a single digest
+    else:
 
-    # set the pattern of the head records (>locus_info)
-    pattern = r'^>(.*)$'
+        # build the scanner of the restriction sites of the enzyme with its ambiguity codes
+        ressite_seq_lists = [[ressite1_seq.upper()]]
+        scanner = RestrictionSiteScanner(ressite_seq_lists)
 
-    # initialize the count of the total fragments and written fragments
-    total_fragments_count = 0
-    written_fragments_count = 0
+        # set the digest function and the scanner of the loci digested in memory
+        if engine.upper() == 'NUMPY':
+            digest_function = digest_locus_single_array
+            locus_scanner = NumpySiteScanner([ressite1_seq], blocksize)
+        else:
+            digest_function = digest_locus_single
+            locus_scanner = scanner
+    Message.print('trace', 'ressite_seq_lists: {0}', ressite_seq_lists)
 
-    # initialize the intervals
-    intervals_dict = {}
+    # return the setup of the digest
+    return (ressite1_seq, ressite2_seq, resoverhang1_seq, resoverhang2_seq, ressite_seq_lists, scanner, digest_function, locus_scanner)
 
-    # initialize the GC distribution
-    GC_distribution_dict = {}
- 
-    # read the first record
-    record = genfile_id.readline()
+#-------------------------------------------------------------------------------
+
+def digest(genfile, enzyme1, enzyme2, minfragsize, maxfragsize, rsfile=None, genstore='NONE', engine='REGEX', blocksize=1000000):
+    '''
+    Digest a genome in this process and yield, in the order of the fragments
+    file, a FragmentRecord for each fragment whose length is between
+    minfragsize and maxfragsize. It is a double digest when the restriction
+    sites of enzyme1 and enzyme2 are different and a single digest otherwise;
+    blocksize is the nucleotides number of the blocks coded by the NUMPY
+    engine. The fragments sequences are not built until they are used, so they
+    are taken from the loci kept in memory (or the genome store mapped in
+    memory when genstore is not NONE) while the fragments are used.
+    '''
+
+    # get the restriction sites file of the package when it is not set
+    if rsfile is None:
+        rsfile = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'restrictionsites.txt')
+
+    # get the restriction site sequences and overhangs and the digest function and scanner of the loci
+    (ressite1_seq, ressite2_seq, resoverhang1_seq, resoverhang2_seq, ressite_seq_lists, scanner, digest_function, locus_scanner) = get_digest_setup(rsfile, enzyme1, enzyme2, engine, blocksize)
+
+    # set the arguments of the digest function (the fragments are gotten without sequence)
+    if ressite1_seq.upper() != ressite2_seq.upper():
+        digest_args = (ressite1_seq, ressite2_seq, resoverhang1_seq, resoverhang2_seq, locus_scanner, minfragsize, maxfragsize, 1, False)
+    else:
+        digest_args = (ressite1_seq, resoverhang1_seq, resoverhang2_seq, locus_scanner, minfragsize, maxfragsize, 1, False)
+
+    # get the loci of the genome (the genome store is not closed, so the fragments sequences can be read after the digest)
+    GC_N_index = None
+    if genstore.upper() != 'NONE':
+        genome_store = open_genome_store(genfile, genstore)
+        GC_N_index = GCNIndex(genstore)
+        loci_iterator = ((locus_info, genome_store.seq, offset, offset + locus_len) for (locus_info, offset, locus_len) in genome_store.get_loci_list())
+    else:
+        loci_iterator = get_genome_loci(genfile, genstore)
+
+    # for each locus, yield its fragments
+    for (contig_index, (locus_info, locus_seq, locus_start, locus_end)) in enumerate(loci_iterator):
+        fragments_list = digest_function(locus_seq, locus_start, locus_end, None, GC_N_index, *digest_args, FragmentsHistogram(), {}, None)[0]
+        for (fragment_len, GC_rate_formatted, strand, start_position, end_position, fragment_seq) in fragments_list:
+            seq_start = locus_start + (start_position - 1 if strand == '+' else start_position - fragment_len)
+            yield FragmentRecord(contig_index, locus_info, strand, start_position, end_position, fragment_len, float(GC_rate_formatted), locus_seq, seq_start)
+
+#-------------------------------------------------------------------------------
 
-    # while there are records
-    while record != '':
+def get_double_digest_cuts(ressite1_positions_list, ressite2_positions_list, ressite1_seq, resoverhang1_seq, resoverhang2_seq):
+    '''Get the list of start and end positions of the fragments of a double digest in a strand from the sorted positions of the restriction sites of both enzymes in this strand.'''
 
-        # process the head record 
-        if record.startswith('>'):
+    # initialize the cuts list
+    cuts_list = []
 
-            # extract the data 
-            mo = re.search(pattern, record)
-            locus_info = mo.group(1)
+    # get the lengths of the restriction site of the first enzyme and the restriction overhangs
+    ressite1_len = len(ressite1_seq)
+    resoverhang1_len = len(resoverhang1_seq)
+    resoverhang2_len = len(resoverhang2_seq)
 
-            # initialize the locus sequence of Watson strand
-            watson_locus_seq = ''
+    # initialize the index of the next restriction site of the second enzyme; both lists are sorted, so it only goes forward
+    # and the pairing is done in a single sweep
+    j = 0
+    ressite1_count = len(ressite1_positions_list)
+    ressite2_count = len(ressite2_positions_list)
 
-            # read the next record
-            record = genfile_id.readline()
+    # for each restriction site of the first enzyme, verify if there is a cut with the second enzyme
+    for i in range(ressite1_count):
 
+        # search the next restriction site of the second enzyme from the restriction site of the first enzyme
+        ressite1_position = ressite1_positions_list[i]
+        while j < ressite2_count and ressite2_positions_list[j] < ressite1_position + ressite1_len:
+            j += 1
+
+        # if any restriction site of the second enzyme is not found, exit of the loop because there is not cut
+        if j == ressite2_count:
+            break
+
+        # get the next restriction site of the second enzyme from the restriction site of the first enzyme
+        ressite2_position = ressite2_positions_list[j]
+
+        # if a restriction site of the second enzyme is found and this is previous to a restriction site of the first enzyme
+        if i == (ressite1_count - 1) or ressite2_position < ressite1_positions_list[i + 1]:
+
+            # calculate the start and end positions of the fragment in the locus
+            cuts_list.append((ressite1_position + ressite1_len - resoverhang1_len, ressite2_position + resoverhang2_len))
+
+    # return the cuts list
+    return cuts_list
+
+#-------------------------------------------------------------------------------
+
+def get_single_digest_cuts(ressite1_positions_list, locus_len, ressite1_seq, resoverhang1_seq, resoverhang2_seq):
+    '''Get the list of start and end positions of the fragments of a single digest in a locus from the sorted positions of the restriction sites.'''
+
+    # initialize the cuts list
+    cuts_list = []
+
+    # inicialize the last position processed
+    last_ressite1_position = 0
+
+    # for each restriction site, the fragment goes from the previous cut (or the locus start) to the site
+    for i in range(len(ressite1_positions_list)):
+        if i == 0:
+            start_position = 0
         else:
+            start_position = last_ressite1_position + len(ressite1_seq) - len(resoverhang1_seq)
+        end_position = ressite1_positions_list[i] + len(resoverhang2_seq)
+        cuts_list.append((start_position, end_position))
+        last_ressite1_position = ressite1_positions_list[i]
 
-            # control the FASTA format
-            raise ProgramError('F003', genfile, 'FASTA')
+    # if there are nucleotides after the last restriction site, add the last fragment
+    if last_ressite1_position < locus_len:
+        start_position = last_ressite1_position + len(ressite1_seq) - len(resoverhang1_seq)
+        end_position = locus_len
+        cuts_list.append((start_position, end_position))
 
-        # while there are records and they are sequence
-        while record != '' and not record.startswith('>'):
+    # return the cuts list
+    return cuts_list
 
-            # concatenate the record to the locus sequence of Watson strand
-            watson_locus_seq += record.strip().upper()
+#-------------------------------------------------------------------------------
 
-            # read the next record
-            record = genfile_id.readline()
+def get_locus_fragments(locus_seq, locus_start, locus_end, cuts_list, strand, GC_N_index, minfragsize, maxfragsize, fragstinterval, is_seq, fragments_histogram, GC_distribution_dict, fragments_table):
+    '''Get the fragments of a strand of a locus from their cuts (in the coordinates of the strand), and update the fragments histogram and the GC distribution. The fragments of the Crick strand are gotten as the reverse complementary sequences of their Watson strand segments. When GC_N_index is not None (the locus is in a genome store), the GC rates and the N counts are got from the index and only the sequences of the fragments written are read. When is_seq is False, the fragments have no sequence (None), which can be got later from their positions.'''
 
-        Message.print('trace', 'watson_locus_seq: {0}'.format(watson_locus_seq))
+    import numpy as np
 
-        # initialize the list of the restriction sites found of the first enzyme in the Watson strand
-        ressite1_positions_list = []
+    # initialize the fragments list
+    fragments_list = []
 
-        # build the list position found corresponding to first enzyme in the Watson strand
-        for unambigous_ressite1_seq in unambiguous_ressite1_seq_list:
-            Message.print('trace', 'unambigous_ressite1_seq: {0}'.format(unambigous_ressite1_seq))
-            for m in re.finditer(r'(?=({0}))'.format(unambigous_ressite1_seq), watson_locus_seq):
-                ressite1_positions_list.append(m.start())
+    # get the locus length
+    locus_len = locus_end - locus_start
 
-        # sort the list position found corresponding to first enzyme in the Watson strand
-        ressite1_positions_list.sort()
-        Message.print('trace', 'ressite1_positions_list: {0}'.format(ressite1_positions_list))
+    # get the segments of the Watson strand of the genome inserts (in the Crick strand, they have the same GC rate and N count)
+    segments_list = []
+    for (start_position, end_position) in cuts_list:
+        clipped_end_position = max(start_position, min(end_position, locus_len))
+        if strand == '+':
+            segments_list.append((start_position, clipped_end_position))
+        else:
+            segments_list.append((locus_len - clipped_end_position, locus_len - start_position))
 
-        # for each restriction site of the first enzyme in the Watson strand, verify if there is a cut with the second enzyme
-        for i in range(len(ressite1_positions_list)):
+    # get the GC rates and the N counts of all segments from the GC and N index
+    if GC_N_index is not None and segments_list != []:
+        segments_array = np.array(segments_list, dtype=np.int64) + locus_start
+        (GC_rates_array, N_counts_array) = GC_N_index.get_GC_N_arrays(segments_array[:, 0], segments_array[:, 1])
+        GC_N_data_list = list(zip(GC_rates_array.tolist(), N_counts_array.tolist()))
 
-            # initialize the list of restriction site of the second enzyme from the restriction site of the first enzyme in the Watson strand
-            ressite2_positions_list = []
-         
-            # search the next restriction site of every unambiguous sequence of the second enzyme from the restriction site of the first enzyme in the Watson strand
-            for unambigous_ressite2_seq in unambiguous_ressite2_seq_list:
-                Message.print('trace', 'unambigous_ressite2_seq: {0}'.format(unambigous_ressite2_seq))
-                unambigous_ressite2_position = watson_locus_seq.find(unambigous_ressite2_seq, (ressite1_positions_list[i] + len(ressite1_seq)))
-                if unambigous_ressite2_position != -1:
-                    ressite2_positions_list.append(unambigous_ressite2_position)
+    # for each cut
+    for (i, (start_position, end_position)) in enumerate(cuts_list):
 
-            # if any restriction site of the second enzyme is not found, exit of the while loop because there is not cut
-            if ressite2_positions_list == []:
-                break; 
+        # calculate the fragment length
+        (segment_start, segment_end) = segments_list[i]
+        fragment_len = segment_end - segment_start
 
-            # calculate the next restriction site of every unambiguous sequence of the second enzyme from the restriction site of the first enzyme in the Watson strand
-            ressite2_position = min(ressite2_positions_list)
-            Message.print('trace', 'ressite1_positions_list[i]: {0} - ressite2_positions_list: {1} - ressite2_position: {2}'.format(ressite1_positions_list[i], ressite2_positions_list, ressite2_position))
+        # get the genome insert, and calculate the GC rate and the N count
+        if GC_N_index is not None:
+            fragment_seq = None
+            (GC_rate, N_count) = GC_N_data_list[i]
+        else:
+            fragment_seq = locus_seq[locus_start + segment_start:locus_start + segment_end].decode('iso-8859-1')
+            (GC_rate, N_count) = get_GC_N_data(fragment_seq)
+        GC_rate_formatted = '{0:3.2f}'.format(GC_rate)
 
-            # if a restriction site of the second enzyme is found and this is previous to a restriction site of the first enzyme
-            if i == (len(ressite1_positions_list) - 1) or ressite2_position < ressite1_positions_list[i + 1]:
+        # if the fragment length is between the lower and the upper loci fragments size
+        if minfragsize <= fragment_len <= maxfragsize:
 
-                # add 1 to the count of total fragments
-                total_fragments_count += 1
+            # get the genome insert when it has not been read
+            if not is_seq:
+                fragment_seq = None
+            elif fragment_seq is None:
+                fragment_seq = locus_seq[locus_start + segment_start:locus_start + segment_end].decode('iso-8859-1')
 
-                # calculate the start and end positions of the fragment in the genome
-                start_position = ressite1_positions_list[i] + len(ressite1_seq) - len(resoverhang1_seq)
-                end_position = ressite2_position + len(resoverhang2_seq)
+            # add the fragment with the positions of its FASTA head
+            if strand == '+':
+                fragments_list.append((fragment_len, GC_rate_formatted, strand, start_position + 1, end_position, fragment_seq))
+            else:
+                fragments_list.append((fragment_len, GC_rate_formatted, strand, locus_len - start_position, locus_len - end_position + 1, get_reverse_complementary_sequence(fragment_seq) if is_seq else None))
 
-                # get the genome insert
-                fragment_seq = watson_locus_seq[start_position:end_position].upper()
+            # update the GC distribution
+            GC_distribution_dict[GC_rate_formatted] = GC_distribution_dict.get(GC_rate_formatted, 0) + 1
 
-                # calculate the fragment length
-                fragment_len = len(fragment_seq)
+        # update the fragments histogram with the fragment length
+        fragments_histogram.update(fragment_len, N_count)
 
-                # calculate the GC rate and the N count
-                (GC_rate, N_count) = get_GC_N_data(fragment_seq)
-                GC_rate_formatted = '{0:3.2f}'.format(GC_rate)
+        # add the fragment to the fragments table
+        if fragments_table is not None:
+            fragments_table = update_fragments_table(fragments_table, fragment_len, GC_rate, N_count)
 
-                # if the fragment length is between the lower and the upper loci fragments size
-                if minfragsize <= fragment_len <= maxfragsize:
+    # return the fragments list, the fragments histogram, the GC distribution and the fragments table
+    return (fragments_list, fragments_histogram, GC_distribution_dict, fragments_table)
 
-                    # add 1 to the count of fragments written
-                    written_fragments_count += 1
+#-------------------------------------------------------------------------------
 
-                    # write the FASTA head and fragment in the fragments file
-                    fragsfile_id.write('>fragment: {0:d} | length: {1:d} | GC: {2} | strand: {3} | start: {4:d} | end: {5:d} | locus: {6}\n'.format(written_fragments_count, fragment_len, GC_rate_formatted, '+', start_position + 1, end_position,  locus_info))
-                    fragsfile_id.write('{0}\n'.format(fragment_seq))
-                    Message.print('trace', 'fragment_seq: {0}'.format(fragment_seq))
+def digest_locus_double(locus_seq, locus_start, locus_end, positions_lists, GC_N_index, ressite1_seq, ressite2_seq, resoverhang1_seq, resoverhang2_seq, scanner, minfragsize, maxfragsize, fragstinterval, is_seq, fragments_histogram, GC_distribution_dict, fragments_table):
+    '''Do the double digest of a locus held in locus_seq[locus_start:locus_end] and get its fragments in the order they are written. The scanner has the sequences of the first and the second enzyme and their reverse complementary ones, so the restriction sites of both strands are found in a single scan of the Watson strand; the scan is skipped when positions_lists has the positions found in a previous run or in the scan of a batch of loci.'''
 
-                    # notify the reads have been written
-                    Message.print('verbose', '\rFragments written ... {0:9d}'.format(written_fragments_count))
+    # get the locus length
+    locus_len = locus_end - locus_start
 
-                    # update the GC distribution
-                    GC_distribution_dict[GC_rate_formatted] = GC_distribution_dict.get(GC_rate_formatted, 0) + 1
+    # get the positions of the restriction sites of each enzyme in the Watson strand and of their reverse complementary sequences
+    if positions_lists is None:
+        RunReport.start_stage('scan')
+        positions_lists = ([], [], [], [])
+        for (position, tag) in scanner.scan(locus_seq, locus_start, locus_end):
+            positions_lists[tag].append(position - locus_start)
+        RunReport.stop_stage('scan', locus_len)
+    else:
+        positions_lists = tuple([positions if isinstance(positions, list) else positions.tolist() for positions in positions_lists])
+    (ressite1_positions_list, ressite2_positions_list, revcompl_ressite1_positions_list, revcompl_ressite2_positions_list) = positions_lists
+    Message.print('trace', 'ressite1_positions_list: {0}', ressite1_positions_list)
+    Message.print('trace', 'ressite2_positions_list: {0}', ressite2_positions_list)
+
+    # get the fragments of the Watson strand
+    RunReport.start_stage('cuts')
+    watson_cuts_list = get_double_digest_cuts(ressite1_positions_list, ressite2_positions_list, ressite1_seq, resoverhang1_seq, resoverhang2_seq)
+    RunReport.stop_stage('cuts')
+    RunReport.start_stage('fragments')
+    (watson_fragments_list, fragments_histogram, GC_distribution_dict, fragments_table) = get_locus_fragments(locus_seq, locus_start, locus_end, watson_cuts_list, '+', GC_N_index, minfragsize, maxfragsize, fragstinterval, is_seq, fragments_histogram, GC_distribution_dict, fragments_table)
+    RunReport.stop_stage('fragments')
+
+    # map the reverse complementary restriction sites in the Watson strand to the positions of the restriction sites in the Crick strand
+    crick_ressite1_positions_list = [locus_len - position - len(ressite1_seq) for position in reversed(revcompl_ressite1_positions_list)]
+    crick_ressite2_positions_list = [locus_len - position - len(ressite2_seq) for position in reversed(revcompl_ressite2_positions_list)]
+
+    # get the fragments of the Crick strand
+    RunReport.start_stage('cuts')
+    crick_cuts_list = get_double_digest_cuts(crick_ressite1_positions_list, crick_ressite2_positions_list, ressite1_seq, resoverhang1_seq, resoverhang2_seq)
+    RunReport.stop_stage('cuts')
+    RunReport.start_stage('fragments')
+    (crick_fragments_list, fragments_histogram, GC_distribution_dict, fragments_table) = get_locus_fragments(locus_seq, locus_start, locus_end, crick_cuts_list, '-', GC_N_index, minfragsize, maxfragsize, fragstinterval, is_seq, fragments_histogram, GC_distribution_dict, fragments_table)
+    RunReport.stop_stage('fragments')
+
+    # return the fragments list, the count of total fragments, the fragments histogram, the GC distribution, the fragments table and the positions of the restriction sites
+    return (watson_fragments_list + crick_fragments_list, len(watson_cuts_list) + len(crick_cuts_list), fragments_histogram, GC_distribution_dict, fragments_table, positions_lists)
 
-                # update the intervals with the fragment length
-                intervals_dict = update_fragments_intervals(intervals_dict, fragstinterval, fragment_len, N_count)
+#-------------------------------------------------------------------------------
 
-        # get the sequence of the Crick strand
-        crick_locus_seq = get_reverse_complementary_sequence(watson_locus_seq)
-        Message.print('trace', 'crick_locus_seq: {0}'.format(crick_locus_seq))
+def digest_locus_single(locus_seq, locus_start, locus_end, positions_lists, GC_N_index, ressite1_seq, resoverhang1_seq, resoverhang2_seq, scanner, minfragsize, maxfragsize, fragstinterval, is_seq, fragments_histogram, GC_distribution_dict, fragments_table):
+    '''Do the single digest of a locus held in locus_seq[locus_start:locus_end] and get its fragments in the order they are written; the scan is skipped when positions_lists has the positions found in a previous run or in the scan of a batch of loci.'''
 
-        # initialize the list of the restriction sites found of the first enzyme in the Crick strand
-        ressite1_positions_list = []
+    # get the positions of the restriction sites in the Watson strand
+    if positions_lists is None:
+        RunReport.start_stage('scan')
+        ressite1_positions_list = [position - locus_start for (position, tag) in scanner.scan(locus_seq, locus_start, locus_end)]
+        RunReport.stop_stage('scan', locus_end - locus_start)
+    else:
+        ressite1_positions_list = positions_lists[0] if isinstance(positions_lists[0], list) else positions_lists[0].tolist()
+    Message.print('trace', 'ressite1_positions_list: {0}', ressite1_positions_list)
 
-        # build the list position found corresponding to first enzyme in the Crick strand
-        for unambigous_ressite1_seq in unambiguous_ressite1_seq_list:
-            Message.print('trace', 'unambigous_ressite1_seq: {0}'.format(unambigous_ressite1_seq))
-            for m in re.finditer(r'(?=({0}))'.format(unambigous_ressite1_seq), crick_locus_seq):
-                ressite1_positions_list.append(m.start())
+    # get the fragments of the Watson strand
+    RunReport.start_stage('cuts')
+    cuts_list = get_single_digest_cuts(ressite1_positions_list, locus_end - locus_start, ressite1_seq, resoverhang1_seq, resoverhang2_seq)
+    RunReport.stop_stage('cuts')
+    RunReport.start_stage('fragments')
+    (fragments_list, fragments_histogram, GC_distribution_dict, fragments_table) = get_locus_fragments(locus_seq, locus_start, locus_end, cuts_list, '+', GC_N_index, minfragsize, maxfragsize, fragstinterval, is_seq, fragments_histogram, GC_distribution_dict, fragments_table)
+    RunReport.stop_stage('fragments')
 
-        # sort the list position found corresponding to first enzyme in the Crick strand
-        ressite1_positions_list.sort()
-        Message.print('trace', 'ressite1_positions_list: {0}'.format(ressite1_positions_list))
+    # return the fragments list, the count of total fragments, the fragments histogram, the GC distribution, the fragments table and the positions of the restriction sites
+    return (fragments_list, len(cuts_list), fragments_histogram, GC_distribution_dict, fragments_table, (ressite1_positions_list,))
 
-        # for each restriction site of the first enzyme in the Crick strand, verify if there is a cut with the second enzyme
-        for i in range(len(ressite1_positions_list)):
+#-------------------------------------------------------------------------------
 
-            # initialize the list of restriction site of the second enzyme from the restriction site of the first enzyme in the Crick strand
-            ressite2_positions_list = []
-         
-            # search the next restriction site of every unambiguous sequence of the second enzyme from the restriction site of the first enzyme in the Crick strand
-            for unambigous_ressite2_seq in unambiguous_ressite2_seq_list:
-                Message.print('trace', 'unambigous_ressite2_seq: {0}'.format(unambigous_ressite2_seq))
-                unambigous_ressite2_position = crick_locus_seq.find(unambigous_ressite2_seq, (ressite1_positions_list[i] + len(ressite1_seq)))
-                if unambigous_ressite2_position != -1:
-                    ressite2_positions_list.append(unambigous_ressite2_position)
+def get_single_digest_cuts_array(ressite1_positions_array, locus_len, ressite1_seq, resoverhang1_seq, resoverhang2_seq):
+    '''Get the arrays of start and end positions of the fragments of a single digest in a locus from the sorted array of positions of the restriction sites.'''
 
-            # if any restriction site of the second enzyme is not found, exit of the while loop because there is not cut
-            if ressite2_positions_list == []:
-                break; 
+    import numpy as np
 
-            # calculate the next restriction site of every unambiguous sequence of the second enzyme from the restriction site of the first enzyme in the Crick strand
-            ressite2_position = min(ressite2_positions_list)
-            Message.print('trace', 'ressite1_positions_list[i]: {0} - ressite2_positions_list: {1} - ressite2_position: {2}'.format(ressite1_positions_list[i], ressite2_positions_list, ressite2_position))
+    # every fragment goes from the previous cut (or the locus start) to a restriction site
+    start_positions_array = np.concatenate(([0], ressite1_positions_array[:-1] + len(ressite1_seq) - len(resoverhang1_seq)))[:len(ressite1_positions_array)]
+    end_positions_array = ressite1_positions_array + len(resoverhang2_seq)
 
-            # if a restriction site of the second enzyme is found and this is previous to a restriction site of the first enzyme
-            if i == (len(ressite1_positions_list) - 1) or ressite2_position < ressite1_positions_list[i + 1]:
+    # if there are nucleotides after the last restriction site, add the last fragment
+    last_ressite1_position = ressite1_positions_array[-1] if len(ressite1_positions_array) > 0 else 0
+    if last_ressite1_position < locus_len:
+        start_positions_array = np.append(start_positions_array, last_ressite1_position + len(ressite1_seq) - len(resoverhang1_seq))
+        end_positions_array = np.append(end_positions_array, locus_len)
 
-                # add 1 to the count of total fragments
-                total_fragments_count += 1
+    # return the arrays of start and end positions
+    return (start_positions_array.astype(np.int64), end_positions_array.astype(np.int64))
 
-                # calculate the start and end positions of the fragment in the genome
-                start_position = ressite1_positions_list[i] + len(ressite1_seq) - len(resoverhang1_seq)
-                end_position = ressite2_position + len(resoverhang2_seq)
+#-------------------------------------------------------------------------------
 
-                # get the genome insert
-                fragment_seq = crick_locus_seq[start_position:end_position].upper()
+def get_locus_fragments_array(locus_seq, locus_start, locus_end, start_positions_array, end_positions_array, strand, GC_cumulative_array, GCAT_cumulative_array, boundaries_array, minfragsize, maxfragsize, fragstinterval, is_seq, fragments_histogram, GC_distribution_dict, fragments_table):
+    '''Get the fragments of a strand of a locus from the arrays of their cuts (in the coordinates of the strand) calculating their lengths, GC rates and N counts as array operations, and update the fragments histogram and the GC distribution. The cumulative counts of GC and GCAT nucleotides are those of the sorted positions of boundaries_array. When is_seq is False, the fragments have no sequence (None).'''
 
-                # calculate the fragment length
-                fragment_len = len(fragment_seq)
+    # initialize the fragments list
+    fragments_list = []
 
-                # calculate the GC rate and the N count
-                (GC_rate, N_count) = get_GC_N_data(fragment_seq)
-                GC_rate_formatted = '{0:3.2f}'.format(GC_rate)
+    # get the locus length
+    locus_len = locus_end - locus_start
 
-                # if the fragment length is between the lower and the upper loci fragments size
-                if minfragsize <= fragment_len <= maxfragsize:
+    # calculate the fragment lengths, their segments in the Watson strand, the GC rates and the N counts
+    (fragment_lens_array, segment_starts_array, segment_ends_array, GC_rates_array, N_counts_array) = get_fragments_GC_N_arrays(start_positions_array, end_positions_array, strand, locus_len, GC_cumulative_array, GCAT_cumulative_array, boundaries_array)
 
-                    # add 1 to the count of fragments written
-                    written_fragments_count += 1
+    # add the fragments to the fragments histogram and the fragments table
+    fragments_histogram.update_arrays(fragment_lens_array, N_counts_array)
+    if fragments_table is not None:
+        fragments_table = update_fragments_table_arrays(fragments_table, fragment_lens_array, GC_rates_array, N_counts_array)
 
-                    # write the FASTA head and fragment in the fragments file
-                    fragsfile_id.write('>fragment: {0:d} | length: {1:d} | GC: {2} | strand: {3} | start: {4:d} | end: {5:d} | locus: {6}\n'.format(written_fragments_count, fragment_len, GC_rate_formatted, '-', (len(crick_locus_seq) - start_position), (len(crick_locus_seq) - end_position + 1),  locus_info))
-                    fragsfile_id.write('{0}\n'.format(fragment_seq))
-                    Message.print('trace', 'fragment_seq: {0}'.format(fragment_seq))
+    # select the fragments whose length is between the lower and the upper loci fragments size
+    is_written_array = (fragment_lens_array >= minfragsize) & (fragment_lens_array <= maxfragsize)
 
-                    # notify the reads have been written
-                    Message.print('verbose', '\rFragments written ... {0:9d}'.format(written_fragments_count))
+    # for each fragment
+    for (start_position, end_position, segment_start, segment_end, fragment_len, GC_rate, N_count, is_written) in zip(start_positions_array.tolist(), end_positions_array.tolist(), segment_starts_array.tolist(), segment_ends_array.tolist(), fragment_lens_array.tolist(), GC_rates_array.tolist(), N_counts_array.tolist(), is_written_array.tolist()):
 
-                    # update the GC distribution
-                    GC_distribution_dict[GC_rate_formatted] = GC_distribution_dict.get(GC_rate_formatted, 0) + 1
+        # if the fragment length is between the lower and the upper loci fragments size
+        if is_written:
 
-                # update the intervals with the fragment length
-                intervals_dict = update_fragments_intervals(intervals_dict, fragstinterval, fragment_len, N_count)
+            # get the genome insert
+            GC_rate_formatted = '{0:3.2f}'.format(GC_rate)
+            fragment_seq = locus_seq[locus_start + segment_start:locus_start + segment_end].decode('iso-8859-1') if is_seq else None
 
-    # close files
-    genfile_id.close()
-    fragsfile_id.close()
+            # add the fragment with the positions of its FASTA head
+            if strand == '+':
+                fragments_list.append((fragment_len, GC_rate_formatted, strand, start_position + 1, end_position, fragment_seq))
+            else:
+                fragments_list.append((fragment_len, GC_rate_formatted, strand, locus_len - start_position, locus_len - end_position + 1, get_reverse_complementary_sequence(fragment_seq) if is_seq else None))
 
-    # show OK message 
-    Message.print('verbose', '\n')
-    Message.print('info', 'The file {0} containing the fragments of the double digest of the genome is created.'.format(get_file_name(fragsfile)))
+            # update the GC distribution
+            GC_distribution_dict[GC_rate_formatted] = GC_distribution_dict.get(GC_rate_formatted, 0) + 1
 
-    # write the statistics and save them in the statistics file
-    title = 'Distribution of fragments after a double digest with {0} and {1}'.format(enzyme1, enzyme2)
-    write_fragments_stats(fragstfile, intervals_dict, total_fragments_count, written_fragments_count, minfragsize, maxfragsize, title)
-    if plot.upper() == 'YES':
-        plot_fragments_graphic(fragstfile, intervals_dict, title)
+    # return the fragments list, the fragments histogram, the GC distribution and the fragments table
+    return (fragments_list, fragments_histogram, GC_distribution_dict, fragments_table)
 
-    # write the GC distribution file
-    write_GC_distribution(fragsfile, GC_distribution_dict)
+#-------------------------------------------------------------------------------
+
+def digest_locus_double_array(locus_seq, locus_start, locus_end, positions_arrays, GC_N_index, ressite1_seq, ressite2_seq, resoverhang1_seq, resoverhang2_seq, scanner, minfragsize, maxfragsize, fragstinterval, is_seq, fragments_histogram, GC_distribution_dict, fragments_table):
+    '''Do the double digest of a locus held in locus_seq[locus_start:locus_end] with the NumPy engine and get its fragments in the order they are written; the search of the restriction sites is skipped when positions_arrays has the positions found in a previous run. The locus is coded in blocks by the scanner and the GC rates and the N counts are calculated from the cumulative counts at the ends of the fragments, so GC_N_index is not used.'''
+
+    import numpy as np
+
+    # get the positions of the restriction sites of each enzyme in the Watson strand and of their reverse complementary sequences
+    if positions_arrays is None:
+        RunReport.start_stage('scan')
+        positions_arrays = scanner.get_positions_arrays(locus_seq, locus_start, locus_end)
+        RunReport.stop_stage('scan', locus_end - locus_start)
+    (ressite1_positions_array, ressite2_positions_array, revcompl_ressite1_positions_array, revcompl_ressite2_positions_array) = positions_arrays
+    locus_len = locus_end - locus_start
+
+    # get the cuts of the Watson strand and of the Crick strand mapping the reverse complementary restriction sites to the positions in this strand
+    RunReport.start_stage('cuts')
+    (watson_start_positions_array, watson_end_positions_array) = get_double_digest_cuts_array(ressite1_positions_array, ressite2_positions_array, ressite1_seq, resoverhang1_seq, resoverhang2_seq)
+    crick_ressite1_positions_array = locus_len - revcompl_ressite1_positions_array[::-1] - len(ressite1_seq)
+    crick_ressite2_positions_array = locus_len - revcompl_ressite2_positions_array[::-1] - len(ressite2_seq)
+    (crick_start_positions_array, crick_end_positions_array) = get_double_digest_cuts_array(crick_ressite1_positions_array, crick_ressite2_positions_array, ressite1_seq, resoverhang1_seq, resoverhang2_seq)
+    RunReport.stop_stage('cuts')
+
+    # get the cumulative counts of GC and GCAT nucleotides at the ends of the segments of the fragments of both strands
+    RunReport.start_stage('GC counts')
+    boundaries_array = np.unique(np.concatenate(get_fragments_segments_arrays(watson_start_positions_array, watson_end_positions_array, '+', locus_len)[1:] + get_fragments_segments_arrays(crick_start_positions_array, crick_end_positions_array, '-', locus_len)[1:]))
+    (GC_cumulative_array, GCAT_cumulative_array) = scanner.get_GC_cumulative_counts_at(locus_seq, locus_start, locus_end, boundaries_array)
+    RunReport.stop_stage('GC counts', locus_len)
+
+    # get the fragments of the Watson strand and the Crick strand
+    RunReport.start_stage('fragments')
+    (watson_fragments_list, fragments_histogram, GC_distribution_dict, fragments_table) = get_locus_fragments_array(locus_seq, locus_start, locus_end, watson_start_positions_array, watson_end_positions_array, '+', GC_cumulative_array, GCAT_cumulative_array, boundaries_array, minfragsize, maxfragsize, fragstinterval, is_seq, fragments_histogram, GC_distribution_dict, fragments_table)
+    (crick_fragments_list, fragments_histogram, GC_distribution_dict, fragments_table) = get_locus_fragments_array(locus_seq, locus_start, locus_end, crick_start_positions_array, crick_end_positions_array, '-', GC_cumulative_array, GCAT_cumulative_array, boundaries_array, minfragsize, maxfragsize, fragstinterval, is_seq, fragments_histogram, GC_distribution_dict, fragments_table)
+    RunReport.stop_stage('fragments')
+    fragments_count = len(watson_start_positions_array) + len(crick_start_positions_array)
+
+    # return the fragments list, the count of total fragments, the fragments histogram, the GC distribution, the fragments table and the positions of the restriction sites
+    return (watson_fragments_list + crick_fragments_list, fragments_count, fragments_histogram, GC_distribution_dict, fragments_table, positions_arrays)
 
 #-------------------------------------------------------------------------------
 
-def do_single_digest(options_dict):
-    '''Do in silico a single digest of the genome.'''
+def digest_locus_single_array(locus_seq, locus_start, locus_end, positions_arrays, GC_N_index, ressite1_seq, resoverhang1_seq, resoverhang2_seq, scanner, minfragsize, maxfragsize, fragstinterval, is_seq, fragments_histogram, GC_distribution_dict, fragments_table):
+    '''Do the single digest of a locus held in locus_seq[locus_start:locus_end] with the NumPy engine and get its fragments in the order they are written; the search of the restriction sites is skipped when positions_arrays has the positions found in a previous run. The locus is coded in blocks by the scanner and the GC rates and the N counts are calculated from the cumulative counts at the ends of the fragments, so GC_N_index is not used.'''
 
-    genfile = options_dict['genfile']['value']
-    fragsfile = options_dict['fragsfile']['value']
-    rsfile = options_dict['rsfile']['value']
-    enzyme1 = options_dict['enzyme1']['value']
-    enzyme2 = options_dict['enzyme2']['value']
-    minfragsize = options_dict['minfragsize']['value']
-    maxfragsize = options_dict['maxfragsize']['value']
-    fragstfile = options_dict['fragstfile']['value']
-    fragstinterval = options_dict['fragstinterval']['value']
-    plot = options_dict['plot']['value']
-    verbose = options_dict['verbose']['value']
-    trace = options_dict['trace']['value']
+    import numpy as np
 
-    # set the verbose and trace status
-    if verbose.upper() == 'YES':
-        Message.set_verbose_status(True)
-    else:
-        Message.set_verbose_status(False)
-    if trace.upper() == 'YES':
-        Message.set_trace_status(True)
-    else:
-        Message.set_trace_status(False)
+    # get the positions of the restriction sites in the Watson strand
+    if positions_arrays is None:
+        RunReport.start_stage('scan')
+        positions_arrays = scanner.get_positions_arrays(locus_seq, locus_start, locus_end)
+        RunReport.stop_stage('scan', locus_end - locus_start)
+    (ressite1_positions_array,) = positions_arrays
+    locus_len = locus_end - locus_start
 
-    # get the restriction site sequences
-    (ressite1_seq, ressite1_lcut_seq, ressite1_rcut_seq, ressite2_seq, ressite2_lcut_seq, ressite2_rcut_seq) = get_ressites(rsfile, enzyme1, enzyme2)
-    Message.print('trace', 'ressite1_seq: {0} - ressite1_lcut_seq: {1} - ressite1_rcut_seq: {2}'.format(ressite1_seq, ressite1_lcut_seq, ressite1_rcut_seq))
+    # get the cuts of the Watson strand
+    RunReport.start_stage('cuts')
+    (start_positions_array, end_positions_array) = get_single_digest_cuts_array(ressite1_positions_array, locus_len, ressite1_seq, resoverhang1_seq, resoverhang2_seq)
+    RunReport.stop_stage('cuts')
 
-    # get the restriction overhangs (the restriction overhang sequences in both ends can be different)
-    if len(ressite1_lcut_seq) >= len(ressite1_rcut_seq):
-        resoverhang1_seq = get_reverse_complementary_sequence(ressite1_lcut_seq)
+    # get the cumulative counts of GC and GCAT nucleotides at the ends of the segments of the fragments
+    RunReport.start_stage('GC counts')
+    boundaries_array = np.unique(np.concatenate(get_fragments_segments_arrays(start_positions_array, end_positions_array, '+', locus_len)[1:]))
+    (GC_cumulative_array, GCAT_cumulative_array) = scanner.get_GC_cumulative_counts_at(locus_seq, locus_start, locus_end, boundaries_array)
+    RunReport.stop_stage('GC counts', locus_len)
+
+    # get the fragments of the Watson strand
+    RunReport.start_stage('fragments')
+    (fragments_list, fragments_histogram, GC_distribution_dict, fragments_table) = get_locus_fragments_array(locus_seq, locus_start, locus_end, start_positions_array, end_positions_array, '+', GC_cumulative_array, GCAT_cumulative_array, boundaries_array, minfragsize, maxfragsize, fragstinterval, is_seq, fragments_histogram, GC_distribution_dict, fragments_table)
+    RunReport.stop_stage('fragments')
+
+    # return the fragments list, the count of total fragments, the fragments histogram, the GC distribution, the fragments table and the positions of the restriction sites
+    return (fragments_list, len(start_positions_array), fragments_histogram, GC_distribution_dict, fragments_table, positions_arrays)
+
+#-------------------------------------------------------------------------------
+
+def get_cached_positions(sitecache, sitecachesize, genfile, ressite_seq_lists):
+    '''Get the site cache, the file of the entry of the genome and the restriction sites and the positions of the restriction sites of every locus saved in it (None when they have to be searched).'''
+
+    # if the positions of the restriction sites are not cached
+    if sitecache.upper() == 'NONE':
+        return (None, None, None)
+
+    # get the entry of the genome and the restriction sites
+    site_cache = RestrictionSiteCache(sitecache, sitecachesize)
+    entry_file = site_cache.get_entry_file(genfile, ressite_seq_lists)
+    loci_positions_list = site_cache.load(entry_file)
+    if loci_positions_list is not None:
+        Message.print('info', 'The positions of the restriction sites are read from the site cache.')
+
+    # return the site cache, the entry file and the positions
+    return (site_cache, entry_file, loci_positions_list)
+
+#-------------------------------------------------------------------------------
+
+def write_locus_fragments(fragsfile_id, locus_info, fragments_list, written_fragments_count):
+    '''Write the fragments of a locus in the fragments file.'''
+
+    # for each fragment
+    for (fragment_len, GC_rate_formatted, strand, start_position, end_position, fragment_seq) in fragments_list:
+
+        # add 1 to the count of fragments written
+        written_fragments_count += 1
+
+        # write the FASTA head and fragment in the fragments file
+        fragsfile_id.write('>fragment: {0:d} | length: {1:d} | GC: {2} | strand: {3} | start: {4:d} | end: {5:d} | locus: {6}\n'.format(written_fragments_count, fragment_len, GC_rate_formatted, strand, start_position, end_position,  locus_info))
+        fragsfile_id.write('{0}\n'.format(fragment_seq))
+        Message.print('trace', 'fragment_seq: {0}', fragment_seq)
+
+    # return the count of fragments written
+    return written_fragments_count
+
+#-------------------------------------------------------------------------------
+
+def write_timed_loci_fragments(fragsfile_id, loci_list, written_fragments_count, journal, journal_record):
+    '''Write the fragments of a batch of loci, given as tuples (locus_info, locus_len, fragments_list, positions, cache_data), in the fragments file adding the time spent to the write stage of the report. When journal is not None, the record of the batch is added to the journal with the size of the fragments file once the fragments are written.'''
+
+    RunReport.start_stage('write')
+    for (locus_info, locus_len, fragments_list, locus_positions, locus_cache_data) in loci_list:
+        written_fragments_count = write_locus_fragments(fragsfile_id, locus_info, fragments_list, written_fragments_count)
+    RunReport.stop_stage('write', sum([fragment[0] for locus in loci_list for fragment in locus[2]]) if RunReport.status else 0)
+
+    # add the record of the batch to the journal
+    if journal is not None:
+        RunReport.start_stage('journal')
+        fragsfile_id.flush()
+        journal.add(journal_record, fragsfile_id.tell())
+        RunReport.stop_stage('journal')
+
+#-------------------------------------------------------------------------------
+
+def get_digest_journal(fragsfile, options_dict):
+    '''Get the journal of the digest and the list of records of the loci completed by an interrupted run with the same options when resume is YES; otherwise, the journal is None and the list is empty, so no journal file is written.'''
+
+    # the journal is only kept when resume is YES
+    if options_dict['resume']['value'].upper() != 'YES':
+        return (None, [])
+
+    # read the records of the journal
+    journal = DigestJournal(fragsfile + '.journal', get_run_signature(options_dict))
+    journal_records_list = [decode_journal_record(journal_record) + (fragsfile_size,) for (journal_record, fragsfile_size) in journal.read()]
+
+    # the fragments file has to hold the fragments of the loci completed
+    if journal_records_list != [] and (not os.path.isfile(fragsfile) or os.path.getsize(fragsfile) < journal_records_list[-1][-1]):
+        journal_records_list = []
+    if journal_records_list != []:
+        Message.print('info', 'The digest is resumed after the {0} loci completed by the interrupted run.'.format(sum([len(journal_record[0]) for journal_record in journal_records_list])))
     else:
-        resoverhang1_seq = ressite1_rcut_seq
-    if len(ressite2_lcut_seq) >= len(ressite2_rcut_seq):
-        resoverhang2_seq = ressite1_lcut_seq
+        Message.print('info', 'There is not an interrupted run with the same options, so the digest starts from the beginning.')
+
+    # open the journal to add the records of the next loci
+    journal.open(journal_records_list != [])
+
+    # return the journal and the records of the loci completed
+    return (journal, journal_records_list)
+
+#-------------------------------------------------------------------------------
+
+def encode_journal_record(journal_loci_list, fragments_count, fragments_histogram, GC_distribution_dict, fragments_table, fragments_columns, written_fragments_count):
+    '''Encode the record of a batch of loci in the journal with plain JSON values: journal_loci_list has a tuple (locus_info, locus_len, positions, cache_data) for each locus, and the histogram, the fragments table and the fragments columns are saved as lists.'''
+
+    import numpy as np
+
+    # get the loci with their positions as lists
+    loci_list = [[locus_info, locus_len, [np.asarray(positions, dtype=np.int64).tolist() for positions in locus_positions] if locus_positions is not None else None, locus_cache_data] for (locus_info, locus_len, locus_positions, locus_cache_data) in journal_loci_list]
+
+    # get the lengths and N flags of the fragments of the histogram
+    (fragment_lens_array, N_flags_array) = fragments_histogram.get_lens_arrays()
+
+    # return the record
+    return {
+        'loci': loci_list,
+        'fragments_count': fragments_count,
+        'histogram': [fragment_lens_array.tolist(), N_flags_array.astype(np.int8).tolist()],
+        'GC_distribution': GC_distribution_dict,
+        'fragments_table': {key: values.tolist() for (key, values) in fragments_table.items()} if fragments_table is not None else None,
+        'fragments_columns': {key: list(values) for (key, values) in fragments_columns.items()} if fragments_columns is not None else None,
+        'written_fragments_count': written_fragments_count
+        }
+
+#-------------------------------------------------------------------------------
+
+def decode_journal_record(journal_record):
+    '''Decode a record of the journal encoded by encode_journal_record and get the tuple (journal_loci_list, fragments_count, fragments_histogram, GC_distribution_dict, fragments_table, fragments_columns, written_fragments_count).'''
+
+    import numpy as np
+
+    # get the loci
+    journal_loci_list = [(locus_info, locus_len, tuple(locus_positions) if locus_positions is not None else None, tuple(locus_cache_data) if locus_cache_data is not None else None) for (locus_info, locus_len, locus_positions, locus_cache_data) in journal_record['loci']]
+
+    # rebuild the histogram
+    fragments_histogram = FragmentsHistogram()
+    (fragment_lens, N_flags) = journal_record['histogram']
+    fragments_histogram.update_arrays(np.array(fragment_lens, dtype=np.int64), np.array(N_flags, dtype=np.int8))
+
+    # rebuild the fragments table and the fragments columns
+    fragments_table = None
+    if journal_record['fragments_table'] is not None:
+        fragments_table = create_fragments_table()
+        for (key, values) in journal_record['fragments_table'].items():
+            fragments_table[key].extend(values)
+    fragments_columns = None
+    if journal_record['fragments_columns'] is not None:
+        fragments_columns = create_fragments_columns()
+        for (key, values) in journal_record['fragments_columns'].items():
+            fragments_columns[key].extend(values)
+
+    # return the data of the record
+    return (journal_loci_list, journal_record['fragments_count'], fragments_histogram, journal_record['GC_distribution'], fragments_table, fragments_columns, journal_record['written_fragments_count'])
+
+#-------------------------------------------------------------------------------
+
+def get_run_signature(options_dict):
+    '''Get the signature of a run: the values of the options that change the data of the loci and the signature of the genome file.'''
+
+    # get the values of the options, except those that do not change the data of the loci
+    signature_list = [(option, options_dict[option]['value']) for option in sorted(options_dict.keys()) if option not in ['resume', 'plot', 'report', 'verbose', 'trace', 'pipeline', 'processes', 'engine', 'gzthreads']]
+
+    # add the signature of the genome file
+    genfile = options_dict['genfile']['value']
+    signature_list.append(('genfile signature', get_genome_signature(genfile) if os.path.isfile(genfile) else ''))
+
+    # return the signature
+    return repr(signature_list)
+
+#-------------------------------------------------------------------------------
+
+def digest_genome_loci(genfile, genstore, processes, digest_function, digest_args, is_fragments_table, loci_positions_list, is_pipeline, fragments_cache, resumed_loci_count, scanner, batchsize, blocksize):
+    '''Digest the loci of a genome with digest_function and yield, in the genome order, tuples (loci_list, fragments_count, fragments_histogram, GC_distribution_dict, fragments_table) with the data of each batch of loci, where loci_list has a tuple (locus_info, locus_len, fragments_list, positions, cache_data) for each locus of the batch (fragments_table is None when is_fragments_table is False). The loci shorter than batchsize are digested in batches of up to blocksize nucleotides, whose restriction sites are found by scanner in a single scan; the other loci are digested alone. When loci_positions_list is not None, it has the positions of the restriction sites of every locus found in a previous run. When is_pipeline is True, the next loci are read by a thread while the current ones are digested. When fragments_cache is not None, the loci digested in previous runs are read from it and cache_data is the tuple (checksum, is_cached) of each locus; otherwise, cache_data is None. The first resumed_loci_count loci, completed by an interrupted run, are skipped.'''
+
+    import multiprocessing
+
+    # if the loci are digested in this process
+    if processes == 1:
+
+        # open the genome store and its GC and N index, building the store before when it is not updated (the store is kept open until
+        # the last batch is digested, because the batches are gotten reading the next locus)
+        genome_store = None
+        GC_N_index = None
+        if genstore.upper() != 'NONE':
+            genome_store = open_genome_store(genfile, genstore)
+            GC_N_index = GCNIndex(genstore)
+            loci_lists_iterator = get_loci_lists(((locus_info, genome_store.seq, offset, offset + locus_len) for (locus_info, offset, locus_len) in genome_store.get_loci_list()), blocksize)
+        else:
+            loci_lists_iterator = get_genome_loci_lists(genfile, genstore, blocksize)
+
+        # digest every batch of loci (the loci of a genome store are not read ahead because they are segments of the store mapped in memory)
+        for batch_list in get_loci_batches(get_timed_loci_lists(loci_lists_iterator, is_pipeline and genome_store is None), loci_positions_list, resumed_loci_count, batchsize, blocksize):
+            yield digest_batch(batch_list, GC_N_index, digest_function, digest_args, is_fragments_table, fragments_cache, scanner)
+
+        # close the genome store
+        if genome_store is not None:
+            genome_store.close()
+
+    # if the loci are digested by a pool of processes
     else:
-        resoverhang2_seq = get_reverse_complementary_sequence(ressite2_rcut_seq)
-    Message.print('trace', 'resoverhang1_seq: {0}'.format(resoverhang1_seq))
-    Message.print('trace', 'resoverhang2_seq: {0}'.format(resoverhang2_seq))
 
-    # get the list of sequences corresponding to each enzyme
-    unambiguous_ressite1_seq_list = get_unambiguous_sequence_list(ressite1_seq.upper())
-    Message.print('trace', 'unambiguous_ressite1_seq_list: {0}'.format(unambiguous_ressite1_seq_list))
+        # build the genome store or the indexes of the BGZF genome file before the processes open them
+        is_bgzf = genstore.upper() == 'NONE' and genfile.endswith('.gz') and is_bgzf_file(genfile)
+        if genstore.upper() != 'NONE':
+            open_genome_store(genfile, genstore).close()
+        elif is_bgzf:
+            BgzfGenome(genfile).close()
 
-    # open the genome file
-    try:
-        if genfile.endswith('.gz'):
-            genfile_id = gzip.open(genfile, mode='rt', encoding='iso-8859-1')
+        # the loci of a genome store or a BGZF genome file are sent as their positions and every process reads its loci
+        if genstore.upper() != 'NONE' or is_bgzf:
+            loci_lists_iterator = get_loci_lists(((locus_info, None, locus_start, locus_end) for (locus_info, locus_start, locus_end) in get_genome_loci_positions(genfile, genstore)), blocksize)
         else:
-            genfile_id = open(genfile, mode='r', encoding='iso-8859-1')
-    except:
-        raise ProgramError('F002', genfile)
+            loci_lists_iterator = get_genome_loci_lists(genfile, genstore, blocksize)
 
-    # open the fragments file
-    try:
-        fragsfile_id = open(fragsfile, mode='w', encoding='iso-8859-1')
-    except:
-        raise ProgramError('F002', fragsfile)
+        # initialize the queue of pending results, which keeps the genome order and bounds the loci held in memory
+        pending_results_deque = collections.deque()
 
-    # set the pattern of the head records (>locus_info)
-    pattern = r'^>(.*)$'
+        with multiprocessing.Pool(processes, initializer=init_digest_process, initargs=(genfile if is_bgzf else 'NONE', genstore, digest_function, digest_args, is_fragments_table, fragments_cache, scanner, RunReport.status)) as pool:
 
-    # initialize the count of the total fragments and written fragments
-    total_fragments_count = 0
-    written_fragments_count = 0
+            # send every batch of loci to the pool
+            for batch_list in get_loci_batches(get_timed_loci_lists(loci_lists_iterator, is_pipeline), loci_positions_list, resumed_loci_count, batchsize, blocksize):
+                pending_results_deque.append(pool.apply_async(digest_batch_task, (batch_list,)))
 
-    # initialize the intervals
-    intervals_dict = {}
+                # yield the oldest result when the queue is full
+                if len(pending_results_deque) >= 2 * processes:
+                    yield get_task_result(pending_results_deque.popleft())
 
-    # initialize the GC distribution
+            # yield the remaining results
+            while pending_results_deque:
+                yield get_task_result(pending_results_deque.popleft())
+
+#-------------------------------------------------------------------------------
+
+def get_loci_batches(loci_lists_iterator, loci_positions_list, resumed_loci_count, batchsize, blocksize):
+    '''Yield the loci of an iterator of loci lists after the first resumed_loci_count ones in batches of tuples (locus_info, locus_seq, locus_start, locus_end, locus_positions), where locus_positions has the positions of the restriction sites found in a previous run (None when loci_positions_list is None): the consecutive loci shorter than batchsize are grouped in batches of up to blocksize nucleotides and every other locus is alone in its batch.'''
+
+    # initialize the batch and the index of the locus in the genome
+    batch_list = []
+    batch_len = 0
+    i = -1
+
+    # for each locus after the resumed ones
+    for loci_list in loci_lists_iterator:
+        for (locus_info, locus_seq, locus_start, locus_end) in loci_list:
+            i += 1
+            if i < resumed_loci_count:
+                continue
+            locus = (locus_info, locus_seq, locus_start, locus_end, loci_positions_list[i] if loci_positions_list is not None else None)
+            locus_len = locus_end - locus_start
+
+            # add a small locus to the batch and yield the batch when it is full
+            if locus_len < batchsize:
+                batch_list.append(locus)
+                batch_len += locus_len
+                if batch_len >= blocksize:
+                    yield batch_list
+                    batch_list = []
+                    batch_len = 0
+
+            # yield the batch and then the locus alone
+            else:
+                if batch_list != []:
+                    yield batch_list
+                    batch_list = []
+                    batch_len = 0
+                yield [locus]
+
+    # yield the last batch
+    if batch_list != []:
+        yield batch_list
+
+#-------------------------------------------------------------------------------
+
+def get_timed_loci_lists(loci_lists_iterator, is_pipeline):
+    '''Yield the loci lists of an iterator adding the time spent reading them to the read stage of the report. When is_pipeline is True, the lists are read ahead by a thread, which keeps up to 2 lists waiting (the small loci are passed to the thread in lists, so it does not cost a queue operation per locus).'''
+
+    # read the loci lists in a thread
+    if is_pipeline:
+        yield from get_prefetched_items(get_timed_loci_lists(loci_lists_iterator, False), 2)
+        return
+
+    while True:
+
+        # get the next loci list
+        RunReport.start_stage('read')
+        loci_list = next(loci_lists_iterator, None)
+        RunReport.stop_stage('read', sum([locus_end - locus_start for (locus_info, locus_seq, locus_start, locus_end) in loci_list]) if loci_list is not None and RunReport.status else 0)
+
+        # yield the loci list while there are lists
+        if loci_list is None:
+            break
+        yield loci_list
+
+#-------------------------------------------------------------------------------
+
+def get_task_result(async_result):
+    '''Get the batch data digested by a process of the pool adding the data of the report recorded by the process.'''
+
+    # wait for the result
+    (batch_data, report_data) = async_result.get()
+
+    # add the data of the report
+    if report_data is not None:
+        RunReport.merge_data(report_data)
+
+    # return the batch data
+    return batch_data
+
+#-------------------------------------------------------------------------------
+
+def digest_batch(batch_list, GC_N_index, digest_function, digest_args, is_fragments_table, fragments_cache, scanner):
+    '''Digest a batch of loci given as tuples (locus_info, locus_seq, locus_start, locus_end, locus_positions) and get the tuple (loci_list, fragments_count, fragments_histogram, GC_distribution_dict, fragments_table) with its data: a locus alone is digested by digest_locus and several loci by digest_loci_batch.'''
+
+    if len(batch_list) == 1:
+        return digest_locus(*batch_list[0], GC_N_index, digest_function, digest_args, is_fragments_table, fragments_cache)
+    else:
+        return digest_loci_batch(batch_list, GC_N_index, digest_function, digest_args, is_fragments_table, scanner)
+
+#-------------------------------------------------------------------------------
+
+def digest_locus(locus_info, locus_seq, locus_start, locus_end, locus_positions, GC_N_index, digest_function, digest_args, is_fragments_table, fragments_cache):
+    '''Digest a locus with digest_function and get the tuple (loci_list, fragments_count, fragments_histogram, GC_distribution_dict, fragments_table) with its data, where loci_list has the tuple (locus_info, locus_len, fragments_list, positions, cache_data) of the locus, adding the locus to the report. When fragments_cache is not None, the locus data is read from it when the locus has been digested in a previous run, and it is saved otherwise.'''
+
+    start_times = RunReport.get_start_times()
+
+    # get the locus data saved in the fragments cache when the locus content has been digested before
+    locus_data = None
+    cache_data = None
+    if fragments_cache is not None:
+        RunReport.start_stage('fragments cache load')
+        locus_checksum = fragments_cache.get_locus_checksum(locus_seq, locus_start, locus_end)
+        locus_data = fragments_cache.load(locus_checksum, locus_info)
+        cache_data = (locus_checksum, locus_data is not None)
+        RunReport.stop_stage('fragments cache load', locus_end - locus_start)
+
+    # digest the locus and save its data in the fragments cache
+    if locus_data is None:
+        locus_data = (locus_info, locus_end - locus_start) + digest_function(locus_seq, locus_start, locus_end, locus_positions, GC_N_index, *digest_args, FragmentsHistogram(), {}, create_fragments_table() if is_fragments_table else None)
+        if fragments_cache is not None:
+            RunReport.start_stage('fragments cache save')
+            fragments_cache.save(locus_checksum, locus_data)
+            RunReport.stop_stage('fragments cache save')
+    (locus_info, locus_len, fragments_list, fragments_count, fragments_histogram, GC_distribution_dict, fragments_table, positions) = locus_data
+
+    # add the locus to the report
+    RunReport.add_locus(locus_info, locus_len, fragments_count, start_times)
+
+    # return the locus data
+    return ([(locus_info, locus_len, fragments_list, positions, cache_data)], fragments_count, fragments_histogram, GC_distribution_dict, fragments_table)
+
+#-------------------------------------------------------------------------------
+
+def digest_loci_batch(batch_list, GC_N_index, digest_function, digest_args, is_fragments_table, scanner):
+    '''Digest together a batch of small loci given as tuples (locus_info, locus_seq, locus_start, locus_end, locus_positions) and get the tuple (loci_list, fragments_count, fragments_histogram, GC_distribution_dict, fragments_table) with its data, where loci_list has a tuple (locus_info, locus_len, fragments_list, positions, None) for each locus, adding the batch to the report. The restriction sites of all the loci are found by scanner in a single scan (it is skipped when every locus has the positions found in a previous run) and the fragments of all the loci are counted in the same histogram, GC distribution and fragments table.'''
+
+    start_times = RunReport.get_start_times()
+    batch_len = sum([locus_end - locus_start for (locus_info, locus_seq, locus_start, locus_end, locus_positions) in batch_list])
+
+    # get the positions of the restriction sites of every locus
+    if any([locus_positions is None for (locus_info, locus_seq, locus_start, locus_end, locus_positions) in batch_list]):
+        RunReport.start_stage('scan')
+        batch_positions_list = scanner.scan_loci([(locus_seq, locus_start, locus_end) for (locus_info, locus_seq, locus_start, locus_end, locus_positions) in batch_list])
+        RunReport.stop_stage('scan', batch_len)
+    else:
+        batch_positions_list = [locus_positions for (locus_info, locus_seq, locus_start, locus_end, locus_positions) in batch_list]
+
+    # digest every locus with its positions
+    loci_list = []
+    fragments_count = 0
+    fragments_histogram = FragmentsHistogram()
     GC_distribution_dict = {}
- 
-    # read the first record
-    record = genfile_id.readline()
+    fragments_table = create_fragments_table() if is_fragments_table else None
+    for ((locus_info, locus_seq, locus_start, locus_end, locus_positions), positions_lists) in zip(batch_list, batch_positions_list):
+        (fragments_list, locus_fragments_count, fragments_histogram, GC_distribution_dict, fragments_table, positions_lists) = digest_function(locus_seq, locus_start, locus_end, positions_lists, GC_N_index, *digest_args, fragments_histogram, GC_distribution_dict, fragments_table)
+        loci_list.append((locus_info, locus_end - locus_start, fragments_list, positions_lists, None))
+        fragments_count += locus_fragments_count
 
-    # while there are records
-    while record != '':
+    # add the batch to the report
+    RunReport.add_locus('{0} loci from {1}'.format(len(batch_list), batch_list[0][0]), batch_len, fragments_count, start_times)
 
-        # process the head record 
-        if record.startswith('>'):
+    # return the batch data
+    return (loci_list, fragments_count, fragments_histogram, GC_distribution_dict, fragments_table)
 
-            # extract the data 
-            mo = re.search(pattern, record)
-            locus_info = mo.group(1)
+#-------------------------------------------------------------------------------
 
-            # initialize the locus sequence of Watson strand
-            watson_locus_seq = ''
+def init_digest_process(bgzf_genfile, genstore, digest_function, digest_args, is_fragments_table, fragments_cache, scanner, report_status):
+    '''Initialize a process of the pool used to digest the loci (bgzf_genfile is the BGZF genome file whose loci are read by the process or NONE).'''
 
-            # read the next record
-            record = genfile_id.readline()
+    global digest_process_data
 
-        else:
+    # open the genome store and its GC and N index or the BGZF genome file of the process
+    genome_seq = None
+    GC_N_index = None
+    bgzf_genome = None
+    if genstore.upper() != 'NONE':
+        genome_seq = GenomeStore(genstore).seq
+        GC_N_index = GCNIndex(genstore)
+    elif bgzf_genfile.upper() != 'NONE':
+        bgzf_genome = BgzfGenome(bgzf_genfile)
 
-            # control the FASTA format
-            raise ProgramError('F003', genfile, 'FASTA')
+    # save the data of the digest and set the report status
+    digest_process_data = (genome_seq, GC_N_index, bgzf_genome, digest_function, digest_args, is_fragments_table, fragments_cache, scanner)
+    RunReport.set_status(report_status)
 
-        # while there are records and they are sequence
-        while record != '' and not record.startswith('>'):
+#-------------------------------------------------------------------------------
 
-            # concatenate the record to the locus sequence of Watson strand
-            watson_locus_seq += record.strip().upper()
+def digest_batch_task(task):
+    '''Digest a batch of loci in a process of the pool.'''
 
-            # read the next record
-            record = genfile_id.readline()
+    # get the data of the digest
+    (genome_seq, GC_N_index, bgzf_genome, digest_function, digest_args, is_fragments_table, fragments_cache, scanner) = digest_process_data
 
-        Message.print('trace', 'watson_locus_seq: {0}'.format(watson_locus_seq))
+    # get the data of every locus (the loci of a BGZF genome file are decompressed by this process)
+    batch_list = []
+    for (locus_info, locus_seq, locus_start, locus_end, locus_positions) in task:
+        if locus_seq is None and bgzf_genome is not None:
+            RunReport.start_stage('decompression')
+            locus_seq = bgzf_genome.get_locus_seq(locus_start, locus_end)
+            (locus_start, locus_end) = (0, len(locus_seq))
+            RunReport.stop_stage('decompression', locus_end)
+        elif locus_seq is None:
+            locus_seq = genome_seq
+        batch_list.append((locus_info, locus_seq, locus_start, locus_end, locus_positions))
 
-        # initialize the list of position corresponding to the restriction sites in the Watson strand
-        ressite1_positions_list = []
+    # return the batch data and the data of the report recorded by this process
+    batch_data = digest_batch(batch_list, GC_N_index, digest_function, digest_args, is_fragments_table, fragments_cache, scanner)
+    return (batch_data, RunReport.pop_data() if RunReport.status else None)
+
+#-------------------------------------------------------------------------------
+
+def write_report(fragstfile, options_dict, enzymes_list, total_fragments_count, written_fragments_count):
+    '''Write the JSON report of the run next to the statistics file.'''
+
+    # get the data of the run
+    run_dict = {
+        'program': get_file_name(__file__),
+        'version': get_project_version(),
+        'genfile': options_dict['genfile']['value'],
+        'genstore': options_dict['genstore']['value'],
+        'enzymes': enzymes_list,
+        'engine': options_dict['engine']['value'],
+        'processes': options_dict['processes']['value'],
+        'stream': options_dict['stream']['value'],
+        'minfragsize': options_dict['minfragsize']['value'],
+        'maxfragsize': options_dict['maxfragsize']['value'],
+        'total_fragments': total_fragments_count,
+        'written_fragments': written_fragments_count
+    }
+
+    # write the report
+    RunReport.write(os.path.splitext(fragstfile)[0] + '-report.json', run_dict)
+
+#-------------------------------------------------------------------------------
+
+def stream_double_digest(genfile_id, genfile, fragsfile_id, blocksize, ressite1_seq, ressite2_seq, resoverhang1_seq, resoverhang2_seq, scanner, minfragsize, maxfragsize, fragstinterval, fragments_histogram, GC_distribution_dict, is_pipeline):
+    '''Do in silico a double digest of the genome scanning it in blocks, so the memory used does not depend on the locus size.'''
+
+    import tempfile
+
+    # get the lengths of the restriction sites and the restriction overhangs
+    ressite1_len = len(ressite1_seq)
+    ressite2_len = len(ressite2_seq)
+    resoverhang1_len = len(resoverhang1_seq)
+    resoverhang2_len = len(resoverhang2_seq)
+    ressite_maxlen = max(ressite1_len, ressite2_len)
+
+    # the scanner tags the restriction sites with their kind: 0 (first enzyme in the Watson strand), 1 (second enzyme in the Watson
+    # strand), 2 (first enzyme in the Crick strand) and 3 (second enzyme in the Crick strand); the restriction sites of the Crick
+    # strand are searched as their reverse complementary sequences in the Watson strand
+
+    # set the nucleotides number kept before every block: the longest fragment written and the restriction sites around it
+    keep_len = maxfragsize + 3 * ressite_maxlen
+
+    # create the temporal file where the fragments of the Crick strand are saved until the locus end
+    crick_file_id = tempfile.TemporaryFile()
+
+    # initialize the count of the total fragments and written fragments
+    total_fragments_count = 0
+    written_fragments_count = 0
+
+    # initialize the indicator of locus start
+    is_locus_start = True
+
+    # for every block of the genome (read ahead by a thread, which keeps up to 4 blocks waiting, when is_pipeline is True)
+    blocks_iterator = read_fasta_blocks(genfile_id, genfile, blocksize)
+    if is_pipeline:
+        blocks_iterator = get_prefetched_items(blocks_iterator, 4)
+    for (locus_info, block_seq, is_locus_end) in blocks_iterator:
+
+        # initialize the locus data
+        if is_locus_start:
+            locus_start_times = RunReport.get_start_times()
+            locus_start_fragments_count = total_fragments_count
+            window = SequenceWindow(keep_len)
+            scan_start = 0
+            watson_ressite1_data = None
+            watson_fragments_deque = collections.deque()
+            last_crick_ressite1_position = None
+            crick_ressite2_positions_list = []
+            crick_N_counts_list = []
+            is_locus_start = False
+
+        # append the block to the locus window
+        window.append(block_seq)
+        end = window.get_end()
+
+        # get the restriction sites starting in the scanned zone (the last nucleotides are scanned again with the next block)
+        RunReport.start_stage('scan')
+        limit = end if is_locus_end else end - ressite_maxlen + 1
+        ressites_list = []
+        for (position, kind) in scanner.scan(window.get_seq(scan_start, end)):
+            if scan_start + position >= limit:
+                break
+            ressites_list.append((scan_start + position, kind))
+        RunReport.stop_stage('scan', end - scan_start)
+        scan_start = max(scan_start, limit)
+
+        # for each restriction site
+        RunReport.start_stage('fragments')
+        for (position, kind) in ressites_list:
+
+            # a restriction site of the first enzyme in the Watson strand is pending of a cut with the second enzyme
+            if kind == 0:
+                start_position = position + ressite1_len - resoverhang1_len
+                watson_ressite1_data = (position, start_position, window.get_N_count(start_position))
+
+            # a restriction site of the second enzyme in the Watson strand cuts the fragment of the pending restriction site of the first enzyme
+            elif kind == 1:
+                if watson_ressite1_data is not None and position >= watson_ressite1_data[0] + ressite1_len:
+                    watson_fragments_deque.append((watson_ressite1_data[1], position + resoverhang2_len, watson_ressite1_data[2]))
+                    watson_ressite1_data = None
+
+            # a restriction site of the first enzyme in the Crick strand cuts a fragment when the nearest restriction site of the second
+            # enzyme is previous to the next restriction site of the first enzyme in the Crick strand
+            elif kind == 2:
+                i = bisect.bisect_right(crick_ressite2_positions_list, position - ressite2_len) - 1
+                if i >= 0:
+                    ressite2_position = crick_ressite2_positions_list[i]
+                    if last_crick_ressite1_position is None or ressite2_position + ressite2_len > last_crick_ressite1_position + ressite1_len:
+
+                        # add 1 to the count of total fragments
+                        total_fragments_count += 1
+
+                        # calculate the positions of the fragment in the Watson strand
+                        start_position = max(0, ressite2_position + ressite2_len - resoverhang2_len)
+                        end_position = position + resoverhang1_len
+                        fragment_len = max(0, end_position - start_position)
+
+                        # if the fragment length is between the lower and the upper loci fragments size
+                        if minfragsize <= fragment_len <= maxfragsize:
+
+                            # get the fragment of the Crick strand and its GC rate and N count
+                            fragment_seq = get_reverse_complementary_sequence(window.get_seq(start_position, end_position))
+                            (GC_rate, N_count) = get_GC_N_data(fragment_seq)
+                            GC_rate_formatted = '{0:3.2f}'.format(GC_rate)
+
+                            # save the fragment until the locus end
+                            record = '{0}\t{1}\t{2}\t{3}\t{4}'.format(fragment_len, GC_rate_formatted, end_position, ressite2_position + ressite2_len - resoverhang2_len + 1, fragment_seq).encode('utf-8')
+                            crick_file_id.write(record + struct.pack('<I', len(record)))
+
+                            # update the GC distribution
+                            GC_distribution_dict[GC_rate_formatted] = GC_distribution_dict.get(GC_rate_formatted, 0) + 1
+
+                        # calculate the N count of a fragment that is not written
+                        else:
+                            N_count = window.get_N_count(end_position) - crick_N_counts_list[i] if fragment_len > 0 else 0
+
+                        # update the fragments histogram with the fragment length
+                        fragments_histogram.update(fragment_len, N_count)
+
+                    # remove the restriction sites of the second enzyme not longer needed
+                    del crick_ressite2_positions_list[:i]
+                    del crick_N_counts_list[:i]
+
+                last_crick_ressite1_position = position
+
+            # a restriction site of the second enzyme in the Crick strand is saved with the N count until the fragment end
+            elif kind == 3:
+                crick_ressite2_positions_list.append(position)
+                crick_N_counts_list.append(window.get_N_count(max(0, position + ressite2_len - resoverhang2_len)))
+        RunReport.stop_stage('fragments')
+
+        # write the fragments of the Watson strand whose end has been read
+        RunReport.start_stage('write')
+        while watson_fragments_deque and (is_locus_end or watson_fragments_deque[0][1] <= end):
 
-        # build the list of position corresponding to the restriction sites in the Watson strand
-        for unambigous_ressite1_seq in unambiguous_ressite1_seq_list:
-            Message.print('trace', 'unambigous_ressite1_seq: {0}'.format(unambigous_ressite1_seq))
-            for m in re.finditer(r'(?=({0}))'.format(unambigous_ressite1_seq), watson_locus_seq):
-                ressite1_positions_list.append(m.start())
+            # add 1 to the count of total fragments
+            total_fragments_count += 1
+
+            # get the fragment data
+            (start_position, end_position, start_N_count) = watson_fragments_deque.popleft()
+            fragment_len = max(0, min(end_position, end) - start_position)
+
+            # write the fragment
+            (written_fragments_count, fragments_histogram, GC_distribution_dict) = write_window_fragment(fragsfile_id, window, start_position, end_position, fragment_len, start_N_count, locus_info, minfragsize, maxfragsize, fragstinterval, written_fragments_count, fragments_histogram, GC_distribution_dict)
+
+        # at the locus end, write the fragments of the Crick strand in the order of this strand
+        if is_locus_end:
+            written_fragments_count = write_saved_crick_fragments(fragsfile_id, crick_file_id, locus_info, written_fragments_count)
+        RunReport.stop_stage('write')
+
+        # add the data of the locus to the run report at its end
+        if is_locus_end:
+            RunReport.add_locus(locus_info, end, total_fragments_count - locus_start_fragments_count, locus_start_times)
+            is_locus_start = True
 
-        # sort the list of position corresponding to the restriction sites in the Watson strand
-        ressite1_positions_list.sort()
-        Message.print('trace', 'ressite1_positions_list: {0}'.format(ressite1_positions_list))
+    # close the temporal file
+    crick_file_id.close()
 
-        # inicialize the last position processed in the Watson strand 
-        last_ressite1_position = 0
+    # return the fragments counts, the fragments histogram and the GC distribution
+    return (total_fragments_count, written_fragments_count, fragments_histogram, GC_distribution_dict)
 
-        # inicialize the indicator of first cut with True
-        is_first_cut = True
+#-------------------------------------------------------------------------------
+
+def stream_single_digest(genfile_id, genfile, fragsfile_id, blocksize, ressite1_seq, resoverhang1_seq, resoverhang2_seq, scanner, minfragsize, maxfragsize, fragstinterval, fragments_histogram, GC_distribution_dict, is_pipeline):
+    '''Do in silico a single digest of the genome scanning it in blocks, so the memory used does not depend on the locus size.'''
+
+    # get the lengths of the restriction site and the restriction overhangs
+    ressite1_len = len(ressite1_seq)
+    resoverhang1_len = len(resoverhang1_seq)
+    resoverhang2_len = len(resoverhang2_seq)
+
+    # set the nucleotides number kept before every block: the longest fragment written and the restriction sites around it
+    keep_len = maxfragsize + 3 * ressite1_len
+
+    # initialize the count of the total fragments and written fragments
+    total_fragments_count = 0
+    written_fragments_count = 0
 
-        # for each restriction site in the Watson strand
+    # initialize the indicator of locus start
+    is_locus_start = True
+
+    # for every block of the genome (read ahead by a thread, which keeps up to 4 blocks waiting, when is_pipeline is True)
+    blocks_iterator = read_fasta_blocks(genfile_id, genfile, blocksize)
+    if is_pipeline:
+        blocks_iterator = get_prefetched_items(blocks_iterator, 4)
+    for (locus_info, block_seq, is_locus_end) in blocks_iterator:
+
+        # initialize the locus data
+        if is_locus_start:
+            locus_start_times = RunReport.get_start_times()
+            locus_start_fragments_count = total_fragments_count
+            window = SequenceWindow(keep_len)
+            scan_start = 0
+            last_ressite1_position = 0
+            is_first_cut = True
+            next_start_position = 0
+            next_start_N_count = 0
+            is_locus_start = False
+
+        # append the block to the locus window
+        window.append(block_seq)
+        end = window.get_end()
+
+        # get the restriction sites starting in the scanned zone (the last nucleotides are scanned again with the next block)
+        RunReport.start_stage('scan')
+        limit = end if is_locus_end else end - ressite1_len + 1
+        ressite1_positions_list = []
+        for (position, kind) in scanner.scan(window.get_seq(scan_start, end)):
+            if scan_start + position >= limit:
+                break
+            ressite1_positions_list.append(scan_start + position)
+        RunReport.stop_stage('scan', end - scan_start)
+        scan_start = max(scan_start, limit)
+
+        # for each restriction site (the fragments are written as they are cut)
+        RunReport.start_stage('fragments')
         for ressite1_position in ressite1_positions_list:
 
             # add 1 to the count of total fragments
             total_fragments_count += 1
 
             # calculate the start and end positions of the fragment in the genome
-            if is_first_cut == True:
-                start_position = 0
-            else:
-                start_position = last_ressite1_position + len(ressite1_seq) - len(resoverhang1_seq)
-            end_position = ressite1_position + len(resoverhang2_seq)
+            start_position = next_start_position
+            end_position = ressite1_position + resoverhang2_len
+            fragment_len = max(0, min(end_position, end) - start_position)
+
+            # write the fragment
+            (written_fragments_count, fragments_histogram, GC_distribution_dict) = write_window_fragment(fragsfile_id, window, start_position, end_position, fragment_len, next_start_N_count, locus_info, minfragsize, maxfragsize, fragstinterval, written_fragments_count, fragments_histogram, GC_distribution_dict)
 
-            # set the indicator of first cut to False
+            # save the last position processed and the start of the next fragment
             is_first_cut = False
+            last_ressite1_position = ressite1_position
+            next_start_position = ressite1_position + ressite1_len - resoverhang1_len
+            next_start_N_count = window.get_N_count(next_start_position)
 
-            # get the genome insert
-            fragment_seq = watson_locus_seq[start_position:end_position].upper()
+        # if there are nucleotides after the last restriction site at the locus end
+        if is_locus_end:
+            if last_ressite1_position < end:
 
-            # calculate the fragment length
-            fragment_len = len(fragment_seq)
+                # add 1 to the count of total fragments
+                total_fragments_count += 1
 
-            # calculate the GC rate and the N count
-            (GC_rate, N_count) = get_GC_N_data(fragment_seq)
-            GC_rate_formatted = '{0:3.2f}'.format(GC_rate)
+                # calculate the start and end positions of the fragment in the genome
+                start_position = last_ressite1_position + ressite1_len - resoverhang1_len
+                start_N_count = window.get_N_count(start_position) if is_first_cut else next_start_N_count
+                fragment_len = max(0, end - start_position)
 
-            # if the fragment length is between the lower and the upper loci fragments size
-            if minfragsize <= fragment_len <= maxfragsize:
+                # write the fragment
+                (written_fragments_count, fragments_histogram, GC_distribution_dict) = write_window_fragment(fragsfile_id, window, start_position, end, fragment_len, start_N_count, locus_info, minfragsize, maxfragsize, fragstinterval, written_fragments_count, fragments_histogram, GC_distribution_dict)
+        RunReport.stop_stage('fragments')
 
-                # add 1 to the count of fragments written
-                written_fragments_count += 1
+        # add the data of the locus to the run report at its end
+        if is_locus_end:
+            RunReport.add_locus(locus_info, end, total_fragments_count - locus_start_fragments_count, locus_start_times)
+            is_locus_start = True
 
-                # write the FASTA head and fragment in the fragments file
-                fragsfile_id.write('>fragment: {0:d} | length: {1:d} | GC: {2} | strand: {3} | start: {4:d} | end: {5:d} | locus: {6}\n'.format(written_fragments_count, fragment_len, GC_rate_formatted, '+', start_position + 1, end_position,  locus_info))
-                fragsfile_id.write('{0}\n'.format(fragment_seq))
-                Message.print('trace', 'fragment_seq: {0}'.format(fragment_seq))
+    # return the fragments counts, the fragments histogram and the GC distribution
+    return (total_fragments_count, written_fragments_count, fragments_histogram, GC_distribution_dict)
 
-                # notify the reads have been written
-                Message.print('verbose', '\rFragments written ... {0:9d}'.format(written_fragments_count))
+#-------------------------------------------------------------------------------
 
-                # update the GC distribution
-                GC_distribution_dict[GC_rate_formatted] = GC_distribution_dict.get(GC_rate_formatted, 0) + 1
+def write_window_fragment(fragsfile_id, window, start_position, end_position, fragment_len, start_N_count, locus_info, minfragsize, maxfragsize, fragstinterval, written_fragments_count, fragments_histogram, GC_distribution_dict):
+    '''Write a fragment of the Watson strand held in the locus window when its length is between the loci fragments size, and update the statistics.'''
 
-            # update the intervals with the fragment length
-            intervals_dict = update_fragments_intervals(intervals_dict, fragstinterval, fragment_len, N_count)
+    # if the fragment length is between the lower and the upper loci fragments size
+    if minfragsize <= fragment_len <= maxfragsize:
 
-            # save the last position processed in the Watson strand 
-            last_ressite1_position = ressite1_position
+        # get the genome insert
+        fragment_seq = window.get_seq(start_position, start_position + fragment_len)
 
-        # if there are nucleotides after the  last restriction site in the Watson strand
-        if last_ressite1_position < len(watson_locus_seq):
+        # calculate the GC rate and the N count
+        (GC_rate, N_count) = get_GC_N_data(fragment_seq)
+        GC_rate_formatted = '{0:3.2f}'.format(GC_rate)
 
-            # add 1 to the count of total fragments
-            total_fragments_count += 1
+        # add 1 to the count of fragments written
+        written_fragments_count += 1
 
-            # calculate the start and end positions of the fragment in the genome
-            #start_position = last_ressite1_position
-            #end_position = len(watson_locus_seq)
-            start_position = last_ressite1_position + len(ressite1_seq) - len(resoverhang1_seq)
-            end_position = len(watson_locus_seq)
+        # write the FASTA head and fragment in the fragments file
+        fragsfile_id.write('>fragment: {0:d} | length: {1:d} | GC: {2} | strand: {3} | start: {4:d} | end: {5:d} | locus: {6}\n'.format(written_fragments_count, fragment_len, GC_rate_formatted, '+', start_position + 1, end_position,  locus_info))
+        fragsfile_id.write('{0}\n'.format(fragment_seq))
+        Message.print('trace', 'fragment_seq: {0}', fragment_seq)
 
-            # get the genome insert
-            fragment_seq = watson_locus_seq[start_position:end_position].upper()
+        # notify the reads have been written
+        Message.print_progress('Fragments written', written_fragments_count, 'fragments')
 
-            # calculate the fragment length
-            fragment_len = len(fragment_seq)
+        # update the GC distribution
+        GC_distribution_dict[GC_rate_formatted] = GC_distribution_dict.get(GC_rate_formatted, 0) + 1
 
-            # calculate the GC rate and the N count
-            (GC_rate, N_count) = get_GC_N_data(fragment_seq)
-            GC_rate_formatted = '{0:3.2f}'.format(GC_rate)
+    # calculate the N count of a fragment that is not written
+    else:
+        N_count = window.get_N_count(start_position + fragment_len) - start_N_count if fragment_len > 0 else 0
 
-            # if the fragment length is between the lower and the upper loci fragments size
-            if minfragsize <= fragment_len <= maxfragsize:
+    # update the fragments histogram with the fragment length
+    fragments_histogram.update(fragment_len, N_count)
 
-                # add 1 to the count of fragments written
-                written_fragments_count += 1
+    # return the count of fragments written, the fragments histogram and the GC distribution
+    return (written_fragments_count, fragments_histogram, GC_distribution_dict)
 
-                # write the FASTA head and fragment in the fragments file
-                fragsfile_id.write('>fragment: {0:d} | length: {1:d} | GC: {2} | strand: {3} | start: {4:d} | end: {5:d} | locus: {6}\n'.format(written_fragments_count, fragment_len, GC_rate_formatted, '+', start_position + 1, end_position,  locus_info))
-                fragsfile_id.write('{0}\n'.format(fragment_seq))
-                Message.print('trace', 'fragment_seq: {0}'.format(fragment_seq))
+#-------------------------------------------------------------------------------
 
-                # notify the reads have been written
-                Message.print('verbose', '\rFragments written ... {0:9d}'.format(written_fragments_count))
+def write_saved_crick_fragments(fragsfile_id, crick_file_id, locus_info, written_fragments_count):
+    '''Write the fragments of the Crick strand of a locus saved in the temporal file reading it from the end.'''
 
-                # update the GC distribution
-                GC_distribution_dict[GC_rate_formatted] = GC_distribution_dict.get(GC_rate_formatted, 0) + 1
+    # read the records from the end of the temporal file
+    position = crick_file_id.tell()
+    while position > 0:
 
-            # update the intervals with the fragment length
-            intervals_dict = update_fragments_intervals(intervals_dict, fragstinterval, fragment_len, N_count)
+        # get the record data
+        crick_file_id.seek(position - 4)
+        record_len = struct.unpack('<I', crick_file_id.read(4))[0]
+        position -= 4 + record_len
+        crick_file_id.seek(position)
+        (fragment_len, GC_rate_formatted, start_position, end_position, fragment_seq) = crick_file_id.read(record_len).decode('utf-8').split('\t', 4)
 
-    # close files
-    genfile_id.close()
-    fragsfile_id.close()
+        # add 1 to the count of fragments written
+        written_fragments_count += 1
 
-    # show OK message 
-    Message.print('verbose', '\n')
-    Message.print('info', 'The file {0} containing the fragments of the single digest of the genome is created.'.format(get_file_name(fragsfile)))
+        # write the FASTA head and fragment in the fragments file
+        fragsfile_id.write('>fragment: {0:d} | length: {1} | GC: {2} | strand: {3} | start: {4} | end: {5} | locus: {6}\n'.format(written_fragments_count, fragment_len, GC_rate_formatted, '-', start_position, end_position,  locus_info))
+        fragsfile_id.write('{0}\n'.format(fragment_seq))
+        Message.print('trace', 'fragment_seq: {0}', fragment_seq)
 
-    # write the statistics and save them in the statistics file
-    title = 'Distribution of fragments after a single digest with {0}'.format(enzyme1)
-    write_fragments_stats(fragstfile, intervals_dict, total_fragments_count, written_fragments_count, minfragsize, maxfragsize, title)
-    if plot.upper() == 'YES':
-        plot_fragments_graphic(fragstfile, intervals_dict, title)
+        # notify the reads have been written
+        Message.print_progress('Fragments written', written_fragments_count, 'fragments')
 
-    # write the GC distribution file
-    write_GC_distribution(fragsfile, GC_distribution_dict)
+    # empty the temporal file
+    crick_file_id.seek(0)
+    crick_file_id.truncate()
+
+    # return the count of fragments written
+    return written_fragments_count
+
+#-------------------------------------------------------------------------------
+
+def check_options(options_dict):
+    '''Check the options whose values are not compatible with the values of other ones, so they are not ignored silently.'''
+
+    # get the options values
+    genstore = options_dict['genstore']['value']
+    stream = options_dict['stream']['value']
+    processes = options_dict['processes']['value']
+    engine = options_dict['engine']['value']
+    fragtable = options_dict['fragtable']['value']
+    fragscolumns = options_dict['fragscolumns']['value']
+    sitecache = options_dict['sitecache']['value']
+    fragcache = options_dict['fragcache']['value']
+    gz = options_dict['gz']['value']
+    resume = options_dict['resume']['value']
+
+    # the fragments file can not be truncated at the end of the last locus completed when it is compressed
+    if resume.upper() == 'YES' and gz.upper() == 'YES':
+        raise ProgramError('L011', 'resume', resume, 'gz is YES')
+
+    # the sequences of the columnar fragments file are segments of the genome store
+    if fragscolumns.upper() != 'NONE' and genstore.upper() == 'NONE':
+        raise ProgramError('L011', 'fragscolumns', fragscolumns, 'genstore is NONE')
+
+    # the genome is scanned in blocks by a single process with regular expressions when stream is YES
+    if genstore.upper() == 'NONE' and stream.upper() == 'YES':
+        if processes != 1:
+            raise ProgramError('L011', 'processes', processes, 'stream is YES')
+        if engine.upper() != 'REGEX':
+            raise ProgramError('L011', 'engine', engine, 'stream is YES')
+
+        # the positions of the restriction sites of the blocks are not cached
+        if sitecache.upper() != 'NONE':
+            raise ProgramError('L011', 'sitecache', sitecache, 'stream is YES')
+
+        # the fragments of the blocks are not cached by locus
+        if fragcache.upper() != 'NONE':
+            raise ProgramError('L011', 'fragcache', fragcache, 'stream is YES')
+
+        # the digest of the blocks is not journaled by locus
+        if resume.upper() == 'YES':
+            raise ProgramError('L011', 'resume', resume, 'stream is YES')
+
+        # the fragments longer than maxfragsize are not kept in memory, so the fragments table can not be saved
+        if fragtable.upper() != 'NONE':
+            raise ProgramError('L011', 'fragtable', fragtable, 'stream is YES')
 
 #-------------------------------------------------------------------------------
 
@@ -603,7 +1834,12 @@ def build_options():
     # define the options dictionary
     options_dict = {
         'genfile': all_options_dict['genfile'],
+        'genstore': all_options_dict['genstore'],
         'fragsfile': all_options_dict['fragsfile'],
+        'fragscolumns': all_options_dict['fragscolumns'],
+        'gz': all_options_dict['gz'],
+        'gzlevel': all_options_dict['gzlevel'],
+        'gzthreads': all_options_dict['gzthreads'],
         'rsfile': all_options_dict['rsfile'],
         'enzyme1': all_options_dict['enzyme1'],
         'enzyme2': all_options_dict['enzyme2'],
@@ -611,7 +1847,20 @@ def build_options():
         'maxfragsize': all_options_dict['maxfragsize'],
         'fragstfile': all_options_dict['fragstfile'],
         'fragstinterval': all_options_dict['fragstinterval'],
+        'fragtable': all_options_dict['fragtable'],
+        'stream': all_options_dict['stream'],
+        'blocksize': all_options_dict['blocksize'],
+        'batchsize': all_options_dict['batchsize'],
+        'pipeline': all_options_dict['pipeline'],
+        'resume': all_options_dict['resume'],
+        'processes': all_options_dict['processes'],
+        'engine': all_options_dict['engine'],
+        'sitecache': all_options_dict['sitecache'],
+        'sitecachesize': all_options_dict['sitecachesize'],
+        'fragcache': all_options_dict['fragcache'],
+        'fragcachesize': all_options_dict['fragcachesize'],
         'plot': all_options_dict['plot'],
+        'report': all_options_dict['report'],
         'verbose': all_options_dict['verbose'],
         'trace': all_options_dict['trace']
     }
@@ -653,7 +1902,12 @@ def print_help(options_dict):
     Message.print('info', '       {0:16}   {1}'.format('option', 'value'))
     Message.print('info', '       {0:16}   {1}'.format('=' * 16, '=' * 78))
     Message.print('info', '       {0:16}   {1}'.format('--genfile', options_dict['genfile']['comment']))
+    Message.print('info', '       {0:16}   {1}'.format('--genstore', options_dict['genstore']['comment']))
     Message.print('info', '       {0:16}   {1}'.format('--fragsfile', options_dict['fragsfile']['comment']))
+    Message.print('info', '       {0:16}   {1}'.format('--fragscolumns', options_dict['fragscolumns']['comment']))
+    Message.print('info', '       {0:16}   {1}'.format('--gz', options_dict['gz']['comment']))
+    Message.print('info', '       {0:16}   {1}'.format('--gzlevel', options_dict['gzlevel']['comment']))
+    Message.print('info', '       {0:16}   {1}'.format('--gzthreads', options_dict['gzthreads']['comment']))
     Message.print('info', '       {0:16}   {1}'.format('--rsfile', options_dict['rsfile']['comment']))
     Message.print('info', '       {0:16}   {1}'.format('--enzyme1', options_dict['enzyme1']['comment']))
     Message.print('info', '       {0:16}   {1}'.format('--enzyme2', options_dict['enzyme2']['comment']))
@@ -661,7 +1915,20 @@ def print_help(options_dict):
     Message.print('info', '       {0:16}   {1}'.format('--maxfragsize', options_dict['maxfragsize']['comment']))
     Message.print('info', '       {0:16}   {1}'.format('--fragstfile', options_dict['fragstfile']['comment']))
     Message.print('info', '       {0:16}   {1}'.format('--fragstinterval', options_dict['fragstinterval']['comment']))
+    Message.print('info', '       {0:16}   {1}'.format('--fragtable', options_dict['fragtable']['comment']))
+    Message.print('info', '       {0:16}   {1}'.format('--stream', options_dict['stream']['comment']))
+    Message.print('info', '       {0:16}   {1}'.format('--blocksize', options_dict['blocksize']['comment']))
+    Message.print('info', '       {0:16}   {1}'.format('--batchsize', options_dict['batchsize']['comment']))
+    Message.print('info', '       {0:16}   {1}'.format('--pipeline', options_dict['pipeline']['comment']))
+    Message.print('info', '       {0:16}   {1}'.format('--resume', options_dict['resume']['comment']))
+    Message.print('info', '       {0:16}   {1}'.format('--processes', options_dict['processes']['comment']))
+    Message.print('info', '       {0:16}   {1}'.format('--engine', options_dict['engine']['comment']))
+    Message.print('info', '       {0:16}   {1}'.format('--sitecache', options_dict['sitecache']['comment']))
+    Message.print('info', '       {0:16}   {1}'.format('--sitecachesize', options_dict['sitecachesize']['comment']))
+    Message.print('info', '       {0:16}   {1}'.format('--fragcache', options_dict['fragcache']['comment']))
+    Message.print('info', '       {0:16}   {1}'.format('--fragcachesize', options_dict['fragcachesize']['comment']))
     Message.print('info', '       {0:16}   {1}'.format('--plot', options_dict['plot']['comment']))
+    Message.print('info', '       {0:16}   {1}'.format('--report', options_dict['report']['comment']))
     Message.print('info', '       {0:16}   {1}'.format('--verbose', options_dict['verbose']['comment']))
     Message.print('info', '       {0:16}   {1}'.format('--trace', options_dict['trace']['comment']))
 
@@ -677,7 +1944,12 @@ def build_config(options_dict):
     try:
         with open(config_file, mode='w', encoding='iso-8859-1') as config_file_id:
             config_file_id.write('{0:43} # {1}\n'.format('genfile' + '=' + options_dict['genfile']['default'], options_dict['genfile']['comment']))
+            config_file_id.write('{0:43} # {1}\n'.format('genstore' + '=' + options_dict['genstore']['default'], options_dict['genstore']['comment']))
             config_file_id.write('{0:43} # {1}\n'.format('fragsfile' + '=' + options_dict['fragsfile']['default'], options_dict['fragsfile']['comment']))
+            config_file_id.write('{0:43} # {1}\n'.format('fragscolumns' + '=' + options_dict['fragscolumns']['default'], options_dict['fragscolumns']['comment']))
+            config_file_id.write('{0:43} # {1}\n'.format('gz' + '=' + options_dict['gz']['default'], options_dict['gz']['comment']))
+            config_file_id.write('{0:43} # {1}\n'.format('gzlevel' + '=' + options_dict['gzlevel']['default'], options_dict['gzlevel']['comment']))
+            config_file_id.write('{0:43} # {1}\n'.format('gzthreads' + '=' + options_dict['gzthreads']['default'], options_dict['gzthreads']['comment']))
             config_file_id.write('{0:43} # {1}\n'.format('rsfile' + '=' + options_dict['rsfile']['default'], options_dict['rsfile']['comment']))
             config_file_id.write('{0:43} # {1}\n'.format('enzyme1' + '=' + options_dict['enzyme1']['default'], options_dict['enzyme1']['comment']))
             config_file_id.write('{0:43} # {1}\n'.format('enzyme2' + '=' + options_dict['enzyme2']['default'], options_dict['enzyme2']['comment']))
@@ -685,7 +1957,20 @@ def build_config(options_dict):
             config_file_id.write('{0:43} # {1}\n'.format('maxfragsize' + '=' + options_dict['maxfragsize']['default'], options_dict['maxfragsize']['comment']))
             config_file_id.write('{0:43} # {1}\n'.format('fragstfile' + '=' + options_dict['fragstfile']['default'], options_dict['fragstfile']['comment']))
             config_file_id.write('{0:43} # {1}\n'.format('fragstinterval' + '=' + options_dict['fragstinterval']['default'], options_dict['fragstinterval']['comment']))
+            config_file_id.write('{0:43} # {1}\n'.format('fragtable' + '=' + options_dict['fragtable']['default'], options_dict['fragtable']['comment']))
+            config_file_id.write('{0:43} # {1}\n'.format('stream' + '=' + options_dict['stream']['default'], options_dict['stream']['comment']))
+            config_file_id.write('{0:43} # {1}\n'.format('blocksize' + '=' + options_dict['blocksize']['default'], options_dict['blocksize']['comment']))
+            config_file_id.write('{0:43} # {1}\n'.format('batchsize' + '=' + options_dict['batchsize']['default'], options_dict['batchsize']['comment']))
+            config_file_id.write('{0:43} # {1}\n'.format('pipeline' + '=' + options_dict['pipeline']['default'], options_dict['pipeline']['comment']))
+            config_file_id.write('{0:43} # {1}\n'.format('resume' + '=' + options_dict['resume']['default'], options_dict['resume']['comment']))
+            config_file_id.write('{0:43} # {1}\n'.format('processes' + '=' + options_dict['processes']['default'], options_dict['processes']['comment']))
+            config_file_id.write('{0:43} # {1}\n'.format('engine' + '=' + options_dict['engine']['default'], options_dict['engine']['comment']))
+            config_file_id.write('{0:43} # {1}\n'.format('sitecache' + '=' + options_dict['sitecache']['default'], options_dict['sitecache']['comment']))
+            config_file_id.write('{0:43} # {1}\n'.format('sitecachesize' + '=' + options_dict['sitecachesize']['default'], options_dict['sitecachesize']['comment']))
+            config_file_id.write('{0:43} # {1}\n'.format('fragcache' + '=' + options_dict['fragcache']['default'], options_dict['fragcache']['comment']))
+            config_file_id.write('{0:43} # {1}\n'.format('fragcachesize' + '=' + options_dict['fragcachesize']['default'], options_dict['fragcachesize']['comment']))
             config_file_id.write('{0:43} # {1}\n'.format('plot' + '=' + options_dict['plot']['default'], options_dict['plot']['comment']))
+            config_file_id.write('{0:43} # {1}\n'.format('report' + '=' + options_dict['report']['default'], options_dict['report']['comment']))
             config_file_id.write('{0:43} # {1}\n'.format('verbose' + '=' + options_dict['verbose']['default'], options_dict['verbose']['comment']))
             config_file_id.write('{0:43} # {1}\n'.format('trace' + '=' + options_dict['trace']['default'], options_dict['trace']['comment']))
     except:
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+
+#-------------------------------------------------------------------------------
+
+'''This source contains the fixtures and functions shared by the tests of the
+   ddRADseqTools software package: the synthetic genomes, built with the seeded
+   generator of benchmark.py, and the runs of the programs in new processes.
+'''
+
+#-------------------------------------------------------------------------------
+
+import filecmp
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+#-------------------------------------------------------------------------------
+
+# the directory of the programs, which is added to the path to import them
+PROGRAMS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROGRAMS_DIR)
+
+#-------------------------------------------------------------------------------
+
+@pytest.fixture(scope='session')
+def genome_file(tmp_path_factory):
+    '''Build a synthetic genome of 2 Mb with 400 contigs of lognormal lengths and N gaps.'''
+
+    import benchmark
+
+    benchmark.Message.set_verbose_status(False)
+    return benchmark.build_synthetic_genome(str(tmp_path_factory.mktemp('genome')), 2, 0.41, 400, 'LOGNORMAL', 20, 1)
+
+#-------------------------------------------------------------------------------
+
+@pytest.fixture(scope='session')
+def small_loci_genome_file(tmp_path_factory):
+    '''Build a synthetic genome of 1 Mb with 5000 small contigs of uniform lengths.'''
+
+    import benchmark
+
+    benchmark.Message.set_verbose_status(False)
+    return benchmark.build_synthetic_genome(str(tmp_path_factory.mktemp('genome')), 1, 0.41, 5000, 'UNIFORM', 0, 2)
+
+#-------------------------------------------------------------------------------
+
+def run_program(program, options_dict):
+    '''Run a program of the package in a new process with the options of a dictionary and get its output.'''
+
+    # build the command with the options
+    command = [sys.executable, os.path.join(PROGRAMS_DIR, program)] + ['--{0}={1}'.format(option, value) for (option, value) in options_dict.items()]
+
+    # run the program and check it ends OK
+    process = subprocess.run(command, capture_output=True, text=True)
+    assert process.returncode == 0, process.stdout + process.stderr
+
+    # return the output
+    return process.stdout
+
+#-------------------------------------------------------------------------------
+
+def run_rsitesearch(genfile, outdir, program='rsitesearch.py', **options):
+    '''Run a double digest of rsitesearch (or of a program that runs it) with EcoRI and MseI (the options can change the enzymes or add other ones) and get the tuple (fragsfile, fragstfile, output) with the paths of its fragments file and statistics file and its output.'''
+
+    # set the options
+    os.makedirs(outdir, exist_ok=True)
+    fragsfile = os.path.join(outdir, 'fragments.fasta')
+    fragstfile = os.path.join(outdir, 'statistics.txt')
+    options_dict = {
+        'genfile': genfile,
+        'fragsfile': fragsfile,
+        'rsfile': os.path.join(PROGRAMS_DIR, 'restrictionsites.txt'),
+        'enzyme1': 'EcoRI',
+        'enzyme2': 'MseI',
+        'minfragsize': 101,
+        'maxfragsize': 300,
+        'fragstfile': fragstfile,
+        'fragstinterval': 25,
+        'plot': 'NO',
+        'verbose': 'NO',
+        'trace': 'NO'
+    }
+    options_dict.update(options)
+
+    # run the digest
+    output = run_program(program, options_dict)
+
+    # return the paths of the fragments file and the statistics file and the output
+    return (options_dict['fragsfile'], fragstfile, output)
+
+#-------------------------------------------------------------------------------
+
+def read_report(fragstfile):
+    '''Read the JSON report written next to a statistics file.'''
+
+    with open(os.path.splitext(fragstfile)[0] + '-report.json', mode='r', encoding='utf-8') as reportfile_id:
+        return json.load(reportfile_id)
+
+#-------------------------------------------------------------------------------
+
+def assert_same_digest(digest_files, other_digest_files):
+    '''Check that two digests, given as tuples whose first items are the paths of their fragments file and statistics file, have the same fragments, statistics (the CSV file of the statistics included) and GC distribution.'''
+
+    for (file, other_file) in zip(get_digest_files_list(*digest_files[:2]), get_digest_files_list(*other_digest_files[:2])):
+        assert filecmp.cmp(file, other_file, shallow=False), '{0} and {1} are different'.format(file, other_file)
+
+#-------------------------------------------------------------------------------
+
+def get_digest_files_list(fragsfile, fragstfile):
+    '''Get the list of files written by a digest: the fragments file, the statistics files and the GC distribution file.'''
+
+    return [fragsfile, fragstfile, os.path.splitext(fragstfile)[0] + '.csv', os.path.splitext(fragsfile[:-3] if fragsfile.endswith('.gz') else fragsfile)[0] + '-GC-distribution.csv']
+
+#-------------------------------------------------------------------------------
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+
+#-------------------------------------------------------------------------------
+
+'''This source contains the tests of benchmark.py.'''
+
+#-------------------------------------------------------------------------------
+
+import filecmp
+import os
+
+import genlib
+
+#-------------------------------------------------------------------------------
+
+def test_synthetic_genome(tmp_path):
+    '''The synthetic genome has the options given and the same seed always gives the same genome.'''
+
+    import benchmark
+
+    benchmark.Message.set_verbose_status(False)
+
+    # build the genome twice with a seed and once with other seed
+    genfiles_list = []
+    for (run, seed) in [('first', 1), ('second', 1), ('other', 2)]:
+        os.makedirs(str(tmp_path / run))
+        genfiles_list.append(benchmark.build_synthetic_genome(str(tmp_path / run), 0.2, 0.6, 30, 'LOGNORMAL', 50, seed))
+    assert filecmp.cmp(genfiles_list[0], genfiles_list[1], shallow=False)
+    assert not filecmp.cmp(genfiles_list[0], genfiles_list[2], shallow=False)
+
+    # check the contigs, the GC rate and the N gaps of the genome
+    loci_seqs_list = [locus_seq[locus_start:locus_end] for (locus_info, locus_seq, locus_start, locus_end) in genlib.get_genome_loci(genfiles_list[0], 'NONE')]
+    genome_seq = b''.join(loci_seqs_list)
+    assert (len(loci_seqs_list), len(genome_seq)) == (30, 200000)
+    assert abs(genlib.get_GC_N_data(genome_seq.decode('iso-8859-1'))[0] - 0.6) < 0.01
+    assert 0 < genome_seq.count(b'N') < len(genome_seq) // 10
+
+    # the genome is not generated again when it exists
+    modification_time = os.path.getmtime(genfiles_list[0])
+    assert benchmark.build_synthetic_genome(str(tmp_path / 'first'), 0.2, 0.6, 30, 'LOGNORMAL', 50, 1) == genfiles_list[0]
+    assert os.path.getmtime(genfiles_list[0]) == modification_time
+
+#-------------------------------------------------------------------------------
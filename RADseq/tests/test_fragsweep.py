@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+
+#-------------------------------------------------------------------------------
+
+'''This source contains the tests of fragsweep.py.'''
+
+#-------------------------------------------------------------------------------
+
+import csv
+import os
+import subprocess
+import sys
+
+from conftest import PROGRAMS_DIR, run_program, run_rsitesearch
+
+#-------------------------------------------------------------------------------
+
+def test_sweep_counts_match_fragments_file(genome_file, tmp_path):
+    '''The fragments of every size window swept over the fragments table are the ones of the fragments file written by the digest with every size.'''
+
+    # digest with every fragment size and save the fragments table
+    fragtable = str(tmp_path / 'table.npz')
+    (fragsfile, fragstfile, output) = run_rsitesearch(genome_file, str(tmp_path / 'digest'), enzyme1='PstI', enzyme2='MseI', minfragsize=1, maxfragsize=1000000, fragtable=fragtable)
+
+    # get the length, the GC rate and the Ns of every fragment of the fragments file
+    fragments_list = []
+    with open(fragsfile, mode='r', encoding='iso-8859-1') as fragsfile_id:
+        records_list = fragsfile_id.read().split('\n')[:-1]
+    for (head, seq) in zip(records_list[::2], records_list[1::2]):
+        fields_dict = dict([field.split(': ') for field in head[1:].split(' | ')[:6]])
+        fragments_list.append((int(fields_dict['length']), float(fields_dict['GC']), 'N' in seq.upper()))
+    assert fragments_list != []
+
+    # sweep the size windows
+    sweepfile = str(tmp_path / 'sweep.csv')
+    run_program('fragsweep.py', {'fragtable': fragtable, 'sweepstart': 51, 'sweepstop': 1051, 'sweepstep': 50, 'sweepwidth': 100, 'sweepfile': sweepfile, 'verbose': 'NO', 'trace': 'NO'})
+    with open(sweepfile, mode='r', encoding='iso-8859-1', newline='') as sweepfile_id:
+        rows_list = list(csv.DictReader(sweepfile_id, delimiter=';'))
+    assert [int(row['MINFRAGSIZE']) for row in rows_list] == list(range(51, 1052, 50))
+
+    # compare every size window with the fragments of the fragments file of its sizes
+    for row in rows_list:
+        (minfragsize, maxfragsize) = (int(row['MINFRAGSIZE']), int(row['MAXFRAGSIZE']))
+        assert maxfragsize == minfragsize + 99
+        window_fragments_list = [fragment for fragment in fragments_list if minfragsize <= fragment[0] <= maxfragsize]
+        assert int(row['FRAGS']) == len(window_fragments_list)
+        assert int(row['FRAGS WITH Ns']) == sum([fragment[2] for fragment in window_fragments_list])
+        if window_fragments_list != []:
+            assert abs(float(row['MEAN GC']) - sum([fragment[1] for fragment in window_fragments_list]) / len(window_fragments_list)) <= 0.0051
+
+#-------------------------------------------------------------------------------
+
+def test_sweep_without_fragments_table(tmp_path):
+    '''The sweep ends with an error when there is not a fragments table.'''
+
+    command = [sys.executable, os.path.join(PROGRAMS_DIR, 'fragsweep.py'), '--fragtable=NONE', '--sweepfile={0}'.format(tmp_path / 'sweep.csv'), '--verbose=NO', '--trace=NO']
+    process = subprocess.run(command, capture_output=True, text=True)
+    assert process.returncode != 0
+    assert 'D207' in process.stdout + process.stderr
+    assert not os.path.exists(tmp_path / 'sweep.csv')
+
+#-------------------------------------------------------------------------------
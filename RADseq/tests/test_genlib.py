@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+
+#-------------------------------------------------------------------------------
+
+'''This source contains the tests of the classes of genlib.py.'''
+
+#-------------------------------------------------------------------------------
+
+import random
+
+import genlib
+
+#-------------------------------------------------------------------------------
+
+def test_GC_N_index(tmp_path):
+    '''The GC rates and N counts of segments got from the prefix sums of the GC and N index are the ones of their nucleotides, also in segments with N runs, empty ones and ones ending at the store end.'''
+
+    import numpy as np
+
+    # write a genome whose loci have runs of Ns across the steps of the index and soft-masked nucleotides
+    random_generator = random.Random(3)
+    loci_list = []
+    for locus_len in [1000, 777, 2048, 5]:
+        locus_seq = ''.join(random_generator.choice('ACGTacgt') for i in range(locus_len))
+        run_start = random_generator.randrange(locus_len)
+        locus_seq = locus_seq[:run_start] + 'N' * 300 + locus_seq[run_start:]
+        loci_list.append(locus_seq)
+    loci_list.append('N' * 513)
+    genfile = str(tmp_path / 'genome.fasta')
+    with open(genfile, mode='w', encoding='iso-8859-1') as genfile_id:
+        for (i, locus_seq) in enumerate(loci_list):
+            genfile_id.write('>locus {0}\n'.format(i + 1))
+            for j in range(0, len(locus_seq), 60):
+                genfile_id.write('{0}\n'.format(locus_seq[j:j + 60]))
+
+    # build the genome store and its GC and N index
+    storefile = str(tmp_path / 'genome.store')
+    genlib.build_genome_store(genfile, storefile)
+    store_seq = ''.join(loci_list).upper()
+    assert len(genlib.GCNIndex.map_store(storefile)) == len(store_seq)
+
+    # get segments of every length, the whole store and empty ones included
+    starts_list = [random_generator.randrange(len(store_seq) + 1) for i in range(500)] + [0, 0, len(store_seq), 1000]
+    ends_list = [random_generator.randrange(start, min(start + 1500, len(store_seq)) + 1) for start in starts_list[:500]] + [len(store_seq), 0, len(store_seq), 1300]
+
+    # compare the GC rates and N counts of the index with the ones of the nucleotides
+    GC_N_index = genlib.GCNIndex(storefile)
+    (GC_rates_array, N_counts_array) = GC_N_index.get_GC_N_arrays(np.array(starts_list, dtype=np.int64), np.array(ends_list, dtype=np.int64))
+    for (start, end, GC_rate, N_count) in zip(starts_list, ends_list, GC_rates_array.tolist(), N_counts_array.tolist()):
+        segment_seq = store_seq[start:end]
+        GC_count = segment_seq.count('G') + segment_seq.count('C')
+        GCAT_count = GC_count + segment_seq.count('A') + segment_seq.count('T')
+        assert N_count == len(segment_seq) - GCAT_count
+        assert GC_rate == (GC_count / GCAT_count if GCAT_count != 0 else 0)
+        assert GC_N_index.get_GC_N_data(start, end) == (GC_rate, N_count)
+
+#-------------------------------------------------------------------------------
+
+def test_fragments_histogram(monkeypatch):
+    '''The histogram counts the fragments longer than the arrays in its dictionary, keeps them when it is merged and rebuilt from its lengths, and gets the intervals of the fragments with the one of the length 0 ending in 0.'''
+
+    # count the pending fragments every few ones, so the merge adds counted and pending fragments, and use lengths around the longest one of the arrays
+    monkeypatch.setattr(genlib.FragmentsHistogram, 'max_pending_count', 7)
+    random_generator = random.Random(5)
+    fragments_list = [(random_generator.choice([0, 1, 24, 25, 26, 63, 64, 1048575, 1048576, 1048577, 3000000]), random_generator.choice([0, 0, 2])) for i in range(200)]
+
+    # count the fragments in two histograms, the second one from arrays, and merge them
+    histogram = genlib.FragmentsHistogram()
+    for (fragment_len, N_count) in fragments_list[:120]:
+        histogram.update(fragment_len, N_count)
+    other_histogram = genlib.FragmentsHistogram()
+    other_histogram.update_arrays([fragment_len for (fragment_len, N_count) in fragments_list[120:190]], [N_count for (fragment_len, N_count) in fragments_list[120:190]])
+    for (fragment_len, N_count) in fragments_list[190:]:
+        other_histogram.update(fragment_len, N_count)
+    histogram.merge(other_histogram)
+    assert sorted(histogram.long_counts_dict) == [1048576, 1048577, 3000000]
+    assert len(histogram.counts_array) <= genlib.FragmentsHistogram.max_array_len
+
+    # the lengths and N flags of the histogram are the ones of the fragments
+    (lens_array, N_flags_array) = histogram.get_lens_arrays()
+    assert sorted(zip(lens_array.tolist(), N_flags_array.tolist())) == sorted([(fragment_len, N_count > 0) for (fragment_len, N_count) in fragments_list])
+
+    # the intervals of the histogram and of the one rebuilt from its lengths are the ones of the fragments
+    rebuilt_histogram = genlib.FragmentsHistogram()
+    rebuilt_histogram.update_arrays(lens_array, N_flags_array)
+    for fragstinterval in [1, 25, 1000]:
+        intervals_dict = {}
+        for (fragment_len, N_count) in fragments_list:
+            first_value = ((fragment_len - 1) // fragstinterval) * fragstinterval + 1
+            data = intervals_dict.setdefault((first_value, first_value + fragstinterval - 1), [0, 0])
+            data[0] += 1
+            data[1] += N_count > 0
+        intervals_list = [(first_value, last_value, count, N_count) for ((first_value, last_value), (count, N_count)) in sorted(intervals_dict.items())]
+        assert intervals_list[0][:2] == (1 - fragstinterval, 0)
+        assert histogram.get_intervals_list(fragstinterval) == intervals_list
+        assert rebuilt_histogram.get_intervals_list(fragstinterval) == intervals_list
+
+#-------------------------------------------------------------------------------
+
+def test_restriction_site_scanner():
+    '''The single pass scanner finds, for every enzyme, the positions of its sites found one by one with a pattern of each unambiguous sequence, in strings and bytes, in a segment of the sequence and in loci scanned together.'''
+
+    import re
+
+    # get the sites of enzymes with shared, overlapping, ambiguous and non palindromic sequences and their reverse complementary ones
+    ressite_seqs_list = ['GAATTC', 'TTAA', 'CACNNNGTG', 'CCWGG', 'GGTCTC', 'GAGACC', 'AATT']
+    ressite_seq_lists = [[ressite_seq] for ressite_seq in ressite_seqs_list]
+    scanner = genlib.RestrictionSiteScanner(ressite_seq_lists)
+
+    # get a sequence with many sites of every enzyme, Ns and other codes
+    random_generator = random.Random(7)
+    seq = ''.join(random_generator.choice(['A', 'C', 'G', 'T', 'A', 'T', 'N', 'GAATTC', 'TTAA', 'CACGTGTG', 'CCAGG', 'GGTCTC', 'GAGACC', 'R']) for i in range(20000))
+
+    # get the sites of every unambiguous sequence one by one
+    def get_ressites_list(seq, start, end):
+        ressites_list = []
+        for (tag, ressite_seq) in enumerate(ressite_seqs_list):
+            for unambiguous_ressite_seq in genlib.get_unambiguous_sequence_list(ressite_seq):
+                ressites_list.extend([(m.start(), tag) for m in re.finditer('(?={0})'.format(unambiguous_ressite_seq), seq[:end]) if m.start() >= start])
+        return sorted(set(ressites_list))
+
+    # compare the sites found by the scanner
+    for (start, end) in [(0, len(seq)), (1234, 5678), (5, 5)]:
+        ressites_list = get_ressites_list(seq, start, end)
+        assert scanner.scan(seq, start, end) == ressites_list
+        assert scanner.scan(seq.encode('iso-8859-1'), start, end) == ressites_list
+    assert len(set([tag for (position, tag) in get_ressites_list(seq, 0, len(seq))])) == len(ressite_seqs_list)
+
+    # compare the positions of the sites of every enzyme of loci scanned together
+    loci_list = [(0, 3000), (3000, 3004), (2990, 9000), (15000, len(seq))]
+    for ((locus_start, locus_end), positions_lists) in zip(loci_list, scanner.scan_loci([(seq.encode('iso-8859-1'), locus_start, locus_end) for (locus_start, locus_end) in loci_list])):
+        ressites_list = get_ressites_list(seq, locus_start, locus_end)
+        assert list(positions_lists) == [[position - locus_start for (position, tag) in ressites_list if tag == i] for i in range(len(ressite_seqs_list))]
+
+#-------------------------------------------------------------------------------
+
+def test_lazy_messages(capsys, monkeypatch):
+    '''The verbose and trace messages are not built when their status is off, and the progress messages are printed at most once every interval with the final count at the end.'''
+
+    # get a message argument that fails when it is formatted and a message text that counts its calls
+    class UnformattableArgument():
+        def __format__(self, format_spec):
+            raise AssertionError('the message is built')
+    calls_list = []
+    def get_message_text():
+        calls_list.append(1)
+        return 'lazy message'
+
+    # the messages are not built when their status is off
+    monkeypatch.setattr(genlib.Message, 'verbose_status', False)
+    monkeypatch.setattr(genlib.Message, 'trace_status', False)
+    genlib.Message.print('trace', 'argument: {0}', UnformattableArgument())
+    genlib.Message.print('verbose', get_message_text)
+    genlib.Message.print_progress('Fragments written', 1, 'fragments')
+    genlib.Message.end_progress()
+    assert calls_list == []
+    assert capsys.readouterr().out == ''
+
+    # the messages are built when their status is on
+    monkeypatch.setattr(genlib.Message, 'verbose_status', True)
+    monkeypatch.setattr(genlib.Message, 'trace_status', True)
+    genlib.Message.print('trace', 'argument: {0}', 'trace')
+    genlib.Message.print('verbose', get_message_text)
+    assert calls_list == [1]
+    assert capsys.readouterr().out == 'argument: trace\nlazy message'
+
+    # only the first progress message of an interval is printed before the final one
+    monkeypatch.setattr(genlib.Message, 'progress_interval', 3600)
+    for count in range(1, 101):
+        genlib.Message.print_progress('Fragments written', count, 'fragments', count * 1000)
+    genlib.Message.end_progress()
+    output = capsys.readouterr().out
+    assert output.count('\r') == 2
+    assert output.startswith('\rFragments written ...         1') and '\rFragments written ...       100' in output and output.endswith('\n')
+
+#-------------------------------------------------------------------------------
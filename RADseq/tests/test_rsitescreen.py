@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+
+#-------------------------------------------------------------------------------
+
+'''This source contains the tests of rsitescreen.py.'''
+
+#-------------------------------------------------------------------------------
+
+import csv
+import os
+
+from conftest import PROGRAMS_DIR, read_report, run_program, run_rsitesearch
+
+#-------------------------------------------------------------------------------
+
+def test_screen_counts_match_rsitesearch(genome_file, tmp_path):
+    '''The fragments of every enzyme pair screened in a genome of many contigs are the ones of its double digest with rsitesearch, in every size window.'''
+
+    # screen a panel with palindromic, ambiguous, interrupted and non palindromic restriction sites in two size windows
+    screenfile = str(tmp_path / 'screen.csv')
+    run_program('rsitescreen.py', {'genfile': genome_file, 'genstore': 'NONE', 'rsfile': os.path.join(PROGRAMS_DIR, 'restrictionsites.txt'), 'enzymes': 'EcoRI,MseI,PstI,c*cgg,ggtctcn*,AdeI,c*cwgg', 'windows': '101-200,201-300', 'screenfile': screenfile, 'verbose': 'NO', 'trace': 'NO'})
+    with open(screenfile, mode='r', encoding='iso-8859-1', newline='') as screenfile_id:
+        rows_dict = {(row['ENZYME1'], row['ENZYME2']): row for row in csv.DictReader(screenfile_id, delimiter=';')}
+
+    # compare some pairs with their digest
+    for (enzyme1, enzyme2) in [('EcoRI', 'MseI'), ('MseI', 'EcoRI'), ('PstI', 'c*cgg'), ('ggtctcn*', 'EcoRI'), ('AdeI', 'c*cwgg'), ('c*cwgg', 'PstI')]:
+        (fragsfile, fragstfile, output) = run_rsitesearch(genome_file, str(tmp_path / 'digest'), enzyme1=enzyme1, enzyme2=enzyme2, minfragsize=101, maxfragsize=300, report='YES')
+        report_dict = read_report(fragstfile)
+        with open(fragsfile, mode='r', encoding='iso-8859-1') as fragsfile_id:
+            fragment_lens_list = [len(record.strip()) for record in fragsfile_id if not record.startswith('>')]
+        assert int(rows_dict[(enzyme1, enzyme2)]['FRAGS']) == report_dict['total_fragments']
+        assert int(rows_dict[(enzyme1, enzyme2)]['101-200']) + int(rows_dict[(enzyme1, enzyme2)]['201-300']) == report_dict['written_fragments']
+        assert int(rows_dict[(enzyme1, enzyme2)]['101-200']) == len([fragment_len for fragment_len in fragment_lens_list if fragment_len <= 200])
+
+#-------------------------------------------------------------------------------
@@ -0,0 +1,424 @@
+# -*- coding: utf-8 -*-
+
+#-------------------------------------------------------------------------------
+
+'''This source contains the tests of rsitesearch.py: every mode of the digest
+   has to write the same fragments and statistics as the default one.
+'''
+
+#-------------------------------------------------------------------------------
+
+import gzip
+import json
+import os
+import shutil
+
+import pytest
+
+from conftest import PROGRAMS_DIR, assert_same_digest, read_report, run_rsitesearch
+
+#-------------------------------------------------------------------------------
+
+@pytest.fixture(scope='module')
+def default_digest(genome_file, tmp_path_factory):
+    '''Do the double digest of the genome with the default options.'''
+
+    return run_rsitesearch(genome_file, str(tmp_path_factory.mktemp('default')))
+
+#-------------------------------------------------------------------------------
+
+@pytest.fixture(scope='module')
+def enzymes_digest(genome_file, tmp_path_factory):
+    '''Get a function that does the digest of the genome with the default options and other enzymes (a single digest when both are the same), which is done once for every pair of enzymes.'''
+
+    digests_dict = {}
+
+    def get_enzymes_digest(enzyme1, enzyme2):
+        if (enzyme1, enzyme2) not in digests_dict:
+            digests_dict[(enzyme1, enzyme2)] = run_rsitesearch(genome_file, str(tmp_path_factory.mktemp('default')), enzyme1=enzyme1, enzyme2=enzyme2)
+        return digests_dict[(enzyme1, enzyme2)]
+
+    return get_enzymes_digest
+
+#-------------------------------------------------------------------------------
+
+def test_stream(genome_file, default_digest, enzymes_digest, tmp_path):
+    '''The digest scanning the genome in blocks is the default one, with blocks shorter than many loci, and in a single digest and with an enzyme with ambiguity codes too.'''
+
+    for blocksize in [1000000, 997]:
+        assert_same_digest(run_rsitesearch(genome_file, str(tmp_path / str(blocksize)), stream='YES', blocksize=blocksize), default_digest)
+    for (enzyme1, enzyme2) in [('PstI', 'PstI'), ('AdeI', 'c*cgg')]:
+        assert_same_digest(run_rsitesearch(genome_file, str(tmp_path / '{0}-{1}'.format(enzyme1, enzyme2).replace('*', '')), enzyme1=enzyme1, enzyme2=enzyme2, stream='YES', blocksize=997), enzymes_digest(enzyme1, enzyme2))
+
+#-------------------------------------------------------------------------------
+
+def test_genome_store(genome_file, default_digest, enzymes_digest, tmp_path):
+    '''The digest of the genome store is the default one, when the store is built and when it is reused by the digests of other enzymes.'''
+
+    genstore = str(tmp_path / 'genome.store')
+    for run in ['build', 'reuse']:
+        assert_same_digest(run_rsitesearch(genome_file, str(tmp_path / run), genstore=genstore), default_digest)
+    for (enzyme1, enzyme2) in [('PstI', 'c*cgg'), ('EcoRI', 'EcoRI')]:
+        assert_same_digest(run_rsitesearch(genome_file, str(tmp_path / '{0}-{1}'.format(enzyme1, enzyme2).replace('*', '')), enzyme1=enzyme1, enzyme2=enzyme2, genstore=genstore), enzymes_digest(enzyme1, enzyme2))
+
+#-------------------------------------------------------------------------------
+
+def test_processes(genome_file, default_digest, enzymes_digest, tmp_path):
+    '''The digest of a pool of processes is the default one, when the loci are sent to the processes and when they read them from the genome store, and in a single digest and with an interrupted palindrome too.'''
+
+    for (run, genstore) in [('fasta', 'NONE'), ('store', str(tmp_path / 'genome.store'))]:
+        assert_same_digest(run_rsitesearch(genome_file, str(tmp_path / run), processes=2, genstore=genstore), default_digest)
+    for (enzyme1, enzyme2) in [('EcoRI', 'EcoRI'), ('gccnnnn*nggc', 'MseI')]:
+        assert_same_digest(run_rsitesearch(genome_file, str(tmp_path / '{0}-{1}'.format(enzyme1, enzyme2).replace('*', '')), enzyme1=enzyme1, enzyme2=enzyme2, processes=2, genstore=str(tmp_path / 'genome.store')), enzymes_digest(enzyme1, enzyme2))
+
+#-------------------------------------------------------------------------------
+
+def test_numpy_engine(genome_file, default_digest, enzymes_digest, tmp_path):
+    '''The digest of the NumPy engine is the default one, with the loci coded in blocks shorter than many loci too, and in a single digest and with enzymes with ambiguity codes.'''
+
+    for blocksize in [1000000, 997]:
+        assert_same_digest(run_rsitesearch(genome_file, str(tmp_path / str(blocksize)), engine='NUMPY', blocksize=blocksize), default_digest)
+    for (enzyme1, enzyme2) in [('PstI', 'PstI'), ('AdeI', 'c*cgg'), ('gccnnnn*nggc', 'MseI')]:
+        assert_same_digest(run_rsitesearch(genome_file, str(tmp_path / '{0}-{1}'.format(enzyme1, enzyme2).replace('*', '')), enzyme1=enzyme1, enzyme2=enzyme2, engine='NUMPY', blocksize=997), enzymes_digest(enzyme1, enzyme2))
+
+#-------------------------------------------------------------------------------
+
+def test_site_cache(genome_file, default_digest, enzymes_digest, tmp_path):
+    '''The digest is the default one when the positions of the restriction sites are saved in the site cache and when they are read from it, and the positions of other enzymes saved in the same cache are kept apart.'''
+
+    sitecache = str(tmp_path / 'sitecache')
+    for run in ['save', 'load']:
+        digest = run_rsitesearch(genome_file, str(tmp_path / run), sitecache=sitecache)
+        assert_same_digest(digest, default_digest)
+    assert 'read from the site cache' in digest[2]
+    for (enzyme1, enzyme2) in [('PstI', 'c*cgg'), ('EcoRI', 'EcoRI')]:
+        for run in ['save', 'load']:
+            digest = run_rsitesearch(genome_file, str(tmp_path / '{0}-{1}-{2}'.format(enzyme1, enzyme2, run).replace('*', '')), enzyme1=enzyme1, enzyme2=enzyme2, sitecache=sitecache)
+            assert_same_digest(digest, enzymes_digest(enzyme1, enzyme2))
+            assert ('read from the site cache' in digest[2]) == (run == 'load')
+
+#-------------------------------------------------------------------------------
+
+def test_bgzf_output(genome_file, enzymes_digest, tmp_path):
+    '''The fragments file compressed in BGZF format has the fragments of the digest, in a single digest too, and the extension .gz is added to its name when it is missing.'''
+
+    import genlib
+
+    for (run, fragsfile_name, enzyme1, enzyme2) in [('gz-name', 'fragments.fasta.gz', 'EcoRI', 'MseI'), ('plain-name', 'fragments.fasta', 'EcoRI', 'MseI'), ('single', 'fragments.fasta', 'PstI', 'PstI')]:
+
+        # do the digest compressing the fragments file
+        (fragsfile, fragstfile, output) = run_rsitesearch(genome_file, str(tmp_path / run), fragsfile=str(tmp_path / run / fragsfile_name), enzyme1=enzyme1, enzyme2=enzyme2, gz='YES', gzthreads=2)
+        fragsfile = str(tmp_path / run / 'fragments.fasta.gz')
+        assert genlib.is_bgzf_file(fragsfile)
+        assert not os.path.exists(str(tmp_path / run / 'fragments.fasta'))
+
+        # decompress the fragments file and compare the digest
+        uncompressed_fragsfile = str(tmp_path / run / 'fragments.fasta')
+        with gzip.open(fragsfile, mode='rb') as fragsfile_id, open(uncompressed_fragsfile, mode='wb') as uncompressed_fragsfile_id:
+            shutil.copyfileobj(fragsfile_id, uncompressed_fragsfile_id)
+        assert_same_digest((uncompressed_fragsfile, fragstfile), enzymes_digest(enzyme1, enzyme2))
+
+#-------------------------------------------------------------------------------
+
+def test_bgzf_genome(genome_file, enzymes_digest, tmp_path):
+    '''The digest of the genome compressed in BGZF format is the one of the uncompressed genome, when it is read by this process and by a pool of processes through its index, and the digest of the genome compressed with gzip too, with several enzymes.'''
+
+    import genlib
+
+    # compress the genome in BGZF format and with gzip
+    bgzf_genfile = str(tmp_path / 'genome-bgzf.fasta.gz')
+    bgzf_genfile_id = genlib.BgzfWriter(bgzf_genfile, 6, 2)
+    with open(genome_file, mode='r', encoding='iso-8859-1') as genfile_id:
+        bgzf_genfile_id.write(genfile_id.read())
+    bgzf_genfile_id.close()
+    gzip_genfile = str(tmp_path / 'genome-gzip.fasta.gz')
+    with open(genome_file, mode='rb') as genfile_id, gzip.open(gzip_genfile, mode='wb') as gzip_genfile_id:
+        shutil.copyfileobj(genfile_id, gzip_genfile_id)
+
+    # compare the digests
+    for (run, genfile, processes, enzyme1, enzyme2) in [('bgzf-1', bgzf_genfile, 1, 'EcoRI', 'MseI'), ('bgzf-2', bgzf_genfile, 2, 'EcoRI', 'MseI'), ('gzip', gzip_genfile, 1, 'EcoRI', 'MseI'), ('bgzf-single', bgzf_genfile, 2, 'EcoRI', 'EcoRI'), ('gzip-ambiguous', gzip_genfile, 1, 'AdeI', 'c*cgg')]:
+        assert_same_digest(run_rsitesearch(genfile, str(tmp_path / run), processes=processes, enzyme1=enzyme1, enzyme2=enzyme2), enzymes_digest(enzyme1, enzyme2))
+
+#-------------------------------------------------------------------------------
+
+def test_fragments_cache(genome_file, default_digest, tmp_path):
+    '''The digest is the default one when the loci are saved in the fragments cache and when they are read from it, only the changed locus of an updated genome is digested again, and the loci of digests with other parameters are not read.'''
+
+    # digest the genome twice with the fragments cache
+    fragcache = str(tmp_path / 'fragcache')
+    for run in ['save', 'load']:
+        digest = run_rsitesearch(genome_file, str(tmp_path / run), fragcache=fragcache)
+        assert_same_digest(digest, default_digest)
+    assert '\n0 of 400 loci have been digested' in digest[2]
+
+    # update the genome changing the sequence of the second contig
+    with open(genome_file, mode='r', encoding='iso-8859-1') as genfile_id:
+        records_list = genfile_id.read().split('\n')
+    i = [j for (j, record) in enumerate(records_list) if record.startswith('>')][1] + 1
+    records_list[i] = records_list[i][::-1]
+    updated_genfile = str(tmp_path / 'updated-genome.fasta')
+    with open(updated_genfile, mode='w', encoding='iso-8859-1') as updated_genfile_id:
+        updated_genfile_id.write('\n'.join(records_list))
+
+    # digest the updated genome with the fragments cache
+    digest = run_rsitesearch(updated_genfile, str(tmp_path / 'update'), fragcache=fragcache)
+    assert_same_digest(digest, run_rsitesearch(updated_genfile, str(tmp_path / 'update-default')))
+    assert '\n1 of 400 loci have been digested' in digest[2]
+
+    # the loci digested with other enzymes and other fragment sizes are saved apart in the same fragments cache
+    for (enzyme1, enzyme2, maxfragsize) in [('EcoRI', 'EcoRI', 300), ('gccnnnn*nggc', 'MseI', 300), ('gccnnnn*nggc', 'MseI', 250)]:
+        other_default_digest = run_rsitesearch(genome_file, str(tmp_path / '{0}-{1}-{2}-default'.format(enzyme1, enzyme2, maxfragsize).replace('*', '')), enzyme1=enzyme1, enzyme2=enzyme2, maxfragsize=maxfragsize)
+        for (run, digested_loci_count) in [('save', 400), ('load', 0)]:
+            digest = run_rsitesearch(genome_file, str(tmp_path / '{0}-{1}-{2}-{3}'.format(enzyme1, enzyme2, maxfragsize, run).replace('*', '')), enzyme1=enzyme1, enzyme2=enzyme2, maxfragsize=maxfragsize, fragcache=fragcache)
+            assert_same_digest(digest, other_default_digest)
+            assert '\n{0} of 400 loci have been digested'.format(digested_loci_count) in digest[2]
+
+#-------------------------------------------------------------------------------
+
+def test_resume(genome_file, default_digest, enzymes_digest, tmp_path):
+    '''The digest resumed after an interrupted run is the default one, in a double and a single digest, also when the fragments table and columns are saved.'''
+
+    import numpy as np
+
+    # a completed digest removes its journal
+    (fragsfile, fragstfile, output) = run_rsitesearch(genome_file, str(tmp_path / 'completed'), resume='YES')
+    assert_same_digest((fragsfile, fragstfile), default_digest)
+    assert not os.path.exists(fragsfile + '.journal')
+
+    # write a program that does a digest keeping its journal
+    program = str(tmp_path / 'rsitesearch_keeping_journal.py')
+    with open(program, mode='w', encoding='utf-8') as program_id:
+        program_id.write('import sys\nsys.path.insert(0, {0!r})\nimport genlib\ngenlib.DigestJournal.remove = lambda journal: journal.journal_file_id.close()\nimport rsitesearch\nrsitesearch.main(sys.argv[1:])\n'.format(PROGRAMS_DIR))
+
+    for (enzyme1, enzyme2, options_dict) in [('EcoRI', 'MseI', {}), ('PstI', 'PstI', {'genstore': str(tmp_path / 'genome.store'), 'fragtable': str(tmp_path / 'table.npz'), 'fragscolumns': str(tmp_path / 'columns.npz')})]:
+
+        # do a digest that keeps its journal and break the journal in a record, as a run interrupted after writing the
+        # fragments of the next loci
+        run = '{0}-{1}'.format(enzyme1, enzyme2)
+        (fragsfile, fragstfile, output) = run_rsitesearch(genome_file, str(tmp_path / run), program=program, enzyme1=enzyme1, enzyme2=enzyme2, resume='YES', batchsize=0, **options_dict)
+        with open(fragsfile + '.journal', mode='r', encoding='utf-8') as journal_file_id:
+            assert all([json.loads(record) is not None for record in journal_file_id])
+        os.truncate(fragsfile + '.journal', os.path.getsize(fragsfile + '.journal') * 2 // 3)
+        saved_arrays_list = [(file, dict(np.load(file))) for file in [options_dict.get('fragtable'), options_dict.get('fragscolumns')] if file is not None]
+
+        # resume the digest
+        digest = run_rsitesearch(genome_file, str(tmp_path / run), enzyme1=enzyme1, enzyme2=enzyme2, resume='YES', batchsize=0, **options_dict)
+        assert 'The digest is resumed after the' in digest[2]
+        assert_same_digest(digest, enzymes_digest(enzyme1, enzyme2))
+        assert not os.path.exists(fragsfile + '.journal')
+        for (file, arrays_dict) in saved_arrays_list:
+            resumed_arrays_dict = dict(np.load(file))
+            assert sorted(resumed_arrays_dict) == sorted(arrays_dict)
+            assert all([np.array_equal(resumed_arrays_dict[name], array) for (name, array) in arrays_dict.items()])
+
+#-------------------------------------------------------------------------------
+
+def test_pipeline(genome_file, enzymes_digest, tmp_path):
+    '''The digest without the threads that read the genome ahead and write the fragments file is the one with them, in the digest of the loci in memory, from the genome store, by a pool of processes and in the stream digest, in a double and a single digest.'''
+
+    for (enzyme1, enzyme2) in [('EcoRI', 'MseI'), ('PstI', 'PstI')]:
+        for (run, options_dict) in [('memory', {}), ('store', {'genstore': str(tmp_path / 'genome.store')}), ('processes', {'processes': 2}), ('stream', {'stream': 'YES', 'blocksize': 997})]:
+            assert_same_digest(run_rsitesearch(genome_file, str(tmp_path / '{0}-{1}-{2}'.format(enzyme1, enzyme2, run)), enzyme1=enzyme1, enzyme2=enzyme2, pipeline='NO', **options_dict), enzymes_digest(enzyme1, enzyme2))
+
+#-------------------------------------------------------------------------------
+
+def test_batches(small_loci_genome_file, tmp_path):
+    '''The digest of the small loci in batches is the digest of every locus alone, with and without the read ahead of the loci, by a pool of processes and from the genome store, in a double digest with an enzyme with ambiguity codes and in a single digest too.'''
+
+    for (enzyme1, enzyme2) in [('EcoRI', 'MseI'), ('AdeI', 'c*cgg'), ('MseI', 'MseI')]:
+        run_dir = tmp_path / '{0}-{1}'.format(enzyme1, enzyme2).replace('*', '')
+        unbatched_digest = run_rsitesearch(small_loci_genome_file, str(run_dir / 'unbatched'), enzyme1=enzyme1, enzyme2=enzyme2, batchsize=0)
+        for (run, options_dict) in [('batched', {}), ('small-batches', {'blocksize': 5000}), ('no-pipeline', {'pipeline': 'NO'}), ('processes', {'processes': 2}), ('store', {'genstore': str(tmp_path / 'genome.store')})]:
+            assert_same_digest(run_rsitesearch(small_loci_genome_file, str(run_dir / run), enzyme1=enzyme1, enzyme2=enzyme2, **options_dict), unbatched_digest)
+
+#-------------------------------------------------------------------------------
+
+def test_ambiguity_codes(genome_file, tmp_path):
+    '''The restriction sites with ambiguity codes are found as their expanded unambiguous sequences, and their digest, double or single, is the same with every engine and in the stream digest.'''
+
+    import genlib
+
+    # the scanner of the sequences with ambiguity codes finds the sites of the expanded sequences
+    ressite_seqs_list = ['GCCNNNNNGGC', 'GGTCTCN', 'RGCGCY', 'GAGAC']
+    scanner = genlib.RestrictionSiteScanner([[ressite_seq] for ressite_seq in ressite_seqs_list])
+    expanded_scanner = genlib.RestrictionSiteScanner([genlib.get_unambiguous_sequence_list(ressite_seq) for ressite_seq in ressite_seqs_list])
+    for (locus_info, locus_seq, locus_start, locus_end) in genlib.get_genome_loci(genome_file, 'NONE'):
+        assert scanner.scan(locus_seq, locus_start, locus_end) == expanded_scanner.scan(locus_seq, locus_start, locus_end)
+
+    # digest with an interrupted palindrome and an enzyme with an ambiguity code in its overhang, with two enzymes with
+    # ambiguity codes in their sites and with a single enzyme with an ambiguity code
+    for (enzyme1, enzyme2) in [('gccnnnn*nggc', 'c*cwgg'), ('AdeI', 'rgcgc*y'), ('c*cwgg', 'c*cwgg')]:
+        run_dir = tmp_path / '{0}-{1}'.format(enzyme1, enzyme2).replace('*', '')
+        default_digest = run_rsitesearch(genome_file, str(run_dir / 'default'), enzyme1=enzyme1, enzyme2=enzyme2)
+        for (run, options_dict) in [('numpy', {'engine': 'NUMPY'}), ('stream', {'stream': 'YES'})]:
+            assert_same_digest(run_rsitesearch(genome_file, str(run_dir / run), enzyme1=enzyme1, enzyme2=enzyme2, **options_dict), default_digest)
+
+    # the double digest is the one found with every unambiguous sequence of the sites
+    (fragsfile, fragstfile, output) = run_rsitesearch(genome_file, str(tmp_path / 'reference'), enzyme1='AdeI', enzyme2='rgcgc*y', minfragsize=1, maxfragsize=1000000)
+    with open(fragsfile, mode='r', encoding='iso-8859-1') as fragsfile_id:
+        assert fragsfile_id.read().split('\n')[:-1] == get_reference_double_digest(genome_file, 'AdeI', 'rgcgc*y', 1, 1000000)
+
+#-------------------------------------------------------------------------------
+
+def test_digest_generator(genome_file, tmp_path):
+    '''The fragment records yielded by the digest generator are the fragments written by the program, for a double digest and a single digest and with and without the genome store.'''
+
+    import rsitesearch
+
+    for (run, enzyme1, enzyme2) in [('double', 'PstI', 'c*cgg'), ('single', 'EcoRI', 'EcoRI')]:
+
+        # read the fragments written by the program
+        (fragsfile, fragstfile, output) = run_rsitesearch(genome_file, str(tmp_path / run), enzyme1=enzyme1, enzyme2=enzyme2)
+        with open(fragsfile, mode='r', encoding='iso-8859-1') as fragsfile_id:
+            records_list = fragsfile_id.read().split('\n')[:-1]
+        assert records_list != []
+
+        for genstore in ['NONE', str(tmp_path / 'genome.store')]:
+
+            # build the records of the fragments yielded by the generator
+            digest_records_list = []
+            for (i, fragment) in enumerate(rsitesearch.digest(genome_file, enzyme1, enzyme2, 101, 300, genstore=genstore)):
+                assert not hasattr(fragment, '__dict__')
+                assert fragment.N_count == fragment.length - sum([fragment.seq.count(nucleotide) for nucleotide in 'ACGT'])
+                digest_records_list.append('>fragment: {0:d} | length: {1:d} | GC: {2:3.2f} | strand: {3} | start: {4:d} | end: {5:d} | locus: {6}'.format(i + 1, fragment.length, fragment.GC_rate, fragment.strand, fragment.start, fragment.end, fragment.contig_info))
+                digest_records_list.append(fragment.seq)
+
+            # compare the fragments
+            assert digest_records_list == records_list
+
+#-------------------------------------------------------------------------------
+
+def test_fragments_columns(genome_file, tmp_path):
+    '''The columnar fragments file has the fragments of the FASTA file: their heads in its columns and their sequences as segments of the genome store, also when it is read as a fragments file, when the columns of the loci digested by a pool of processes are merged and in a single digest.'''
+
+    import genlib
+
+    genstore = str(tmp_path / 'genome.store')
+    for (enzyme1, enzyme2, processes) in [('AdeI', 'MseI', 1), ('AdeI', 'MseI', 2), ('EcoRI', 'EcoRI', 1)]:
+
+        # digest writing the fragments as FASTA and as columns
+        fragscolumns = str(tmp_path / '{0}-{1}-{2}.npz'.format(enzyme1, enzyme2, processes))
+        (fragsfile, fragstfile, output) = run_rsitesearch(genome_file, str(tmp_path / '{0}-{1}-{2}'.format(enzyme1, enzyme2, processes)), enzyme1=enzyme1, enzyme2=enzyme2, processes=processes, genstore=genstore, fragscolumns=fragscolumns)
+        with open(fragsfile, mode='r', encoding='iso-8859-1') as fragsfile_id:
+            records_list = fragsfile_id.read().split('\n')[:-1]
+        assert records_list != []
+
+        # build the records of the fragments from the columns and the segments of the genome store
+        columns_dict = genlib.read_fragments_columns(fragscolumns)
+        assert columns_dict['genstore'] == os.path.abspath(genstore)
+        genome_store = genlib.GenomeStore(genstore)
+        columns_records_list = []
+        for i in range(len(columns_dict['lengths'])):
+            fragment_seq = genome_store.seq[columns_dict['seq_starts'][i]:columns_dict['seq_ends'][i]]
+            if columns_dict['strands'][i] < 0:
+                fragment_seq = genlib.get_reverse_complementary_bytes(fragment_seq)
+            fragment_seq = fragment_seq.decode('iso-8859-1')
+            assert columns_dict['N_counts'][i] == len(fragment_seq) - sum([fragment_seq.count(nucleotide) for nucleotide in 'ACGT'])
+            columns_records_list.append('>fragment: {0:d} | length: {1:d} | GC: {2:3.2f} | strand: {3} | start: {4:d} | end: {5:d} | locus: {6}'.format(i + 1, columns_dict['lengths'][i], columns_dict['GC_rates'][i], '+' if columns_dict['strands'][i] > 0 else '-', columns_dict['starts'][i], columns_dict['ends'][i], columns_dict['contigs'][columns_dict['contig_ids'][i]]))
+            columns_records_list.append(fragment_seq)
+        genome_store.close()
+        assert columns_records_list == records_list
+
+        # the fragments read from the columnar file are the ones read from the FASTA file
+        assert sorted([fragment[:3] for fragment in genlib.get_fragments_list(fragscolumns)]) == sorted([fragment[:3] for fragment in genlib.get_fragments_list(fragsfile)])
+
+#-------------------------------------------------------------------------------
+
+def test_report(genome_file, tmp_path):
+    '''The report of the run has the stages of the digest and the data of every locus, also when the loci are digested by a pool of processes, and its totals are the ones of the fragments file.'''
+
+    import genlib
+
+    # get the lengths of the loci of the genome
+    loci_lens_dict = {locus_info: locus_end - locus_start for (locus_info, locus_seq, locus_start, locus_end) in genlib.get_genome_loci(genome_file, 'NONE')}
+    assert len(loci_lens_dict) == 400
+
+    for processes in [1, 2]:
+
+        # digest every locus alone writing the report
+        (fragsfile, fragstfile, output) = run_rsitesearch(genome_file, str(tmp_path / 'processes-{0}'.format(processes)), enzyme1='PstI', enzyme2='MseI', processes=processes, batchsize=0, report='YES')
+        report_dict = read_report(fragstfile)
+        with open(fragsfile, mode='r', encoding='iso-8859-1') as fragsfile_id:
+            written_fragments_count = sum([record.startswith('>') for record in fragsfile_id])
+
+        # check the run data
+        assert (report_dict['enzymes'], report_dict['processes']) == (['PstI', 'MseI'], processes)
+        assert report_dict['written_fragments'] == written_fragments_count > 0
+
+        # check the stages, whose data recorded by the processes of the pool are merged in the report
+        assert {'scan', 'cuts', 'fragments', 'merge', 'write', 'statistics', 'GC distribution'} <= set(report_dict['stages'])
+        assert report_dict['stages']['scan']['calls'] == 400
+        assert report_dict['stages']['scan']['bytes'] == sum(loci_lens_dict.values())
+
+        # check the loci, recorded by the process that digested them
+        assert {locus_dict['locus']: locus_dict['length'] for locus_dict in report_dict['loci']} == loci_lens_dict
+        assert len(report_dict['loci']) == 400
+        assert sum([locus_dict['fragments'] for locus_dict in report_dict['loci']]) == report_dict['total_fragments'] >= written_fragments_count
+
+#-------------------------------------------------------------------------------
+
+def get_reference_double_digest(genfile, enzyme1, enzyme2, minfragsize, maxfragsize):
+    '''Get the records of the fragments file of a double digest done as the first version of rsitesearch did it: finding the sites of every unambiguous sequence of the first enzyme in each strand, the reverse complementary sequence of the locus included, and the next site of the second enzyme after each of them.'''
+
+    import re
+
+    import genlib
+
+    # get the restriction site sequences and the restriction overhangs
+    (ressite1_seq, ressite1_lcut_seq, ressite1_rcut_seq, ressite2_seq, ressite2_lcut_seq, ressite2_rcut_seq) = genlib.get_ressites(os.path.join(PROGRAMS_DIR, 'restrictionsites.txt'), enzyme1, enzyme2)
+    resoverhang1_seq = genlib.get_reverse_complementary_sequence(ressite1_lcut_seq) if len(ressite1_lcut_seq) >= len(ressite1_rcut_seq) else ressite1_rcut_seq
+    resoverhang2_seq = ressite1_lcut_seq if len(ressite2_lcut_seq) >= len(ressite2_rcut_seq) else genlib.get_reverse_complementary_sequence(ressite2_rcut_seq)
+    unambiguous_ressite1_seq_list = genlib.get_unambiguous_sequence_list(ressite1_seq.upper())
+    unambiguous_ressite2_seq_list = genlib.get_unambiguous_sequence_list(ressite2_seq.upper())
+
+    # for each strand of every locus
+    records_list = []
+    for (locus_info, locus_seq, locus_start, locus_end) in genlib.get_genome_loci(genfile, 'NONE'):
+        watson_locus_seq = locus_seq[locus_start:locus_end].decode('iso-8859-1').upper()
+        for (strand, strand_locus_seq) in [('+', watson_locus_seq), ('-', genlib.get_reverse_complementary_sequence(watson_locus_seq))]:
+
+            # get a fragment from every site of the first enzyme followed by a site of the second enzyme before the next site of the first enzyme
+            ressite1_positions_list = sorted([m.start() for unambiguous_ressite1_seq in unambiguous_ressite1_seq_list for m in re.finditer('(?={0})'.format(unambiguous_ressite1_seq), strand_locus_seq)])
+            for (i, ressite1_position) in enumerate(ressite1_positions_list):
+                ressite2_positions_list = [position for position in [strand_locus_seq.find(unambiguous_ressite2_seq, ressite1_position + len(ressite1_seq)) for unambiguous_ressite2_seq in unambiguous_ressite2_seq_list] if position != -1]
+                if ressite2_positions_list == []:
+                    break
+                ressite2_position = min(ressite2_positions_list)
+                if i == len(ressite1_positions_list) - 1 or ressite2_position < ressite1_positions_list[i + 1]:
+                    start_position = ressite1_position + len(ressite1_seq) - len(resoverhang1_seq)
+                    end_position = ressite2_position + len(resoverhang2_seq)
+                    fragment_seq = strand_locus_seq[start_position:end_position]
+                    if minfragsize <= len(fragment_seq) <= maxfragsize:
+                        (start, end) = (start_position + 1, end_position) if strand == '+' else (len(strand_locus_seq) - start_position, len(strand_locus_seq) - end_position + 1)
+                        records_list.append('>fragment: {0:d} | length: {1:d} | GC: {2:3.2f} | strand: {3} | start: {4:d} | end: {5:d} | locus: {6}'.format(len(records_list) // 2 + 1, len(fragment_seq), genlib.get_GC_N_data(fragment_seq)[0], strand, start, end, locus_info))
+                        records_list.append(fragment_seq)
+
+    # return the records of the fragments file
+    return records_list
+
+#-------------------------------------------------------------------------------
+
+def test_crick_strand(genome_file, tmp_path):
+    '''The fragments of the Crick strand, found without building its sequence, are the ones found in the reverse complementary sequence of every locus, with non palindromic restriction sites and in every engine.'''
+
+    for (enzyme1, enzyme2) in [('ggtctcn*', 'EcoRI'), ('PstI', 'gagg*ag')]:
+        records_list = get_reference_double_digest(genome_file, enzyme1, enzyme2, 101, 300)
+        assert [record for record in records_list if record.startswith('>') and '| strand: - |' in record] != []
+        for engine in ['REGEX', 'NUMPY']:
+            (fragsfile, fragstfile, output) = run_rsitesearch(genome_file, str(tmp_path / '{0}-{1}-{2}'.format(enzyme1, enzyme2, engine).replace('*', '')), enzyme1=enzyme1, enzyme2=enzyme2, engine=engine)
+            with open(fragsfile, mode='r', encoding='iso-8859-1') as fragsfile_id:
+                assert fragsfile_id.read().split('\n')[:-1] == records_list
+
+#-------------------------------------------------------------------------------
+
+def test_sites_pairing(genome_file, tmp_path):
+    '''The fragments got pairing the sorted sites of both enzymes in a single walk are the ones got searching the next site of the second enzyme after every site of the first one, with every fragment size, when the sites of the first enzyme are more frequent or rare, when the second enzyme is missing in the end of the loci, when its sites are inside the ones of the first enzyme and with ambiguity codes.'''
+
+    for (enzyme1, enzyme2) in [('MseI', 'EcoRI'), ('EcoRI', 'gc*ggccgc'), ('EcoRI', 'a*att'), ('AdeI', 'c*cwgg')]:
+        records_list = get_reference_double_digest(genome_file, enzyme1, enzyme2, 1, 1000000)
+        assert records_list != []
+        (fragsfile, fragstfile, output) = run_rsitesearch(genome_file, str(tmp_path / '{0}-{1}'.format(enzyme1, enzyme2).replace('*', '')), enzyme1=enzyme1, enzyme2=enzyme2, minfragsize=1, maxfragsize=1000000)
+        with open(fragsfile, mode='r', encoding='iso-8859-1') as fragsfile_id:
+            assert fragsfile_id.read().split('\n')[:-1] == records_list
+
+#-------------------------------------------------------------------------------
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+
+#-------------------------------------------------------------------------------
+
+'''This source contains the tests of the startup of the programs.'''
+
+#-------------------------------------------------------------------------------
+
+import subprocess
+import sys
+
+import pytest
+
+from conftest import PROGRAMS_DIR, run_program
+
+#-------------------------------------------------------------------------------
+
+@pytest.mark.parametrize('program', ['genlib', 'rsitesearch', 'rsitescreen', 'fragsweep'])
+def test_lazy_imports(program):
+    '''The heavy modules are not imported when a program starts, only in the functions that use them.'''
+
+    command = [sys.executable, '-c', 'import sys\nsys.path.insert(0, {0!r})\nimport {1}\nprint(sorted([module for module in {2!r} if module in sys.modules]))'.format(PROGRAMS_DIR, program, ['numpy', 'json', 'hashlib', 'matplotlib', 'multiprocessing', 'concurrent.futures', 'tempfile'])]
+    process = subprocess.run(command, capture_output=True, text=True)
+    assert process.returncode == 0, process.stderr
+    assert process.stdout == '[]\n'
+
+#-------------------------------------------------------------------------------
+
+@pytest.mark.parametrize(('program', 'option'), [('rsitesearch.py', 'enzyme1'), ('rsitescreen.py', 'enzymes'), ('fragsweep.py', 'sweepwidth')])
+def test_help(program, option):
+    '''The help of every program is shown with its options.'''
+
+    assert option in run_program(program, {'help': 'YES'})
+
+#-------------------------------------------------------------------------------